@@ -1,5 +1,9 @@
 # async_redis_manager.py
-import aioredis
+try:
+    # redis-py >= 4.2 ships the aioredis API as redis.asyncio
+    from redis import asyncio as aioredis
+except ImportError:
+    import aioredis
 import json
 import time
 import asyncio
@@ -69,13 +73,14 @@ class AsyncRedisManager:
                 port=self.port,
                 db=self.db,
                 max_connections=self.pool_size,
+                decode_responses=True,
                 retry_on_timeout=True,
                 socket_connect_timeout=5,
                 socket_timeout=5
             )
             
             # Create Redis client
-            self.redis = aioredis.Redis(connection_pool=self.pool, decode_responses=True)
+            self.redis = aioredis.Redis(connection_pool=self.pool)
             
             # Test connection
             await asyncio.wait_for(self.redis.ping(), timeout=2.0)
@@ -131,7 +136,8 @@ class AsyncRedisManager:
     
     async def _safe_execute(self, operation, *args, **kwargs):
         """Execute Redis operation with error handling and metrics"""
-        if not await self.ensure_connected():
+        # Only (re)connect when needed; pinging before every command doubles round trips
+        if not self._connected and not await self.connect():
             raise ConnectionError("Cannot connect to Redis")
             
         start_time = time.time()
@@ -144,6 +150,8 @@ class AsyncRedisManager:
             return result
         except Exception as e:
             self.metrics['errors'] += 1
+            if isinstance(e, (ConnectionError, aioredis.ConnectionError)):
+                self._connected = False
             logging.error(f"[AsyncRedis] Operation failed: {str(e)}")
             raise
     
@@ -0,0 +1,237 @@
+# broadcast_fanout.py
+"""
+Serialize-once, concurrent fan-out for room broadcasts.
+
+Room broadcasts send the same body to every player with a few per-recipient
+fields (``you``, ``player_number``, a player's own hand). Instead of copying
+the payload and calling json.dumps for each recipient, the shared part is
+encoded once and the per-recipient fields are spliced onto the end of the
+encoded object. All sends then run concurrently, each with its own timeout,
+so one slow client no longer delays the rest of the room. Sockets with an
+OutboundQueue (outbound_queue.py) are not awaited at all: their frames are
+queued for the connection's writer task. Connections that negotiated the
+binary protocol (wire_protocol.py) get a BinaryPayload, also encoded once.
+"""
+
+import asyncio
+import json
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import websockets
+
+import wire_protocol
+
+log = logging.getLogger(__name__)
+
+DEFAULT_SEND_TIMEOUT = 2.0
+
+
+class FanoutMetrics:
+    """Per-broadcast latency and egress counters"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Reset all metrics"""
+        with self._lock:
+            self.broadcasts = 0
+            self.messages_sent = 0
+            self.send_failures = 0
+            self.send_timeouts = 0
+            self.queue_drops = 0
+            self.bytes_sent = 0
+            self.encode_times = deque(maxlen=1000)   # Seconds spent serializing per broadcast
+            self.latencies = deque(maxlen=1000)      # Seconds from encode start to last send
+            self.max_latency = 0.0
+            self.per_type = {}
+
+    def record_broadcast(self, msg_type: str, encode_time: float, latency: float,
+                         sent: int, failed: int, timed_out: int, nbytes: int, dropped: int = 0):
+        with self._lock:
+            self.broadcasts += 1
+            self.messages_sent += sent
+            self.send_failures += failed
+            self.send_timeouts += timed_out
+            self.queue_drops += dropped
+            self.bytes_sent += nbytes
+            self.encode_times.append(encode_time)
+            self.latencies.append(latency)
+            self.max_latency = max(self.max_latency, latency)
+            stats = self.per_type.setdefault(msg_type, {'count': 0, 'bytes': 0, 'latency_sum': 0.0})
+            stats['count'] += 1
+            stats['bytes'] += nbytes
+            stats['latency_sum'] += latency
+
+    def get_metrics_dict(self) -> Dict[str, Any]:
+        """Get all metrics as dictionary (times in milliseconds)"""
+        with self._lock:
+            latencies = list(self.latencies)
+            encode_times = list(self.encode_times)
+            return {
+                'broadcasts': self.broadcasts,
+                'messages_sent': self.messages_sent,
+                'send_failures': self.send_failures,
+                'send_timeouts': self.send_timeouts,
+                'queue_drops': self.queue_drops,
+                'bytes_sent': self.bytes_sent,
+                'avg_latency_ms': (sum(latencies) / len(latencies) * 1000) if latencies else 0.0,
+                'max_latency_ms': self.max_latency * 1000,
+                'avg_encode_ms': (sum(encode_times) / len(encode_times) * 1000) if encode_times else 0.0,
+                'per_type': {
+                    msg_type: {
+                        'count': stats['count'],
+                        'bytes': stats['bytes'],
+                        'avg_latency_ms': stats['latency_sum'] / stats['count'] * 1000
+                    }
+                    for msg_type, stats in self.per_type.items()
+                }
+            }
+
+
+class SharedPayload:
+    """
+    A message encoded once, with per-recipient fields appended as raw JSON.
+
+    ``fields`` passed to render() override keys of the shared body, which is
+    why those keys are removed from the body before encoding.
+    """
+
+    def __init__(self, msg_type: str, data: Optional[Dict[str, Any]] = None,
+                 per_recipient_keys: Iterable[str] = ()):
+        body = {'type': msg_type}
+        if data:
+            body.update(data)
+        for key in per_recipient_keys:
+            body.pop(key, None)
+        body['type'] = msg_type
+        encoded = json.dumps(body)
+        # Always at least {"type": ...}, so a field can be spliced in after a comma
+        self.prefix = encoded[:-1]
+
+    def render(self, **fields) -> str:
+        """Encoded message with the given per-recipient fields spliced in"""
+        if not fields:
+            return self.prefix + '}'
+        parts = [self.prefix]
+        for key, value in fields.items():
+            parts.append(f', {json.dumps(key)}: {json.dumps(value)}')
+        parts.append('}')
+        return ''.join(parts)
+
+
+class BinaryPayload:
+    """SharedPayload for binary frames: shared map entries packed once, header sized per recipient"""
+
+    def __init__(self, msg_type: str, data: Optional[Dict[str, Any]] = None,
+                 per_recipient_keys: Iterable[str] = ()):
+        body = {'type': msg_type}
+        if data:
+            body.update(data)
+        for key in per_recipient_keys:
+            body.pop(key, None)
+        body['type'] = msg_type
+        self.size = len(body)
+        self.entries = b''.join(wire_protocol.pack_field(key, value) for key, value in body.items())
+
+    def render(self, **fields) -> bytes:
+        """Encoded message with the given per-recipient fields added"""
+        parts = [wire_protocol.map_header(self.size + len(fields)), self.entries]
+        for key, value in fields.items():
+            parts.append(wire_protocol.pack_field(key, value))
+        return b''.join(parts)
+
+
+class BroadcastFanout:
+    """Concurrent sender for pre-encoded messages"""
+
+    def __init__(self, send_timeout: float = DEFAULT_SEND_TIMEOUT, outbound=None):
+        self.send_timeout = send_timeout
+        self.outbound = outbound   # OutboundQueues; sockets with a queue are not awaited
+        self.metrics = FanoutMetrics()
+
+    async def _send_one(self, websocket, msg_type: str, message: str, timeout: float) -> str:
+        """Send one frame; returns 'ok', 'timeout', 'dropped' or 'failed'"""
+        if self.outbound is not None:
+            offered = self.outbound.offer(websocket, msg_type, message)
+            if offered is not None:
+                return {'closed': 'failed', 'dropped': 'dropped'}.get(offered, 'ok')
+        try:
+            await asyncio.wait_for(websocket.send(message), timeout=timeout)
+            return 'ok'
+        except asyncio.TimeoutError:
+            return 'timeout'
+        except websockets.ConnectionClosed:
+            return 'failed'
+        except Exception as e:
+            log.error("Failed to send message: %s", e)
+            return 'failed'
+
+    async def send_all(self, msg_type: str, recipients: List[Tuple[Any, str]],
+                       timeout: Optional[float] = None, started_at: Optional[float] = None,
+                       encode_time: float = 0.0) -> Dict[str, List[Any]]:
+        """
+        Send (websocket, message) pairs concurrently.
+
+        Returns the sockets that failed (closed/errored), those that timed
+        out and those whose outbound queue was full, so the caller can decide
+        how to treat each.
+        """
+        start = started_at if started_at is not None else time.perf_counter()
+        timeout = self.send_timeout if timeout is None else timeout
+
+        results = await asyncio.gather(
+            *(self._send_one(ws, msg_type, message, timeout) for ws, message in recipients)
+        )
+
+        failed, timed_out, dropped = [], [], []
+        nbytes = 0
+        for (ws, message), outcome in zip(recipients, results):
+            if outcome == 'ok':
+                nbytes += len(message)
+            elif outcome == 'timeout':
+                timed_out.append(ws)
+            elif outcome == 'dropped':
+                dropped.append(ws)
+            else:
+                failed.append(ws)
+
+        self.metrics.record_broadcast(
+            msg_type, encode_time, time.perf_counter() - start,
+            len(recipients) - len(failed) - len(timed_out) - len(dropped), len(failed), len(timed_out), nbytes,
+            dropped=len(dropped)
+        )
+        return {'failed': failed, 'timed_out': timed_out, 'dropped': dropped}
+
+    async def broadcast(self, msg_type: str, data: Optional[Dict[str, Any]],
+                        recipients: List[Tuple[Any, Dict[str, Any]]],
+                        timeout: Optional[float] = None) -> Dict[str, List[Any]]:
+        """
+        Encode ``data`` once and send it to each (websocket, fields) recipient,
+        with ``fields`` spliced in as that recipient's private keys.
+        """
+        start = time.perf_counter()
+        per_recipient_keys = set()
+        for _, fields in recipients:
+            per_recipient_keys.update(fields)
+        payloads = {}   # One encoding per wire protocol in use
+        messages = []
+        for ws, fields in recipients:
+            binary = wire_protocol.uses_binary(ws)
+            payload = payloads.get(binary)
+            if payload is None:
+                payload_class = BinaryPayload if binary else SharedPayload
+                payload = payloads[binary] = payload_class(msg_type, data, per_recipient_keys)
+            messages.append((ws, payload.render(**fields)))
+        encode_time = time.perf_counter() - start
+        return await self.send_all(msg_type, messages, timeout=timeout, started_at=start, encode_time=encode_time)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        metrics = self.metrics.get_metrics_dict()
+        metrics['send_timeout'] = self.send_timeout
+        return metrics
@@ -0,0 +1,80 @@
+# card_bits.py
+"""
+52-bit card set encoding for the bitmask game engine.
+
+Card i (0..51) is bit ``1 << i`` with i = suit_index * 13 + rank_index, using
+the suit and rank order of GameBoard._create_deck(). Within a suit a higher
+bit is a higher card, so "best card of a suit in this set" is a mask and a
+bit_length() call. A hand, the played cards or a trick is a single int.
+
+Card strings ("rank_suit") are only produced when decoding for the protocol.
+"""
+
+from typing import Dict, Iterable, List, Optional
+
+SUITS = ('hearts', 'diamonds', 'clubs', 'spades')
+RANKS = ('2', '3', '4', '5', '6', '7', '8', '9', '10', 'J', 'Q', 'K', 'A')
+
+CARD_NAMES: List[str] = [f"{rank}_{suit}" for suit in SUITS for rank in RANKS]
+CARD_INDEX: Dict[str, int] = {name: i for i, name in enumerate(CARD_NAMES)}
+CARD_BITS: Dict[str, int] = {name: 1 << i for i, name in enumerate(CARD_NAMES)}
+
+SUIT_INDEX: Dict[str, int] = {suit: i for i, suit in enumerate(SUITS)}
+SUIT_MASKS: List[int] = [((1 << 13) - 1) << (13 * i) for i in range(len(SUITS))]
+SUIT_MASK_BY_NAME: Dict[str, int] = {suit: SUIT_MASKS[i] for i, suit in enumerate(SUITS)}
+FULL_DECK_MASK = (1 << 52) - 1
+
+
+def card_bit(card: str) -> int:
+    """Single-bit mask for a card string; raises KeyError for unknown cards"""
+    return CARD_BITS[card]
+
+
+def cards_to_mask(cards: Iterable[str]) -> int:
+    """Encode card strings as a set mask"""
+    mask = 0
+    for card in cards:
+        mask |= CARD_BITS[card]
+    return mask
+
+
+def mask_to_cards(mask: int) -> List[str]:
+    """Decode a set mask to card strings in deck order"""
+    cards = []
+    while mask:
+        low = mask & -mask
+        cards.append(CARD_NAMES[low.bit_length() - 1])
+        mask ^= low
+    return cards
+
+
+def card_count(mask: int) -> int:
+    return mask.bit_count()
+
+
+def suit_of_bit(bit: int) -> str:
+    """Suit name of a single-bit card mask"""
+    return SUITS[(bit.bit_length() - 1) // 13]
+
+
+def highest_bit(mask: int) -> int:
+    """Single-bit mask of the highest card in mask (0 if empty)"""
+    return 1 << (mask.bit_length() - 1) if mask else 0
+
+
+def legal_cards_mask(hand_mask: int, led_suit: Optional[str]) -> int:
+    """Cards that may be played: the led suit if the hand holds any, otherwise the whole hand"""
+    if led_suit:
+        following = hand_mask & SUIT_MASK_BY_NAME[led_suit]
+        if following:
+            return following
+    return hand_mask
+
+
+def trick_winner_bit(trick_mask: int, led_suit: str, hokm: Optional[str]) -> int:
+    """Winning card of a trick: highest trump if any was played, else highest of the led suit"""
+    if hokm:
+        trumps = trick_mask & SUIT_MASK_BY_NAME[hokm]
+        if trumps:
+            return highest_bit(trumps)
+    return highest_bit(trick_mask & SUIT_MASK_BY_NAME[led_suit])
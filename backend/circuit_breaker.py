@@ -4,6 +4,7 @@ Provides resilience and fault tolerance for Redis connectivity issues
 """
 
 import time
+import asyncio
 import threading
 import json
 import logging
@@ -43,7 +44,8 @@ class CircuitBreakerMetrics:
     """Metrics collection for circuit breaker"""
     
     def __init__(self):
-        self._lock = threading.Lock()
+        # Reentrant: get_metrics_dict() calls get_failure_rate() while holding the lock
+        self._lock = threading.RLock()
         self.reset()
     
     def reset(self):
@@ -262,6 +264,40 @@ class CircuitBreaker:
             self.logger.warning(f"Circuit {self.name} is OPEN, using fallback")
             return self._try_fallback(fallback_func, cache_key, "Circuit breaker is OPEN", args, kwargs)
     
+    async def call_async(self, func: Callable, *args, fallback_func: Callable = None, cache_key: str = None, **kwargs) -> OperationResult:
+        """Execute coroutine function with circuit breaker protection (fallback_func stays synchronous)"""
+        start_time = time.time()
+
+        if self._should_allow_request():
+            try:
+                result = await self._execute_with_retry_async(func, *args, **kwargs)
+                execution_time = time.time() - start_time
+
+                self._on_success()
+
+                if cache_key and result is not None:
+                    self.cache.set(cache_key, result)
+
+                self.metrics.record_request(True, execution_time)
+
+                return OperationResult(
+                    success=True,
+                    value=result,
+                    execution_time=execution_time
+                )
+
+            except Exception as e:
+                execution_time = time.time() - start_time
+                error_type = type(e).__name__
+
+                self._on_failure()
+                self.metrics.record_request(False, execution_time, error_type)
+
+                return self._try_fallback(fallback_func, cache_key, str(e), args, kwargs)
+        else:
+            self.logger.warning(f"Circuit {self.name} is OPEN, using fallback")
+            return self._try_fallback(fallback_func, cache_key, "Circuit breaker is OPEN", args, kwargs)
+
     def _should_allow_request(self) -> bool:
         """Check if request should be allowed based on circuit state"""
         with self._lock:
@@ -303,7 +339,31 @@ class CircuitBreaker:
         
         # All retries failed
         raise last_exception
-    
+
+    async def _execute_with_retry_async(self, func: Callable, *args, **kwargs) -> Any:
+        """Await coroutine function with exponential backoff retry (non-blocking sleeps)"""
+        last_exception = None
+
+        for attempt in range(self.config.max_retry_attempts):
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                last_exception = e
+
+                if attempt < self.config.max_retry_attempts - 1:
+                    delay = min(
+                        self.config.base_backoff_delay * (2 ** attempt),
+                        self.config.max_backoff_delay
+                    )
+
+                    self.logger.warning(
+                        f"Circuit {self.name} attempt {attempt + 1} failed: {str(e)}. "
+                        f"Retrying in {delay:.2f}s"
+                    )
+                    await asyncio.sleep(delay)
+
+        raise last_exception
+
     def _on_success(self):
         """Handle successful operation"""
         with self._lock:
@@ -1,7 +1,7 @@
 # client.py
 import asyncio
-import websockets
 import json
+import websockets
 import sys
 import random
 import os
@@ -16,9 +16,13 @@ sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from game_states import GameState
 from client_auth_manager import ClientAuthManager
+from game_state_delta import SyncedState
+from wire_protocol import DECODE_ERRORS, client_subprotocols, decode, encode_for
 
 
 SERVER_URI = "ws://localhost:8760"  # Load balancer port
+WIRE_PROTOCOL = os.getenv('HOKM_WIRE_PROTOCOL')  # 'msgpack' for compact binary frames; JSON by default
+WIRE_COMPRESSION = os.getenv('HOKM_WIRE_COMPRESSION', '1') != '0'  # Accept compressed state frames
 
 def get_terminal_session_id():
     """Generate a persistent session ID for the current terminal"""
@@ -41,6 +45,41 @@ def get_terminal_session_id():
 
 # Create persistent session file per terminal window
 SESSION_FILE = os.environ.get('PLAYER_SESSION', get_terminal_session_id())
+# Last acknowledged state_sync position and state (servers in delta sync mode), so a reconnect only needs what came after
+SYNC_FILE = SESSION_FILE + '.sync'
+# Signed resume token from the server; lets a reconnect skip the server's Redis session checks
+TOKEN_FILE = SESSION_FILE + '.token'
+
+def load_synced_state():
+    """The state saved with the session, or an empty one"""
+    try:
+        with open(SYNC_FILE, 'r') as f:
+            return SyncedState.from_dict(json.load(f))
+    except (OSError, ValueError):
+        return SyncedState()
+
+def save_synced_state(synced):
+    try:
+        with open(SYNC_FILE, 'w') as f:
+            json.dump(synced.to_dict(), f)
+    except OSError as e:
+        print(f"⚠️ Warning: Could not save synced state: {e}")
+
+def load_resume_token():
+    try:
+        with open(TOKEN_FILE, 'r') as f:
+            return f.read().strip() or None
+    except OSError:
+        return None
+
+def save_resume_token(token):
+    if not token:
+        return
+    try:
+        with open(TOKEN_FILE, 'w') as f:
+            f.write(token)
+    except OSError as e:
+        print(f"⚠️ Warning: Could not save resume token: {e}")
 
 def display_hand_by_suit(hand, hokm=None):
     suits = ['hearts', 'diamonds', 'clubs', 'spades']
@@ -117,7 +156,7 @@ async def check_for_exit(ws, room_code):
         if cmd and cmd.strip().lower() == 'exit':
             print("\nSending command to clear room 9999 and exiting...")
             try:
-                await ws.send(json.dumps({
+                await ws.send(encode_for(ws, {
                     'type': 'clear_room',
                     'room_code': room_code
                 }))
@@ -131,6 +170,9 @@ async def check_for_exit(ws, room_code):
 def clear_session():
     """Clear the current session file"""
     try:
+        for path in (SYNC_FILE, TOKEN_FILE):
+            if os.path.exists(path):
+                os.remove(path)
         if os.path.exists(SESSION_FILE):
             os.remove(SESSION_FILE)
             print("🗑️ Session cleared")
@@ -152,7 +194,7 @@ async def handle_exit(websocket):
             "type": "exit",
             "reason": "user_exit"
         }
-        await websocket.send(json.dumps(exit_message))
+        await websocket.send(encode_for(websocket, exit_message))
         
         # Give server time to process
         await asyncio.sleep(0.5)
@@ -173,13 +215,14 @@ async def main():
         try:
             async with websockets.connect(
                 SERVER_URI,
+                subprotocols=client_subprotocols(WIRE_PROTOCOL, WIRE_COMPRESSION),
                 ping_interval=60,      # Send ping every 60 seconds
                 ping_timeout=300,      # 5 minutes timeout for ping response
                 close_timeout=300,     # 5 minutes timeout for close handshake
                 max_size=1024*1024,    # 1MB max message size
                 max_queue=100          # Max queued messages
             ) as ws:
-                await ws.send(json.dumps({
+                await ws.send(encode_for(ws, {
                     'type': 'clear_room',
                     'room_code': room_code
                 }))
@@ -211,6 +254,7 @@ async def main():
 
     # Track player ID for gameplay
     player_id = None
+    synced = SyncedState()  # Room state from state_sync messages (delta sync servers only)
     
     # Check for existing session data for reconnection
     session_player_id = None
@@ -219,6 +263,7 @@ async def main():
             with open(SESSION_FILE, 'r') as f:
                 session_player_id = f.read().strip()
             if session_player_id:
+                synced = load_synced_state()
                 print(f"🔍 Found existing session file with player ID: {session_player_id}")
                 print(f"🔄 Attempting to reconnect to previous game...")
                 print(f"   (If this fails, the game may have ended or server restarted)")
@@ -237,6 +282,7 @@ async def main():
     
     async with websockets.connect(
         SERVER_URI,
+        subprotocols=client_subprotocols(WIRE_PROTOCOL, WIRE_COMPRESSION),
         ping_interval=60,      # Send ping every 60 seconds
         ping_timeout=300,      # 5 minutes timeout for ping response
         close_timeout=300,     # 5 minutes timeout for close handshake
@@ -269,10 +315,13 @@ async def main():
         if session_player_id and session_player_id == player_id:
             print(f"✅ Session matches current player - attempting reconnection")
             print(f"� Connecting to previous game session...")
-            await ws.send(json.dumps({
+            await ws.send(encode_for(ws, {
                 "type": "reconnect",
                 "player_id": session_player_id,
-                "room_code": "9999"
+                "room_code": "9999",
+                "last_seq": synced.sequence_id,  # Only changes after this are resent
+                "epoch": synced.epoch,
+                "resume_token": load_resume_token()
             }))
             
             # Wait for response with timeout
@@ -280,19 +329,20 @@ async def main():
                 print(f"🕐 Waiting for reconnection response (30s timeout)...")
                 response = await asyncio.wait_for(ws.recv(), timeout=30.0)  # Increased from 10.0
                 print(f"📥 Received response: {response[:100]}..." if len(response) > 100 else f"📥 Received response: {response}")
-                data = json.loads(response)
+                data = decode(response)
                 msg_type = data.get('type')
                 print(f"🔍 Message type: {msg_type}")
                 
                 if msg_type == 'reconnect_success':
                     print(f"✅ Successfully reconnected!")
+                    save_resume_token(data.get('resume_token'))
                     # Continue to main message loop
                 elif msg_type == 'error':
                     error_msg = data.get('message', 'Unknown error')
                     print(f"❌ Reconnection failed: {error_msg}")
                     # If reconnection fails, try joining as new player
                     print(f"🔄 Trying to join as new player...")
-                    await ws.send(json.dumps({
+                    await ws.send(encode_for(ws, {
                         "type": "join",
                         "room_code": "9999"
                     }))
@@ -307,7 +357,7 @@ async def main():
                 print(f"⏰ Reconnection request timed out")
                 print(f"   Server may be unresponsive. Trying to join as new player...")
                 try:
-                    await ws.send(json.dumps({
+                    await ws.send(encode_for(ws, {
                         "type": "join", 
                         "room_code": "9999"
                     }))
@@ -335,7 +385,7 @@ async def main():
             else:
                 print(f"📝 No previous session - starting fresh")
                 
-            await ws.send(json.dumps({
+            await ws.send(encode_for(ws, {
                 "type": "join",
                 "room_code": "9999"
             }))
@@ -363,8 +413,8 @@ async def main():
                     
                 # Parse JSON message
                 try:
-                    data = json.loads(msg)
-                except json.JSONDecodeError as e:
+                    data = decode(msg)
+                except DECODE_ERRORS as e:
                     print(f"❌ Failed to parse JSON message: {msg[:100]}... Error: {e}")
                     continue
                     
@@ -406,7 +456,7 @@ async def main():
                         session_player_id = None  # Clear session
                         
                         # Try joining as new player
-                        await ws.send(json.dumps({
+                        await ws.send(encode_for(ws, {
                             "type": "join",
                             "room_code": "9999"
                         }))
@@ -451,7 +501,7 @@ async def main():
                                     print("Exiting client...")
                                     preserve_session()  # Keep session for reconnection
                                     try:
-                                        await ws.send(json.dumps({
+                                        await ws.send(encode_for(ws, {
                                             'type': 'clear_room',
                                             'room_code': room_code
                                         }))
@@ -477,10 +527,11 @@ async def main():
                                                 session_content = f.read().strip()
                                             if session_content:
                                                 print(f"[DEBUG] Using player_id: {session_content[:8]}...")
-                                                await ws.send(json.dumps({
+                                                await ws.send(encode_for(ws, {
                                                     "type": "reconnect",
                                                     "player_id": session_content,
-                                                    "room_code": room_code
+                                                    "room_code": room_code,
+                                                    "resume_token": load_resume_token()
                                                 }))
                                                 print("Reconnection request sent. Waiting for server response...")
                                                 input_received = True
@@ -533,7 +584,7 @@ async def main():
                                     if choice.lower() == 'exit':
                                         print("Exiting client...")
                                         preserve_session()  # Keep session for reconnection
-                                        await ws.send(json.dumps({
+                                        await ws.send(encode_for(ws, {
                                             'type': 'clear_room',
                                             'room_code': room_code
                                         }))
@@ -543,7 +594,7 @@ async def main():
                                     elif choice.lower() == 'clear_session':
                                         print("Clearing session and exiting...")
                                         clear_session()  # Remove session file
-                                        await ws.send(json.dumps({
+                                        await ws.send(encode_for(ws, {
                                             'type': 'clear_room',
                                             'room_code': room_code
                                         }))
@@ -557,7 +608,7 @@ async def main():
                                     if 0 <= card_idx < len(sorted_hand):
                                         card = sorted_hand[card_idx]
                                         print(f"[DEBUG] Error re-prompt - Selected card: {card}")
-                                        await ws.send(json.dumps({
+                                        await ws.send(encode_for(ws, {
                                             "type": "play_card",
                                             "room_code": room_code,
                                             "player_id": player_id,
@@ -570,7 +621,7 @@ async def main():
                                     print(f"[DEBUG] Error re-prompt - ValueError: {ve}")
                                     if choice.lower() == 'exit':
                                         print("Sending command to clear room and exiting...")
-                                        await ws.send(json.dumps({
+                                        await ws.send(encode_for(ws, {
                                             'type': 'clear_room',
                                             'room_code': room_code
                                         }))
@@ -588,6 +639,7 @@ async def main():
                     player_id = data.get('player_id')
                     username = data.get('username', username)
                     reconnected = data.get('reconnected', False)
+                    save_resume_token(data.get('resume_token'))
                     
                     if player_id:
                         # Save player_id to session file for reconnection
@@ -613,6 +665,7 @@ async def main():
                     player_id = data.get('player_id')
                     username = data.get('username', username)
                     game_state_data = data.get('game_state', {})
+                    save_resume_token(data.get('resume_token'))
                     
                     if player_id:
                         # Update session file
@@ -677,9 +730,9 @@ async def main():
                                     print("Choose hokm (hearts/diamonds/clubs/spades):")
                                     suit = await get_valid_suit_choice()
                                     if suit == 'exit':
-                                        await ws.send(json.dumps({'type':'clear_room','room_code':room_code}))
+                                        await ws.send(encode_for(ws, {'type':'clear_room','room_code':room_code}))
                                         return
-                                    await ws.send(json.dumps({'type':'hokm_selected','suit':suit,'room_code':room_code}))
+                                    await ws.send(encode_for(ws, {'type':'hokm_selected','suit':suit,'room_code':room_code}))
                                     await_hokm_selection = False
                                 
                                 elif phase == 'gameplay' and your_turn and hand:
@@ -703,7 +756,7 @@ async def main():
                                             if choice.lower() == 'exit':
                                                 print("Exiting client...")
                                                 preserve_session()
-                                                await ws.send(json.dumps({
+                                                await ws.send(encode_for(ws, {
                                                     'type': 'clear_room',
                                                     'room_code': room_code
                                                 }))
@@ -713,7 +766,7 @@ async def main():
                                             elif choice.lower() == 'clear_session':
                                                 print("Clearing session and exiting...")
                                                 clear_session()
-                                                await ws.send(json.dumps({
+                                                await ws.send(encode_for(ws, {
                                                     'type': 'clear_room',
                                                     'room_code': room_code
                                                 }))
@@ -727,7 +780,7 @@ async def main():
                                             if 0 <= card_idx < len(sorted_hand):
                                                 card = sorted_hand[card_idx]
                                                 print(f"[DEBUG] Reconnect card play - Selected card: {card}")
-                                                await ws.send(json.dumps({
+                                                await ws.send(encode_for(ws, {
                                                     "type": "play_card",
                                                     "room_code": room_code,
                                                     "player_id": player_id,
@@ -740,7 +793,7 @@ async def main():
                                             print(f"[DEBUG] Reconnect card play - ValueError: {ve}")
                                             if choice.lower() == 'exit':
                                                 print("Sending command to clear room and exiting...")
-                                                await ws.send(json.dumps({
+                                                await ws.send(encode_for(ws, {
                                                     'type': 'clear_room',
                                                     'room_code': room_code
                                                 }))
@@ -807,9 +860,9 @@ async def main():
                         print("\nNow you can choose hokm (hearts/diamonds/clubs/spades):")
                         suit = await get_valid_suit_choice()
                         if suit == 'exit':
-                            await ws.send(json.dumps({'type':'clear_room','room_code':room_code}))
+                            await ws.send(encode_for(ws, {'type':'clear_room','room_code':room_code}))
                             return
-                        await ws.send(json.dumps({'type':'hokm_selected','suit':suit,'room_code':room_code}))
+                        await ws.send(encode_for(ws, {'type':'hokm_selected','suit':suit,'room_code':room_code}))
                         await_hokm_selection = False
                     elif is_hakem:
                         print(f"\nYou are the Hakem! Waiting for phase to choose hokm...")
@@ -863,7 +916,7 @@ async def main():
                     print(data.get('message'))
                     answer = input("Create a new room? (y/n): ").strip().lower()
                     if answer == 'y':
-                        await ws.send(json.dumps({
+                        await ws.send(encode_for(ws, {
                             "type": "create_room",
                             "username": username,
                             "response": "y"
@@ -908,7 +961,7 @@ async def main():
                                     if choice.lower() == 'exit':
                                         print("Exiting client...")
                                         preserve_session()  # Keep session for reconnection
-                                        await ws.send(json.dumps({
+                                        await ws.send(encode_for(ws, {
                                             'type': 'clear_room',
                                             'room_code': room_code
                                         }))
@@ -918,7 +971,7 @@ async def main():
                                     elif choice.lower() == 'clear_session':
                                         print("Clearing session and exiting...")
                                         clear_session()  # Remove session file
-                                        await ws.send(json.dumps({
+                                        await ws.send(encode_for(ws, {
                                             'type': 'clear_room',
                                             'room_code': room_code
                                         }))
@@ -932,7 +985,7 @@ async def main():
                                     if 0 <= card_idx < len(sorted_hand):
                                         card = sorted_hand[card_idx]
                                         print(f"[DEBUG] Selected card: {card}")
-                                        await ws.send(json.dumps({
+                                        await ws.send(encode_for(ws, {
                                             "type": "play_card",
                                             "room_code": room_code,
                                             "player_id": player_id,
@@ -947,7 +1000,7 @@ async def main():
                                         print(f"[DEBUG] ValueError: {ve}")
                                         if choice.lower() == 'exit':
                                             print("Sending command to clear room and exiting...")
-                                            await ws.send(json.dumps({
+                                            await ws.send(encode_for(ws, {
                                                 'type': 'clear_room',
                                                 'room_code': room_code
                                             }))
@@ -1085,7 +1138,7 @@ async def main():
                                 choice = input(f"Select a card to play (1-{len(sorted_hand)}) or 'exit': ")
                                 if choice.lower() == 'exit':
                                     print("Sending command to clear room and exiting...")
-                                    await ws.send(json.dumps({
+                                    await ws.send(encode_for(ws, {
                                         'type': 'clear_room',
                                         'room_code': room_code
                                     }))
@@ -1095,7 +1148,7 @@ async def main():
                                 card_idx = int(choice) - 1
                                 if 0 <= card_idx < len(sorted_hand):
                                     card = sorted_hand[card_idx]
-                                    await ws.send(json.dumps({
+                                    await ws.send(encode_for(ws, {
                                         "type": "play_card",
                                         "room_code": room_code,
                                         "player_id": player_id,
@@ -1107,7 +1160,7 @@ async def main():
                             except ValueError:
                                 if choice.lower() == 'exit':
                                     print("Sending command to clear room and exiting...")
-                                    await ws.send(json.dumps({
+                                    await ws.send(encode_for(ws, {
                                         'type': 'clear_room',
                                         'room_code': room_code
                                     }))
@@ -1155,6 +1208,25 @@ async def main():
                     print("=" * 50)
                     print("\nWaiting for next trick to start...")
                     
+                # Sequenced state (delta sync servers): apply, acknowledge, resync on a gap
+                elif msg_type == 'state_sync':
+                    if not synced.apply(data):
+                        print(f"[DEBUG] State sync gap at sequence {data.get('seq')}, requesting resync")
+                        await ws.send(encode_for(ws, synced.resync_message(room_code)))
+                        continue
+                    if data.get('resume'):
+                        state = synced.state
+                        hand = state.get('hand', hand)
+                        hokm = state.get('hokm') or hokm
+                        hakem = state.get('hakem') or hakem
+                        print(f"\n📋 Game state restored: {state.get('phase', 'unknown')} (sequence {synced.sequence_id})")
+                        if hand:
+                            print("Your hand:")
+                            display_hand_by_suit(hand, hokm)
+                    if data.get('keyframe') or data.get('resume') or synced.ack_due():
+                        await ws.send(encode_for(ws, synced.ack_message(room_code)))
+                        save_synced_state(synced)
+
                 # Add handlers for reconnection messages
                 elif msg_type == 'player_reconnected':
                     username = data.get('username')
@@ -1187,7 +1259,7 @@ async def main():
                                   'hand_complete', 'game_over', 'error', 
                                   'round_result', 'trick_complete',
                                   'player_reconnected', 'reconnect_success',
-                                  'waiting_for_players']:
+                                  'waiting_for_players', 'state_sync']:
                     print("Server:", data)
             except asyncio.TimeoutError:
                 if current_state == GameState.WAITING_FOR_PLAYERS:
@@ -7,6 +7,8 @@ import asyncio
 import websockets
 from typing import Optional, Dict, Any
 
+from wire_protocol import decode, encode_for
+
 class ClientAuthManager:
     """Client-side authentication manager"""
     
@@ -84,11 +86,11 @@ class ClientAuthManager:
             }
             
             print(f"🔐 Authenticating with token for {self.player_info.get('username')}...")
-            await websocket.send(json.dumps(auth_message))
+            await websocket.send(encode_for(websocket, auth_message))
             
             # Wait for authentication response
             response = await websocket.recv()
-            response_data = json.loads(response)
+            response_data = decode(response)
             
             if response_data.get('type') == 'auth_response':
                 if response_data.get('success'):
@@ -172,11 +174,11 @@ class ClientAuthManager:
             }
             
             print(f"🔐 Logging in as {username}...")
-            await websocket.send(json.dumps(auth_message))
+            await websocket.send(encode_for(websocket, auth_message))
             
             # Wait for authentication response
             response = await websocket.recv()
-            response_data = json.loads(response)
+            response_data = decode(response)
             
             if response_data.get('type') == 'auth_response':
                 if response_data.get('success'):
@@ -254,11 +256,11 @@ class ClientAuthManager:
             }
             
             print(f"📝 Registering account for {username}...")
-            await websocket.send(json.dumps(auth_message))
+            await websocket.send(encode_for(websocket, auth_message))
             
             # Wait for authentication response
             response = await websocket.recv()
-            response_data = json.loads(response)
+            response_data = decode(response)
             
             if response_data.get('type') == 'auth_response':
                 if response_data.get('success'):
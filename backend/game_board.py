@@ -1,14 +1,63 @@
 # game_board.py
 import random
 import json
+import logging
 import time
+from collections.abc import Mapping
 from typing import List, Dict, Tuple, Optional, Any, ClassVar
 
-class GameBoard:
+log = logging.getLogger('game_board')
+
+class BaseGameBoard:
+    """
+    Hokm rules shared by the board classes.
+
+    Only scalar state lives in __slots__; teams, tricks, round_scores,
+    player_tricks, hands and played_cards are left to subclasses so they can
+    be plain attributes (GameBoard) or views over compact storage
+    (CompactGameBoard, which declares __slots__ and has no instance __dict__).
+    """
+
+    __slots__ = (
+        '_dirty_fields', '_dirty_hands', '_full_write_needed', '_sync_fields', '_sync_hands', '_views',
+        'players', 'deck', 'hakem', 'hokm', 'current_turn', 'completed_tricks',
+        'current_trick', 'led_suit', 'game_phase', 'room_code', 'created_at', 'last_move_at',
+        'event_log',
+    )
+
+    # Attributes persisted by to_redis_dict -> the Redis hash field they are stored in.
+    # Assigning one of them marks it dirty; in-place mutations call _mark_dirty.
+    REDIS_FIELDS: ClassVar[Dict[str, str]] = {
+        'game_phase': 'phase',
+        'hokm': 'hokm',
+        'hakem': 'hakem',
+        'players': 'players',
+        'teams': 'teams',
+        'current_turn': 'current_turn',
+        'tricks': 'tricks',
+        'round_scores': 'round_scores',
+        'player_tricks': 'player_tricks',
+        'completed_tricks': 'completed_tricks',
+        'led_suit': 'led_suit',
+        'current_trick': 'current_trick',
+        'played_cards': 'played_cards',
+        'hands': None,  # one hand_<player> field per player
+    }
+
     def __init__(self, players: List[str], room_code: Optional[str] = None):
         if len(players) != 4:
             raise ValueError("Hokm requires exactly 4 players")
         
+        # Dirty tracking for incremental persistence (see to_redis_delta)
+        self._dirty_fields = set()
+        self._dirty_hands = set()
+        self._full_write_needed = True
+        # Separate tracking for the delta stream, started by take_state_changes
+        self._sync_fields = None
+        self._sync_hands = None
+        # Cached player_view results, dropped when a field they show changes
+        self._views = {}
+        
         # Game state components
         self.players = players.copy()  # Maintain original order until team assignment
         self.deck = self._create_deck()
@@ -31,6 +80,43 @@ class GameBoard:
         self.created_at = int(time.time())
         self.last_move_at = self.created_at
 
+        # Optional GameEventLog (game_events.py) that receives a typed event per state change
+        self.event_log = None
+
+    def __setattr__(self, name, value):
+        if name in self.REDIS_FIELDS:
+            try:
+                self._dirty_fields.add(name)
+                if self._sync_fields is not None:
+                    self._sync_fields.add(name)
+                if self._views:
+                    self._views.clear()
+            except AttributeError:
+                pass  # dirty tracking not set up yet
+        object.__setattr__(self, name, value)
+
+    def _mark_dirty(self, field: str, player: Optional[str] = None):
+        """Record an in-place change to a persisted attribute (player narrows 'hands' to one hand)"""
+        if field == 'hands' and player is not None:
+            self._dirty_hands.add(player)
+            if self._sync_hands is not None:
+                self._sync_hands.add(player)
+            self._views.pop(player, None)
+        else:
+            self._dirty_fields.add(field)
+            if self._sync_fields is not None:
+                self._sync_fields.add(field)
+            if self._views:
+                self._views.clear()
+
+    def _record_event(self, event_type: str, **data):
+        if self.event_log is not None:
+            self.event_log.append(event_type, data)
+
+    def mark_all_dirty(self):
+        """Force the next to_redis_delta to be a full write (e.g. after a failed save)"""
+        self._full_write_needed = True
+
     def _create_deck(self) -> List[str]:
         """Create a standard 52-card deck"""
         suits = ['hearts', 'diamonds', 'clubs', 'spades']
@@ -45,31 +131,31 @@ class GameBoard:
         3. Assign remaining 2 players to Team 2
         4. Choose Hakem randomly from all players (equal chance for everyone)
         """
-        print("=== Team Assignment Process ===")
-        print(f"Players: {self.players}")
+        log.debug("=== Team Assignment Process ===")
+        log.debug("Players: %s", self.players)
         
         # Validate that we have exactly 4 players
         if len(self.players) != 4:
             error_msg = f"Cannot assign teams: Expected 4 players, got {len(self.players)}"
-            print(f"[ERROR] {error_msg}")
+            log.error("%s", error_msg)
             return {"error": error_msg}
         
         # Step 1: Choose first player for Team 1
         first_team1_player = random.choice(self.players)
-        print(f"First Team 1 player selected: {first_team1_player}")
+        log.debug("First Team 1 player selected: %s", first_team1_player)
         
         # Step 2: Choose second player for Team 1 from remaining players
         remaining_players = [p for p in self.players if p != first_team1_player]
         second_team1_player = random.choice(remaining_players)
-        print(f"Second Team 1 player selected: {second_team1_player}")
+        log.debug("Second Team 1 player selected: %s", second_team1_player)
         
         # Step 3: Assign remaining players to Team 2
         team2_players = [p for p in remaining_players if p != second_team1_player]
-        print(f"Team 2 players: {team2_players}")
+        log.debug("Team 2 players: %s", team2_players)
         
         # Step 4: Choose Hakem randomly from all players (equal chance)
         self.hakem = random.choice(self.players)
-        print(f"Hakem selected (random from all players): {self.hakem}")
+        log.debug("Hakem selected (random from all players): %s", self.hakem)
         
         # Assign teams
         self.teams = {
@@ -79,10 +165,10 @@ class GameBoard:
             team2_players[1]: 1
         }
         
-        print(f"[GAMEBOARD DEBUG] Teams assigned:")
-        print(f"  Team 0: {first_team1_player}, {second_team1_player}")
-        print(f"  Team 1: {team2_players[0]}, {team2_players[1]}")
-        print(f"  Teams dict: {self.teams}")
+        log.debug("Teams assigned:")
+        log.debug("Team 0: %s, %s", first_team1_player, second_team1_player)
+        log.debug("Team 1: %s, %s", team2_players[0], team2_players[1])
+        log.debug("Teams dict: %s", self.teams)
         
         # Reorder players: Hakem first, then clockwise order
         hakem_idx = self.players.index(self.hakem)
@@ -90,21 +176,22 @@ class GameBoard:
         self.players = self.players[hakem_idx:] + self.players[:hakem_idx]
         self.current_turn = 0
         
-        print(f"[GAMEBOARD DEBUG] Player reordering:")
-        print(f"  Original order: {old_order}")
-        print(f"  Hakem: {self.hakem} (was at index {hakem_idx})")
-        print(f"  New order: {self.players}")
-        print(f"  Hakem now at index: {self.players.index(self.hakem)}")
-        print(f"  Teams after reorder: {self.teams}")
+        log.debug("Player reordering:")
+        log.debug("Original order: %s", old_order)
+        log.debug("Hakem: %s (was at index %s)", self.hakem, hakem_idx)
+        log.debug("New order: %s", self.players)
+        log.debug("Hakem now at index: %s", self.players.index(self.hakem))
+        log.debug("Teams after reorder: %s", self.teams)
         
         # Verify all players are in teams
         for player in self.players:
             if player not in self.teams:
-                print(f"[ERROR] Player {player} not found in teams!")
+                log.error("Player %s not found in teams!", player)
             else:
-                print(f"  {player} -> Team {self.teams[player]}")
+                log.debug("%s -> Team %s", player, self.teams[player])
         
         self.game_phase = "initial_deal"
+        self._record_event('teams_assigned', teams=dict(self.teams), hakem=self.hakem, players=list(self.players))
         
         # Save team assignments and hakem selection to Redis
         if self.room_code and redis_manager:
@@ -123,9 +210,9 @@ class GameBoard:
             "hakem": self.hakem
         }
         
-        print(f"Teams: Team 1: {[first_team1_player, second_team1_player]}")
-        print(f"       Team 2: {team2_players}")
-        print("=== End Team Assignment ===\n")
+        log.debug("Teams: Team 1: %s", [first_team1_player, second_team1_player])
+        log.debug("Team 2: %s", team2_players)
+        log.debug("=== End Team Assignment ===")
         
         return result
 
@@ -137,25 +224,28 @@ class GameBoard:
         random.shuffle(self.deck)
         for _ in range(5):
             for player in self.players:
-                self.hands[player].append(self.deck.pop(0))
+                self._deal_card(player, self.deck.pop(0))
+        self._mark_dirty('hands')
         
-        print(f"[LOG] Initial deal completed. Changing phase from {self.game_phase} to hokm_selection")
+        log.info("Initial deal completed. Changing phase from %s to hokm_selection", self.game_phase)
         self.game_phase = "hokm_selection"
+        self._record_event('deal', stage='initial', hakem=self.hakem, hands={p: list(cards) for p, cards in self.hands.items()})
         return {p: self.hands[p].copy() for p in self.players}
 
     def set_hokm(self, suit: str, redis_manager=None, room_code=None) -> bool:
         """Validate and set hokm suit with Redis persistence and broadcasting"""
         if self.game_phase != "hokm_selection":
-            print(f"[ERROR] Cannot set hokm in phase: {self.game_phase}. Expected: hokm_selection")
+            log.error("Cannot set hokm in phase: %s. Expected: hokm_selection", self.game_phase)
             return False
         
         if suit.lower() not in {'hearts', 'diamonds', 'clubs', 'spades'}:
-            print(f"[ERROR] Invalid hokm suit: {suit}")
+            log.error("Invalid hokm suit: %s", suit)
             return False
         
-        print(f"[LOG] Setting hokm to {suit.lower()} and changing phase from {self.game_phase} to final_deal")
+        log.info("Setting hokm to %s and changing phase from %s to final_deal", suit.lower(), self.game_phase)
         self.hokm = suit.lower()
         self.game_phase = "final_deal"
+        self._record_event('hokm_set', suit=self.hokm)
         
         # Store hokm selection in Redis
         if self.room_code and redis_manager:
@@ -174,7 +264,7 @@ class GameBoard:
                     self.room_code = room_code
                 
             except Exception as e:
-                print(f"[WARNING] Failed to persist hokm selection: {str(e)}")
+                log.warning("Failed to persist hokm selection: %s", e)
         
         return True
 
@@ -194,10 +284,10 @@ class GameBoard:
             }
             
             # This will be called from server.py with proper async context
-            print(f"📡 Broadcasting hokm selection '{self.hokm}' to room {self.room_code}")
+            log.debug("📡 Broadcasting hokm selection '%s' to room %s", self.hokm, self.room_code)
             return broadcast_data
         except Exception as e:
-            print(f"[ERROR] Failed to prepare hokm broadcast: {str(e)}")
+            log.error("Failed to prepare hokm broadcast: %s", e)
             return None
 
     def final_deal(self, redis_manager=None) -> Dict[str, List[str]]:
@@ -209,18 +299,20 @@ class GameBoard:
         for _ in range(8):
             for player in self.players:
                 if self.deck:
-                    self.hands[player].append(self.deck.pop(0))
+                    self._deal_card(player, self.deck.pop(0))
+        self._mark_dirty('hands')
         
         self.game_phase = "gameplay"
+        self._record_event('deal', stage='final', hakem=self.hakem, hands={p: list(cards) for p, cards in self.hands.items()})
         
         # 🔥 NEW: Persist final deal state
         if redis_manager and hasattr(self, 'room_code') and self.room_code:
             try:
                 game_state = self.to_redis_dict()
                 redis_manager.save_game_state(self.room_code, game_state)
-                print(f"✅ Final deal saved to Redis for room {self.room_code}")
+                log.debug("✅ Final deal saved to Redis for room %s", self.room_code)
             except Exception as e:
-                print(f"[WARNING] Failed to persist final deal: {str(e)}")
+                log.warning("Failed to persist final deal: %s", e)
         
         return {p: self.hands[p].copy() for p in self.players}
 
@@ -253,25 +345,26 @@ class GameBoard:
         
         try:
             # Remove card from hand and add to trick
-            self.hands[player].remove(card)
-            self.played_cards.append(card)  # Track played card
+            self._take_from_hand(player, card)
             
             # Add card to current trick
             self.current_trick.append((player, card))
+            self._mark_dirty('current_trick')
             
             # Set led suit if first card in trick
             if len(self.current_trick) == 1:
                 self.led_suit = card.split('_')[1]
+            self._record_event('card_played', player=player, card=card)
             
             # Move to next player
             old_turn = self.current_turn
             self.current_turn = (self.current_turn + 1) % 4
             next_player = self.players[self.current_turn]
             
-            print(f"[GAMEBOARD DEBUG] Turn transition: {self.players[old_turn]} -> {next_player}")
-            print(f"[GAMEBOARD DEBUG] current_turn index: {old_turn} -> {self.current_turn}")
-            print(f"[GAMEBOARD DEBUG] players list: {self.players}")
-            print(f"[GAMEBOARD DEBUG] trick length: {len(self.current_trick)}/4")
+            log.debug("Turn transition: %s -> %s", self.players[old_turn], next_player)
+            log.debug("current_turn index: %s -> %s", old_turn, self.current_turn)
+            log.debug("players list: %s", self.players)
+            log.debug("trick length: %s/4", len(self.current_trick))
             
             result = {
                 "valid": True,
@@ -282,7 +375,7 @@ class GameBoard:
                 "led_suit": self.led_suit
             }
             
-            print(f"[GAMEBOARD DEBUG] Result next_turn: {result['next_turn']}")
+            log.debug("Result next_turn: %s", result['next_turn'])
             
             # Check if trick is complete
             if len(self.current_trick) == 4:
@@ -311,14 +404,14 @@ class GameBoard:
                     redis_manager.save_game_state(self.room_code, game_state)
                     
                 except Exception as e:
-                    print(f"[WARNING] Failed to persist game state: {str(e)}")
+                    log.warning("Failed to persist game state: %s", e)
                     # Don't block the game if persistence fails
                     pass
                     
             return result
             
         except Exception as e:
-            print(f"[ERROR] Error processing card play: {str(e)}")
+            log.error("Error processing card play: %s", e)
             return {"valid": False, "message": "Internal error processing move"}
 
     def _resolve_trick(self) -> Dict[str, Any]:
@@ -327,24 +420,7 @@ class GameBoard:
         if len(self.current_trick) != 4:
             raise ValueError(f"Cannot resolve trick: expected 4 cards, got {len(self.current_trick)}")
         
-        trick_winner = None
-        highest_value = -1
-        trump_played = False
-        
-        for player, card in self.current_trick:
-            rank, suit = card.split('_')
-            value = self._card_value(rank)
-            
-            # Hokm handling
-            if suit == self.hokm:
-                if not trump_played or value > highest_value:
-                    trick_winner = player
-                    highest_value = value
-                    trump_played = True
-            elif not trump_played and suit == self.led_suit:
-                if value > highest_value:
-                    trick_winner = player
-                    highest_value = value
+        trick_winner = self._find_trick_winner()
         
         # Safety check: ensure we found a winner
         if trick_winner is None:
@@ -353,7 +429,9 @@ class GameBoard:
         # update trick‐counts
         winner_idx = self.teams[trick_winner]
         self.tricks[winner_idx] += 1
+        self._mark_dirty('tricks')
         self.player_tricks[trick_winner] = self.player_tricks.get(trick_winner, 0) + 1  # Track individual player tricks
+        self._mark_dirty('player_tricks')
         self.completed_tricks += 1
 
         # decide if this hand is done - either team reaches 7 tricks OR all 13 tricks played
@@ -371,6 +449,7 @@ class GameBoard:
         self.current_trick = []
         self.led_suit = None
         self.current_turn = self.players.index(trick_winner)
+        self._record_event('trick_resolved', winner=trick_winner, tricks=self.tricks.copy())
         
         if hand_done:
             # determine which team won this hand
@@ -387,11 +466,15 @@ class GameBoard:
 
             # record round score
             self.round_scores[hand_winner_idx] += 1
+            self._mark_dirty('round_scores')
             result["round_winner"]  = hand_winner_idx + 1
             result["round_scores"]  = self.round_scores.copy()
 
             # check for game over (first team to win 7 rounds)
-            if self.round_scores[hand_winner_idx] >= 7:
+            game_complete = self.round_scores[hand_winner_idx] >= 7
+            self._record_event('hand_complete', winner_team=hand_winner_idx,
+                               round_scores=self.round_scores.copy(), game_complete=game_complete)
+            if game_complete:
                 self.game_phase = "completed"
                 result["game_complete"] = True
             else:
@@ -440,14 +523,14 @@ class GameBoard:
             new_hakem = winning_team_players[0]
             
         self.hakem = new_hakem
-        print(f"[LOG] New hakem selected: {self.hakem} from winning team {winning_team} with {max_tricks} tricks")
+        log.info("New hakem selected: %s from winning team %s with %s tricks", self.hakem, winning_team, max_tricks)
 
     def start_new_round(self, redis_manager=None):
         """Start a new round with proper hakem selection and initial deal"""
         if self.game_phase == "completed":
             return {"error": "Game is already completed"}
         
-        print(f"[LOG] Starting new round. Current hakem: {self.hakem}")
+        log.info("Starting new round. Current hakem: %s", self.hakem)
         
         # Select new hakem from winning team (based on previous round results)
         winning_team = 0 if self.tricks[0] > self.tricks[1] else 1
@@ -484,6 +567,39 @@ class GameBoard:
             "phase": self.game_phase
         }
 
+    def _deal_card(self, player: str, card: str):
+        """Add a dealt card to a player's hand"""
+        self.hands[player].append(card)
+
+    def _take_from_hand(self, player: str, card: str):
+        """Move a card from a player's hand to the played cards"""
+        self.hands[player].remove(card)
+        self.played_cards.append(card)  # Track played card
+        self._mark_dirty('hands', player)
+        self._mark_dirty('played_cards')
+
+    def _find_trick_winner(self) -> Optional[str]:
+        """Player who wins the (complete) current trick"""
+        trick_winner = None
+        highest_value = -1
+        trump_played = False
+        
+        for player, card in self.current_trick:
+            rank, suit = card.split('_')
+            value = self._card_value(rank)
+            
+            # Hokm handling
+            if suit == self.hokm:
+                if not trump_played or value > highest_value:
+                    trick_winner = player
+                    highest_value = value
+                    trump_played = True
+            elif not trump_played and suit == self.led_suit:
+                if value > highest_value:
+                    trick_winner = player
+                    highest_value = value
+        return trick_winner
+
     def _card_value(self, rank: str) -> int:
         """Get numeric value for card comparison"""
         values = {
@@ -527,12 +643,13 @@ class GameBoard:
                 
                 # Players and teams
                 'players': json.dumps(self.players),
-                'teams': json.dumps(self.teams),
+                'teams': json.dumps(self.teams, default=dict),
                 'current_turn': str(self.current_turn),
                 
                 # Game progress
-                'tricks': json.dumps(self.tricks),
-                'round_scores': json.dumps(self.round_scores),
+                'tricks': json.dumps(self.tricks, default=dict),
+                'round_scores': json.dumps(self.round_scores, default=dict),
+                'player_tricks': json.dumps(self.player_tricks, default=dict),
                 'completed_tricks': str(self.completed_tricks),
                 'led_suit': self.led_suit or '',
                 'current_trick': json.dumps(self.current_trick),
@@ -549,64 +666,171 @@ class GameBoard:
             }
             return game_state
         except Exception as e:
-            print(f"Error serializing game state: {str(e)}")
+            log.error("Error serializing game state: %s", e)
             raise
             
+    def _encode_redis_field(self, attr: str) -> Dict[str, str]:
+        """Encode one persisted attribute exactly as to_redis_dict does"""
+        if attr == 'game_phase':
+            return {'phase': self.game_phase}
+        if attr in ('hokm', 'hakem', 'led_suit'):
+            return {attr: getattr(self, attr) or ''}
+        if attr in ('current_turn', 'completed_tricks'):
+            return {attr: str(getattr(self, attr))}
+        if attr == 'hands':
+            return {f'hand_{player}': json.dumps(hand) for player, hand in self.hands.items()}
+        return {self.REDIS_FIELDS[attr]: json.dumps(getattr(self, attr), default=dict)}
+
+    def to_redis_delta(self) -> Dict[str, str]:
+        """
+        Serialize only the fields changed since the previous call.
+
+        The first call (and any call after mark_all_dirty) returns the full
+        to_redis_dict() snapshot. Callers must persist every delta they take,
+        or call mark_all_dirty() if the write fails.
+        """
+        if self._full_write_needed:
+            state = self.to_redis_dict()
+            self._full_write_needed = False
+            self._dirty_fields.clear()
+            self._dirty_hands.clear()
+            return state
+
+        state = self._encode_changed_fields(self._dirty_fields, self._dirty_hands)
+        self._dirty_fields.clear()
+        self._dirty_hands.clear()
+
+        now = str(int(time.time()))
+        state['last_activity'] = now
+        state['last_updated'] = now
+        return state
+
+    def _encode_changed_fields(self, fields, hands) -> Dict[str, str]:
+        state = {}
+        for attr in fields:
+            state.update(self._encode_redis_field(attr))
+        if 'hands' not in fields:
+            for player in hands:
+                if player in self.hands:
+                    state[f'hand_{player}'] = json.dumps(self.hands[player])
+        return state
+
+    def _new_change_sets(self):
+        """Empty (fields, hands) records for change tracking"""
+        return set(), set()
+
+    def take_state_changes(self, full: bool = False) -> Dict[str, str]:
+        """
+        Fields changed since the previous call, encoded as in to_redis_dict,
+        for the delta stream (GameStateDeltaManager.advance_changes).
+
+        Independent of to_redis_delta. The first call (or full=True) returns
+        the whole to_redis_dict() and starts the tracking, so boards that are
+        never streamed do not pay for it. A changed field may have been
+        assigned its old value again; the receiver compares.
+        """
+        if self._sync_fields is None or full:
+            self._sync_fields, self._sync_hands = self._new_change_sets()
+            return self.to_redis_dict()
+        state = self._encode_changed_fields(self._sync_fields, self._sync_hands)
+        self._sync_fields.clear()
+        self._sync_hands.clear()
+        return state
+
+    def player_view(self, username: str) -> Dict[str, Any]:
+        """
+        What a (re)connecting player needs to resume: shared table state plus
+        only their own hand. Cached until a field it shows changes, so a burst
+        of reconnects to one room builds each view once. Callers must not
+        modify the returned dict.
+        """
+        view = self._views.get(username)
+        if view is None:
+            teams = dict(self.teams)
+            view = {
+                'phase': self.game_phase,
+                'players': list(self.players),
+                'teams': teams,
+                'hakem': self.hakem,
+                'hokm': self.hokm,
+                'hand': list(self.hands.get(username, ())),
+                'current_turn': self.current_turn,
+                'tricks': dict(self.tricks),
+                'current_trick': list(self.current_trick),
+                'completed_tricks': self.completed_tricks,
+                'you': username,
+                'your_team': str(teams[username] + 1) if username in teams else None
+            }
+            self._views[username] = view
+        return view
+
     @classmethod
-    def from_redis_dict(cls, state_dict: Dict[str, str], players: List[str]) -> 'GameBoard':
+    def from_redis_dict(cls, state_dict: Dict[str, Any], players: List[str],
+                        room_code: Optional[str] = None) -> 'GameBoard':
         """
         Create a new GameBoard instance from Redis-stored state dictionary.
         
         Args:
-            state_dict: Dictionary of game state from Redis
+            state_dict: Dictionary of game state from Redis (JSON fields may
+                already be decoded, as get_game_state does for some of them)
             players: List of player usernames
+            room_code: Room the board belongs to
             
         Returns:
             GameBoard: New instance with restored state
         """
+        def field(key):
+            value = state_dict[key]
+            return json.loads(value) if isinstance(value, str) else value
+
         try:
             # Create new instance
-            game = cls(players)
+            game = cls(players, room_code)
             
-            # Restore basic game state
-            game.game_phase = state_dict.get('game_phase', 'lobby')
+            # Restore basic game state (to_redis_dict stores the phase as 'phase')
+            game.game_phase = state_dict.get('phase') or state_dict.get('game_phase', 'lobby')
             game.hokm = state_dict.get('hokm') or None
             game.hakem = state_dict.get('hakem') or None
             
             # Restore players and teams
             if 'players' in state_dict:
-                game.players = json.loads(state_dict['players'])
+                game.players = field('players')
             if 'teams' in state_dict:
-                game.teams = json.loads(state_dict['teams'])
+                game.teams = field('teams')
             if 'current_turn' in state_dict:
                 game.current_turn = int(state_dict['current_turn'])
                 
             # Restore game progress
+            # JSON turns the team keys into strings; the rules index them by int
             if 'tricks' in state_dict:
-                game.tricks = json.loads(state_dict['tricks'])
+                game.tricks = {int(k): v for k, v in field('tricks').items()}
             if 'round_scores' in state_dict:
-                game.round_scores = json.loads(state_dict['round_scores'])
+                game.round_scores = {int(k): v for k, v in field('round_scores').items()}
+            if 'player_tricks' in state_dict:
+                game.player_tricks = field('player_tricks')
             if 'completed_tricks' in state_dict:
                 game.completed_tricks = int(state_dict['completed_tricks'])
             game.led_suit = state_dict.get('led_suit') or None
             if 'current_trick' in state_dict:
-                game.current_trick = json.loads(state_dict['current_trick'])
+                game.current_trick = [tuple(play) for play in field('current_trick')]
             if 'played_cards' in state_dict:
-                game.played_cards = json.loads(state_dict['played_cards'])
+                game.played_cards = field('played_cards')
                 
             # Restore player hands
             game.hands = {}
             for player in players:
                 hand_key = f'hand_{player}'
                 if hand_key in state_dict:
-                    game.hands[player] = json.loads(state_dict[hand_key])
+                    game.hands[player] = field(hand_key)
                 else:
                     game.hands[player] = []
+            if 'created_at' in state_dict:
+                game.created_at = int(state_dict['created_at'])
                     
             return game
             
         except Exception as e:
-            print(f"Error deserializing game state: {str(e)}")
+            log.error("Error deserializing game state: %s", e)
             raise
             
     def validate_state(self) -> bool:
@@ -620,11 +844,11 @@ class GameBoard:
                 return False
                 
             # Validate teams
-            if not isinstance(self.teams, dict) or len(self.teams) != 4:
+            if not isinstance(self.teams, Mapping) or len(self.teams) != 4:
                 return False
                 
             # Validate hands
-            if not isinstance(self.hands, dict) or len(self.hands) != 4:
+            if not isinstance(self.hands, Mapping) or len(self.hands) != 4:
                 return False
                 
             # Validate card consistency
@@ -646,3 +870,6 @@ class GameBoard:
         except Exception:
             return False
 
+
+class GameBoard(BaseGameBoard):
+    """Board with per-player dicts and card-string lists"""
@@ -0,0 +1,136 @@
+# game_board_bits.py
+"""
+Bitmask card engine for GameBoard.
+
+BitGameBoard keeps each hand and the played cards as 52-bit ints (see
+card_bits.py). Dealing, playing, follow-suit validation and trick resolution
+are bit operations; card strings are only built when something reads
+``hands`` / ``played_cards`` (serialization and protocol messages), so the
+server and to_redis_dict work unchanged.
+
+Select it with HOKM_CARD_ENGINE=bits.
+"""
+
+from collections.abc import MutableMapping
+from typing import Dict, List, Optional
+
+from game_board import GameBoard
+from card_bits import (
+    CARD_BITS, cards_to_mask, mask_to_cards, legal_cards_mask, trick_winner_bit, suit_of_bit
+)
+
+
+class HandMasks(MutableMapping):
+    """player -> hand mapping that stores each hand as a card mask and decodes on read"""
+
+    __slots__ = ('masks',)
+
+    def __init__(self, masks: Optional[Dict[str, int]] = None):
+        self.masks = masks if masks is not None else {}
+
+    def __getitem__(self, player: str) -> List[str]:
+        return mask_to_cards(self.masks[player])
+
+    def __setitem__(self, player: str, cards):
+        self.masks[player] = cards_to_mask(cards)
+
+    def __delitem__(self, player: str):
+        del self.masks[player]
+
+    def __iter__(self):
+        return iter(self.masks)
+
+    def __len__(self) -> int:
+        return len(self.masks)
+
+    def __contains__(self, player) -> bool:
+        return player in self.masks
+
+    def copy(self) -> Dict[str, List[str]]:
+        return {player: mask_to_cards(mask) for player, mask in self.masks.items()}
+
+
+class BitGameBoard(GameBoard):
+    """GameBoard whose hands and played cards are card masks"""
+
+    def __init__(self, players: List[str], room_code: Optional[str] = None):
+        # Must exist before GameBoard.__init__ assigns hands/played_cards
+        self._hand_masks = HandMasks()
+        self._played_mask = 0
+        super().__init__(players, room_code)
+
+    # --- string views (protocol boundary) ---
+
+    @property
+    def hands(self) -> HandMasks:
+        return self._hand_masks
+
+    @hands.setter
+    def hands(self, value):
+        if isinstance(value, HandMasks):
+            self._hand_masks = HandMasks(dict(value.masks))
+        else:
+            self._hand_masks = HandMasks({player: cards_to_mask(cards) for player, cards in value.items()})
+
+    @property
+    def played_cards(self) -> List[str]:
+        """Played cards of the current hand, in deck order"""
+        return mask_to_cards(self._played_mask)
+
+    @played_cards.setter
+    def played_cards(self, value):
+        self._played_mask = cards_to_mask(value)
+
+    # --- mask accessors ---
+
+    def hand_mask(self, player: str) -> int:
+        return self._hand_masks.masks.get(player, 0)
+
+    @property
+    def played_mask(self) -> int:
+        return self._played_mask
+
+    def legal_cards(self, player: str) -> List[str]:
+        """Cards the player may legally play right now"""
+        led_suit = suit_of_bit(CARD_BITS[self.current_trick[0][1]]) if self.current_trick else None
+        return mask_to_cards(legal_cards_mask(self.hand_mask(player), led_suit))
+
+    # --- engine hooks ---
+
+    def _deal_card(self, player: str, card: str):
+        self._hand_masks.masks[player] = self._hand_masks.masks.get(player, 0) | CARD_BITS[card]
+
+    def _take_from_hand(self, player: str, card: str):
+        bit = CARD_BITS[card]
+        self._hand_masks.masks[player] &= ~bit
+        self._played_mask |= bit
+        self._mark_dirty('hands', player)
+        self._mark_dirty('played_cards')
+
+    def validate_play(self, player, card):
+        # Only allow play if it's player's turn and card is in hand
+        if self.game_phase != "gameplay":
+            return False, "Game not in progress"
+        if player != self.players[self.current_turn]:
+            return False, "Not your turn"
+        bit = CARD_BITS.get(card, 0)
+        hand = self.hand_mask(player)
+        if not hand & bit:
+            return False, "Card not in hand"
+
+        # Enforce follow suit
+        if self.current_trick:
+            led_suit = suit_of_bit(CARD_BITS[self.current_trick[0][1]])
+            if not legal_cards_mask(hand, led_suit) & bit:
+                return False, f"You must follow suit: {led_suit}"
+        return True, ""
+
+    def _find_trick_winner(self) -> Optional[str]:
+        trick_mask = 0
+        owners = {}
+        for player, card in self.current_trick:
+            bit = CARD_BITS[card]
+            trick_mask |= bit
+            owners[bit] = player
+        led_suit = self.led_suit or suit_of_bit(CARD_BITS[self.current_trick[0][1]])
+        return owners.get(trick_winner_bit(trick_mask, led_suit, self.hokm))
@@ -0,0 +1,359 @@
+# game_board_compact.py
+"""
+Compact GameBoard for memory-bound deployments.
+
+CompactGameBoard keeps a table's state in a few fixed-size arrays indexed by
+seat (the player's position in the join order) instead of username-keyed
+dicts and card-string lists:
+
+- hands: array('Q') of four 52-bit card masks (see card_bits.py)
+- teams / player_tricks: bytearray(4); tricks / round_scores: bytearray(2)
+- played cards: one card mask
+- deck: bytearray of card ids, shuffled and dealt in place
+- dirty-field tracking for to_redis_delta and take_state_changes: int bit
+  flags instead of sets
+
+It declares __slots__ all the way up (BaseGameBoard), so there is no
+per-instance __dict__. Player names are interned and card strings only come
+from the shared CARD_NAMES table. teams, tricks, hands etc. are exposed as
+mapping views, so the server, serialization and the rules in BaseGameBoard
+run unchanged.
+
+Select it with HOKM_CARD_ENGINE=compact. Run this module to measure bytes per
+active table and how many tables fit in a memory budget:
+
+    python game_board_compact.py --tables 2000 --rss-mb 512
+"""
+
+import argparse
+import json
+import random
+import sys
+import tracemalloc
+from array import array
+from collections.abc import MutableMapping
+from typing import Dict, List, Optional
+
+from game_board import BaseGameBoard, GameBoard
+from card_bits import (
+    CARD_BITS, CARD_INDEX, CARD_NAMES, cards_to_mask, mask_to_cards, legal_cards_mask, trick_winner_bit, suit_of_bit
+)
+
+UNASSIGNED = 0xFF
+
+
+class SeatView(MutableMapping):
+    """player -> small int view over a bytearray indexed by seat"""
+
+    __slots__ = ('_board', '_values')
+
+    def __init__(self, board: 'CompactGameBoard', values: bytearray):
+        self._board = board
+        self._values = values
+
+    def __getitem__(self, player: str) -> int:
+        value = self._values[self._board._seat(player)]
+        if value == UNASSIGNED:
+            raise KeyError(player)
+        return value
+
+    def __setitem__(self, player: str, value: int):
+        self._values[self._board._seat(player)] = value
+
+    def __delitem__(self, player: str):
+        self._values[self._board._seat(player)] = UNASSIGNED
+
+    def __iter__(self):
+        return (name for name, value in zip(self._board._names, self._values) if value != UNASSIGNED)
+
+    def __len__(self) -> int:
+        return sum(1 for value in self._values if value != UNASSIGNED)
+
+    def copy(self) -> Dict[str, int]:
+        return dict(self.items())
+
+
+class TeamCounts(MutableMapping):
+    """{0: n, 1: m} view over a bytearray(2) (trick and hand counts per team)"""
+
+    __slots__ = ('_values',)
+
+    def __init__(self, values: bytearray):
+        self._values = values
+
+    def __getitem__(self, team) -> int:
+        return self._values[int(team)]
+
+    def __setitem__(self, team, value: int):
+        self._values[int(team)] = value
+
+    def __delitem__(self, team):
+        self._values[int(team)] = 0
+
+    def __iter__(self):
+        return iter((0, 1))
+
+    def __len__(self) -> int:
+        return 2
+
+    def copy(self) -> Dict[int, int]:
+        return {0: self._values[0], 1: self._values[1]}
+
+
+class SeatHands(MutableMapping):
+    """player -> hand view that decodes the seat's card mask on read"""
+
+    __slots__ = ('_board',)
+
+    def __init__(self, board: 'CompactGameBoard'):
+        self._board = board
+
+    def __getitem__(self, player: str) -> List[str]:
+        return mask_to_cards(self._board._hands[self._board._seat(player)])
+
+    def __setitem__(self, player: str, cards):
+        self._board._hands[self._board._seat(player)] = cards_to_mask(cards)
+
+    def __delitem__(self, player: str):
+        self._board._hands[self._board._seat(player)] = 0
+
+    def __iter__(self):
+        return iter(self._board._names)
+
+    def __len__(self) -> int:
+        return len(self._board._names)
+
+    def __contains__(self, player) -> bool:
+        return player in self._board._names
+
+    def copy(self) -> Dict[str, List[str]]:
+        return {player: self[player] for player in self._board._names}
+
+
+class DirtyFlags:
+    """Set-like record of changed names from a fixed tuple, kept as one int (an empty set is 216 bytes)"""
+
+    __slots__ = ('_names', '_bits')
+
+    def __init__(self, names: tuple):
+        self._names = names
+        self._bits = 0
+
+    def add(self, name: str):
+        self._bits |= 1 << self._names.index(name)
+
+    def clear(self):
+        self._bits = 0
+
+    def __contains__(self, name) -> bool:
+        return name in self._names and bool(self._bits >> self._names.index(name) & 1)
+
+    def __iter__(self):
+        return (name for i, name in enumerate(self._names) if self._bits >> i & 1)
+
+    def __len__(self) -> int:
+        return self._bits.bit_count()
+
+
+def _fill_seats(board: 'CompactGameBoard', values: bytearray, mapping):
+    values[:] = bytes([UNASSIGNED]) * len(values)
+    for player, value in mapping.items():
+        values[board._seat(player)] = value
+
+
+class CompactGameBoard(BaseGameBoard):
+    """GameBoard with seat-indexed arrays, card masks and no instance __dict__"""
+
+    __slots__ = ('_names', '_teams', '_player_tricks', '_tricks', '_round_scores', '_hands', '_played_mask')
+
+    DIRTY_FIELD_NAMES = tuple(BaseGameBoard.REDIS_FIELDS)
+
+    def __init__(self, players: List[str], room_code: Optional[str] = None):
+        # Seat storage must exist before BaseGameBoard.__init__ assigns the views
+        self._names = tuple(sys.intern(player) for player in players)
+        self._teams = bytearray([UNASSIGNED] * len(players))
+        self._player_tricks = bytearray(len(players))
+        self._tricks = bytearray(2)
+        self._round_scores = bytearray(2)
+        self._hands = array('Q', [0] * len(players))
+        self._played_mask = 0
+        super().__init__(list(self._names), room_code)
+        self._dirty_fields = DirtyFlags(self.DIRTY_FIELD_NAMES)
+        self._dirty_hands = DirtyFlags(self._names)
+
+    def _new_change_sets(self):
+        return DirtyFlags(self.DIRTY_FIELD_NAMES), DirtyFlags(self._names)
+
+    def _seat(self, player: str) -> int:
+        try:
+            return self._names.index(player)
+        except ValueError:
+            raise KeyError(player) from None
+
+    def _create_deck(self) -> bytearray:
+        """Card ids 0..51 in GameBoard deck order (random.shuffle and pop work in place)"""
+        return bytearray(range(len(CARD_NAMES)))
+
+    # --- mapping views (protocol and rules boundary) ---
+
+    @property
+    def teams(self) -> SeatView:
+        return SeatView(self, self._teams)
+
+    @teams.setter
+    def teams(self, value):
+        _fill_seats(self, self._teams, value)
+
+    @property
+    def player_tricks(self) -> SeatView:
+        return SeatView(self, self._player_tricks)
+
+    @player_tricks.setter
+    def player_tricks(self, value):
+        _fill_seats(self, self._player_tricks, value)
+
+    @property
+    def tricks(self) -> TeamCounts:
+        return TeamCounts(self._tricks)
+
+    @tricks.setter
+    def tricks(self, value):
+        self._tricks[:] = bytes(2)
+        for team, count in value.items():
+            self._tricks[int(team)] = count
+
+    @property
+    def round_scores(self) -> TeamCounts:
+        return TeamCounts(self._round_scores)
+
+    @round_scores.setter
+    def round_scores(self, value):
+        self._round_scores[:] = bytes(2)
+        for team, count in value.items():
+            self._round_scores[int(team)] = count
+
+    @property
+    def hands(self) -> SeatHands:
+        return SeatHands(self)
+
+    @hands.setter
+    def hands(self, value):
+        for seat in range(len(self._hands)):
+            self._hands[seat] = 0
+        for player, cards in value.items():
+            self._hands[self._seat(player)] = cards_to_mask(cards)
+
+    @property
+    def played_cards(self) -> List[str]:
+        """Played cards of the current hand, in deck order"""
+        return mask_to_cards(self._played_mask)
+
+    @played_cards.setter
+    def played_cards(self, value):
+        self._played_mask = cards_to_mask(value)
+
+    def hand_mask(self, player: str) -> int:
+        return self._hands[self._seat(player)]
+
+    # --- engine hooks ---
+
+    def _deal_card(self, player: str, card):
+        card_id = card if isinstance(card, int) else CARD_INDEX[card]
+        self._hands[self._seat(player)] |= 1 << card_id
+
+    def _take_from_hand(self, player: str, card: str):
+        bit = CARD_BITS[card]
+        self._hands[self._seat(player)] &= ~bit
+        self._played_mask |= bit
+        self._mark_dirty('hands', player)
+        self._mark_dirty('played_cards')
+
+    def validate_play(self, player, card):
+        # Only allow play if it's player's turn and card is in hand
+        if self.game_phase != "gameplay":
+            return False, "Game not in progress"
+        if player != self.players[self.current_turn]:
+            return False, "Not your turn"
+        bit = CARD_BITS.get(card, 0)
+        hand = self.hand_mask(player)
+        if not hand & bit:
+            return False, "Card not in hand"
+
+        # Enforce follow suit
+        if self.current_trick:
+            led_suit = suit_of_bit(CARD_BITS[self.current_trick[0][1]])
+            if not legal_cards_mask(hand, led_suit) & bit:
+                return False, f"You must follow suit: {led_suit}"
+        return True, ""
+
+    def _find_trick_winner(self) -> Optional[str]:
+        trick_mask = 0
+        owners = {}
+        for player, card in self.current_trick:
+            bit = CARD_BITS[card]
+            trick_mask |= bit
+            owners[bit] = player
+        led_suit = self.led_suit or suit_of_bit(CARD_BITS[self.current_trick[0][1]])
+        return owners.get(trick_winner_bit(trick_mask, led_suit, self.hokm))
+
+
+# --- memory benchmark ---
+
+def _mid_hand_board(board_class, players: List[str], number: int):
+    """Board dealt to gameplay with a few tricks played (typical live table)"""
+    board = board_class(players, f"ROOM{number:05d}")
+    board.assign_teams_and_hakem()
+    board.initial_deal()
+    board.set_hokm(random.choice(['hearts', 'diamonds', 'clubs', 'spades']))
+    board.final_deal()
+    for _ in range(6):
+        player = board.players[board.current_turn]
+        card = next(c for c in board.hands[player] if board.validate_play(player, c)[0])
+        board.play_card(player, card)
+    return board
+
+
+def measure_table_bytes(board_class, tables: int = 1000) -> float:
+    """Average bytes allocated per live table (board only; player names excluded)"""
+    random.seed(1)
+    # Names are owned by the connection layer, so create them outside the measurement
+    names = [[f"player_{n}_{seat}" for seat in range(4)] for n in range(tables)]
+    devnull = open('/dev/null', 'w')
+    stdout, sys.stdout = sys.stdout, devnull
+    try:
+        tracemalloc.start()
+        before = tracemalloc.get_traced_memory()[0]
+        boards = [_mid_hand_board(board_class, names[n], n) for n in range(tables)]
+        after = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+    finally:
+        sys.stdout = stdout
+        devnull.close()
+    del names, boards
+    return (after - before) / tables
+
+
+def tables_per_budget(bytes_per_table: float, budget_bytes: int) -> int:
+    return int(budget_bytes // bytes_per_table) if bytes_per_table else 0
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Bytes per active table for each board class")
+    parser.add_argument('--tables', type=int, default=2000)
+    parser.add_argument('--rss-mb', type=int, default=512, help="memory budget for game boards")
+    args = parser.parse_args()
+
+    from game_board_bits import BitGameBoard
+    budget = args.rss_mb * 1024 * 1024
+    results = {}
+    for board_class in (GameBoard, BitGameBoard, CompactGameBoard):
+        per_table = measure_table_bytes(board_class, args.tables)
+        results[board_class.__name__] = {
+            'bytes_per_table': round(per_table),
+            f'tables_in_{args.rss_mb}mb': tables_per_budget(per_table, budget),
+        }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+# game_events.py
+"""
+Event-sourced game log.
+
+Every board mutation that matters for rebuilding a game is recorded as a
+typed, sequenced event by the board itself (see BaseGameBoard._record_event)
+when it has an ``event_log`` attached:
+
+    teams_assigned  {teams, hakem, players}
+    deal            {stage: initial|final, hakem, hands}
+    hokm_set        {suit}
+    card_played     {player, card}
+    trick_resolved  {winner, tricks}
+    hand_complete   {winner_team, round_scores, game_complete}
+
+The server appends pending events to a Redis Stream (room:{code}:events,
+entry id 0-<seq>) and stores a snapshot (room:{code}:snapshot) every
+``snapshot_every`` events. Both keys are cleared before a new game's first
+append, since its ids start over below the previous game's. replay() rebuilds a board from the latest snapshot
+plus the events after it; trick_resolved and hand_complete are derived
+events, checked against the replayed board rather than applied.
+"""
+
+import json
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from game_board import GameBoard
+
+TEAMS_ASSIGNED = 'teams_assigned'
+DEAL = 'deal'
+HOKM_SET = 'hokm_set'
+CARD_PLAYED = 'card_played'
+TRICK_RESOLVED = 'trick_resolved'
+HAND_COMPLETE = 'hand_complete'
+
+EVENT_TYPES = (TEAMS_ASSIGNED, DEAL, HOKM_SET, CARD_PLAYED, TRICK_RESOLVED, HAND_COMPLETE)
+
+SNAPSHOT_TIMESTAMP_FIELDS = ('created_at', 'last_activity', 'last_updated')
+
+
+class GameEventLog:
+    """Append-only event sequence for one room, buffering events until they are persisted"""
+
+    def __init__(self, room_code: str, snapshot_every: int = 64, seq: int = 0, new_game: bool = False):
+        self.room_code = room_code
+        self.snapshot_every = snapshot_every
+        self.seq = seq                  # seq of the last event appended
+        self.snapshot_seq = seq         # seq covered by the last stored snapshot
+        self.pending: List[Dict[str, Any]] = []
+        # A new game restarts at seq 1, so an earlier game's stream and snapshot must go first
+        self.clear_stored = new_game
+
+    def append(self, event_type: str, data: Dict[str, Any]) -> Dict[str, Any]:
+        if event_type not in EVENT_TYPES:
+            raise ValueError(f"Unknown game event type: {event_type}")
+        self.seq += 1
+        event = {'seq': self.seq, 'type': event_type, 'data': data, 'timestamp': time.time()}
+        self.pending.append(event)
+        return event
+
+    def take_pending(self) -> List[Dict[str, Any]]:
+        """Hand the unpersisted events to the writer"""
+        events, self.pending = self.pending, []
+        return events
+
+    def restore_pending(self, events: List[Dict[str, Any]]):
+        """Put events back after a failed write, ahead of anything appended since"""
+        self.pending[:0] = events
+
+    def snapshot_due(self) -> bool:
+        return self.seq - self.snapshot_seq >= self.snapshot_every
+
+    def mark_snapshot(self, seq: int):
+        self.snapshot_seq = seq
+
+    def request_snapshot(self):
+        """Make the next persist store a snapshot (e.g. for a board loaded from the state hash)"""
+        self.snapshot_seq = min(self.snapshot_seq, self.seq - self.snapshot_every)
+
+
+def take_snapshot(board, seq: int) -> Dict[str, Any]:
+    """Compact snapshot of a board as of event seq (to_redis_dict fields without timestamps)"""
+    state = {k: v for k, v in board.to_redis_dict().items() if k not in SNAPSHOT_TIMESTAMP_FIELDS}
+    return {'seq': seq, 'state': state}
+
+
+def restore_snapshot(snapshot: Dict[str, Any], board_class=GameBoard, room_code: Optional[str] = None):
+    """Board restored from a take_snapshot() payload"""
+    state = snapshot['state']
+    return board_class.from_redis_dict(state, json.loads(state['players']), room_code)
+
+
+def replay(events: Iterable[Dict[str, Any]], snapshot: Optional[Dict[str, Any]] = None,
+           players: Optional[List[str]] = None, board_class=GameBoard, room_code: Optional[str] = None):
+    """
+    Rebuild a board from an optional snapshot plus the events after it.
+
+    Without a snapshot, ``players`` (join order) starts a fresh board.
+    Raises ValueError if an event cannot be applied or a derived event
+    disagrees with the replayed board.
+    """
+    if snapshot is not None:
+        board = restore_snapshot(snapshot, board_class, room_code)
+        after = snapshot['seq']
+    elif players is not None:
+        board = board_class(players, room_code)
+        after = 0
+    else:
+        raise ValueError("replay needs a snapshot or the player list")
+
+    last_result: Dict[str, Any] = {}
+    for event in events:
+        if event['seq'] <= after:
+            continue
+        if event['seq'] != after + 1:
+            raise ValueError(f"Event log gap in room {room_code}: expected seq {after + 1}, got {event['seq']}")
+        after = event['seq']
+        last_result = _APPLY[event['type']](board, event['data'], last_result)
+    return board
+
+
+def _apply_teams_assigned(board, data, last_result):
+    board.players = list(data['players'])
+    board.teams = dict(data['teams'])
+    board.hakem = data['hakem']
+    board.current_turn = 0
+    board.game_phase = "initial_deal"
+    return {}
+
+
+def _apply_deal(board, data, last_result):
+    board.hakem = data['hakem']
+    board.hands = {player: list(cards) for player, cards in data['hands'].items()}
+    board.deck = []
+    if data['stage'] == 'initial':
+        board.current_turn = board.players.index(board.hakem)
+        board.game_phase = "hokm_selection"
+    else:
+        board.game_phase = "gameplay"
+    return {}
+
+
+def _apply_hokm_set(board, data, last_result):
+    if not board.set_hokm(data['suit']):
+        raise ValueError(f"Cannot replay hokm {data['suit']} in phase {board.game_phase}")
+    return {}
+
+
+def _apply_card_played(board, data, last_result):
+    result = board.play_card(data['player'], data['card'])
+    if not result.get('valid'):
+        raise ValueError(f"Cannot replay {data['player']} playing {data['card']}: {result.get('message')}")
+    return result
+
+
+def _apply_trick_resolved(board, data, last_result):
+    if last_result.get('trick_winner') != data['winner']:
+        raise ValueError(f"Replayed trick winner {last_result.get('trick_winner')} != logged {data['winner']}")
+    return last_result
+
+
+def _apply_hand_complete(board, data, last_result):
+    if last_result.get('round_winner') != data['winner_team'] + 1:
+        raise ValueError(f"Replayed hand winner {last_result.get('round_winner')} != logged team {data['winner_team'] + 1}")
+    return last_result
+
+
+_APPLY = {
+    TEAMS_ASSIGNED: _apply_teams_assigned,
+    DEAL: _apply_deal,
+    HOKM_SET: _apply_hokm_set,
+    CARD_PLAYED: _apply_card_played,
+    TRICK_RESOLVED: _apply_trick_resolved,
+    HAND_COMPLETE: _apply_hand_complete,
+}
@@ -7,18 +7,41 @@ This module provides:
 2. Delta compression and patch generation
 3. State reconciliation for missed updates
 4. Optimized bandwidth usage for real-time card games
+
+Sequenced sync (the server's HOKM_STATE_SYNC=delta mode): each room has one
+GameStateDeltaManager whose advance() turns every state change into one
+delta with the next sequence number, so every player of the room sees the
+same sequence. Players get a filtered view (their own hand only) as a
+state_sync message; every keyframe_interval sequences a full view is sent
+instead, so a client that lost track converges without asking. Clients
+acknowledge what they applied, and a reconnecting (or resyncing) client gets
+the changes after its sequence merged into one message, or a keyframe when
+the history no longer reaches back that far. SyncedState is the client's
+side of this. Messages are compressed as whole binary frames for clients
+that accept them (compress_frame, see wire_protocol), never inside the JSON.
+
+State checksums are incremental. Each tracked field has a 64-bit hash of
+its name and value, and the state checksum is the XOR of those hashes, so a
+change only rehashes the fields it touched. The board reports which fields
+changed (GameBoard.take_state_changes), and advance_changes() compares just
+those fields instead of diffing every field of two full states. Run this
+module to compare that path with the old full diff plus MD5 of the whole
+state, over a full game:
+
+    python game_state_delta.py --repeat 5
 """
 
 import json
-import zlib
-import base64
 import time
 import hashlib
-from typing import Dict, List, Optional, Any, Tuple, Set
+import uuid
+from typing import Dict, List, Optional, Any, Tuple, Set, Union
 from enum import Enum
 from dataclasses import dataclass, asdict
 from copy import deepcopy
 
+from wire_protocol import DEFAULT_COMPRESS_MIN, FrameCompressor, WireFormatError, decompress_frame
+
 
 class UpdateType(Enum):
     """Types of game state updates for efficient categorization"""
@@ -32,6 +55,46 @@ class UpdateType(Enum):
     FULL_SYNC = "full_sync"              # Complete state (fallback)
 
 
+DEFAULT_KEYFRAME_INTERVAL = 32   # Sequences between full views
+DEFAULT_MAX_HISTORY = 50         # Deltas kept for resuming clients
+CHECKSUM_BITS = 64
+
+# to_redis_dict() bookkeeping that is not game state
+UNTRACKED_FIELDS = frozenset({'created_at', 'last_activity', 'last_updated'})
+# Fields stored as JSON text (as in to_redis_dict) and sent to clients decoded
+JSON_FIELDS = frozenset({
+    'players', 'teams', 'tricks', 'round_scores', 'player_tricks', 'current_trick', 'played_cards', 'hand'
+})
+INT_FIELDS = frozenset({'current_turn', 'completed_tricks'})
+
+
+def _view_value(key: str, value: Any) -> Any:
+    """Decode one stored field for a client view"""
+    if isinstance(value, str):
+        if key in JSON_FIELDS:
+            try:
+                return json.loads(value)
+            except json.JSONDecodeError:
+                return value
+        if key in INT_FIELDS and value.lstrip('-').isdigit():
+            return int(value)
+    return value
+
+
+def field_hash(key: str, value: Any) -> int:
+    """Stable 64-bit hash of one state field (name and value)"""
+    if not isinstance(value, str):
+        value = json.dumps(value, sort_keys=True, default=str)
+    digest = hashlib.blake2b(f"{key}\0{value}".encode(), digest_size=CHECKSUM_BITS // 8).digest()
+    return int.from_bytes(digest, 'big')
+
+
+def md5_state_checksum(state: Dict[str, Any]) -> str:
+    """The previous checksum: MD5 of the whole state as sorted JSON (kept for the benchmark)"""
+    state_str = json.dumps(state, sort_keys=True, default=str)
+    return hashlib.md5(state_str.encode()).hexdigest()[:8]
+
+
 @dataclass
 class StateDelta:
     """Represents a change in game state"""
@@ -42,6 +105,7 @@ class StateDelta:
     affected_players: List[str]
     checksum: str
     compressed_size: int = 0
+    keyframe: bool = False               # Sent as a full view rather than as changes
     
     def to_dict(self) -> Dict[str, Any]:
         """Convert to dictionary for JSON serialization"""
@@ -52,7 +116,8 @@ class StateDelta:
             'changes': self.changes,
             'affected_players': self.affected_players,
             'checksum': self.checksum,
-            'compressed_size': self.compressed_size
+            'compressed_size': self.compressed_size,
+            'keyframe': self.keyframe
         }
     
     @classmethod
@@ -65,7 +130,8 @@ class StateDelta:
             changes=data['changes'],
             affected_players=data['affected_players'],
             checksum=data['checksum'],
-            compressed_size=data.get('compressed_size', 0)
+            compressed_size=data.get('compressed_size', 0),
+            keyframe=data.get('keyframe', False)
         )
 
 
@@ -74,16 +140,32 @@ class GameStateDeltaManager:
     Manages delta generation, compression, and state reconciliation for game updates
     """
     
-    def __init__(self, compression_threshold: int = 500):
-        self.compression_threshold = compression_threshold  # Compress if delta > 500 bytes
+    def __init__(self, compression_threshold: int = DEFAULT_COMPRESS_MIN,
+                 keyframe_interval: int = DEFAULT_KEYFRAME_INTERVAL,
+                 max_history: int = DEFAULT_MAX_HISTORY):
+        self.compression_threshold = compression_threshold  # Smaller frames are never compressed
+        self.frame_compressor = FrameCompressor(min_size=compression_threshold)
         self.sequence_counter = 0
         self.state_history: List[Dict[str, Any]] = []  # Keep last N states for diffing
         self.delta_history: List[StateDelta] = []      # Keep delta history for reconciliation
-        self.max_history = 50                          # Maximum states/deltas to keep
+        self.max_history = max_history                 # Maximum states/deltas to keep
+        
+        # Sequenced stream: a new epoch means sequence numbers restarted (e.g. server restart)
+        self.epoch = uuid.uuid4().hex[:8]
+        self.keyframe_interval = max(1, keyframe_interval)
+        self.last_keyframe_seq = 0
+        self.last_state: Dict[str, Any] = {}           # State as of sequence_counter
         
         # Player-specific state tracking
-        self.player_states: Dict[str, Dict[str, Any]] = {}
-        self.player_sequence_ids: Dict[str, int] = {}
+        self.player_sequence_ids: Dict[str, int] = {}  # player_id -> last acknowledged sequence
+        
+        self.untracked_fields = set(UNTRACKED_FIELDS)
+        
+        # Incremental checksum of last_state: XOR of field_hash over its tracked fields
+        self.field_hashes: Dict[str, int] = {}
+        self.state_hash = 0
+        self._players_json: Optional[str] = None
+        self._players: List[str] = []
         
         # Pre-defined static fields (don't delta these unless they actually change)
         self.static_fields = {
@@ -96,10 +178,25 @@ class GameStateDeltaManager:
         }
     
     def compute_state_checksum(self, state: Dict[str, Any]) -> str:
-        """Compute MD5 checksum of state for validation"""
-        # Sort keys for consistent hashing
-        state_str = json.dumps(state, sort_keys=True, default=str)
-        return hashlib.md5(state_str.encode()).hexdigest()[:8]
+        """Checksum of a whole state, computed from scratch (equals the incremental one)"""
+        state_hash = 0
+        for key, value in state.items():
+            if key not in self.untracked_fields and value is not None:
+                state_hash ^= field_hash(key, value)
+        return f"{state_hash:016x}"
+    
+    @property
+    def checksum(self) -> str:
+        """Checksum of last_state"""
+        return f"{self.state_hash:016x}"
+    
+    def _update_checksum(self, changes: Dict[str, Any]):
+        """Rehash only the changed fields (None removes a field)"""
+        for key, value in changes.items():
+            self.state_hash ^= self.field_hashes.pop(key, 0)
+            if value is not None:
+                new_hash = self.field_hashes[key] = field_hash(key, value)
+                self.state_hash ^= new_hash
     
     def generate_delta(self, 
                       old_state: Dict[str, Any], 
@@ -116,57 +213,69 @@ class GameStateDeltaManager:
         Returns:
             StateDelta object containing only the changes
         """
+        changes = self.diff_states(old_state, new_state)
+        return self._record(changes, self.classify_changes(changes),
+                            affected_players, old_state, new_state, self.compute_state_checksum(new_state))
+    
+    def diff_states(self, old_state: Dict[str, Any], new_state: Dict[str, Any]) -> Dict[str, Any]:
+        """Fields whose value differs between the states (removed fields map to None)"""
         changes = {}
-        update_types = set()
-        
-        # Compare all fields and identify changes
-        all_keys = set(old_state.keys()) | set(new_state.keys())
-        
-        for key in all_keys:
-            old_value = old_state.get(key)
+        for key in set(old_state.keys()) | set(new_state.keys()):
+            if key in self.untracked_fields:
+                continue
             new_value = new_state.get(key)
-            
-            if old_value != new_value:
+            if old_state.get(key) != new_value:
                 changes[key] = new_value
-                
-                # Categorize the change
-                if key.startswith('hand_'):
-                    update_types.add(UpdateType.HAND_UPDATE)
-                elif key in ['current_turn']:
-                    update_types.add(UpdateType.TURN_TRANSITION)
-                elif key in ['tricks', 'round_scores', 'completed_tricks']:
-                    update_types.add(UpdateType.SCORE_CHANGE)
-                elif key in ['phase', 'game_phase']:
-                    update_types.add(UpdateType.PHASE_CHANGE)
-                elif key in ['hokm', 'current_trick', 'led_suit']:
-                    update_types.add(UpdateType.PLAYER_ACTION)
-                elif key in ['teams', 'hakem']:
-                    update_types.add(UpdateType.GAME_SETUP)
+        return changes
+    
+    @staticmethod
+    def classify_changes(changes: Dict[str, Any]) -> UpdateType:
+        """Primary UpdateType of a set of changed fields"""
+        update_types = set()
+        for key in changes:
+            if key.startswith('hand_'):
+                update_types.add(UpdateType.HAND_UPDATE)
+            elif key in ['current_turn']:
+                update_types.add(UpdateType.TURN_TRANSITION)
+            elif key in ['tricks', 'round_scores', 'completed_tricks']:
+                update_types.add(UpdateType.SCORE_CHANGE)
+            elif key in ['phase', 'game_phase']:
+                update_types.add(UpdateType.PHASE_CHANGE)
+            elif key in ['hokm', 'current_trick', 'led_suit']:
+                update_types.add(UpdateType.PLAYER_ACTION)
+            elif key in ['teams', 'hakem']:
+                update_types.add(UpdateType.GAME_SETUP)
         
         # Determine primary update type
         if UpdateType.TRICK_RESULT in update_types or (
             UpdateType.SCORE_CHANGE in update_types and 
-            'current_trick' in changes and not changes['current_trick']
+            'current_trick' in changes and changes['current_trick'] in ('[]', [])
         ):
-            primary_type = UpdateType.TRICK_RESULT
+            return UpdateType.TRICK_RESULT
         elif update_types:
-            primary_type = list(update_types)[0]
-        else:
-            primary_type = UpdateType.FULL_SYNC
-        
+            return list(update_types)[0]
+        return UpdateType.FULL_SYNC
+    
+    def _record(self, changes: Dict[str, Any], update_type: UpdateType,
+                affected_players: Optional[List[str]], old_state: Dict[str, Any],
+                new_state: Dict[str, Any], checksum: str, keyframe: bool = False) -> StateDelta:
+        """Assign the next sequence number to a set of changes and keep it in the history"""
         # Auto-detect affected players if not specified
         if affected_players is None:
             affected_players = self._detect_affected_players(changes, old_state, new_state)
         
-        # Create delta
         self.sequence_counter += 1
+        if keyframe or self.sequence_counter - self.last_keyframe_seq >= self.keyframe_interval:
+            keyframe = True
+            self.last_keyframe_seq = self.sequence_counter
         delta = StateDelta(
-            update_type=primary_type,
+            update_type=update_type,
             timestamp=time.time(),
             sequence_id=self.sequence_counter,
             changes=changes,
             affected_players=affected_players,
-            checksum=self.compute_state_checksum(new_state)
+            checksum=checksum,
+            keyframe=keyframe
         )
         
         # Store in history
@@ -176,6 +285,118 @@ class GameStateDeltaManager:
         
         return delta
     
+    def advance(self, new_state: Dict[str, Any], affected_players: Optional[List[str]] = None,
+                update_type: Optional[UpdateType] = None, keyframe: bool = False) -> Optional[StateDelta]:
+        """
+        Move the room's stream to new_state.
+        
+        Returns the delta for this change (a keyframe for the room's first
+        state, when forced, or when the interval is due), or None if nothing
+        tracked changed.
+        """
+        changes = self.diff_states(self.last_state, new_state)
+        if not changes and not keyframe:
+            return None
+        old_state, self.last_state = self.last_state, dict(new_state)
+        self._update_checksum(changes)
+        return self._record(changes, update_type or self.classify_changes(changes), affected_players,
+                            old_state, self.last_state, self.checksum,
+                            keyframe=keyframe or not old_state)
+    
+    def advance_changes(self, changes: Dict[str, Any], affected_players: Optional[List[str]] = None,
+                        update_type: Optional[UpdateType] = None, keyframe: bool = False) -> Optional[StateDelta]:
+        """
+        Like advance(), given only the fields that may have changed (as from
+        GameBoard.take_state_changes): just those are compared and rehashed.
+        """
+        last_state = self.last_state
+        changed = {key: value for key, value in changes.items()
+                   if key not in self.untracked_fields and last_state.get(key) != value}
+        if not changed and not keyframe:
+            return None
+        first = not last_state
+        old_values = {key: last_state.get(key) for key in changed}
+        last_state.update(changed)
+        self._update_checksum(changed)
+        return self._record(changed, update_type or self.classify_changes(changed), affected_players,
+                            old_values, last_state, self.checksum, keyframe=keyframe or first)
+    
+    def record_changes(self, changes: Dict[str, Any], update_type: UpdateType,
+                       affected_players: Optional[List[str]] = None) -> StateDelta:
+        """Add known changes to the stream without comparing them (targeted updates)"""
+        old_values = {key: self.last_state.get(key) for key in changes}
+        self.last_state.update(changes)
+        self._update_checksum(changes)
+        return self._record(dict(changes), update_type, affected_players, old_values, self.last_state,
+                            self.checksum)
+    
+    def player_view(self, changes: Dict[str, Any], player: str) -> Dict[str, Any]:
+        """What one player may see of a state or changes: no other hands, JSON fields decoded"""
+        view = {}
+        own_hand = f'hand_{player}'
+        for key, value in changes.items():
+            if key.startswith('hand_'):
+                if key != own_hand:
+                    continue
+                key = 'hand'
+            view[key] = _view_value(key, value)
+        return view
+    
+    def _sync_message(self, sequence_id: int, view: Dict[str, Any], keyframe: bool,
+                      base: int = 0) -> Dict[str, Any]:
+        """Body of a state_sync message (the caller adds type and room_code)"""
+        message = {'epoch': self.epoch, 'seq': sequence_id, 'keyframe': keyframe}
+        if not keyframe:
+            message['base'] = base      # The changes apply on top of any sequence in [base, seq)
+        message['changes'] = view
+        return message
+    
+    def player_message(self, delta: StateDelta, player: str) -> Dict[str, Any]:
+        """state_sync body for the latest delta, as one player sees it"""
+        if delta.keyframe:
+            return self.keyframe_message(player)
+        return self._sync_message(delta.sequence_id, self.player_view(delta.changes, player),
+                                  keyframe=False, base=delta.sequence_id - 1)
+    
+    def keyframe_message(self, player: str) -> Dict[str, Any]:
+        """state_sync body carrying the player's full view at the current sequence"""
+        return self._sync_message(self.sequence_counter, self.player_view(self.last_state, player),
+                                  keyframe=True)
+    
+    def resume_message(self, player: str, last_sequence: Optional[int],
+                       epoch: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Catch a player up from last_sequence: the later changes merged into
+        one message, or a keyframe if the history does not reach back (or the
+        sequence is from another epoch). None if the player is up to date or
+        the room has no state yet.
+        """
+        current = self.sequence_counter
+        if current == 0 or (epoch == self.epoch and last_sequence == current):
+            return None
+        oldest = self.delta_history[0].sequence_id if self.delta_history else current + 1
+        if (epoch != self.epoch or last_sequence is None
+                or not oldest - 1 <= last_sequence < current):
+            message = self.keyframe_message(player)
+        else:
+            merged = {}
+            for delta in self.delta_history:
+                if delta.sequence_id > last_sequence:
+                    merged.update(delta.changes)
+            message = self._sync_message(current, self.player_view(merged, player),
+                                         keyframe=False, base=last_sequence)
+        message['resume'] = True
+        return message
+    
+    def acknowledge(self, player_id: str, sequence_id: int, epoch: Optional[str] = None) -> bool:
+        """Record that a player applied everything up to sequence_id"""
+        if epoch is not None and epoch != self.epoch:
+            return False
+        sequence_id = min(int(sequence_id), self.sequence_counter)
+        if sequence_id > self.player_sequence_ids.get(player_id, 0):
+            self.player_sequence_ids[player_id] = sequence_id
+        return True
+    
     def _detect_affected_players(self, 
                                 changes: Dict[str, Any], 
                                 old_state: Dict[str, Any], 
@@ -192,9 +413,7 @@ class GameStateDeltaManager:
         # Turn changes affect current and next players
         if 'current_turn' in changes:
             try:
-                players = new_state.get('players', [])
-                if isinstance(players, str):
-                    players = json.loads(players)
+                players = self._state_players(new_state)
                 
                 current_turn = changes['current_turn']
                 if isinstance(current_turn, int) and 0 <= current_turn < len(players):
@@ -210,235 +429,58 @@ class GameStateDeltaManager:
         # Trick results affect all players
         if any(key in changes for key in ['tricks', 'current_trick', 'round_scores']):
             try:
-                players = new_state.get('players', [])
-                if isinstance(players, str):
-                    players = json.loads(players)
-                affected.update(players)
+                affected.update(self._state_players(new_state))
             except (json.JSONDecodeError, TypeError):
                 pass
         
         # Default to all players if we can't determine
         if not affected:
             try:
-                players = new_state.get('players', [])
-                if isinstance(players, str):
-                    players = json.loads(players)
-                affected.update(players)
+                affected.update(self._state_players(new_state))
             except (json.JSONDecodeError, TypeError):
                 affected = ['all']
         
         return list(affected)
     
-    def compress_delta(self, delta: StateDelta) -> Tuple[str, bool]:
-        """
-        Compress delta if it's larger than threshold
-        
-        Returns:
-            (compressed_data, was_compressed)
-        """
-        delta_json = json.dumps(delta.to_dict())
-        original_size = len(delta_json.encode())
-        
-        if original_size > self.compression_threshold:
-            # Compress using zlib and encode as base64
-            compressed = zlib.compress(delta_json.encode(), level=6)
-            compressed_b64 = base64.b64encode(compressed).decode()
-            
-            delta.compressed_size = len(compressed_b64)
-            
-            return compressed_b64, True
-        
-        return delta_json, False
+    def _state_players(self, state: Dict[str, Any]) -> List[str]:
+        """The state's player list, decoded once per distinct value rather than per delta"""
+        players = state.get('players', [])
+        if not isinstance(players, str):
+            return players
+        if players != self._players_json:
+            self._players = json.loads(players)
+            self._players_json = players
+        return self._players
     
-    def decompress_delta(self, compressed_data: str, is_compressed: bool) -> StateDelta:
-        """Decompress and parse delta"""
-        if is_compressed:
-            try:
-                compressed_bytes = base64.b64decode(compressed_data.encode())
-                decompressed = zlib.decompress(compressed_bytes)
-                delta_json = decompressed.decode()
-            except Exception as e:
-                raise ValueError(f"Failed to decompress delta: {e}")
-        else:
-            delta_json = compressed_data
-        
-        try:
-            delta_dict = json.loads(delta_json)
-            return StateDelta.from_dict(delta_dict)
-        except json.JSONDecodeError as e:
-            raise ValueError(f"Failed to parse delta JSON: {e}")
-    
-    def create_optimized_update(self, 
-                              old_state: Dict[str, Any], 
-                              new_state: Dict[str, Any],
-                              target_player: str,
-                              affected_players: Optional[List[str]] = None) -> Dict[str, Any]:
-        """
-        Create an optimized update for a specific player
-        
-        This method creates player-specific deltas that only include
-        information relevant to that player.
-        """
-        # Generate base delta
-        delta = self.generate_delta(old_state, new_state, affected_players)
-        
-        # Filter changes for target player
-        player_changes = {}
-        
-        for key, value in delta.changes.items():
-            # Include player's own hand
-            if key == f'hand_{target_player}':
-                player_changes[key] = value
-            
-            # Include global game state (but not other players' hands)
-            elif not key.startswith('hand_') or key == f'hand_{target_player}':
-                player_changes[key] = value
-            
-            # Include turn information if it affects this player
-            elif key == 'current_turn':
-                try:
-                    players = new_state.get('players', [])
-                    if isinstance(players, str):
-                        players = json.loads(players)
-                    
-                    current_player = players[value] if 0 <= value < len(players) else None
-                    if current_player == target_player or target_player in affected_players:
-                        player_changes[key] = value
-                        player_changes['your_turn'] = (current_player == target_player)
-                except (json.JSONDecodeError, IndexError, TypeError):
-                    player_changes[key] = value
-        
-        # Create optimized delta
-        optimized_delta = StateDelta(
-            update_type=delta.update_type,
-            timestamp=delta.timestamp,
-            sequence_id=delta.sequence_id,
-            changes=player_changes,
-            affected_players=[target_player],
-            checksum=delta.checksum
-        )
-        
-        # Compress if needed
-        compressed_data, is_compressed = self.compress_delta(optimized_delta)
-        
-        return {
-            'type': 'delta_update',
-            'delta': optimized_delta.to_dict(),
-            'compressed': is_compressed,
-            'data': compressed_data,
-            'target_player': target_player
-        }
-    
-    def create_full_sync(self, 
-                        state: Dict[str, Any], 
-                        target_player: str) -> Dict[str, Any]:
-        """Create a full state synchronization for a player"""
-        # Filter state for player
-        player_state = {}
-        
-        for key, value in state.items():
-            # Include player's own hand
-            if key == f'hand_{target_player}':
-                player_state['hand'] = value if isinstance(value, list) else json.loads(value or '[]')
-            
-            # Include global state (excluding other players' hands)
-            elif not key.startswith('hand_'):
-                if key == 'teams' and isinstance(value, str):
-                    player_state[key] = json.loads(value)
-                elif key == 'players' and isinstance(value, str):
-                    player_state[key] = json.loads(value)
-                elif key in ['tricks', 'round_scores'] and isinstance(value, str):
-                    player_state[key] = json.loads(value)
-                else:
-                    player_state[key] = value
-        
-        # Add player-specific metadata
-        player_state['target_player'] = target_player
-        player_state['sync_timestamp'] = time.time()
-        
-        self.sequence_counter += 1
-        
-        return {
-            'type': 'full_sync',
-            'sequence_id': self.sequence_counter,
-            'state': player_state,
-            'checksum': self.compute_state_checksum(state),
-            'target_player': target_player
-        }
+    def compress_frame(self, frame: Union[str, bytes], kind: str) -> Union[str, bytes]:
+        """An encoded state_sync frame as it should be sent: compressed if that pays off"""
+        return self.frame_compressor.compress(frame, kind)
     
-    def generate_reconciliation_patch(self, 
-                                    player_id: str,
-                                    last_known_sequence: int,
-                                    current_state: Dict[str, Any]) -> Dict[str, Any]:
+    def compress_delta(self, delta: StateDelta) -> Tuple[Union[str, bytes], bool]:
         """
-        Generate a reconciliation patch for a player who missed updates
+        Encode a delta record, as a compressed binary frame if that pays off
         
-        Args:
-            player_id: Player who needs reconciliation
-            last_known_sequence: Last sequence ID the player received
-            current_state: Current game state
-            
         Returns:
-            Reconciliation patch or full sync if too many missed updates
+            (data, was_compressed)
         """
-        # Find deltas since last known sequence
-        missed_deltas = [
-            delta for delta in self.delta_history 
-            if delta.sequence_id > last_known_sequence
-        ]
-        
-        # If too many missed updates, send full sync
-        if len(missed_deltas) > 10:
-            return self.create_full_sync(current_state, player_id)
-        
-        # Aggregate missed changes
-        aggregated_changes = {}
-        update_types = set()
-        
-        for delta in missed_deltas:
-            # Only include changes relevant to this player
-            for key, value in delta.changes.items():
-                if (key == f'hand_{player_id}' or 
-                    not key.startswith('hand_') or
-                    player_id in delta.affected_players):
-                    aggregated_changes[key] = value
-            
-            update_types.add(delta.update_type)
-        
-        # Create reconciliation delta
-        self.sequence_counter += 1
-        reconciliation_delta = StateDelta(
-            update_type=UpdateType.FULL_SYNC if len(update_types) > 3 else UpdateType.PLAYER_ACTION,
-            timestamp=time.time(),
-            sequence_id=self.sequence_counter,
-            changes=aggregated_changes,
-            affected_players=[player_id],
-            checksum=self.compute_state_checksum(current_state)
-        )
-        
-        # Compress if needed
-        compressed_data, is_compressed = self.compress_delta(reconciliation_delta)
-        
-        return {
-            'type': 'reconciliation_patch',
-            'delta': reconciliation_delta.to_dict(),
-            'compressed': is_compressed,
-            'data': compressed_data,
-            'missed_sequences': [d.sequence_id for d in missed_deltas],
-            'target_player': player_id
-        }
+        frame = json.dumps(delta.to_dict())
+        data = self.frame_compressor.compress(frame, 'delta_record')
+        compressed = data is not frame
+        if compressed:
+            delta.compressed_size = len(data)
+        return data, compressed
     
-    def update_player_state(self, player_id: str, sequence_id: int, state_changes: Dict[str, Any]):
-        """Update tracking for a player's last known state"""
-        self.player_sequence_ids[player_id] = sequence_id
-        
-        if player_id not in self.player_states:
-            self.player_states[player_id] = {}
-        
-        self.player_states[player_id].update(state_changes)
+    def decompress_delta(self, data: Union[str, bytes], is_compressed: bool) -> StateDelta:
+        """Inverse of compress_delta"""
+        try:
+            if is_compressed:
+                data = decompress_frame(data)
+            return StateDelta.from_dict(json.loads(data))
+        except (WireFormatError, json.JSONDecodeError) as e:
+            raise ValueError(f"Failed to decode delta: {e}")
     
     def get_player_last_sequence(self, player_id: str) -> int:
-        """Get the last sequence ID a player received"""
+        """Get the last sequence ID a player acknowledged"""
         return self.player_sequence_ids.get(player_id, 0)
     
     def cleanup_old_history(self):
@@ -461,7 +503,7 @@ class GameStateDeltaManager:
     def get_compression_stats(self) -> Dict[str, Any]:
         """Get compression and efficiency statistics"""
         if not self.delta_history:
-            return {'total_deltas': 0}
+            return {'total_deltas': 0, 'frames': self.frame_compressor.get_stats()}
         
         total_deltas = len(self.delta_history)
         compressed_deltas = sum(1 for d in self.delta_history if d.compressed_size > 0)
@@ -474,8 +516,153 @@ class GameStateDeltaManager:
             'compressed_deltas': compressed_deltas,
             'compression_ratio': compressed_deltas / total_deltas if total_deltas > 0 else 0,
             'avg_delta_size': avg_delta_size,
+            'frames': self.frame_compressor.get_stats(),
             'update_types': {
                 update_type.value: sum(1 for d in self.delta_history if d.update_type == update_type)
                 for update_type in UpdateType
             }
         }
+
+
+class SyncedState:
+    """
+    Client-side copy of a room's state, kept current from state_sync messages
+    """
+    
+    def __init__(self, ack_every: int = 8):
+        self.ack_every = max(1, ack_every)   # Acknowledge at least every N sequences
+        self.epoch: Optional[str] = None
+        self.sequence_id = 0
+        self.acked_sequence = 0
+        self.state: Dict[str, Any] = {}
+    
+    def apply(self, message: Dict[str, Any]) -> bool:
+        """
+        Apply a state_sync message.
+        
+        Returns False if it cannot be applied (missed sequences or a new
+        epoch); the client should then send resync_message().
+        """
+        changes = message.get('changes', {})
+        sequence_id = message['seq']
+        
+        if message.get('keyframe'):
+            self.state = dict(changes)
+            self.epoch = message.get('epoch')
+            self.sequence_id = sequence_id
+            return True
+        if message.get('epoch') != self.epoch or message.get('base', sequence_id - 1) > self.sequence_id:
+            return False
+        if sequence_id > self.sequence_id:
+            self.state.update(changes)
+            self.sequence_id = sequence_id
+        return True
+    
+    def ack_due(self) -> bool:
+        return self.sequence_id - self.acked_sequence >= self.ack_every
+    
+    def ack_message(self, room_code: str) -> Dict[str, Any]:
+        self.acked_sequence = self.sequence_id
+        return {'type': 'state_ack', 'room_code': room_code, 'epoch': self.epoch, 'seq': self.sequence_id}
+    
+    def resync_message(self, room_code: str) -> Dict[str, Any]:
+        return {'type': 'state_resync', 'room_code': room_code, 'epoch': self.epoch, 'last_seq': self.sequence_id}
+    
+    def to_dict(self) -> Dict[str, Any]:
+        return {'epoch': self.epoch, 'seq': self.sequence_id, 'state': self.state}
+    
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any], ack_every: int = 8) -> 'SyncedState':
+        synced = cls(ack_every)
+        synced.epoch = data.get('epoch')
+        synced.sequence_id = synced.acked_sequence = int(data.get('seq', 0))
+        synced.state = data.get('state', {})
+        return synced
+
+
+def play_game(seed: int, on_change) -> int:
+    """Play one full game (to 7 hands), calling on_change(board) after every state change"""
+    import random
+    from game_board import GameBoard
+
+    random.seed(seed)
+    board = GameBoard([f"player_{seat}" for seat in range(4)], "ROOM1")
+    board.assign_teams_and_hakem()
+    changes = 1
+    on_change(board)
+    while True:
+        board.initial_deal()
+        on_change(board)
+        board.set_hokm(max(('hearts', 'diamonds', 'clubs', 'spades'),
+                           key=lambda s: sum(card.endswith('_' + s) for card in board.hands[board.hakem])))
+        on_change(board)
+        board.final_deal()
+        on_change(board)
+        changes += 3
+        while True:
+            player = board.players[board.current_turn]
+            result = board.play_card(player, next(c for c in board.hands[player] if board.validate_play(player, c)[0]))
+            on_change(board)
+            changes += 1
+            if result.get('hand_complete'):
+                break
+        if result.get('game_complete'):
+            return changes
+
+
+def measure_sync_costs(incremental: bool, seed: int = 1, repeat: int = 5) -> Dict[str, Any]:
+    """
+    CPU per state change (microseconds) for turning a board into the next
+    delta: to_redis_dict + full diff + MD5, or take_state_changes +
+    advance_changes with the incremental checksum
+    """
+    elapsed = 0.0
+    changes = 0
+    for _ in range(repeat):
+        manager = GameStateDeltaManager()
+        timings = []
+
+        def on_change(board):
+            start = time.perf_counter()
+            if incremental:
+                manager.advance_changes(board.take_state_changes())
+            else:
+                state = board.to_redis_dict()
+                changed = manager.diff_states(manager.last_state, state)
+                if changed:
+                    manager.last_state = state
+                    manager._record(changed, manager.classify_changes(changed), None, {}, state,
+                                    md5_state_checksum(state))
+            timings.append(time.perf_counter() - start)
+
+        changes = play_game(seed, on_change)
+        elapsed += sum(timings)
+    return {
+        'changes': changes,
+        'sequences': manager.sequence_counter,
+        'us_per_change': elapsed / repeat / changes * 1e6
+    }
+
+
+def main():
+    import argparse
+    import logging
+
+    parser = argparse.ArgumentParser(description="CPU per state change: full diff + MD5 vs incremental checksums")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    logging.getLogger('game_board').setLevel(logging.WARNING)
+    results = {
+        'full_diff_md5': measure_sync_costs(False, args.seed, args.repeat),
+        'incremental': measure_sync_costs(True, args.seed, args.repeat)
+    }
+    results['speedup'] = round(results['full_diff_md5']['us_per_change'] / results['incremental']['us_per_change'], 2)
+    for key in ('full_diff_md5', 'incremental'):
+        results[key]['us_per_change'] = round(results[key]['us_per_change'], 1)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,179 @@
+# heartbeat.py
+"""
+Consolidated connection heartbeat.
+
+Liveness used to be checked three times over: a ping_client task per
+connection, the websockets library's own ping_interval, and cleanup_task,
+which pinged every socket one after another with a 5s timeout each minute
+(so a sweep over a few thousand sockets could take longer than its period).
+
+HeartbeatScheduler replaces all three with one task. Every inbound frame
+calls touch(), which only stores a timestamp. A heap keyed by each socket's
+next deadline (last activity + idle_timeout) tells the task when to wake;
+entries whose socket has been active since are pushed back lazily, so only
+sockets that have really been silent for idle_timeout are pinged. Probes run
+in parallel (at most max_parallel at a time) and sockets that fail them are
+handed to on_dead in bounded parallel batches.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+log = logging.getLogger(__name__)
+
+DEFAULT_IDLE_TIMEOUT = 30.0   # Seconds of silence before a socket is pinged
+DEFAULT_PONG_TIMEOUT = 10.0   # Seconds a pinged socket has to answer
+DEFAULT_MAX_PARALLEL = 64     # Concurrent probes / disconnect handlers
+
+
+class HeartbeatScheduler:
+    """One task that probes idle sockets in deadline order"""
+
+    def __init__(self, on_dead: Callable[[Any], Awaitable[None]],
+                 idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+                 pong_timeout: float = DEFAULT_PONG_TIMEOUT,
+                 max_parallel: int = DEFAULT_MAX_PARALLEL):
+        self.on_dead = on_dead
+        self.idle_timeout = idle_timeout
+        self.pong_timeout = pong_timeout
+        self.max_parallel = max_parallel
+        self.last_activity: Dict[Any, float] = {}
+        self._heap: List[Tuple[float, int, Any]] = []
+        self._seq = itertools.count()
+        self._probing = set()
+        self.task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.probes = 0
+        self.failed_probes = 0
+        self.dead_handled = 0
+        self.handler_errors = 0
+        self.sweep_times = deque(maxlen=1000)   # Seconds per sweep that probed something
+
+    def _push(self, websocket, deadline: float):
+        heapq.heappush(self._heap, (deadline, next(self._seq), websocket))
+
+    def register(self, websocket, now: Optional[float] = None):
+        now = time.monotonic() if now is None else now
+        self.last_activity[websocket] = now
+        self._push(websocket, now + self.idle_timeout)
+
+    def touch(self, websocket, now: Optional[float] = None):
+        """Record inbound activity; the heap entry is moved lazily when it comes due"""
+        if websocket in self.last_activity:
+            self.last_activity[websocket] = time.monotonic() if now is None else now
+
+    def unregister(self, websocket):
+        # Its heap entry is dropped when it comes due
+        self.last_activity.pop(websocket, None)
+        self._probing.discard(websocket)
+
+    def next_deadline(self) -> Optional[float]:
+        return self._heap[0][0] if self._heap else None
+
+    def due(self, now: Optional[float] = None) -> List[Any]:
+        """Pop every socket that has been silent for idle_timeout"""
+        now = time.monotonic() if now is None else now
+        idle = []
+        while self._heap and self._heap[0][0] <= now:
+            _, _, websocket = heapq.heappop(self._heap)
+            last = self.last_activity.get(websocket)
+            if last is None or websocket in self._probing:
+                continue
+            deadline = last + self.idle_timeout
+            if deadline > now:
+                self._push(websocket, deadline)   # Active since it was scheduled
+            else:
+                idle.append(websocket)
+        return idle
+
+    async def _probe(self, websocket, limit: asyncio.Semaphore) -> bool:
+        async with limit:
+            self.probes += 1
+            try:
+                pong_waiter = await websocket.ping()
+                await asyncio.wait_for(pong_waiter, timeout=self.pong_timeout)
+                return True
+            except Exception:
+                self.failed_probes += 1
+                return False
+
+    async def sweep(self, now: Optional[float] = None) -> List[Any]:
+        """Probe due sockets, reschedule live ones and hand dead ones to on_dead; returns the dead"""
+        idle = self.due(now)
+        if not idle:
+            return []
+        started = time.monotonic()
+        self._probing.update(idle)
+        limit = asyncio.Semaphore(self.max_parallel)
+        try:
+            alive = await asyncio.gather(*(self._probe(ws, limit) for ws in idle))
+        finally:
+            self._probing.difference_update(idle)
+
+        dead = []
+        for websocket, ok in zip(idle, alive):
+            if websocket not in self.last_activity:
+                continue   # Closed normally while being probed
+            if ok:
+                self.register(websocket)
+            else:
+                self.unregister(websocket)
+                dead.append(websocket)
+
+        for start in range(0, len(dead), self.max_parallel):
+            batch = dead[start:start + self.max_parallel]
+            results = await asyncio.gather(*(self.on_dead(ws) for ws in batch), return_exceptions=True)
+            for result in results:
+                if isinstance(result, Exception):
+                    self.handler_errors += 1
+                    log.error("Error handling dead connection: %s", result)
+        self.dead_handled += len(dead)
+        self.sweep_times.append(time.monotonic() - started)
+        if dead:
+            log.info("Heartbeat: %s of %s idle connections were dead", len(dead), len(idle))
+        return dead
+
+    async def _run(self):
+        while True:
+            deadline = self.next_deadline()
+            # New sockets are always due after every existing entry, so sleeping
+            # until the earliest deadline never misses one
+            delay = self.idle_timeout if deadline is None else max(0.0, deadline - time.monotonic())
+            await asyncio.sleep(delay)
+            try:
+                await self.sweep()
+            except Exception as e:
+                log.error("Heartbeat sweep failed: %s", e)
+
+    def start(self):
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run(), name="heartbeat")
+        return self.task
+
+    async def stop(self):
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+    def get_metrics(self) -> Dict[str, Any]:
+        sweep_times = list(self.sweep_times)
+        return {
+            'tracked': len(self.last_activity),
+            'scheduled': len(self._heap),
+            'idle_timeout': self.idle_timeout,
+            'probes': self.probes,
+            'failed_probes': self.failed_probes,
+            'dead_handled': self.dead_handled,
+            'handler_errors': self.handler_errors,
+            'avg_sweep_ms': (sum(sweep_times) / len(sweep_times) * 1000) if sweep_times else 0.0,
+            'max_sweep_ms': max(sweep_times) * 1000 if sweep_times else 0.0
+        }
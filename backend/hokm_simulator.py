@@ -0,0 +1,498 @@
+# hokm_simulator.py
+"""
+Headless Hokm simulator for rules and capacity benchmarking.
+
+Plays whole games (deal, hokm selection, tricks, hand scoring and hakem
+rotation) without sockets or Redis, using pluggable bot policies.
+
+Two engines:
+- HokmSimulator.run() plays many tables at once. Hands are int64 card masks
+  (see card_bits.py) in NumPy arrays of shape (tables, 4), and legal-move
+  masks and trick winners are computed for every table in one array
+  operation. Optionally records a sample of tables and replays them through
+  GameBoard to cross-check the results.
+- HokmSimulator.run_board() plays games one at a time through GameBoard (or
+  BitGameBoard) itself, which is the real per-move cost the server pays.
+
+Both report games per second and per-phase timings.
+
+Usage:
+    python hokm_simulator.py --games 10000 --policy random --verify 20
+    python hokm_simulator.py --games 200 --engine board
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import random
+import time
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+
+from card_bits import CARD_INDEX, CARD_NAMES, SUITS, SUIT_MASKS
+from game_board import GameBoard
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    np = None
+    NUMPY_AVAILABLE = False
+
+PLAYERS = ["S0", "S1", "S2", "S3"]
+
+if NUMPY_AVAILABLE:
+    _CARD_INDICES = np.arange(52, dtype=np.int64)
+    _SUIT_MASKS = np.array(SUIT_MASKS, dtype=np.int64)
+
+
+def _require_numpy():
+    if not NUMPY_AVAILABLE:
+        raise RuntimeError("numpy is required for the batched simulator (pip install numpy)")
+
+
+def _mask_bits(masks):
+    """(n,) card masks -> (n, 52) bool matrix"""
+    return ((masks[:, None] >> _CARD_INDICES) & 1).astype(bool)
+
+
+def _lowest_index(masks):
+    """Card index of the lowest set bit of each (non-empty) mask"""
+    return np.log2((masks & -masks).astype(np.float64)).astype(np.int64)
+
+
+def _highest_index(masks):
+    """Card index of the highest set bit of each (non-empty) mask"""
+    idx = np.floor(np.log2(masks.astype(np.float64))).astype(np.int64)
+    # log2 rounds up just below a power of two
+    return idx - ((np.int64(1) << idx) > masks)
+
+
+# --- bot policies ---
+
+class BotPolicy:
+    """
+    Chooses hokm and cards for bots.
+
+    Batched methods take an array of masks (one per table) and return card or
+    suit indices; the scalar methods take a single int mask. Legal masks are
+    never empty. The default hokm choice is the suit the hakem holds most of
+    in their first five cards (lowest suit index on ties).
+    """
+
+    name = "base"
+
+    def choose_cards(self, legal, rng):
+        raise NotImplementedError
+
+    def choose_card(self, legal: int, rng) -> int:
+        raise NotImplementedError
+
+    def choose_hokm(self, initial, rng):
+        counts = _mask_bits(initial).reshape(len(initial), len(SUITS), 13).sum(axis=2)
+        return counts.argmax(axis=1)
+
+    def choose_hokm_suit(self, initial: int, rng) -> int:
+        counts = [(initial & mask).bit_count() for mask in SUIT_MASKS]
+        return counts.index(max(counts))
+
+
+class RandomPolicy(BotPolicy):
+    """Uniformly random legal card"""
+
+    name = "random"
+
+    def choose_cards(self, legal, rng):
+        weights = rng.random((len(legal), 52))
+        weights[~_mask_bits(legal)] = -1.0
+        return weights.argmax(axis=1)
+
+    def choose_card(self, legal: int, rng) -> int:
+        indices = [i for i in range(52) if legal >> i & 1]
+        return indices[int(rng.integers(len(indices)))]
+
+
+class LowestCardPolicy(BotPolicy):
+    """Always plays the lowest legal card in deck order"""
+
+    name = "lowest"
+
+    def choose_cards(self, legal, rng):
+        return _lowest_index(legal)
+
+    def choose_card(self, legal: int, rng) -> int:
+        return (legal & -legal).bit_length() - 1
+
+
+class HighestCardPolicy(BotPolicy):
+    """Always plays the highest legal card in deck order"""
+
+    name = "highest"
+
+    def choose_cards(self, legal, rng):
+        return _highest_index(legal)
+
+    def choose_card(self, legal: int, rng) -> int:
+        return legal.bit_length() - 1
+
+
+POLICIES = {cls.name: cls for cls in (RandomPolicy, LowestCardPolicy, HighestCardPolicy)}
+
+
+# --- results ---
+
+@dataclass
+class SimulationReport:
+    """Throughput and phase timings of a simulation run"""
+    engine: str
+    policy: str
+    games: int = 0
+    hands: int = 0
+    tricks: int = 0
+    moves: int = 0
+    elapsed: float = 0.0
+    phase_seconds: Dict[str, float] = field(default_factory=dict)
+    team_wins: List[int] = field(default_factory=lambda: [0, 0])
+    verified_tables: int = 0
+    mismatches: List[str] = field(default_factory=list)
+
+    @property
+    def games_per_second(self) -> float:
+        return self.games / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def moves_per_second(self) -> float:
+        return self.moves / self.elapsed if self.elapsed else 0.0
+
+    @property
+    def move_cost_us(self) -> float:
+        """Average wall time per card play, all phases included"""
+        return self.elapsed / self.moves * 1e6 if self.moves else 0.0
+
+    def to_dict(self) -> Dict:
+        return {
+            'engine': self.engine,
+            'policy': self.policy,
+            'games': self.games,
+            'hands': self.hands,
+            'tricks': self.tricks,
+            'moves': self.moves,
+            'elapsed_seconds': round(self.elapsed, 4),
+            'games_per_second': round(self.games_per_second, 1),
+            'moves_per_second': round(self.moves_per_second, 1),
+            'move_cost_us': round(self.move_cost_us, 3),
+            'phase_seconds': {k: round(v, 4) for k, v in self.phase_seconds.items()},
+            'team_wins': list(self.team_wins),
+            'verified_tables': self.verified_tables,
+            'mismatches': list(self.mismatches),
+        }
+
+
+class _PhaseClock:
+    """Accumulates perf_counter time per phase name"""
+
+    def __init__(self, phases):
+        self.seconds = {phase: 0.0 for phase in phases}
+        self.started = time.perf_counter()
+
+    def lap(self, phase):
+        now = time.perf_counter()
+        self.seconds[phase] += now - self.started
+        self.started = now
+
+
+# --- simulator ---
+
+class HokmSimulator:
+    """Plays headless Hokm games with bot policies"""
+
+    def __init__(self, policy: Optional[BotPolicy] = None, seed: Optional[int] = None,
+                 batch_size: int = 1024):
+        self.policy = policy or RandomPolicy()
+        self.seed = seed
+        self.batch_size = batch_size
+
+    def run(self, games: int, verify: int = 0, board_class=GameBoard) -> SimulationReport:
+        """
+        Play games in batches of batch_size tables with NumPy.
+
+        The first ``verify`` tables are recorded and replayed through
+        board_class; any disagreement is listed in report.mismatches.
+        """
+        _require_numpy()
+        rng = np.random.default_rng(self.seed)
+        report = SimulationReport(engine='numpy', policy=self.policy.name)
+        clock = _PhaseClock(('deal', 'hokm', 'play', 'resolve', 'score'))
+        logs = []
+
+        started = time.perf_counter()
+        remaining = games
+        while remaining > 0:
+            tables = min(self.batch_size, remaining)
+            record = max(0, min(verify - len(logs), tables))
+            logs.extend(self._play_batch(tables, rng, report, clock, record))
+            remaining -= tables
+        report.elapsed = time.perf_counter() - started
+        report.phase_seconds = clock.seconds
+
+        for number, log in enumerate(logs):
+            report.mismatches.extend(f"table {number}: {problem}" for problem in verify_table(log, board_class))
+        report.verified_tables = len(logs)
+        return report
+
+    def record(self, games: int) -> List[Dict]:
+        """Play games in a single batch and return every table's log (deals, hokm, moves, results)"""
+        _require_numpy()
+        rng = np.random.default_rng(self.seed)
+        report = SimulationReport(engine='numpy', policy=self.policy.name)
+        clock = _PhaseClock(('deal', 'hokm', 'play', 'resolve', 'score'))
+        return self._play_batch(games, rng, report, clock, games)
+
+    def _play_batch(self, n, rng, report, clock, record):
+        """Play n complete games; returns move logs for the first ``record`` tables"""
+        policy = self.policy
+        tables = np.arange(n)
+
+        # Seat 0 is the first hakem (GameBoard rotates players so the hakem leads);
+        # two random seats form team 0
+        seat_order = rng.permuted(np.tile(np.arange(4), (n, 1)), axis=1)
+        teams = np.ones((n, 4), dtype=np.int64)
+        teams[tables[:, None], seat_order[:, :2]] = 0
+        hakem = np.zeros(n, dtype=np.int64)
+        round_scores = np.zeros((n, 2), dtype=np.int64)
+        in_game = np.ones(n, dtype=bool)
+
+        logs = [{'teams': teams[t].tolist(), 'hands': []} for t in range(record)]
+
+        while in_game.any():
+            g = np.flatnonzero(in_game)
+            m = len(g)
+            rows = np.arange(m)
+            clock.started = time.perf_counter()
+
+            # Deal: deck position j goes to seat j % 4 (5 cards, then 8 after hokm)
+            decks = rng.permuted(np.tile(_CARD_INDICES, (m, 1)), axis=1)
+            card_bits = np.left_shift(np.int64(1), decks)
+            hands = np.stack([np.bitwise_or.reduce(card_bits[:, s::4], axis=1) for s in range(4)], axis=1)
+            h = hakem[g]
+            first_five = h[:, None] + 4 * np.arange(5)
+            initial = np.bitwise_or.reduce(card_bits[rows[:, None], first_five], axis=1)
+            clock.lap('deal')
+
+            hokm = np.asarray(policy.choose_hokm(initial, rng), dtype=np.int64)
+            trump_masks = _SUIT_MASKS[hokm]
+            clock.lap('hokm')
+
+            hand_logs = {}
+            for t in range(min(record, m)):
+                if g[t] < record:
+                    hand_logs[t] = {'hakem': int(h[t]), 'deck': decks[t].tolist(),
+                                    'hokm': int(hokm[t]), 'moves': [], 'trick_winners': []}
+                    logs[g[t]]['hands'].append(hand_logs[t])
+
+            leader = h.copy()
+            tricks = np.zeros((m, 2), dtype=np.int64)
+            player_tricks = np.zeros((m, 4), dtype=np.int64)
+            live = np.ones(m, dtype=bool)
+
+            for trick_number in range(13):
+                lr = np.flatnonzero(live)
+                lead_seat = leader[lr]
+                played = np.empty((len(lr), 4), dtype=np.int64)
+                trick_mask = np.zeros(len(lr), dtype=np.int64)
+                led = None
+                for k in range(4):
+                    seat = (lead_seat + k) % 4
+                    hand = hands[lr, seat]
+                    if led is None:
+                        legal = hand
+                    else:
+                        following = hand & _SUIT_MASKS[led]
+                        legal = np.where(following != 0, following, hand)
+                    card = np.asarray(policy.choose_cards(legal, rng), dtype=np.int64)
+                    bit = np.left_shift(np.int64(1), card)
+                    hands[lr, seat] = hand & ~bit
+                    trick_mask |= bit
+                    played[:, k] = card
+                    if led is None:
+                        led = card // 13
+                clock.lap('play')
+
+                # Highest trump if any, else highest card of the led suit
+                trumps = trick_mask & trump_masks[lr]
+                pool = np.where(trumps != 0, trumps, trick_mask & _SUIT_MASKS[led])
+                winning_card = _highest_index(pool)
+                winner = (lead_seat + (played == winning_card[:, None]).argmax(axis=1)) % 4
+                tricks[lr, teams[g[lr], winner]] += 1
+                player_tricks[lr, winner] += 1
+                leader[lr] = winner
+                hand_over = (tricks[lr].max(axis=1) >= 7) | (trick_number == 12)
+                live[lr[hand_over]] = False
+                report.tricks += len(lr)
+                report.moves += 4 * len(lr)
+                clock.lap('resolve')
+
+                for row, hand_log in hand_logs.items():
+                    i = np.searchsorted(lr, row)
+                    if i < len(lr) and lr[i] == row:
+                        hand_log['moves'].extend(played[i].tolist())
+                        hand_log['trick_winners'].append(int(winner[i]))
+                if not live.any():
+                    break
+
+            # A team with 7 tricks always has more, so the hand winner is the trick leader
+            hand_winner = np.where(tricks[:, 0] > tricks[:, 1], 0, 1)
+            round_scores[g, hand_winner] += 1
+            finished = round_scores[g, hand_winner] >= 7
+            in_game[g[finished]] = False
+            # New hakem: first seat of the winning team with the most tricks
+            candidates = np.where(teams[g] == hand_winner[:, None], player_tricks, -1)
+            hakem[g] = candidates.argmax(axis=1)
+            report.hands += m
+            clock.lap('score')
+
+            for row, hand_log in hand_logs.items():
+                hand_log['hand_winner'] = int(hand_winner[row])
+
+        winners = round_scores.argmax(axis=1)
+        report.games += n
+        report.team_wins[0] += int((winners == 0).sum())
+        report.team_wins[1] += int((winners == 1).sum())
+        for t, log in enumerate(logs):
+            log['round_scores'] = round_scores[t].tolist()
+        return logs
+
+    def run_board(self, games: int, board_class=GameBoard) -> SimulationReport:
+        """Play games one at a time through board_class to measure the real rules-engine cost"""
+        _require_numpy()
+        rng = np.random.default_rng(self.seed)
+        random.seed(self.seed)
+        policy = self.policy
+        report = SimulationReport(engine=board_class.__name__, policy=policy.name)
+        clock = _PhaseClock(('deal', 'hokm', 'policy', 'play'))
+
+        started = time.perf_counter()
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            for _ in range(games):
+                clock.started = time.perf_counter()
+                board = board_class(list(PLAYERS), "SIM")
+                board.assign_teams_and_hakem()
+                while board.game_phase != "completed":
+                    clock.started = time.perf_counter()
+                    board.initial_deal()
+                    clock.lap('deal')
+                    first_five = _hand_mask(board.hands[board.hakem])
+                    board.set_hokm(SUITS[policy.choose_hokm_suit(first_five, rng)])
+                    clock.lap('hokm')
+                    board.final_deal()
+                    clock.lap('deal')
+                    while board.game_phase == "gameplay":
+                        player = board.players[board.current_turn]
+                        hand = _hand_mask(board.hands[player])
+                        if board.current_trick:
+                            led = SUITS.index(board.current_trick[0][1].split('_')[1])
+                            legal = hand & SUIT_MASKS[led] or hand
+                        else:
+                            legal = hand
+                        card = CARD_NAMES[policy.choose_card(legal, rng)]
+                        clock.lap('policy')
+                        result = board.play_card(player, card)
+                        clock.lap('play')
+                        report.moves += 1
+                        if result.get('trick_complete'):
+                            report.tricks += 1
+                        if result.get('hand_complete'):
+                            report.hands += 1
+                report.games += 1
+                report.team_wins[max(board.round_scores, key=board.round_scores.get)] += 1
+        report.elapsed = time.perf_counter() - started
+        report.phase_seconds = clock.seconds
+        return report
+
+
+def _hand_mask(cards) -> int:
+    mask = 0
+    for card in cards:
+        mask |= 1 << CARD_INDEX[card]
+    return mask
+
+
+def verify_table(log: Dict, board_class=GameBoard) -> List[str]:
+    """
+    Replay one recorded table through board_class.
+
+    Uses the recorded deals, hokm and moves, and returns a description of
+    every point where the board disagrees with the simulator (empty if none).
+    """
+    problems = []
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        board = board_class(list(PLAYERS), "SIM")
+        board.teams = {player: log['teams'][seat] for seat, player in enumerate(PLAYERS)}
+        board.hakem = PLAYERS[0]
+        board.current_turn = 0
+
+        for number, hand in enumerate(log['hands']):
+            if board.hakem != PLAYERS[hand['hakem']]:
+                problems.append(f"hand {number}: hakem {board.hakem} != {PLAYERS[hand['hakem']]}")
+                break
+            deck = [CARD_NAMES[i] for i in hand['deck']]
+            board.hands = {player: deck[seat:20:4] for seat, player in enumerate(PLAYERS)}
+            board.game_phase = "hokm_selection"
+            board.set_hokm(SUITS[hand['hokm']])
+            board.deck = deck[20:]
+            board.final_deal()
+
+            winners = iter(hand['trick_winners'])
+            result = {}
+            for move, card_index in enumerate(hand['moves']):
+                player = board.players[board.current_turn]
+                result = board.play_card(player, CARD_NAMES[card_index])
+                if not result.get('valid'):
+                    problems.append(f"hand {number} move {move}: {player} {CARD_NAMES[card_index]} rejected "
+                                    f"({result.get('message')})")
+                    return problems
+                if result.get('trick_complete'):
+                    expected = PLAYERS[next(winners)]
+                    if result['trick_winner'] != expected:
+                        problems.append(f"hand {number} move {move}: trick winner "
+                                        f"{result['trick_winner']} != {expected}")
+            if not result.get('hand_complete'):
+                problems.append(f"hand {number}: board did not complete the hand")
+                return problems
+            if result['round_winner'] - 1 != hand['hand_winner']:
+                problems.append(f"hand {number}: hand winner team {result['round_winner'] - 1} "
+                                f"!= {hand['hand_winner']}")
+
+        round_scores = [board.round_scores[0], board.round_scores[1]]
+        if round_scores != log['round_scores']:
+            problems.append(f"round scores {round_scores} != {log['round_scores']}")
+        if board.game_phase != "completed":
+            problems.append(f"board phase {board.game_phase} != completed")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless Hokm simulator")
+    parser.add_argument('--games', type=int, default=10000)
+    parser.add_argument('--batch', type=int, default=1024, help="tables per NumPy batch")
+    parser.add_argument('--policy', choices=sorted(POLICIES), default='random')
+    parser.add_argument('--engine', choices=['numpy', 'board', 'bits'], default='numpy',
+                        help="numpy batches, or one game at a time through GameBoard / BitGameBoard")
+    parser.add_argument('--verify', type=int, default=0, help="tables to cross-check against GameBoard")
+    parser.add_argument('--seed', type=int, default=None)
+    args = parser.parse_args()
+
+    simulator = HokmSimulator(POLICIES[args.policy](), seed=args.seed, batch_size=args.batch)
+    if args.engine == 'numpy':
+        report = simulator.run(args.games, verify=args.verify)
+    elif args.engine == 'bits':
+        from game_board_bits import BitGameBoard
+        report = simulator.run_board(args.games, board_class=BitGameBoard)
+    else:
+        report = simulator.run_board(args.games)
+    print(json.dumps(report.to_dict(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,232 @@
+# io_executor.py
+"""
+Shared, bounded thread pool for blocking I/O (synchronous Redis calls).
+
+The server and network manager used to build a fresh ThreadPoolExecutor for
+every request and never shut it down. This module provides one process-wide
+executor with:
+- a configurable worker count
+- per-operation timeouts
+- queue-depth, wait-time and run-time metrics
+- a clean shutdown path
+"""
+
+import asyncio
+import logging
+import os
+import threading
+import time
+import concurrent.futures
+from collections import deque, defaultdict
+from typing import Any, Callable, Dict, Optional
+
+log = logging.getLogger(__name__)
+
+DEFAULT_TIMEOUT = 2.0
+
+
+class IOExecutorMetrics:
+    """Thread-safe metrics for the shared I/O executor"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Reset all metrics"""
+        with self._lock:
+            self.submitted = 0
+            self.started = 0
+            self.completed = 0
+            self.failed = 0
+            self.timeouts = 0
+            self.abandoned = 0      # Timed out before a worker picked them up
+            self.queued = 0         # Waiting for a worker
+            self.in_flight = 0      # Running on a worker
+            self.max_queue_depth = 0
+            self.wait_times = deque(maxlen=1000)  # Seconds spent queued
+            self.run_times = deque(maxlen=1000)   # Seconds spent running
+            self.per_operation = defaultdict(lambda: {'calls': 0, 'timeouts': 0, 'errors': 0, 'run_time_sum': 0.0})
+
+    def record_submit(self, op_name: str):
+        with self._lock:
+            self.submitted += 1
+            self.queued += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queued)
+            self.per_operation[op_name]['calls'] += 1
+
+    def record_start(self, wait_time: float):
+        with self._lock:
+            self.started += 1
+            self.queued -= 1
+            self.in_flight += 1
+            self.wait_times.append(wait_time)
+
+    def record_finish(self, op_name: str, run_time: float, success: bool):
+        with self._lock:
+            self.in_flight -= 1
+            self.run_times.append(run_time)
+            self.per_operation[op_name]['run_time_sum'] += run_time
+            if success:
+                self.completed += 1
+            else:
+                self.failed += 1
+                self.per_operation[op_name]['errors'] += 1
+
+    def record_timeout(self, op_name: str):
+        with self._lock:
+            self.timeouts += 1
+            self.per_operation[op_name]['timeouts'] += 1
+
+    def record_abandoned(self):
+        with self._lock:
+            self.abandoned += 1
+            self.queued -= 1
+
+    @staticmethod
+    def _percentile(values, pct: float) -> float:
+        if not values:
+            return 0.0
+        ordered = sorted(values)
+        index = min(len(ordered) - 1, int(round(pct * (len(ordered) - 1))))
+        return ordered[index]
+
+    def get_metrics_dict(self) -> Dict[str, Any]:
+        """Get all metrics as dictionary"""
+        with self._lock:
+            wait_times = list(self.wait_times)
+            run_times = list(self.run_times)
+            return {
+                'submitted': self.submitted,
+                'started': self.started,
+                'completed': self.completed,
+                'failed': self.failed,
+                'timeouts': self.timeouts,
+                'abandoned': self.abandoned,
+                'queue_depth': self.queued,
+                'max_queue_depth': self.max_queue_depth,
+                'in_flight': self.in_flight,
+                'avg_wait_time': sum(wait_times) / len(wait_times) if wait_times else 0.0,
+                'p99_wait_time': self._percentile(wait_times, 0.99),
+                'avg_run_time': sum(run_times) / len(run_times) if run_times else 0.0,
+                'p99_run_time': self._percentile(run_times, 0.99),
+                'operations': {name: dict(stats) for name, stats in self.per_operation.items()}
+            }
+
+
+class IOExecutor:
+    """
+    Process-wide bounded executor for blocking calls.
+
+    Like NetworkManager this is a singleton: the first construction decides the
+    pool size, later constructions return the same instance.
+
+    Usage:
+        result = await IOExecutor().run(redis_manager.get_room_players, room_code, timeout=2.0)
+
+    run() raises asyncio.TimeoutError when the timeout expires, so existing
+    ``except asyncio.TimeoutError`` fallbacks keep working unchanged.
+    """
+    _instance = None
+
+    def __new__(cls, *args, **kwargs):
+        if cls._instance is None:
+            cls._instance = super(IOExecutor, cls).__new__(cls)
+            cls._instance.initialized = False
+        return cls._instance
+
+    def __init__(self, max_workers: Optional[int] = None, default_timeout: float = DEFAULT_TIMEOUT):
+        if self.initialized:
+            return
+        if max_workers is None:
+            max_workers = int(os.getenv('HOKM_IO_WORKERS', '0')) or min(32, (os.cpu_count() or 1) + 4)
+        self.max_workers = max_workers
+        self.default_timeout = default_timeout
+        self.metrics = IOExecutorMetrics()
+        self._executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=self.max_workers,
+            thread_name_prefix='hokm-io'
+        )
+        self._closed = False
+        self.initialized = True
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    async def run(self, func: Callable, *args, timeout: Optional[float] = None, op_name: Optional[str] = None, **kwargs) -> Any:
+        """
+        Run a blocking callable on the shared pool.
+
+        Args:
+            func: Blocking callable
+            timeout: Seconds to wait (defaults to default_timeout; 0 waits indefinitely)
+            op_name: Name used for per-operation metrics (defaults to func.__name__)
+        """
+        if self._closed:
+            raise RuntimeError("IOExecutor has been shut down")
+
+        if timeout is None:
+            timeout = self.default_timeout
+        op_name = op_name or getattr(func, '__name__', 'anonymous')
+        loop = asyncio.get_running_loop()
+        submitted_at = time.monotonic()
+        state = {'started': False, 'abandoned': False}
+        state_lock = threading.Lock()
+        metrics = self.metrics
+
+        def _call():
+            with state_lock:
+                if state['abandoned']:
+                    # Caller already gave up; don't run a stale operation
+                    return None
+                state['started'] = True
+            started_at = time.monotonic()
+            metrics.record_start(started_at - submitted_at)
+            success = False
+            try:
+                result = func(*args, **kwargs)
+                success = True
+                return result
+            finally:
+                metrics.record_finish(op_name, time.monotonic() - started_at, success)
+
+        metrics.record_submit(op_name)
+        future = loop.run_in_executor(self._executor, _call)
+        try:
+            if timeout and timeout > 0:
+                return await asyncio.wait_for(future, timeout=timeout)
+            return await future
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if isinstance(e, asyncio.TimeoutError):
+                metrics.record_timeout(op_name)
+            with state_lock:
+                if not state['started'] and not state['abandoned']:
+                    state['abandoned'] = True
+                    metrics.record_abandoned()
+            raise
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get executor metrics including configuration"""
+        stats = self.metrics.get_metrics_dict()
+        stats.update({
+            'max_workers': self.max_workers,
+            'default_timeout': self.default_timeout,
+            'closed': self._closed
+        })
+        return stats
+
+    def shutdown(self, wait: bool = True, cancel_pending: bool = True):
+        """Stop accepting work and release worker threads"""
+        if self._closed:
+            return
+        self._closed = True
+        self._executor.shutdown(wait=wait, cancel_futures=cancel_pending)
+        log.info("IOExecutor shut down (completed=%s, timeouts=%s)", self.metrics.completed, self.metrics.timeouts)
+
+    @classmethod
+    def reset_instance(cls):
+        """Shut down and forget the singleton (used by tests and restarts)"""
+        if cls._instance is not None and cls._instance.initialized:
+            cls._instance.shutdown(wait=False)
+        cls._instance = None
@@ -0,0 +1,223 @@
+# log_pipeline.py
+"""
+Leveled, non-blocking logging for the game server.
+
+The hot paths (message dispatch, card plays, broadcasts, game state reads)
+used unconditional print() calls: dozens of synchronous stdout writes per
+card play, all made on the event loop, with no way to turn them off. They
+now log through the standard logging module, and configure_logging()
+installs one pipeline on the root logger:
+
+- Levels: HOKM_LOG_LEVEL (default INFO) for everything, plus per-module
+  overrides in HOKM_LOG_MODULES, e.g. "game_board=DEBUG,network=WARNING".
+  Disabled calls cost one cached isEnabledFor check; messages use %-style
+  arguments so nothing is formatted unless the record is emitted.
+- Sampling: with HOKM_LOG_DEBUG_EVERY=N only every Nth DEBUG record from
+  each call site is kept, so a debug trace on the card-play path stays
+  usable under load. INFO and above are never sampled.
+- Non-blocking output: records go to a bounded queue and a listener thread
+  does the formatting and the stdout write. When the queue is full records
+  are dropped and counted instead of stalling the loop.
+- HOKM_LOG_FORMAT=json writes one JSON object per line, including any
+  extra= fields, for log shippers. The default is a plain text line.
+"""
+
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+from typing import Any, Dict, Optional
+
+DEFAULT_LEVEL = 'INFO'
+DEFAULT_QUEUE_SIZE = 10000
+TEXT_FORMAT = '%(asctime)s [%(levelname)s] %(name)s: %(message)s'
+
+# LogRecord attributes; anything else on a record came from extra=
+_RECORD_FIELDS = frozenset(vars(logging.LogRecord('', 0, '', 0, '', (), None))) | {'message', 'asctime'}
+
+
+def parse_module_levels(spec: str) -> Dict[str, int]:
+    """'game_board=DEBUG,network=WARNING' -> {'game_board': 10, 'network': 30}"""
+    levels = {}
+    for item in (spec or '').split(','):
+        name, _, level = item.partition('=')
+        name, level = name.strip(), level.strip().upper()
+        if not name or not level:
+            continue
+        value = logging.getLevelName(level)
+        if not isinstance(value, int):
+            raise ValueError(f"Unknown log level {level!r} for {name}")
+        levels[name] = value
+    return levels
+
+
+class DebugSampler(logging.Filter):
+    """Keep the 1st, (N+1)th, ... DEBUG record of each call site"""
+
+    def __init__(self, every: int = 1):
+        super().__init__()
+        self.every = max(1, every)
+        self._counts: Dict[tuple, int] = {}
+        self.sampled_out = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if self.every == 1 or record.levelno > logging.DEBUG:
+            return True
+        site = (record.pathname, record.lineno)
+        count = self._counts.get(site, 0)
+        self._counts[site] = count + 1
+        if count % self.every == 0:
+            return True
+        self.sampled_out += 1
+        return False
+
+
+class JsonFormatter(logging.Formatter):
+    """One JSON object per record"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'ts': round(record.created, 6),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage()
+        }
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_FIELDS and not key.startswith('_'):
+                entry[key] = value
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry['exc'] = record.exc_text
+        return json.dumps(entry, default=str)
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """QueueHandler that never blocks: records that do not fit are counted and dropped"""
+
+    def __init__(self, log_queue: queue.Queue):
+        super().__init__(log_queue)
+        self.enqueued = 0
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # The listener thread formats; only resolve args that may not be thread-safe to share
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+            self.enqueued += 1
+        except queue.Full:
+            self.dropped += 1
+
+
+class LogPipeline:
+    """The installed queue handler, its listener thread and the sampler"""
+
+    def __init__(self, level: int, module_levels: Dict[str, int], debug_every: int,
+                 queue_size: int, fmt: str, stream):
+        self.level = level
+        self.module_levels = module_levels
+        self.previous_level = logging.WARNING   # Root level to restore on shutdown
+        self.queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self.sampler = DebugSampler(debug_every)
+        self.handler = DroppingQueueHandler(self.queue)
+        self.handler.addFilter(self.sampler)
+
+        output = logging.StreamHandler(stream)
+        output.setFormatter(JsonFormatter() if fmt == 'json' else logging.Formatter(TEXT_FORMAT))
+        self.output = output
+        self.listener = logging.handlers.QueueListener(self.queue, output, respect_handler_level=False)
+
+    def start(self):
+        self.listener.start()
+
+    def stop(self):
+        """Flush what is queued and stop the listener thread"""
+        if self.listener._thread is not None:
+            self.listener.stop()
+        self.output.flush()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            'level': logging.getLevelName(self.level),
+            'modules': {name: logging.getLevelName(level) for name, level in self.module_levels.items()},
+            'debug_every': self.sampler.every,
+            'queued': self.queue.qsize(),
+            'capacity': self.queue.maxsize,
+            'enqueued': self.handler.enqueued,
+            'dropped': self.handler.dropped,
+            'sampled_out': self.sampler.sampled_out
+        }
+
+
+_pipeline: Optional[LogPipeline] = None
+_lock = threading.Lock()
+
+
+def configure_logging(level: Optional[str] = None, modules: Optional[str] = None,
+                      debug_every: Optional[int] = None, queue_size: Optional[int] = None,
+                      fmt: Optional[str] = None, stream=None) -> LogPipeline:
+    """Install the queue pipeline on the root logger (arguments default to HOKM_LOG_* env vars)"""
+    global _pipeline
+    level = (level or os.getenv('HOKM_LOG_LEVEL', DEFAULT_LEVEL)).upper()
+    root_level = logging.getLevelName(level)
+    if not isinstance(root_level, int):
+        raise ValueError(f"Unknown log level {level!r}")
+    module_levels = parse_module_levels(modules if modules is not None else os.getenv('HOKM_LOG_MODULES', ''))
+    if debug_every is None:
+        debug_every = int(os.getenv('HOKM_LOG_DEBUG_EVERY', '1'))
+    if queue_size is None:
+        queue_size = int(os.getenv('HOKM_LOG_QUEUE', str(DEFAULT_QUEUE_SIZE)))
+    fmt = (fmt or os.getenv('HOKM_LOG_FORMAT', 'text')).lower()
+
+    with _lock:
+        if _pipeline is not None:
+            _uninstall(_pipeline)
+        pipeline = LogPipeline(root_level, module_levels, debug_every, queue_size, fmt, stream or sys.stdout)
+        root = logging.getLogger()
+        # Replace direct stream handlers (e.g. from basicConfig) so nothing writes on the loop
+        for handler in list(root.handlers):
+            if type(handler) is logging.StreamHandler:
+                root.removeHandler(handler)
+        root.addHandler(pipeline.handler)
+        pipeline.previous_level = root.level
+        root.setLevel(root_level)
+        for name, module_level in module_levels.items():
+            logging.getLogger(name).setLevel(module_level)
+        pipeline.start()
+        _pipeline = pipeline
+    return pipeline
+
+
+def _uninstall(pipeline: LogPipeline):
+    root = logging.getLogger()
+    root.removeHandler(pipeline.handler)
+    root.setLevel(pipeline.previous_level)
+    for name in pipeline.module_levels:
+        logging.getLogger(name).setLevel(logging.NOTSET)
+    pipeline.stop()
+
+
+def shutdown_logging():
+    """Flush and remove the pipeline (server shutdown, tests)"""
+    global _pipeline
+    with _lock:
+        if _pipeline is not None:
+            _uninstall(_pipeline)
+            _pipeline = None
+
+
+def get_metrics() -> Dict[str, Any]:
+    if _pipeline is None:
+        return {'configured': False}
+    return dict(_pipeline.get_metrics(), configured=True)
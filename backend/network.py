@@ -5,7 +5,8 @@ import websockets
 import time
 import sys
 import os
-from typing import Optional, Dict, Any
+import logging
+from typing import Optional, Dict, Any, List
 try:
     from websockets.legacy.server import WebSocketServerProtocol
 except ImportError:
@@ -18,29 +19,82 @@ except ImportError:
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from redis_manager import RedisManager
+from io_executor import IOExecutor
+from broadcast_fanout import BroadcastFanout
+from outbound_queue import OFFER_CONFLATED, OFFER_QUEUED, OutboundQueues
+from resume_tokens import ResumeClaims, ResumeTokenSigner
+from wire_protocol import DECODE_ERRORS, decode, encode_for
+
+log = logging.getLogger('network')
+
+
+def _log_session_update(task):
+    if not task.cancelled() and task.exception() is not None:
+        log.debug("Background session update after reconnect failed: %s", task.exception())
 
 class NetworkManager:
     _instance = None
     
     def __new__(cls):
-        if cls._instance is None:
-            cls._instance = super(NetworkManager, cls).__new__(cls)
-            cls._instance.initialized = False
-        return cls._instance
+        # One manager per process, shared with subclasses (DeltaNetworkManager): the class
+        # created first is what every later NetworkManager() returns
+        instance = NetworkManager._instance
+        if instance is None:
+            instance = super(NetworkManager, cls).__new__(cls)
+            instance.initialized = False
+            NetworkManager._instance = instance
+        elif not isinstance(instance, cls):
+            raise RuntimeError(f"{type(instance).__name__} already created, cannot create a {cls.__name__}")
+        return instance
     
     def __init__(self):
         if not self.initialized:
             # Initialize Redis connection
             self.redis_manager = RedisManager()
+            self.io_executor = IOExecutor()
+            # Registered connections send through a bounded queue and writer task (0 disables it)
+            outbound_capacity = int(os.getenv('HOKM_OUTBOUND_QUEUE', '64'))
+            self.outbound = OutboundQueues(
+                capacity=outbound_capacity,
+                slow_after=float(os.getenv('HOKM_SLOW_CONSUMER_AFTER', '5.0')),
+                on_slow=self.evict_slow_consumer
+            ) if outbound_capacity > 0 else None
+            self.fanout = BroadcastFanout(float(os.getenv('HOKM_SEND_TIMEOUT', '2.0')), outbound=self.outbound)
             
             # Store only live WebSocket connections
             self.live_connections = {}  # Maps player_id -> websocket
             self.connection_metadata = {}  # Maps websocket -> {player_id, room_code}
+            self.room_connections = {}  # Maps room_code -> {websocket: None} (insertion ordered)
+            self.journal_ids = {}  # Maps room_code -> (ms, seq) of the last journal event id issued
+            # Signed tokens that let a reconnect skip the Redis session checks (resume_tokens.py)
+            self.resume_tokens = ResumeTokenSigner.from_env()
+            self.reconnect_stats = {'fast': 0, 'slow': 0}
             
             self.initialized = True
             
+    def next_event_id(self, room_code: str) -> str:
+        """
+        Next journal stream ID for a room ("<ms>-<seq>").
+
+        IDs are issued here rather than by Redis so they can be sent to clients
+        with the broadcast itself; they strictly increase per room even if the
+        clock stalls or steps back.
+        """
+        now_ms = int(time.time() * 1000)
+        last_ms, last_seq = self.journal_ids.get(room_code, (0, -1))
+        if now_ms > last_ms:
+            event = (now_ms, 0)
+        else:
+            event = (last_ms, last_seq + 1)
+        self.journal_ids[room_code] = event
+        return f"{event[0]}-{event[1]}"
+
     def register_connection(self, websocket, player_id: str, room_code: str, username: str = None):
         """Register a new live WebSocket connection"""
+        # Re-registering a socket (e.g. join after reconnect) must not leave stale index entries
+        if websocket in self.connection_metadata:
+            self._unindex_connection(websocket)
+        
         self.live_connections[player_id] = websocket
         self.connection_metadata[websocket] = {
             'player_id': player_id,
@@ -48,19 +102,87 @@ class NetworkManager:
             'username': username,
             'connected_at': int(time.time())
         }
+        self.room_connections.setdefault(room_code, {})[websocket] = None
+        if self.outbound is not None:
+            self.outbound.open(websocket)
         
     def remove_connection(self, websocket):
         """Remove a WebSocket connection"""
+        if self.outbound is not None:
+            self.outbound.close(websocket)
+        self._unindex_connection(websocket)
+
+    def _unindex_connection(self, websocket):
         if websocket in self.connection_metadata:
-            player_id = self.connection_metadata[websocket]['player_id']
-            if player_id in self.live_connections:
+            metadata = self.connection_metadata.pop(websocket)
+            player_id = metadata['player_id']
+            # Only drop the player mapping if it still points at this socket (not a newer reconnect)
+            if self.live_connections.get(player_id) is websocket:
                 del self.live_connections[player_id]
-            del self.connection_metadata[websocket]
             
+            room_sockets = self.room_connections.get(metadata['room_code'])
+            if room_sockets is not None:
+                room_sockets.pop(websocket, None)
+                if not room_sockets:
+                    del self.room_connections[metadata['room_code']]
+            
+    def evict_slow_consumer(self, websocket):
+        """Drop a connection whose outbound queue fell behind; it goes through the normal reconnect path"""
+        metadata = self.connection_metadata.get(websocket, {})
+        log.warning("Evicting slow consumer %s in room %s", metadata.get('username'), metadata.get('room_code'))
+        # The peer is not reading, so a close handshake would only wait; the receive loop
+        # ends and handle_connection_closed marks the player disconnected
+        transport = getattr(websocket, 'transport', None)
+        if transport is not None:
+            transport.abort()
+        else:
+            asyncio.ensure_future(websocket.close(1008, "slow consumer"))
+
+    def resume_position(self, room_code: str, player_id: str):
+        """(sequence, epoch) of the player's state stream to put in a resume token"""
+        return 0, None
+
+    def issue_resume_token(self, player_id: str, username: str, room_code: str) -> str:
+        sequence, epoch = self.resume_position(room_code, player_id)
+        return self.resume_tokens.issue(player_id, username, room_code, sequence, epoch)
+
     def get_live_connection(self, player_id: str):
         """Get a player's live WebSocket connection if it exists"""
         return self.live_connections.get(player_id)
     
+    def get_room_connections(self, room_code: str):
+        """Get (websocket, metadata) pairs for a room in join order (snapshot, safe across awaits)"""
+        room_sockets = self.room_connections.get(room_code)
+        if not room_sockets:
+            return []
+        return [(ws, self.connection_metadata[ws]) for ws in room_sockets]
+    
+    def count_room_connections(self, room_code: str) -> int:
+        """Number of live connections in a room"""
+        return len(self.room_connections.get(room_code, ()))
+    
+    def is_player_connected(self, player_id: str, room_code: str = None) -> bool:
+        """Check whether a player has a live connection (optionally in a specific room)"""
+        ws = self.live_connections.get(player_id)
+        if ws is None:
+            return False
+        return room_code is None or self.connection_metadata.get(ws, {}).get('room_code') == room_code
+    
+    async def redis_call(self, redis_manager, func, *args, timeout: float = 2.0):
+        """
+        Call a Redis manager method without blocking the event loop.
+
+        Async managers (``is_async = True``) are awaited directly on the loop;
+        synchronous ones run on the shared IOExecutor. Both raise
+        asyncio.TimeoutError when the timeout expires.
+        """
+        if getattr(redis_manager, 'is_async', False):
+            return await asyncio.wait_for(func(*args), timeout=timeout)
+        if self.io_executor.closed:
+            # The shared pool was reset (restart); pick up its replacement
+            self.io_executor = IOExecutor()
+        return await self.io_executor.run(func, *args, timeout=timeout)
+
     @staticmethod
     async def send_message(websocket, message_type: str, data: Optional[Dict[str, Any]] = None) -> bool:
         """Send a message to a websocket with proper error handling"""
@@ -68,57 +190,70 @@ class NetworkManager:
             message = {"type": message_type}
             if data:
                 message.update(data)
-            await websocket.send(json.dumps(message))
+            # JSON text, or a binary frame if the connection negotiated it
+            frame = encode_for(websocket, message)
+        except Exception as e:
+            log.error("Failed to send message: %s", e)
+            return False
+        return await NetworkManager.send_frame(websocket, message_type, frame)
+
+    @staticmethod
+    async def send_frame(websocket, message_type: str, frame) -> bool:
+        """Send a frame already encoded for this connection (encode_for)"""
+        try:
+            # Registered connections are written by their outbound queue's task
+            outbound = getattr(NetworkManager._instance, 'outbound', None)
+            offered = outbound.offer(websocket, message_type, frame) if outbound is not None else None
+            if offered is not None:
+                return offered in (OFFER_QUEUED, OFFER_CONFLATED)
+            await websocket.send(frame)
             return True
         except websockets.ConnectionClosed:
-            print("[ERROR] Connection closed while sending message")
+            log.error("Connection closed while sending message")
             return False
         except Exception as e:
-            print(f"[ERROR] Failed to send message: {str(e)}")
+            log.error("Failed to send message: %s", e)
             return False
             
-    async def broadcast_to_room(self, room_code: str, msg_type: str, data: Dict[str, Any], redis_manager: RedisManager):
+    async def broadcast_to_room(self, room_code: str, msg_type: str, data: Dict[str, Any], redis_manager: RedisManager,
+                                players: Optional[List[Dict[str, Any]]] = None):
         """
         Broadcast a message to all live connections in a room.
-        Room membership is checked from Redis but messages are sent only to live connections.
+        Room membership is checked from Redis (or taken from ``players`` when the caller
+        already holds an authoritative roster) but messages are sent only to live connections.
         """
         try:
             # Get all players in room from Redis with timeout protection
             try:
-                import concurrent.futures
-                executor = concurrent.futures.ThreadPoolExecutor()
-                loop = asyncio.get_event_loop()
-                players = await asyncio.wait_for(
-                    loop.run_in_executor(executor, redis_manager.get_room_players, room_code),
-                    timeout=2.0
-                )
-                print(f"[DEBUG] Got {len(players)} players from Redis for broadcast")
+                if players is None:
+                    players = await self.redis_call(redis_manager, redis_manager.get_room_players, room_code)
+                    log.debug("Got %s players from Redis for broadcast", len(players))
             except asyncio.TimeoutError:
-                print(f"[DEBUG] Redis timeout getting room players for broadcast, using network connections")
+                log.debug("Redis timeout getting room players for broadcast, using network connections")
                 # Fallback: use network manager connections
                 players = []
-                for ws, metadata in self.connection_metadata.items():
-                    if metadata.get('room_code') == room_code:
-                        players.append({
-                            'player_id': metadata.get('player_id'),
-                            'username': f"Player{len(players)+1}",  # Fallback name
-                            'player_number': len(players) + 1
-                        })
+                for ws, metadata in self.get_room_connections(room_code):
+                    players.append({
+                        'player_id': metadata.get('player_id'),
+                        'username': f"Player{len(players)+1}",  # Fallback name
+                        'player_number': len(players) + 1
+                    })
             except Exception as e:
-                print(f"[DEBUG] Error getting room players: {e}, using network connections fallback")
+                log.debug("Error getting room players: %s, using network connections fallback", e)
                 # Fallback: use network manager connections
                 players = []
-                for ws, metadata in self.connection_metadata.items():
-                    if metadata.get('room_code') == room_code:
-                        players.append({
-                            'player_id': metadata.get('player_id'),
-                            'username': f"Player{len(players)+1}",  # Fallback name
-                            'player_number': len(players) + 1
-                        })
+                for ws, metadata in self.get_room_connections(room_code):
+                    players.append({
+                        'player_id': metadata.get('player_id'),
+                        'username': f"Player{len(players)+1}",  # Fallback name
+                        'player_number': len(players) + 1
+                    })
             
-            print(f"[DEBUG] Broadcasting {msg_type} to {len(players)} players in room {room_code}")
+            log.debug("Broadcasting %s to %s players in room %s", msg_type, len(players), room_code)
             
-            # Send message only to players with live connections
+            # Send message only to players with live connections; the shared body is
+            # encoded once and only 'you'/'player_number' differ per recipient
+            recipients = []
             for player in players:
                 player_id = player.get('player_id')
                 if not player_id:
@@ -127,67 +262,70 @@ class NetworkManager:
                 # Get live connection for player if it exists
                 ws = self.get_live_connection(player_id)
                 if ws:
-                    try:
-                        # Customize message for player if needed
-                        player_data = data.copy()
-                        player_data.update({
-                            'you': player.get('username'),
-                            'player_number': player.get('player_number', 0)
-                        })
-                        
-                        success = await self.send_message(ws, msg_type, player_data)
-                        if success:
-                            print(f"[DEBUG] Successfully sent {msg_type} to {player.get('username')}")
-                        else:
-                            print(f"[WARNING] Failed to send message to {player.get('username')}")
-                            # Remove failed connection
-                            self.remove_connection(ws)
-                    except Exception as e:
-                        print(f"[ERROR] Failed to send message to player {player.get('username')}: {str(e)}")
-                        # Remove failed connection
-                        self.remove_connection(ws)
+                    recipients.append((ws, {
+                        'you': player.get('username'),
+                        'player_number': player.get('player_number', 0)
+                    }))
                 else:
-                    print(f"[INFO] Player {player.get('username')} has no live connection")
+                    log.info("Player %s has no live connection", player.get('username'))
+
+            event_id = self.next_event_id(room_code)
+            outcome = await self.fanout.broadcast(msg_type, dict(data, event_id=event_id), recipients)
+            for ws in outcome['failed']:
+                log.warning("Failed to send %s to %s", msg_type, self.connection_metadata.get(ws, {}).get('username'))
+                # Remove failed connection
+                self.remove_connection(ws)
+            for ws in outcome['timed_out']:
+                log.warning("Timed out sending %s to %s", msg_type, self.connection_metadata.get(ws, {}).get('username'))
+            for ws in outcome['dropped']:
+                log.warning("Outbound queue full, dropped %s for %s", msg_type, self.connection_metadata.get(ws, {}).get('username'))
                     
-            # Always persist broadcast in Redis for state recovery (with timeout)
+            # Always append the broadcast to the room journal so reconnecting clients can catch up
             try:
-                broadcast_key = f"broadcast:{room_code}:{int(time.time())}"
-                await asyncio.wait_for(
-                    loop.run_in_executor(executor, redis_manager.redis.set,
-                        broadcast_key,
-                        json.dumps({
-                            'type': msg_type,
-                            'data': data,
-                            'timestamp': time.time()
-                        }),
-                        3600  # Expire after 1 hour
-                    ),
+                await self.redis_call(
+                    redis_manager,
+                    redis_manager.append_room_event,
+                    room_code,
+                    event_id,
+                    msg_type,
+                    data,
                     timeout=1.0
                 )
             except asyncio.TimeoutError:
-                print(f"[DEBUG] Redis timeout when saving broadcast, continuing anyway")
+                log.debug("Redis timeout when saving broadcast, continuing anyway")
             except Exception as e:
-                print(f"[DEBUG] Could not save broadcast to Redis: {e}, continuing anyway")
+                log.debug("Could not save broadcast to Redis: %s, continuing anyway", e)
                     
         except Exception as e:
-            print(f"[ERROR] Failed to broadcast to room {room_code}: {str(e)}")
+            log.error("Failed to broadcast to room %s: %s", room_code, e)
             import traceback
             traceback.print_exc()
             
         # Log broadcast for debugging
-        print(f"[DEBUG] Broadcast {msg_type} to room {room_code}")
-        print(f"[DEBUG] Active connections: {len(self.live_connections)}")
+        log.debug("Broadcast %s to room %s", msg_type, room_code)
+        log.debug("Active connections: %s", len(self.live_connections))
             
     async def broadcast_game_state(self, room_code: str, game_state: Dict[str, Any], redis_manager: RedisManager):
         """Broadcast current game state to all live connections, persisting in Redis"""
         try:
             # 1. Save complete state to Redis first
-            redis_manager.save_game_state(room_code, game_state)
+            await self.redis_call(redis_manager, redis_manager.save_game_state, room_code, game_state)
             
             # 2. Send state updates to live connections
-            players = redis_manager.get_room_players(room_code)
+            players = await self.redis_call(redis_manager, redis_manager.get_room_players, room_code)
             teams = json.loads(game_state.get('teams', '{}'))
             
+            # Fields shared by every player are encoded once
+            shared_state = {
+                'phase': game_state.get('game_phase', 'unknown'),
+                'hakem': game_state.get('hakem'),
+                'hokm': game_state.get('hokm'),
+                'current_turn': game_state.get('current_turn'),
+                'tricks': json.loads(game_state.get('tricks', '{}')),
+                'room_code': room_code,
+                'teams': teams
+            }
+            recipients = []
             for player in players:
                 player_id = player.get('player_id')
                 if not player_id:
@@ -203,33 +341,28 @@ class NetworkManager:
                     continue
                     
                 # Customize state for each player
-                player_state = {
-                    'type': 'game_state',
-                    'phase': game_state.get('game_phase', 'unknown'),
+                recipients.append((ws, {
                     'you': username,
                     'hand': json.loads(game_state.get(f'hand_{username}', '[]')),
-                    'your_team': "1" if username in teams.get('1', []) else "2",
-                    'hakem': game_state.get('hakem'),
-                    'hokm': game_state.get('hokm'),
-                    'current_turn': game_state.get('current_turn'),
-                    'tricks': json.loads(game_state.get('tricks', '{}')),
-                    'room_code': room_code,
-                    'teams': teams
-                }
+                    'your_team': "1" if username in teams.get('1', []) else "2"
+                }))
                 
-                await self.send_message(ws, 'game_state', player_state)
+            await self.fanout.broadcast('game_state', shared_state, recipients)
                 
             # Log successful broadcast
-            print(f"[LOG] Game state broadcast to {len(self.live_connections)} live connection(s) in room {room_code}")
+            log.info("Game state broadcast to %s live connection(s) in room %s", len(self.live_connections), room_code)
             
         except Exception as e:
-            print(f"[ERROR] Failed to broadcast game state to room {room_code}: {str(e)}")
+            log.error("Failed to broadcast game state to room %s: %s", room_code, e)
             # Log error details for debugging
-            print(f"[DEBUG] Game state: {game_state}")
+            log.debug("Game state: %s", game_state)
             
     @staticmethod
     async def notify_error(websocket, message: str):
         """Send an error message to a websocket"""
+        if websocket is None:
+            # Server-initiated actions (e.g. auto-play) have no requesting socket
+            return
         await NetworkManager.send_message(
             websocket,
             'error',
@@ -260,7 +393,7 @@ class NetworkManager:
                 'player_number': player_data.get('player_number', 0),
                 'connection_status': 'active'
             }
-            redis_manager.save_player_session(player_id, session_data)
+            await self.redis_call(redis_manager, redis_manager.save_player_session, player_id, session_data)
             
             # 2. Register live connection
             self.register_connection(websocket, player_id, room_code, username)
@@ -271,10 +404,10 @@ class NetworkManager:
                 'joined_at': str(int(time.time())),
                 'connection_status': 'active'
             }
-            redis_manager.add_player_to_room(room_code, room_data)
+            await self.redis_call(redis_manager, redis_manager.add_player_to_room, room_code, room_data)
             
             # 4. Get existing game state if available
-            game_state = redis_manager.get_game_state(room_code)
+            game_state = await self.redis_call(redis_manager, redis_manager.get_game_state, room_code)
             join_response = {
                 'username': username,
                 'player_id': player_id,
@@ -288,12 +421,12 @@ class NetworkManager:
             # 5. Send join confirmation
             await self.send_message(websocket, 'join_success', join_response)
             
-            print(f"[LOG] Player {username} connected to room {room_code}")
-            print(f"[DEBUG] Active connections: {len(self.live_connections)}")
+            log.info("Player %s connected to room %s", username, room_code)
+            log.debug("Active connections: %s", len(self.live_connections))
             return True
             
         except Exception as e:
-            print(f"[ERROR] Failed to handle player connection: {str(e)}")
+            log.error("Failed to handle player connection: %s", e)
             await self.notify_error(websocket, "Failed to join room")
             return False
 
@@ -302,27 +435,27 @@ class NetworkManager:
         try:
             # 1. Get player data from connection metadata
             if websocket not in self.connection_metadata:
-                print("[ERROR] No metadata found for disconnected websocket")
+                log.error("No metadata found for disconnected websocket")
                 return False
                 
             metadata = self.connection_metadata[websocket]
             player_id = metadata['player_id']
             
-            print(f"[DEBUG] Starting disconnect handling for player_id: {player_id[:8]}... in room: {room_code}")
+            log.debug("Starting disconnect handling for player_id: %s... in room: %s", player_id[:8], room_code)
             
             # 2. Get player info from Redis
-            session = redis_manager.get_player_session(player_id)
+            session = await self.redis_call(redis_manager, redis_manager.get_player_session, player_id)
             if not session:
-                print(f"[ERROR] No session found for player {player_id}")
+                log.error("No session found for player %s", player_id)
                 self.remove_connection(websocket)
                 return False
                 
             username = session.get('username')
             
-            print(f"[DEBUG] Player {username} (ID: {player_id[:8]}...) disconnecting from room {room_code}")
+            log.debug("Player %s (ID: %s...) disconnecting from room %s", username, player_id[:8], room_code)
             
             # DEBUG: Check room state before making any changes
-            print(f"[DEBUG] Before disconnect processing:")
+            log.debug("Before disconnect processing:")
             # Skip debug_room_state since it doesn't exist in ResilientRedisManager
             # redis_manager.debug_room_state(room_code)
             
@@ -334,13 +467,13 @@ class NetworkManager:
                 # Keep session alive for reconnection
                 'expires_at': str(int(time.time()) + 3600)
             }
-            redis_manager.save_player_session(player_id, disconnect_data)
+            await self.redis_call(redis_manager, redis_manager.save_player_session, player_id, disconnect_data)
             
             # 4. Update room player data to mark as disconnected
-            room_players = redis_manager.get_room_players(room_code)
-            print(f"[DEBUG] Room {room_code} currently has {len(room_players)} players:")
+            room_players = await self.redis_call(redis_manager, redis_manager.get_room_players, room_code)
+            log.debug("Room %s currently has %s players:", room_code, len(room_players))
             for i, player in enumerate(room_players):
-                print(f"[DEBUG]   Player {i+1}: {player.get('username', 'NO_NAME')} (ID: {player.get('player_id', 'NO_ID')[:8]}...) - Status: {player.get('connection_status', 'NO_STATUS')}")
+                log.debug("Player %s: %s (ID: %s...) - Status: %s", i+1, player.get('username', 'NO_NAME'), player.get('player_id', 'NO_ID')[:8], player.get('connection_status', 'NO_STATUS'))
             
             player_found = False
             for i, player in enumerate(room_players):
@@ -348,30 +481,23 @@ class NetworkManager:
                     room_players[i]['connection_status'] = 'disconnected'
                     room_players[i]['disconnected_at'] = str(int(time.time()))
                     # Update the room player list
-                    update_result = redis_manager.update_player_in_room(room_code, player_id, room_players[i])
-                    print(f"[DEBUG] Updated player {username} status to disconnected. Update result: {update_result}")
+                    update_result = await self.redis_call(redis_manager, redis_manager.update_player_in_room, room_code, player_id, room_players[i])
+                    log.debug("Updated player %s status to disconnected. Update result: %s", username, update_result)
                     player_found = True
                     break
             
             if not player_found:
-                print(f"[ERROR] Player {player_id[:8]}... not found in room {room_code} players list!")
+                log.error("Player %s... not found in room %s players list!", player_id[:8], room_code)
                 
             # 5. Remove live connection
             self.remove_connection(websocket)
             
-            # 6. Save game state if in active game
-            game_state = redis_manager.get_game_state(room_code)
-            if game_state:
-                game_state['last_activity'] = str(int(time.time()))
-                redis_manager.save_game_state(room_code, game_state)
-                print(f"[DEBUG] Updated game state for room {room_code}")
-            else:
-                print(f"[DEBUG] No game state found for room {room_code}")
+            # The game's last_activity is touched by the server's write-behind persister; a
+            # read-modify-write of the whole state here could overwrite a newer delta write
+            log.info("Player %s disconnected from room %s", username, room_code)
+            log.debug("Remaining connections: %s", len(self.live_connections))
             
-            print(f"[LOG] Player {username} disconnected from room {room_code}")
-            print(f"[DEBUG] Remaining connections: {len(self.live_connections)}")
-            
-            # 7. Notify other players with remaining connection count
+            # 6. Notify other players with remaining connection count
             await self.broadcast_to_room(
                 room_code,
                 'player_disconnected',
@@ -383,74 +509,75 @@ class NetworkManager:
                 redis_manager
             )
             
-            # 8. Final verification - check if player is still in room
-            updated_room_players = redis_manager.get_room_players(room_code)
-            print(f"[DEBUG] After disconnect handling, room {room_code} has {len(updated_room_players)} players:")
+            # 7. Final verification - check if player is still in room
+            updated_room_players = await self.redis_call(redis_manager, redis_manager.get_room_players, room_code)
+            log.debug("After disconnect handling, room %s has %s players:", room_code, len(updated_room_players))
             for i, player in enumerate(updated_room_players):
-                print(f"[DEBUG]   Player {i+1}: {player.get('username', 'NO_NAME')} (ID: {player.get('player_id', 'NO_ID')[:8]}...) - Status: {player.get('connection_status', 'NO_STATUS')}")
+                log.debug("Player %s: %s (ID: %s...) - Status: %s", i+1, player.get('username', 'NO_NAME'), player.get('player_id', 'NO_ID')[:8], player.get('connection_status', 'NO_STATUS'))
             
             return True
         except Exception as e:
-            print(f"[ERROR] Failed to handle player disconnection: {str(e)}")
+            log.error("Failed to handle player disconnection: %s", e)
             # Clean up connection anyway
             self.remove_connection(websocket)
             return False
-    async def handle_player_reconnected(self, websocket, player_id: str, redis_manager: RedisManager):
-        """Handle player reconnection with state recovery"""
+    async def handle_player_reconnected(self, websocket, player_id: str, redis_manager: RedisManager,
+                                        include_state: bool = True):
+        """Handle player reconnection with state recovery (include_state=False: the caller resumes the state stream)"""
         try:
-            print(f"[DEBUG] Starting reconnection for {player_id[:8]}...")
+            log.debug("Starting reconnection for %s...", player_id[:8])
             
             # 1. Validate and get session
-            print(f"[DEBUG] Step 1: Validating session...")
-            is_valid, session = redis_manager.attempt_reconnect(player_id, {
+            log.debug("Step 1: Validating session...")
+            is_valid, session = await self.redis_call(redis_manager, redis_manager.attempt_reconnect, player_id, {
                 'reconnected_at': str(int(time.time())),
                 'connection_status': 'active'
             })
-            print(f"[DEBUG] Session validation result: {is_valid}")
+            log.debug("Session validation result: %s", is_valid)
             
             if not is_valid:
                 error_msg = session.get('error', 'Failed to reconnect')
-                print(f"[DEBUG] Reconnection failed for {player_id[:8]}...: {error_msg}")
+                log.debug("Reconnection failed for %s...: %s", player_id[:8], error_msg)
                 await self.notify_error(websocket, error_msg)
                 return False
                 
             room_code = session.get('room_code')
             username = session.get('username')
-            print(f"[DEBUG] Session data: room_code={room_code}, username={username}")
+            log.debug("Session data: room_code=%s, username=%s", room_code, username)
             
             if not room_code or not username:
-                print(f"[DEBUG] Invalid session data")
+                log.debug("Invalid session data")
                 await self.notify_error(websocket, "Invalid session data")
                 return False
             
             # Additional validation: Check if player is actually in the room and disconnected
-            print(f"[DEBUG] Step 2: Getting room players...")
-            room_players = redis_manager.get_room_players(room_code)
-            print(f"[DEBUG] Got {len(room_players)} players from room")
+            log.debug("Step 2: Getting room players...")
+            room_players = await self.redis_call(redis_manager, redis_manager.get_room_players, room_code)
+            log.debug("Got %s players from room", len(room_players))
             player_in_room = None
             
-            print(f"[DEBUG] Reconnection validation for player_id: {player_id}")
+            log.debug("Reconnection validation for player_id: %s", player_id)
             
             # Debug room state - skip since debug_room_state doesn't exist in ResilientRedisManager
             # redis_manager.debug_room_state(room_code)
             
-            print(f"[DEBUG] Room {room_code} has {len(room_players)} players:")
+            log.debug("Room %s has %s players:", room_code, len(room_players))
             for i, player in enumerate(room_players):
-                print(f"[DEBUG]   Player {i+1}: {player.get('player_id', 'NO_ID')[:8]}... ({player.get('username', 'NO_NAME')}) - {player.get('connection_status', 'NO_STATUS')}")
+                log.debug("Player %s: %s... (%s) - %s", i+1, player.get('player_id', 'NO_ID')[:8], player.get('username', 'NO_NAME'), player.get('connection_status', 'NO_STATUS'))
                 if player.get('player_id') == player_id:
                     player_in_room = player
                     break
             
             if not player_in_room:
-                print(f"[DEBUG] Player {player_id[:8]}... not found in room {room_code}")
+                log.debug("Player %s... not found in room %s", player_id[:8], room_code)
                 
                 # Check if room exists at all
-                if not redis_manager.room_exists(room_code):
+                if not await self.redis_call(redis_manager, redis_manager.room_exists, room_code):
                     await self.notify_error(websocket, "Game room no longer exists. The game may have ended or been cancelled.")
                     return False
                 
                 # Check if there's an active game but player is not in it
-                game_state = redis_manager.get_game_state(room_code)
+                game_state = await self.redis_call(redis_manager, redis_manager.get_game_state, room_code)
                 if game_state:
                     await self.notify_error(websocket, "Game is active but your player slot is no longer available. The game may have been restarted.")
                 else:
@@ -464,37 +591,37 @@ class NetworkManager:
                 await self.notify_error(websocket, "Player is already connected")
                 return False
             
-            print(f"[DEBUG] Player {username} reconnection allowed - live_connection: {live_connection is not None}, status: {player_in_room.get('connection_status')}")
+            log.debug("Player %s reconnection allowed - live_connection: %s, status: %s", username, live_connection is not None, player_in_room.get('connection_status'))
             
             # 2. Register new connection
-            print(f"[DEBUG] Step 3: Registering connection for {username}...")
+            log.debug("Step 3: Registering connection for %s...", username)
             self.register_connection(websocket, player_id, room_code, username)
-            print(f"[DEBUG] Connection registered successfully")
+            log.debug("Connection registered successfully")
             
             # 3. Get current game state
-            print(f"[DEBUG] Step 4: Getting game state for room {room_code}...")
+            log.debug("Step 4: Getting game state for room %s...", room_code)
             try:
-                print(f"[DEBUG] Step 4a: Calling get_game_state directly...")
-                game_state = redis_manager.get_game_state(room_code)
-                print(f"[DEBUG] Step 4b: Game state retrieval completed")
+                log.debug("Step 4a: Calling get_game_state directly...")
+                game_state = await self.redis_call(redis_manager, redis_manager.get_game_state, room_code)
+                log.debug("Step 4b: Game state retrieval completed")
                 
             except Exception as e:
-                print(f"[ERROR] Exception during game state retrieval: {e}")
-                print(f"[ERROR] Exception type: {type(e).__name__}")
+                log.error("Exception during game state retrieval: %s", e)
+                log.error("Exception type: %s", type(e).__name__)
                 import traceback
                 traceback.print_exc()
                 await self.notify_error(websocket, f"Reconnection failed: Game state error - {str(e)}")
                 return False
                 
-            print(f"[DEBUG] Game state retrieved: {bool(game_state)}")
+            log.debug("Game state retrieved: %s", bool(game_state))
             if game_state:
-                print(f"[DEBUG] Game state has {len(game_state)} keys: {list(game_state.keys())}")
+                log.debug("Game state has %s keys: %s", len(game_state), list(game_state.keys()))
             else:
-                print(f"[DEBUG] No game state found, using empty state")
+                log.debug("No game state found, using empty state")
                 game_state = {}
             
             # 4. Send reconnection success with full state
-            print(f"[DEBUG] Step 5: Preparing reconnection success message...")
+            log.debug("Step 5: Preparing reconnection success message...")
             
             # Handle JSON parsing safely - data might already be parsed from Redis
             teams_data = game_state.get('teams', '{}')
@@ -502,26 +629,27 @@ class NetworkManager:
                 teams = json.loads(teams_data)
             else:
                 teams = teams_data
-            print(f"[DEBUG] Teams data processed: {teams}")
+            log.debug("Teams data processed: %s", teams)
                 
             hand_data = game_state.get(f'hand_{username}', '[]')
             if isinstance(hand_data, str):
                 hand = json.loads(hand_data)
             else:
                 hand = hand_data
-            print(f"[DEBUG] Reconnection: Player {username} hand has {len(hand)} cards from Redis")
+            log.debug("Reconnection: Player %s hand has %s cards from Redis", username, len(hand))
                 
             tricks_data = game_state.get('tricks', '{}')
             if isinstance(tricks_data, str):
                 tricks = json.loads(tricks_data)
             else:
                 tricks = tricks_data
-            print(f"[DEBUG] Tricks data processed: {bool(tricks)}")
+            log.debug("Tricks data processed: %s", bool(tricks))
                 
             restored_state = {
                 'username': username,
                 'room_code': room_code,
                 'player_id': player_id,
+                'resume_token': self.issue_resume_token(player_id, username, room_code),
                 'game_state': {
                     'phase': game_state.get('phase', game_state.get('game_phase', 'waiting')),  # Try both 'phase' and 'game_phase'
                     'teams': teams,
@@ -535,56 +663,35 @@ class NetworkManager:
                 }
             }
             
-            print(f"[DEBUG] Step 6: Sending reconnect_success to {username}...")
+            if not include_state:
+                restored_state.pop('game_state')
+            
+            log.debug("Step 6: Sending reconnect_success to %s...", username)
             try:
                 success = await self.send_message(websocket, 'reconnect_success', restored_state)
-                print(f"[DEBUG] Message send result: {success}")
+                log.debug("Message send result: %s", success)
                 if not success:
-                    print(f"[ERROR] Failed to send reconnect_success message")
+                    log.error("Failed to send reconnect_success message")
                     return False
             except Exception as e:
-                print(f"[ERROR] Exception while sending reconnect_success: {e}")
+                log.error("Exception while sending reconnect_success: %s", e)
                 return False
             
-            print(f"[LOG] Player {username} reconnected to room {room_code}")
-            print(f"[DEBUG] Active connections: {len(self.live_connections)}")
-            
-            # 7. Check if reconnected player is hakem and needs to choose hokm
-            current_phase = game_state.get('phase', game_state.get('game_phase', 'waiting'))
-            current_hakem = game_state.get('hakem')
-            current_hokm = game_state.get('hokm', '')
-            
-            if (current_phase == 'hokm_selection' and 
-                current_hakem == username and 
-                not current_hokm):
-                print(f"[LOG] Reconnected hakem {username} needs to choose hokm")
-                await self.send_message(websocket, 'hokm_request', {
-                    'message': 'You are the Hakem. Choose hokm (hearts, diamonds, clubs, spades).',
-                    'hand': hand
-                })
-            elif current_phase == 'gameplay':
-                # Player reconnected during gameplay - send current turn info
-                print(f"[LOG] Player {username} reconnected during gameplay")
-                current_turn = int(game_state.get('current_turn', 0))
-                players = json.loads(game_state.get('players', '[]')) if isinstance(game_state.get('players'), str) else game_state.get('players', [])
-                
-                if players and current_turn < len(players):
-                    current_player = players[current_turn]
-                    await self.send_message(websocket, 'turn_start', {
-                        'current_player': current_player,
-                        'your_turn': username == current_player,
-                        'hand': hand,
-                        'hokm': current_hokm,
-                        'message': f'Game in progress. {current_player}\'s turn.'
-                    })
-            elif current_phase in ['final_deal']:
-                # Player reconnected during final deal phase - send their full hand
-                print(f"[LOG] Player {username} reconnected during final deal")
-                await self.send_message(websocket, 'final_deal', {
-                    'hand': hand,
-                    'hokm': current_hokm,
-                    'message': f'Final deal completed. You have {len(hand)} cards.'
-                })
+            log.info("Player %s reconnected to room %s", username, room_code)
+            log.debug("Active connections: %s", len(self.live_connections))
+            
+            # 7. Prompt for whatever the player has to do next
+            players = game_state.get('players', [])
+            if isinstance(players, str):
+                players = json.loads(players)
+            await self.send_resume_prompt(websocket, username, {
+                'phase': game_state.get('phase', game_state.get('game_phase', 'waiting')),
+                'hakem': game_state.get('hakem'),
+                'hokm': game_state.get('hokm', ''),
+                'hand': hand,
+                'players': players,
+                'current_turn': int(game_state.get('current_turn', 0))
+            })
             
             # 6. Notify other players
             await self.broadcast_to_room(
@@ -597,33 +704,107 @@ class NetworkManager:
                 redis_manager
             )
             
+            self.reconnect_stats['slow'] += 1
             return True
             
         except Exception as e:
-            print(f"[ERROR] Exception in handle_player_reconnected for {player_id[:8]}...: {e}")
-            print(f"[ERROR] Exception type: {type(e).__name__}")
+            log.error("Exception in handle_player_reconnected for %s...: %s", player_id[:8], e)
+            log.error("Exception type: %s", type(e).__name__)
             import traceback
             traceback.print_exc()
             try:
                 await self.notify_error(websocket, f"Reconnection failed due to server error: {str(e)}")
             except:
-                print(f"[ERROR] Could not send error notification to client")
+                log.error("Could not send error notification to client")
             return False
             
         except Exception as e:
-            print(f"[ERROR] Failed to handle player reconnection: {str(e)}")
+            log.error("Failed to handle player reconnection: %s", e)
             await self.notify_error(websocket, "Failed to reconnect")
             return False
 
+    async def send_resume_prompt(self, websocket, username: str, view: Dict[str, Any]):
+        """After a reconnect, ask for the player's pending action (view as BaseGameBoard.player_view)"""
+        phase, hand, hokm = view.get('phase'), view.get('hand', []), view.get('hokm') or ''
+        if phase == 'hokm_selection' and view.get('hakem') == username and not hokm:
+            log.info("Reconnected hakem %s needs to choose hokm", username)
+            await self.send_message(websocket, 'hokm_request', {
+                'message': 'You are the Hakem. Choose hokm (hearts, diamonds, clubs, spades).',
+                'hand': hand
+            })
+        elif phase == 'gameplay':
+            # Player reconnected during gameplay - send current turn info
+            log.info("Player %s reconnected during gameplay", username)
+            players, current_turn = view.get('players') or [], view.get('current_turn', 0)
+            if current_turn < len(players):
+                current_player = players[current_turn]
+                await self.send_message(websocket, 'turn_start', {
+                    'current_player': current_player,
+                    'your_turn': username == current_player,
+                    'hand': hand,
+                    'hokm': hokm,
+                    'message': f'Game in progress. {current_player}\'s turn.'
+                })
+        elif phase == 'final_deal':
+            # Player reconnected during final deal phase - send their full hand
+            log.info("Player %s reconnected during final deal", username)
+            await self.send_message(websocket, 'final_deal', {
+                'hand': hand,
+                'hokm': hokm,
+                'message': f'Final deal completed. You have {len(hand)} cards.'
+            })
+
+    async def handle_token_reconnected(self, websocket, claims: ResumeClaims, player: Dict[str, Any],
+                                       view: Dict[str, Any], redis_manager: RedisManager,
+                                       include_state: bool = True, players: Optional[List[Dict[str, Any]]] = None) -> bool:
+        """
+        Reconnect fast path: the caller verified the resume token and found the
+        player's seat (roster entry) and cached view in memory, so answering
+        waits on nothing. The Redis session is marked active in the background.
+        """
+        player_id, username, room_code = claims.player_id, claims.username, claims.room_code
+        live_connection = self.get_live_connection(player_id)
+        if live_connection is not None and live_connection is not websocket and player.get('connection_status') == 'active':
+            await self.notify_error(websocket, "Player is already connected")
+            return False
+
+        self.register_connection(websocket, player_id, room_code, username)
+        restored_state = {
+            'username': username,
+            'room_code': room_code,
+            'player_id': player_id,
+            'resume_token': self.issue_resume_token(player_id, username, room_code)
+        }
+        if include_state:
+            restored_state['game_state'] = view
+        if not await self.send_message(websocket, 'reconnect_success', restored_state):
+            log.error("Failed to send reconnect_success message")
+            return False
+        self.reconnect_stats['fast'] += 1
+        log.info("Player %s reconnected to room %s (resume token)", username, room_code)
+
+        task = asyncio.ensure_future(self.redis_call(redis_manager, redis_manager.attempt_reconnect, player_id, {
+            'reconnected_at': str(int(time.time())),
+            'connection_status': 'active'
+        }))
+        task.add_done_callback(_log_session_update)
+
+        await self.send_resume_prompt(websocket, username, view)
+        await self.broadcast_to_room(room_code, 'player_reconnected', {
+            'username': username,
+            'active_players': len(self.live_connections)
+        }, redis_manager, players=players)
+        return True
+
     @staticmethod
     async def receive_message(websocket) -> Optional[Dict[str, Any]]:
-        """Receive and parse a JSON message from websocket"""
+        """Receive and parse a message (JSON text or binary frame) from websocket"""
         try:
             message = await websocket.recv()
-            return json.loads(message)
+            return decode(message)
         except websockets.ConnectionClosed:
-            print("[ERROR] Connection closed while receiving message")
+            log.error("Connection closed while receiving message")
             return None
-        except json.JSONDecodeError:
-            print("[ERROR] Invalid JSON received")
+        except DECODE_ERRORS:
+            log.error("Invalid message frame received")
             return None
@@ -7,17 +7,65 @@ This module extends the existing network manager with:
 2. Player-specific update optimization
 3. State reconciliation for reconnecting players
 4. Bandwidth usage monitoring
+
+The server runs on it with HOKM_STATE_SYNC=delta: every state change of a
+room goes out as one sequenced state_sync message per player (see
+game_state_delta.py), clients acknowledge with state_ack, and reconnecting or
+resyncing clients are sent only what they missed. Bytes and message counts
+are kept per room.
+
+Bursts of changes (the deal, a trick completing, a round ending) are
+coalesced: batch_updates() merges a room's changes last-writer-wins per
+field into one pending batch, and a single timer per room sends it as one
+sequence once no change arrived for HOKM_DELTA_BATCH_WINDOW seconds, or
+HOKM_DELTA_BATCH_MAX_LATENCY after the first one at the latest. Phase
+changes and batches of HOKM_DELTA_BATCH_MAX updates are sent at once.
+Hands stay per-player fields (hand_<name>) in the merged batch, so each
+player's view of it still carries only their own hand.
 """
 
 import asyncio
-import json
+import os
 import time
 import logging
-from typing import Dict, List, Optional, Any, Set
-from collections import defaultdict
+from typing import Dict, List, Optional, Any
 
 from network import NetworkManager
-from game_state_delta import GameStateDeltaManager, UpdateType, StateDelta
+from game_state_delta import (DEFAULT_KEYFRAME_INTERVAL, DEFAULT_MAX_HISTORY, GameStateDeltaManager,
+                              UpdateType, StateDelta)
+from wire_protocol import encode_for, uses_frame_compression
+
+DEFAULT_BATCH_WINDOW = 0.05        # Quiet time that ends a burst
+DEFAULT_BATCH_MAX_LATENCY = 0.2    # Longest a change may wait in a batch
+DEFAULT_BATCH_MAX_UPDATES = 16     # Updates merged before a batch is sent regardless
+PHASE_FIELDS = ('phase', 'game_phase')
+
+
+def _room_counters() -> Dict[str, int]:
+    return {
+        'deltas': 0, 'delta_bytes': 0,
+        'keyframes': 0, 'keyframe_bytes': 0,
+        'resumes': 0, 'resume_bytes': 0,
+        'bytes_sent': 0, 'bytes_saved': 0, 'compressed': 0,
+        'acks': 0, 'resyncs': 0, 'coalesced': 0
+    }
+
+
+class _PendingBatch:
+    """Changes waiting to be sent for one room"""
+
+    __slots__ = ('state', 'changes', 'affected_players', 'update_types', 'players',
+                 'count', 'first_at', 'last_at', 'timer')
+
+    def __init__(self):
+        self.state: Optional[Dict[str, Any]] = None   # Latest full state, if updates carried one
+        self.changes: Dict[str, Any] = {}             # Field changes since that state
+        self.affected_players: set = set()
+        self.update_types: set = set()
+        self.players: Optional[List[Dict[str, Any]]] = None
+        self.count = 0
+        self.first_at = self.last_at = time.monotonic()
+        self.timer: Optional[asyncio.Task] = None
 
 
 class DeltaNetworkManager(NetworkManager):
@@ -27,225 +75,223 @@ class DeltaNetworkManager(NetworkManager):
     
     def __init__(self):
         super().__init__()
+        if getattr(self, 'delta_initialized', False):
+            return   # Shared singleton, already set up
+        self.delta_initialized = True
         
-        # Delta management
-        self.delta_manager = GameStateDeltaManager()
-        
-        # Per-room state tracking
-        self.room_states: Dict[str, Dict[str, Any]] = {}  # room_code -> last_state
+        # Per-room delta streams (sequence numbers, history, acknowledgements)
+        self.keyframe_interval = int(os.getenv('HOKM_DELTA_KEYFRAME_EVERY', str(DEFAULT_KEYFRAME_INTERVAL)))
+        self.max_delta_history = int(os.getenv('HOKM_DELTA_HISTORY', str(DEFAULT_MAX_HISTORY)))
         self.room_delta_managers: Dict[str, GameStateDeltaManager] = {}
         
-        # Player tracking for reconciliation
-        self.player_last_updates: Dict[str, Dict[str, Any]] = {}  # player_id -> {sequence_id, timestamp}
-        
-        # Bandwidth monitoring
+        # Bandwidth monitoring, overall and per room
         self.bandwidth_stats = {
             'delta_updates_sent': 0,
             'full_syncs_sent': 0,
+            'resumes_sent': 0,
             'bytes_saved': 0,
             'total_bytes_sent': 0,
             'compression_saves': 0
         }
+        self.room_bandwidth: Dict[str, Dict[str, int]] = {}
         
-        # Update batching
-        self.pending_updates: Dict[str, List[Dict[str, Any]]] = defaultdict(list)  # room_code -> updates
-        self.batch_timers: Dict[str, Any] = {}  # room_code -> timer
-        self.batch_delay = 0.1  # 100ms batching delay
+        # Update coalescing: one pending batch (and at most one timer) per room
+        self.pending_updates: Dict[str, _PendingBatch] = {}
+        self.batch_delay = float(os.getenv('HOKM_DELTA_BATCH_WINDOW', str(DEFAULT_BATCH_WINDOW)))
+        self.batch_max_latency = float(os.getenv('HOKM_DELTA_BATCH_MAX_LATENCY', str(DEFAULT_BATCH_MAX_LATENCY)))
+        self.batch_max_updates = int(os.getenv('HOKM_DELTA_BATCH_MAX', str(DEFAULT_BATCH_MAX_UPDATES)))
+        self.send_locks: Dict[str, asyncio.Lock] = {}   # Keeps a room's sequences in order on the wire
+        self.batch_stats = {'submitted': 0, 'flushed': 0, 'by_timer': 0, 'by_phase': 0, 'by_size': 0}
         
-        # Setup logging
         self.logger = logging.getLogger(__name__)
-        self.logger.setLevel(logging.INFO)
     
     def get_room_delta_manager(self, room_code: str) -> GameStateDeltaManager:
         """Get or create delta manager for a room"""
         if room_code not in self.room_delta_managers:
-            self.room_delta_managers[room_code] = GameStateDeltaManager()
+            self.room_delta_managers[room_code] = GameStateDeltaManager(
+                keyframe_interval=self.keyframe_interval, max_history=self.max_delta_history
+            )
         return self.room_delta_managers[room_code]
     
+    def resume_position(self, room_code: str, player_id: str):
+        """The player's last acknowledged sequence and the stream's epoch"""
+        delta_manager = self.room_delta_managers.get(room_code)
+        if delta_manager is None:
+            return 0, None
+        return delta_manager.get_player_last_sequence(player_id), delta_manager.epoch
+
+    def get_room_bandwidth(self, room_code: str) -> Dict[str, int]:
+        """Running byte and message counters of a room's state stream"""
+        counters = self.room_bandwidth.get(room_code)
+        if counters is None:
+            counters = self.room_bandwidth[room_code] = _room_counters()
+        return counters
+    
     async def broadcast_game_state_delta(self, 
                                        room_code: str, 
                                        new_state: Dict[str, Any],
-                                       redis_manager,
+                                       redis_manager=None,
                                        update_type: Optional[UpdateType] = None,
                                        affected_players: Optional[List[str]] = None,
-                                       force_full_sync: bool = False) -> Dict[str, Any]:
+                                       force_full_sync: bool = False,
+                                       players: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
         """
         Broadcast game state using delta updates
         
         Args:
             room_code: Room to broadcast to
-            new_state: New game state
-            redis_manager: Redis manager for persistence
+            new_state: New game state (as from to_redis_dict)
+            redis_manager: If given, new_state is persisted first and players are read from it
             update_type: Type of update (optional, will be auto-detected)
             affected_players: Players affected by update
-            force_full_sync: Force full state sync instead of delta
+            force_full_sync: Send a keyframe instead of a delta
+            players: Room players ({'player_id', 'username'} dicts); defaults to live connections
             
         Returns:
             Statistics about the broadcast
         """
         try:
-            # Get previous state
-            old_state = self.room_states.get(room_code, {})
             delta_manager = self.get_room_delta_manager(room_code)
             
-            # Save new state
-            self.room_states[room_code] = new_state.copy()
-            
-            # Persist to Redis first
-            redis_manager.save_game_state(room_code, new_state)
-            
-            # Get room players
-            try:
-                players = redis_manager.get_room_players(room_code)
-            except Exception as e:
-                self.logger.error(f"Failed to get room players: {e}")
-                return {'error': 'Failed to get room players'}
-            
-            broadcast_stats = {
-                'room_code': room_code,
-                'total_players': len(players),
-                'delta_updates': 0,
-                'full_syncs': 0,
-                'bytes_sent': 0,
-                'compression_used': False,
-                'update_type': update_type.value if update_type else 'auto'
-            }
-            
-            # Determine if we should use delta or full sync
-            use_delta = not force_full_sync and old_state and len(old_state) > 0
+            if redis_manager is not None:
+                await self.redis_call(redis_manager, redis_manager.save_game_state, room_code, new_state)
+                if players is None:
+                    players = await self.redis_call(redis_manager, redis_manager.get_room_players, room_code)
             
-            if use_delta:
-                # Generate delta
-                delta = delta_manager.generate_delta(old_state, new_state, affected_players)
-                
-                # Only send delta if there are actual changes
-                if not delta.changes:
-                    self.logger.debug(f"No changes detected for room {room_code}, skipping broadcast")
-                    return broadcast_stats
-                
-                self.logger.info(f"Broadcasting delta update to room {room_code}: {delta.update_type.value}")
-                self.logger.debug(f"Delta changes: {list(delta.changes.keys())}")
-                
-                # Send optimized updates to each player
-                for player in players:
-                    player_id = player.get('player_id')
-                    username = player.get('username')
-                    
-                    if not player_id or not username:
-                        continue
-                    
-                    # Get live connection
-                    ws = self.get_live_connection(player_id)
-                    if not ws:
-                        continue
-                    
-                    try:
-                        # Create player-specific optimized update
-                        update_data = delta_manager.create_optimized_update(
-                            old_state, new_state, username, affected_players
-                        )
-                        
-                        # Add player context
-                        update_data.update({
-                            'room_code': room_code,
-                            'timestamp': time.time(),
-                            'your_username': username
-                        })
-                        
-                        # Send update
-                        await self._send_delta_update(ws, update_data)
-                        
-                        # Update player tracking
-                        self._update_player_tracking(player_id, delta.sequence_id, update_data)
-                        
-                        broadcast_stats['delta_updates'] += 1
-                        broadcast_stats['bytes_sent'] += len(json.dumps(update_data))
-                        
-                    except Exception as e:
-                        self.logger.error(f"Failed to send delta to player {username}: {e}")
-                        # Fallback: remove failed connection
-                        self.remove_connection(ws)
-                
-                self.bandwidth_stats['delta_updates_sent'] += broadcast_stats['delta_updates']
+            await self.flush_updates(room_code)   # Anything batched goes out first, in order
+            async with self._send_lock(room_code):
+                delta = delta_manager.advance(new_state, affected_players, update_type, keyframe=force_full_sync)
+                if delta is None:
+                    self.logger.debug("No changes detected for room %s, skipping broadcast", room_code)
+                    return {'room_code': room_code, 'sequence_id': delta_manager.sequence_counter,
+                            'sent': 0, 'bytes_sent': 0}
                 
-            else:
-                # Send full sync to all players
-                self.logger.info(f"Broadcasting full sync to room {room_code}")
-                
-                for player in players:
-                    player_id = player.get('player_id')
-                    username = player.get('username')
-                    
-                    if not player_id or not username:
-                        continue
-                    
-                    ws = self.get_live_connection(player_id)
-                    if not ws:
-                        continue
-                    
-                    try:
-                        # Create full sync for player
-                        sync_data = delta_manager.create_full_sync(new_state, username)
-                        sync_data.update({
-                            'room_code': room_code,
-                            'timestamp': time.time(),
-                            'your_username': username
-                        })
-                        
-                        # Send full sync
-                        await self.send_message(ws, 'full_sync', sync_data)
-                        
-                        # Update player tracking
-                        self._update_player_tracking(player_id, sync_data['sequence_id'], sync_data)
-                        
-                        broadcast_stats['full_syncs'] += 1
-                        broadcast_stats['bytes_sent'] += len(json.dumps(sync_data))
-                        
-                    except Exception as e:
-                        self.logger.error(f"Failed to send full sync to player {username}: {e}")
-                        self.remove_connection(ws)
-                
-                self.bandwidth_stats['full_syncs_sent'] += broadcast_stats['full_syncs']
-            
-            # Update total bandwidth stats
-            self.bandwidth_stats['total_bytes_sent'] += broadcast_stats['bytes_sent']
-            
-            # Clean up old history periodically
-            if len(self.room_delta_managers) > 0:
-                delta_manager.cleanup_old_history()
-            
-            return broadcast_stats
+                return await self.send_delta(room_code, delta, players)
             
         except Exception as e:
-            self.logger.error(f"Failed to broadcast game state delta: {e}")
+            self.logger.error("Failed to broadcast game state delta: %s", e)
             return {'error': str(e)}
     
-    async def _send_delta_update(self, websocket, update_data: Dict[str, Any]) -> bool:
-        """Send a delta update to a websocket"""
-        try:
-            # Check if data is compressed
-            is_compressed = update_data.get('compressed', False)
-            
-            if is_compressed:
-                # Send compressed data indicator first
-                await websocket.send(json.dumps({
-                    'type': 'compressed_delta',
-                    'compressed': True,
-                    'size': len(update_data['data'])
-                }))
-                
-                # Send compressed data
-                await websocket.send(update_data['data'])
-                self.bandwidth_stats['compression_saves'] += 1
-            else:
-                # Send regular delta update
-                await websocket.send(json.dumps(update_data))
+    async def send_delta(self, room_code: str, delta: StateDelta,
+                         players: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Send the room's latest delta to every live player, each seeing their own view"""
+        delta_manager = self.get_room_delta_manager(room_code)
+        if players is None:
+            players = [metadata for _, metadata in self.get_room_connections(room_code)]
+        
+        broadcast_stats = {
+            'room_code': room_code,
+            'sequence_id': delta.sequence_id,
+            'update_type': delta.update_type.value,
+            'keyframe': delta.keyframe,
+            'sent': 0,
+            'bytes_sent': 0
+        }
+        kind = 'keyframe' if delta.keyframe else 'delta'
+        
+        # Every player gets every sequence (possibly with no visible changes) so gaps mean loss
+        for player in players:
+            player_id = player.get('player_id')
+            username = player.get('username')
+            if not player_id or not username:
+                continue
             
-            return True
+            ws = self.get_live_connection(player_id)
+            if not ws:
+                continue
             
-        except Exception as e:
-            self.logger.error(f"Failed to send delta update: {e}")
+            size = await self._send_sync(ws, room_code, delta_manager.player_message(delta, username), kind)
+            if size:
+                broadcast_stats['sent'] += 1
+                broadcast_stats['bytes_sent'] += size
+        
+        # Clean up old history periodically
+        if delta.keyframe:
+            delta_manager.cleanup_old_history()
+        
+        return broadcast_stats
+    
+    async def _send_sync(self, websocket, room_code: str, body: Dict[str, Any], kind: str) -> int:
+        """Send one state_sync message; returns the bytes sent (0 on failure)"""
+        message = {'type': 'state_sync', 'room_code': room_code}
+        message.update(body)
+        encoded = frame = encode_for(websocket, message)
+        if uses_frame_compression(websocket):
+            frame = self.get_room_delta_manager(room_code).compress_frame(encoded, kind)
+        if not await self.send_frame(websocket, 'state_sync', frame):
+            return 0
+        
+        size = len(frame)
+        counters = self.get_room_bandwidth(room_code)
+        counters[kind + 's'] += 1
+        counters[kind + '_bytes'] += size
+        counters['bytes_sent'] += size
+        self.bandwidth_stats['total_bytes_sent'] += size
+        if frame is not encoded:
+            counters['compressed'] += 1
+            self.bandwidth_stats['compression_saves'] += 1
+        
+        if kind == 'delta':
+            self.bandwidth_stats['delta_updates_sent'] += 1
+            if counters['keyframes']:
+                # Versus sending this player a full view (average keyframe) every time
+                saved = max(0, counters['keyframe_bytes'] // counters['keyframes'] - size)
+                counters['bytes_saved'] += saved
+                self.bandwidth_stats['bytes_saved'] += saved
+        elif kind == 'keyframe':
+            self.bandwidth_stats['full_syncs_sent'] += 1
+        else:
+            self.bandwidth_stats['resumes_sent'] += 1
+        return size
+    
+    async def resume_player(self, websocket, room_code: str, player_id: str, username: str,
+                            last_sequence: Optional[int] = None, epoch: Optional[str] = None) -> bool:
+        """
+        Send a (re)connected player what they missed since last_sequence, or since
+        their last acknowledgement if the client did not say. False if the room
+        has no state stream.
+        """
+        await self.flush_updates(room_code)   # Resume from the latest state, not a pending batch
+        delta_manager = self.room_delta_managers.get(room_code)
+        if delta_manager is None:
             return False
+        
+        if last_sequence is None:
+            last_sequence = delta_manager.get_player_last_sequence(player_id)
+            epoch = delta_manager.epoch if last_sequence else None
+        else:
+            delta_manager.acknowledge(player_id, last_sequence, epoch)
+        
+        async with self._send_lock(room_code):
+            message = delta_manager.resume_message(username, last_sequence, epoch)
+            if message is not None:
+                await self._send_sync(websocket, room_code, message, 'resume')
+        if message is not None:
+            self.logger.info("Resumed %s in room %s from sequence %s to %s (%s)", username, room_code,
+                             last_sequence, message['seq'], 'keyframe' if message['keyframe'] else 'delta')
+        return True
+    
+    def acknowledge(self, websocket, sequence_id: int, epoch: Optional[str] = None) -> bool:
+        """Record a client's state_ack for the room its connection is in"""
+        metadata = self.connection_metadata.get(websocket)
+        if not metadata:
+            return False
+        delta_manager = self.room_delta_managers.get(metadata['room_code'])
+        if delta_manager is None:
+            return False
+        self.get_room_bandwidth(metadata['room_code'])['acks'] += 1
+        return delta_manager.acknowledge(metadata['player_id'], sequence_id, epoch)
+    
+    async def resync_player(self, websocket, last_sequence: int, epoch: Optional[str] = None) -> bool:
+        """Handle a client's state_resync (it found a gap or a new epoch)"""
+        metadata = self.connection_metadata.get(websocket)
+        if not metadata:
+            return False
+        room_code = metadata['room_code']
+        if room_code in self.room_delta_managers:
+            self.get_room_bandwidth(room_code)['resyncs'] += 1
+        return await self.resume_player(websocket, room_code, metadata['player_id'], metadata['username'],
+                                        last_sequence, epoch)
     
     async def handle_player_reconnection_with_reconciliation(self, 
                                                            websocket, 
@@ -256,51 +302,21 @@ class DeltaNetworkManager(NetworkManager):
         Handle player reconnection with state reconciliation
         """
         try:
-            # Get player's last known sequence
-            last_sequence = self.delta_manager.get_player_last_sequence(player_id)
+            username = self.connection_metadata.get(websocket, {}).get('username')
+            if not username:
+                players = await self.redis_call(redis_manager, redis_manager.get_room_players, room_code)
+                username = next((p.get('username') for p in players if p.get('player_id') == player_id), None)
             
-            # Get current game state
-            current_state = redis_manager.get_game_state(room_code)
-            if not current_state:
+            if not username or not await self.resume_player(websocket, room_code, player_id, username):
                 await self.notify_error(websocket, "No active game found")
                 return False
-            
-            # Get room delta manager
-            delta_manager = self.get_room_delta_manager(room_code)
-            
-            # Generate reconciliation patch
-            reconciliation = delta_manager.generate_reconciliation_patch(
-                player_id, last_sequence, current_state
-            )
-            
-            # Send reconciliation data
-            await self.send_message(websocket, 'reconnection_reconciliation', reconciliation)
-            
-            # Update player tracking
-            sequence_id = reconciliation.get('delta', {}).get('sequence_id', 0)
-            self._update_player_tracking(player_id, sequence_id, reconciliation)
-            
-            self.logger.info(f"Sent reconciliation patch to player {player_id} "
-                           f"(last sequence: {last_sequence}, current: {sequence_id})")
-            
             return True
             
         except Exception as e:
-            self.logger.error(f"Failed to handle reconnection reconciliation: {e}")
+            self.logger.error("Failed to handle reconnection reconciliation: %s", e)
             await self.notify_error(websocket, "Failed to reconcile game state")
             return False
     
-    def _update_player_tracking(self, player_id: str, sequence_id: int, data: Dict[str, Any]):
-        """Update player's last known state for reconciliation"""
-        self.player_last_updates[player_id] = {
-            'sequence_id': sequence_id,
-            'timestamp': time.time(),
-            'data_size': len(json.dumps(data))
-        }
-        
-        # Update delta manager tracking
-        self.delta_manager.update_player_state(player_id, sequence_id, data)
-    
     async def broadcast_specific_update(self, 
                                       room_code: str,
                                       update_type: UpdateType,
@@ -310,128 +326,117 @@ class DeltaNetworkManager(NetworkManager):
         """
         Broadcast a specific type of update with minimal data
         
-        This is optimized for high-frequency updates like turn transitions
+        This is optimized for high-frequency updates like turn transitions:
+        the changes are not diffed or checksummed. They still take the room's
+        next sequence number, so every player is sent (their view of) them.
         """
         try:
-            delta_manager = self.get_room_delta_manager(room_code)
-            
-            # Create minimal delta
-            delta_manager.sequence_counter += 1
-            delta = StateDelta(
-                update_type=update_type,
-                timestamp=time.time(),
-                sequence_id=delta_manager.sequence_counter,
-                changes=changes,
-                affected_players=affected_players,
-                checksum=""  # Skip checksum for fast updates
-            )
-            
-            # Get live connections for affected players
-            live_players = []
-            for player_name in affected_players:
-                # Find player_id from connection metadata
-                for ws, metadata in self.connection_metadata.items():
-                    if metadata.get('username') == player_name:
-                        live_players.append({
-                            'websocket': ws,
-                            'player_id': metadata.get('player_id'),
-                            'username': player_name
-                        })
-                        break
-            
-            broadcast_stats = {
-                'update_type': update_type.value,
-                'affected_players': len(affected_players),
-                'live_players': len(live_players),
-                'bytes_sent': 0
-            }
-            
-            # Send to live players
-            for player_info in live_players:
-                try:
-                    update_data = {
-                        'type': 'specific_update',
-                        'update_type': update_type.value,
-                        'sequence_id': delta.sequence_id,
-                        'changes': changes,
-                        'timestamp': delta.timestamp,
-                        'room_code': room_code
-                    }
-                    
-                    await self.send_message(player_info['websocket'], 'specific_update', update_data)
-                    
-                    # Update tracking
-                    self._update_player_tracking(
-                        player_info['player_id'], 
-                        delta.sequence_id, 
-                        update_data
-                    )
-                    
-                    broadcast_stats['bytes_sent'] += len(json.dumps(update_data))
-                    
-                except Exception as e:
-                    self.logger.error(f"Failed to send specific update to {player_info['username']}: {e}")
-            
-            return broadcast_stats
+            await self.flush_updates(room_code)
+            async with self._send_lock(room_code):
+                delta_manager = self.get_room_delta_manager(room_code)
+                delta = delta_manager.record_changes(changes, update_type, affected_players)
+                return await self.send_delta(room_code, delta)
             
         except Exception as e:
-            self.logger.error(f"Failed to broadcast specific update: {e}")
+            self.logger.error("Failed to broadcast specific update: %s", e)
             return {'error': str(e)}
     
-    async def batch_updates(self, room_code: str, update_data: Dict[str, Any]):
+    async def batch_updates(self, room_code: str, update_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
         """
-        Batch multiple updates together to reduce message frequency
+        Merge an update into the room's pending batch.
+        
+        update_data may carry 'state' (a full state; it supersedes earlier
+        changes), 'changes', 'update_type', 'affected_players', 'players' and
+        'flush' (send now). Returns the broadcast statistics if the batch was
+        sent right away, else None.
         """
-        self.pending_updates[room_code].append(update_data)
+        pending = self.pending_updates.get(room_code)
+        if pending is None:
+            pending = self.pending_updates[room_code] = _PendingBatch()
+        base = pending.state if pending.state is not None else self.get_room_delta_manager(room_code).last_state
+        # Phase as of everything before this update
+        phases = {key: pending.changes.get(key, base.get(key)) for key in PHASE_FIELDS}
         
-        # Cancel existing timer if present
-        if room_code in self.batch_timers:
-            self.batch_timers[room_code].cancel()
+        if update_data.get('state') is not None:
+            pending.state = update_data['state']
+            pending.changes = {}
+            incoming = pending.state
+        else:
+            incoming = update_data.get('changes') or {}
+            pending.changes.update(incoming)
+        if update_data.get('players') is not None:
+            pending.players = update_data['players']
+        if update_data.get('affected_players'):
+            pending.affected_players.update(update_data['affected_players'])
+        if update_data.get('update_type') is not None:
+            pending.update_types.add(UpdateType(update_data['update_type']))
+        pending.count += 1
+        pending.last_at = time.monotonic()
+        self.batch_stats['submitted'] += 1
         
-        # Start new timer
-        self.batch_timers[room_code] = asyncio.create_task(
-            self._flush_batched_updates(room_code)
-        )
+        if any(key in incoming and incoming[key] != phases[key] for key in PHASE_FIELDS):
+            self.batch_stats['by_phase'] += 1
+            return await self.flush_updates(room_code)
+        if update_data.get('flush') or self.batch_delay <= 0:
+            return await self.flush_updates(room_code)
+        if pending.count >= self.batch_max_updates:
+            self.batch_stats['by_size'] += 1
+            return await self.flush_updates(room_code)
+        if pending.timer is None:
+            pending.timer = asyncio.create_task(self._flush_batched_updates(room_code, pending))
+        return None
     
-    async def _flush_batched_updates(self, room_code: str):
-        """Flush batched updates after delay"""
+    async def _flush_batched_updates(self, room_code: str, pending: _PendingBatch):
+        """The room's batch timer: wait for a quiet window (capped by the max latency), then send"""
         try:
-            await asyncio.sleep(self.batch_delay)
-            
-            updates = self.pending_updates[room_code]
-            if not updates:
-                return
-            
-            # Clear pending updates
-            self.pending_updates[room_code] = []
-            
-            # Combine updates efficiently
-            if len(updates) == 1:
-                # Single update - send directly
-                update = updates[0]
-                # Send to affected players
-                # Implementation depends on update structure
-                
-            else:
-                # Multiple updates - merge changes
-                merged_changes = {}
-                affected_players = set()
-                
-                for update in updates:
-                    if 'changes' in update:
-                        merged_changes.update(update['changes'])
-                    if 'affected_players' in update:
-                        affected_players.update(update['affected_players'])
-                
-                # Create merged update
-                # Implementation continues...
-                
+            while True:
+                deadline = min(pending.last_at + self.batch_delay, pending.first_at + self.batch_max_latency)
+                delay = deadline - time.monotonic()
+                if delay <= 0:
+                    break
+                await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            return
+        # From here the batch is being sent; an explicit flush must not cancel it
+        pending.timer = None
+        if self.pending_updates.get(room_code) is pending:
+            self.batch_stats['by_timer'] += 1
+            await self.flush_updates(room_code)
+    
+    async def flush_updates(self, room_code: str) -> Optional[Dict[str, Any]]:
+        """Send the room's pending batch (if any) as one sequence"""
+        pending = self.pending_updates.pop(room_code, None)
+        if pending is None:
+            return None
+        if pending.timer is not None:
+            pending.timer.cancel()
+        self.batch_stats['flushed'] += 1
+        self.get_room_bandwidth(room_code)['coalesced'] += pending.count - 1
+        
+        update_type = next(iter(pending.update_types)) if len(pending.update_types) == 1 else None
+        affected_players = list(pending.affected_players) or None
+        try:
+            async with self._send_lock(room_code):
+                delta_manager = self.get_room_delta_manager(room_code)
+                if pending.state is not None:
+                    state = dict(pending.state, **pending.changes) if pending.changes else pending.state
+                    delta = delta_manager.advance(state, affected_players, update_type)
+                elif pending.changes:
+                    delta = delta_manager.advance_changes(pending.changes, affected_players, update_type)
+                else:
+                    delta = None
+                if delta is None:
+                    return None
+                return await self.send_delta(room_code, delta, pending.players)
         except Exception as e:
-            self.logger.error(f"Failed to flush batched updates: {e}")
-        finally:
-            # Clean up timer
-            if room_code in self.batch_timers:
-                del self.batch_timers[room_code]
+            self.logger.error("Failed to flush batched updates for room %s: %s", room_code, e)
+            return {'error': str(e)}
+    
+    def _send_lock(self, room_code: str) -> asyncio.Lock:
+        lock = self.send_locks.get(room_code)
+        if lock is None:
+            lock = self.send_locks[room_code] = asyncio.Lock()
+        return lock
     
     def get_bandwidth_statistics(self) -> Dict[str, Any]:
         """Get bandwidth usage and optimization statistics"""
@@ -445,7 +450,9 @@ class DeltaNetworkManager(NetworkManager):
             'avg_bytes_per_update': (self.bandwidth_stats['total_bytes_sent'] / total_updates 
                                    if total_updates > 0 else 0),
             'rooms_with_deltas': len(self.room_delta_managers),
-            'total_players_tracked': len(self.player_last_updates)
+            'batching': dict(self.batch_stats, pending=len(self.pending_updates)),
+            'total_players_tracked': sum(len(m.player_sequence_ids) for m in self.room_delta_managers.values()),
+            'rooms': {room_code: self.get_room_report(room_code) for room_code in self.room_delta_managers}
         }
         
         # Get compression stats from delta managers
@@ -460,22 +467,31 @@ class DeltaNetworkManager(NetworkManager):
         
         return stats
     
+    def get_room_report(self, room_code: str) -> Dict[str, Any]:
+        """A room's bandwidth counters and stream position"""
+        delta_manager = self.room_delta_managers.get(room_code)
+        report = dict(self.get_room_bandwidth(room_code))
+        if delta_manager is not None:
+            acks = delta_manager.player_sequence_ids
+            report.update(
+                epoch=delta_manager.epoch,
+                sequence_id=delta_manager.sequence_counter,
+                checksum=delta_manager.checksum,
+                history=len(delta_manager.delta_history),
+                min_acked=min(acks.values()) if acks else 0
+            )
+        return report
+    
     def cleanup_room_data(self, room_code: str):
         """Clean up data for a completed/closed room"""
-        if room_code in self.room_states:
-            del self.room_states[room_code]
-        
-        if room_code in self.room_delta_managers:
-            del self.room_delta_managers[room_code]
-        
-        if room_code in self.pending_updates:
-            del self.pending_updates[room_code]
-        
-        if room_code in self.batch_timers:
-            self.batch_timers[room_code].cancel()
-            del self.batch_timers[room_code]
+        self.room_delta_managers.pop(room_code, None)
+        self.room_bandwidth.pop(room_code, None)
+        self.send_locks.pop(room_code, None)
+        pending = self.pending_updates.pop(room_code, None)
+        if pending is not None and pending.timer is not None:
+            pending.timer.cancel()
         
-        self.logger.info(f"Cleaned up delta data for room {room_code}")
+        self.logger.debug("Cleaned up delta data for room %s", room_code)
     
     # Convenience methods for common game updates
     
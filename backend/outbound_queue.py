@@ -0,0 +1,233 @@
+# outbound_queue.py
+"""
+Bounded per-connection outbound queues with slow-consumer eviction.
+
+send_message and room broadcasts awaited websocket.send directly, so a
+player on a bad mobile link held up every broadcast that included them, and
+nothing bounded how much could pile up for one socket (max_queue=100 only
+limits the inbound side). Each registered connection now gets an
+OutboundQueue: senders enqueue a frame and return at once, and one writer
+task per connection drains the queue in order.
+
+Coalescible messages (game_state) are conflated: a newer frame replaces one
+of the same type that is still waiting, since only the latest state matters.
+When the queue is full further frames are dropped and counted. A dropped
+frame that cannot be conflated (turn_start, card_played, ...) leaves the
+client unable to follow the game, so the connection is marked slow at once.
+Otherwise it is marked slow once the queue has not drained back to half its
+capacity for slow_after seconds. Slow connections are handed to on_slow,
+which drops them into the normal disconnect/reconnect path; the room journal
+lets the client catch up on what it missed.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Iterable, Optional
+
+import websockets
+
+log = logging.getLogger(__name__)
+
+DEFAULT_CAPACITY = 64          # Frames a connection may have waiting
+DEFAULT_SLOW_AFTER = 5.0       # Seconds a full queue is tolerated before eviction
+COALESCIBLE_TYPES = ('game_state',)
+
+OFFER_QUEUED = 'queued'
+OFFER_CONFLATED = 'conflated'
+OFFER_DROPPED = 'dropped'
+OFFER_CLOSED = 'closed'
+
+
+class OutboundQueue:
+    """One connection's pending frames and the task that writes them"""
+
+    def __init__(self, websocket, capacity: int = DEFAULT_CAPACITY, slow_after: float = DEFAULT_SLOW_AFTER,
+                 coalescible: Iterable[str] = COALESCIBLE_TYPES,
+                 on_slow: Optional[Callable[['OutboundQueue'], None]] = None):
+        self.websocket = websocket
+        self.capacity = capacity
+        self.low_water = capacity // 2      # Depth a full queue must drain to before its slow timer stops
+        self.slow_after = slow_after
+        self.coalescible = frozenset(coalescible)
+        self._on_slow = on_slow
+        self.pending = deque()              # [msg_type, frame] entries in send order
+        self._latest: Dict[str, list] = {}  # Coalescible msg_type -> its waiting entry
+        self._ready = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        self.in_flight = 0                  # 1 while the writer is inside websocket.send
+        self.full_since: Optional[float] = None
+        self.closed = False
+        self.slow = False
+
+        # Metrics
+        self.sent = 0
+        self.dropped = 0
+        self.conflated = 0
+        self.max_depth = 0
+
+    def offer(self, msg_type: str, frame: str) -> str:
+        """Queue a frame without waiting; returns queued, conflated, dropped or closed"""
+        if self.closed:
+            return OFFER_CLOSED
+        if self.task is None:
+            self.task = asyncio.create_task(self._run())
+
+        entry = self._latest.get(msg_type)
+        if entry is not None:
+            entry[1] = frame
+            self.conflated += 1
+            return OFFER_CONFLATED
+
+        # The frame inside websocket.send still occupies the buffer: a stalled
+        # socket must stay full, not free a slot by having one frame taken
+        if len(self.pending) + self.in_flight >= self.capacity:
+            self.dropped += 1
+            if msg_type not in self.coalescible:
+                self._evict("dropped a %s frame" % msg_type)
+                return OFFER_DROPPED
+            if self.full_since is None:
+                self.full_since = time.monotonic()
+                asyncio.get_running_loop().call_later(self.slow_after, self._check_slow)
+            return OFFER_DROPPED
+
+        entry = [msg_type, frame]
+        self.pending.append(entry)
+        if msg_type in self.coalescible:
+            self._latest[msg_type] = entry
+        self.max_depth = max(self.max_depth, len(self.pending))
+        self._ready.set()
+        return OFFER_QUEUED
+
+    def _check_slow(self):
+        if self.closed or self.full_since is None:
+            return
+        remaining = self.full_since + self.slow_after - time.monotonic()
+        if remaining > 0:
+            # Drained and filled up again since the timer was set
+            asyncio.get_running_loop().call_later(remaining, self._check_slow)
+            return
+        self._evict("outbound queue full for %.1fs" % self.slow_after)
+
+    def _evict(self, reason: str):
+        self.slow = True
+        log.warning("Slow consumer %s: %s, dropping connection",
+                    getattr(self.websocket, 'remote_address', None), reason)
+        self.close()
+        if self._on_slow is not None:
+            self._on_slow(self)
+
+    async def _run(self):
+        try:
+            while not self.closed:
+                if not self.pending:
+                    self._ready.clear()
+                    await self._ready.wait()
+                    continue
+                entry = self.pending.popleft()
+                if self._latest.get(entry[0]) is entry:
+                    del self._latest[entry[0]]
+                self.in_flight = 1
+                await self.websocket.send(entry[1])
+                self.in_flight = 0
+                self.sent += 1
+                # A client that takes a frame now and then is still behind until it catches up
+                if len(self.pending) <= self.low_water:
+                    self.full_since = None
+        except websockets.ConnectionClosed:
+            self.close()
+        except asyncio.CancelledError:
+            pass
+        except Exception as e:
+            log.error("Outbound writer failed: %s", e)
+            self.close()
+
+    def close(self):
+        """Stop writing; frames still waiting are discarded"""
+        if self.closed:
+            return
+        self.closed = True
+        self.pending.clear()
+        self._latest.clear()
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+
+    async def drain(self, timeout: float = 1.0) -> bool:
+        """Wait until everything queued so far has been written (tests and shutdown)"""
+        deadline = time.monotonic() + timeout
+        while (self.pending or self.in_flight) and not self.closed and time.monotonic() < deadline:
+            await asyncio.sleep(0.005)
+        return not (self.pending or self.in_flight)
+
+
+class OutboundQueues:
+    """Creates and tracks the OutboundQueue of each registered connection"""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, slow_after: float = DEFAULT_SLOW_AFTER,
+                 coalescible: Iterable[str] = COALESCIBLE_TYPES,
+                 on_slow: Optional[Callable[[Any], None]] = None):
+        self.capacity = capacity
+        self.slow_after = slow_after
+        self.coalescible = tuple(coalescible)
+        self.on_slow = on_slow
+        self.queues: Dict[Any, OutboundQueue] = {}
+
+        # Totals from queues that have been closed
+        self.opened = 0
+        self.evicted = 0
+        self._closed_totals = {'sent': 0, 'dropped': 0, 'conflated': 0}
+
+    def open(self, websocket) -> OutboundQueue:
+        queue = self.queues.get(websocket)
+        if queue is None:
+            queue = OutboundQueue(websocket, self.capacity, self.slow_after, self.coalescible,
+                                  on_slow=self._slow)
+            self.queues[websocket] = queue
+            self.opened += 1
+        return queue
+
+    def get(self, websocket) -> Optional[OutboundQueue]:
+        return self.queues.get(websocket)
+
+    def close(self, websocket):
+        queue = self.queues.pop(websocket, None)
+        if queue is None:
+            return
+        queue.close()
+        for key in self._closed_totals:
+            self._closed_totals[key] += getattr(queue, key)
+
+    def _slow(self, queue: OutboundQueue):
+        self.evicted += 1
+        self.close(queue.websocket)
+        if self.on_slow is not None:
+            try:
+                self.on_slow(queue.websocket)
+            except Exception as e:
+                log.error("Error evicting slow consumer: %s", e)
+
+    def offer(self, websocket, msg_type: str, frame: str) -> Optional[str]:
+        """Queue a frame for a registered connection; None if it has no queue"""
+        queue = self.queues.get(websocket)
+        if queue is None:
+            return None
+        return queue.offer(msg_type, frame)
+
+    def get_metrics(self) -> Dict[str, Any]:
+        queues = list(self.queues.values())
+        depths = [len(q.pending) for q in queues]
+        return {
+            'connections': len(queues),
+            'opened': self.opened,
+            'capacity': self.capacity,
+            'slow_after': self.slow_after,
+            'queued_frames': sum(depths),
+            'max_depth': max(depths) if depths else 0,
+            'peak_depth': max((q.max_depth for q in queues), default=0),
+            'full_connections': sum(1 for q in queues if q.full_since is not None),
+            'sent': self._closed_totals['sent'] + sum(q.sent for q in queues),
+            'dropped': self._closed_totals['dropped'] + sum(q.dropped for q in queues),
+            'conflated': self._closed_totals['conflated'] + sum(q.conflated for q in queues),
+            'evicted': self.evicted
+        }
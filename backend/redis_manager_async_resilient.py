@@ -0,0 +1,613 @@
+# redis_manager_async_resilient.py
+"""
+Async ResilientRedisManager
+
+Native asyncio counterpart of ResilientRedisManager. Built on the pooled
+AsyncRedisManager client, it keeps the same circuit breakers, fallback cache
+and method names, so GameServer can swap it in with --redis-mode async and
+await Redis directly instead of hopping through a thread pool.
+"""
+
+import json
+import time
+import logging
+from typing import Dict, List, Optional, Any, Tuple
+
+from async_redis_manager import AsyncRedisManager
+from circuit_breaker import CircuitBreaker, CircuitBreakerConfig
+from redis_manager_resilient import JOURNAL_MAXLEN, EVENT_LOG_MAXLEN
+
+
+class AsyncResilientRedisManager(AsyncRedisManager):
+    """
+    Async Redis manager with circuit breaker protection
+
+    Features:
+    - Pooled non-blocking connections (AsyncRedisManager)
+    - Circuit breakers for read/write/delete/scan operations
+    - In-memory fallback cache mirroring ResilientRedisManager
+    - Same method names as the sync manager, as coroutines
+    """
+
+    # Callers use this to decide between awaiting directly and the IOExecutor
+    is_async = True
+
+    def __init__(self, host='localhost', port=6379, db=0, pool_size=20):
+        super().__init__(host=host, port=port, db=db, pool_size=pool_size)
+
+        self.circuit_config = CircuitBreakerConfig(
+            failure_threshold=3,        # Open circuit after 3 failures
+            success_threshold=2,        # Close circuit after 2 successes
+            timeout=30.0,              # Wait 30s before trying half-open
+            time_window=120.0,         # 2-minute failure tracking window
+            max_retry_attempts=2,      # Retry failed operations twice
+            base_backoff_delay=0.5,    # Start with 500ms backoff
+            max_backoff_delay=5.0      # Max 5s backoff
+        )
+
+        self.circuits = {
+            'read': CircuitBreaker('redis_async_read', self.circuit_config),
+            'write': CircuitBreaker('redis_async_write', self.circuit_config),
+            'delete': CircuitBreaker('redis_async_delete', self.circuit_config),
+            'scan': CircuitBreaker('redis_async_scan', self.circuit_config)
+        }
+
+        self.fallback_cache = {
+            'game_states': {},      # Room code -> game state
+            'player_sessions': {},  # Player ID -> session data
+            'room_players': {},     # Room code -> list of players
+            'room_metadata': {}     # Room code -> metadata
+        }
+
+        self.logger = logging.getLogger(__name__)
+        self.logger.info("AsyncResilientRedisManager initialized with circuit breaker protection")
+
+    # ===== METRICS / HEALTH (sync, used by CircuitBreakerMonitor thread) =====
+
+    def get_performance_metrics(self) -> dict:
+        """Get performance metrics including circuit breaker stats"""
+        base_metrics = super().get_performance_metrics()
+        base_metrics['circuit_breakers'] = {
+            f'{name}_circuit': circuit.get_metrics() for name, circuit in self.circuits.items()
+        }
+        base_metrics['fallback_cache_stats'] = {
+            'game_states_cached': len(self.fallback_cache['game_states']),
+            'player_sessions_cached': len(self.fallback_cache['player_sessions']),
+            'room_players_cached': len(self.fallback_cache['room_players'])
+        }
+        return base_metrics
+
+    def get_circuit_breaker_status(self) -> Dict[str, Any]:
+        """Get status of all circuit breakers"""
+        return {
+            name: {'state': circuit.get_state().value, 'metrics': circuit.get_metrics()}
+            for name, circuit in self.circuits.items()
+        }
+
+    def reset_circuit_breakers(self):
+        """Reset all circuit breakers to closed state"""
+        for circuit in self.circuits.values():
+            circuit.reset()
+        self.logger.info("All circuit breakers reset")
+
+    def is_healthy(self) -> bool:
+        """Connection state as seen by the pool (no blocking ping from monitor threads)"""
+        return self._connected and all(
+            circuit.get_state().value != 'open' for circuit in self.circuits.values()
+        )
+
+    async def _client(self):
+        """Connected client, or ConnectionError so the circuit breaker counts the failure"""
+        if not self._connected and not await self.connect():
+            raise ConnectionError("Cannot connect to Redis")
+        return self.redis
+
+    def _create_cache_key(self, operation: str, *args) -> str:
+        """Create cache key for operations"""
+        return f"{operation}:{':'.join(str(arg) for arg in args)}"
+
+    # ===== SESSION MANAGEMENT =====
+
+    async def save_player_session(self, player_id: str, session_data: dict) -> bool:
+        """Save player session with circuit breaker protection"""
+        async def _redis_save():
+            redis = await self._client()
+            key = f"session:{player_id}"
+            updated_data = {'last_heartbeat': str(int(time.time()))}
+            if 'connection_status' not in session_data:
+                updated_data['connection_status'] = 'active'
+            updated_data.update(session_data)
+
+            pipe = redis.pipeline()
+            pipe.hset(key, mapping={k: str(v) for k, v in updated_data.items()})
+            pipe.expire(key, 3600)
+            await self._safe_execute(pipe.execute)
+            return True
+
+        def _fallback_save():
+            self.fallback_cache['player_sessions'][player_id] = session_data.copy()
+            self.logger.warning(f"Using fallback storage for player session {player_id}")
+            return True
+
+        result = await self.circuits['write'].call_async(
+            _redis_save,
+            fallback_func=_fallback_save,
+            cache_key=self._create_cache_key("session", player_id)
+        )
+        if result.success:
+            self.fallback_cache['player_sessions'][player_id] = session_data.copy()
+        return result.success
+
+    async def get_player_session(self, player_id: str) -> dict:
+        """Get player session with circuit breaker protection"""
+        async def _redis_get():
+            redis = await self._client()
+            return await self._safe_execute(redis.hgetall, f"session:{player_id}") or {}
+
+        result = await self.circuits['read'].call_async(
+            _redis_get,
+            fallback_func=lambda: self.fallback_cache['player_sessions'].get(player_id, {})
+        )
+        return result.value if result.success else {}
+
+    async def attempt_reconnect(self, player_id: str, reconnect_data: dict = None) -> Tuple[bool, dict]:
+        """Validate a stored session and mark it active again (same contract as the sync manager)"""
+        try:
+            session = await self.get_player_session(player_id)
+            if not session:
+                return False, {'error': 'No session found for player'}
+
+            for field in ('username', 'room_code'):
+                if field not in session:
+                    return False, {'error': f'Invalid session: missing {field}'}
+
+            room_code = session['room_code']
+            if not await self.room_exists(room_code):
+                return False, {'error': 'Game room no longer exists'}
+
+            if reconnect_data:
+                session.update(reconnect_data)
+            session['connection_status'] = 'active'
+            session['last_reconnect'] = str(int(time.time()))
+
+            if await self.save_player_session(player_id, session):
+                self.logger.info(f"Player {player_id[:8]}... successfully reconnected to room {room_code}")
+                return True, session
+            return False, {'error': 'Failed to update session'}
+        except Exception as e:
+            self.logger.error(f"Error during reconnection attempt for {player_id[:8]}...: {e}")
+            return False, {'error': f'Reconnection failed: {str(e)}'}
+
+    # ===== ROOM MANAGEMENT =====
+
+    async def room_exists(self, room_code: str) -> bool:
+        """Room exists if either its state or players key exists"""
+        async def _redis_exists():
+            redis = await self._client()
+            count = await self._safe_execute(
+                redis.exists, f"game:{room_code}:state", f"room:{room_code}:players"
+            )
+            return bool(count)
+
+        result = await self.circuits['read'].call_async(
+            _redis_exists,
+            fallback_func=lambda: (room_code in self.fallback_cache['game_states'] or
+                                   room_code in self.fallback_cache['room_players'])
+        )
+        return bool(result.value) if result.success else False
+
+    async def create_room(self, room_code: str) -> bool:
+        """Create room unless it already exists"""
+        async def _redis_create():
+            redis = await self._client()
+            players_key = f"room:{room_code}:players"
+            state_key = f"game:{room_code}:state"
+            if await self._safe_execute(redis.exists, state_key, players_key):
+                return True
+
+            pipe = redis.pipeline()
+            pipe.hset(state_key, mapping={
+                "phase": "waiting_for_players",
+                "created_at": str(int(time.time()))
+            })
+            pipe.expire(state_key, 3600)
+            await self._safe_execute(pipe.execute)
+            return True
+
+        def _fallback_create():
+            if room_code not in self.fallback_cache['room_players'] and room_code not in self.fallback_cache['game_states']:
+                self.fallback_cache['room_players'][room_code] = []
+                self.fallback_cache['game_states'][room_code] = {
+                    'phase': 'waiting_for_players',
+                    'created_at': str(int(time.time()))
+                }
+                self.logger.warning(f"Using fallback storage for creating room {room_code}")
+            return True
+
+        result = await self.circuits['write'].call_async(_redis_create, fallback_func=_fallback_create)
+        if result.success:
+            self.fallback_cache['room_players'][room_code] = []
+            self.fallback_cache['game_states'][room_code] = {
+                'phase': 'waiting_for_players',
+                'created_at': str(int(time.time()))
+            }
+        return result.success
+
+    async def delete_room(self, room_code: str) -> bool:
+        """Delete all room-related keys"""
+        async def _redis_delete():
+            redis = await self._client()
+            keys = [key async for key in redis.scan_iter(match=f"*{room_code}*")]
+            if keys:
+                await self._safe_execute(redis.delete, *keys)
+            return True
+
+        result = await self.circuits['delete'].call_async(_redis_delete, fallback_func=lambda: True)
+
+        # Always clean up fallback cache regardless of Redis operation success
+        self.fallback_cache['game_states'].pop(room_code, None)
+        self.fallback_cache['room_players'].pop(room_code, None)
+        self.fallback_cache['room_metadata'].pop(room_code, None)
+        return result.success
+
+    async def clear_room(self, room_code: str) -> bool:
+        """Legacy method - redirects to delete_room"""
+        return await self.delete_room(room_code)
+
+    async def get_active_rooms(self) -> List[str]:
+        """Get active rooms with circuit breaker protection"""
+        async def _redis_scan():
+            redis = await self._client()
+            return [key.split(':')[1] async for key in redis.scan_iter(match="game:*:state")]
+
+        result = await self.circuits['scan'].call_async(
+            _redis_scan,
+            fallback_func=lambda: list(self.fallback_cache['game_states'].keys())
+        )
+        return result.value if result.success else []
+
+    # ===== PLAYER MANAGEMENT =====
+
+    async def add_player_to_room(self, room_code: str, player_data: dict) -> bool:
+        """Add player to room (append, skip duplicates by username or player_id)"""
+        async def _redis_add():
+            redis = await self._client()
+            key = f"room:{room_code}:players"
+            existing = await self._safe_execute(redis.lrange, key, 0, -1)
+            existing_ids = set()
+            for raw in existing:
+                try:
+                    info = json.loads(raw)
+                except json.JSONDecodeError:
+                    continue
+                existing_ids.add(info.get('username'))
+                existing_ids.add(info.get('player_id'))
+
+            pipe = redis.pipeline()
+            if player_data.get('username') not in existing_ids and player_data.get('player_id') not in existing_ids:
+                pipe.rpush(key, json.dumps(player_data))
+            pipe.expire(key, 3600)
+            await self._safe_execute(pipe.execute)
+            return True
+
+        def _fallback_add():
+            players = self.fallback_cache['room_players'].setdefault(room_code, [])
+            if player_data.get('username') not in {p.get('username') for p in players}:
+                players.append(player_data)
+            return True
+
+        result = await self.circuits['write'].call_async(_redis_add, fallback_func=_fallback_add)
+        return result.success
+
+    async def get_room_players(self, room_code: str) -> List[dict]:
+        """Get room players, ignoring placeholder entries"""
+        async def _redis_get():
+            redis = await self._client()
+            raw_players = await self._safe_execute(redis.lrange, f"room:{room_code}:players", 0, -1)
+            players = []
+            for raw in raw_players:
+                try:
+                    player = json.loads(raw)
+                except json.JSONDecodeError:
+                    continue
+                if not player.get('placeholder'):
+                    players.append(player)
+            return players
+
+        result = await self.circuits['read'].call_async(
+            _redis_get,
+            fallback_func=lambda: list(self.fallback_cache['room_players'].get(room_code, []))
+        )
+        return result.value if result.success else []
+
+    async def update_player_in_room(self, room_code: str, player_id: str, updated_data: dict) -> bool:
+        """Merge updated_data into the matching player entry"""
+        async def _redis_update():
+            redis = await self._client()
+            key = f"room:{room_code}:players"
+            raw_players = await self._safe_execute(redis.lrange, key, 0, -1)
+            for i, raw in enumerate(raw_players):
+                try:
+                    player = json.loads(raw)
+                except json.JSONDecodeError:
+                    continue
+                if player.get('player_id') == player_id:
+                    player.update(updated_data)
+                    pipe = redis.pipeline()
+                    pipe.lset(key, i, json.dumps(player))
+                    pipe.expire(key, 3600)
+                    await self._safe_execute(pipe.execute)
+                    return True
+            return False
+
+        def _fallback_update():
+            for player in self.fallback_cache['room_players'].get(room_code, []):
+                if player.get('player_id') == player_id:
+                    player.update(updated_data)
+                    return True
+            return False
+
+        result = await self.circuits['write'].call_async(_redis_update, fallback_func=_fallback_update)
+        return bool(result.value) if result.success else False
+
+    async def cleanup_disconnected_players(self, room_code: str, active_player_ids: List[str]) -> bool:
+        """Remove players that are not in active_player_ids"""
+        async def _redis_cleanup():
+            redis = await self._client()
+            key = f"room:{room_code}:players"
+            raw_players = await self._safe_execute(redis.lrange, key, 0, -1)
+            kept = []
+            for raw in raw_players:
+                try:
+                    if json.loads(raw).get('player_id') in active_player_ids:
+                        kept.append(raw)
+                except json.JSONDecodeError:
+                    continue
+
+            if len(kept) != len(raw_players):
+                pipe = redis.pipeline()
+                pipe.delete(key)
+                if kept:
+                    pipe.rpush(key, *kept)
+                    pipe.expire(key, 3600)
+                await self._safe_execute(pipe.execute)
+            return True
+
+        result = await self.circuits['write'].call_async(_redis_cleanup)
+        return result.success
+
+    # ===== GAME STATE MANAGEMENT =====
+
+    async def save_game_state(self, room_code: str, game_state: dict, moves: List[dict] = None) -> bool:
+        """Save game state (and append any moves to moves:{room}) in one pipeline"""
+        async def _redis_save():
+            redis = await self._client()
+            if 'created_at' not in game_state:
+                game_state['created_at'] = str(int(time.time()))
+            if 'last_activity' not in game_state:
+                game_state['last_activity'] = str(int(time.time()))
+
+            is_valid, error = self.validate_game_state(game_state)
+            if not is_valid:
+                self.logger.warning(f"Game state validation failed for room {room_code}: {error}")
+
+            encoded_state = {
+                k: json.dumps(v) if isinstance(v, (dict, list)) else str(v)
+                for k, v in game_state.items()
+            }
+            key = f"game:{room_code}:state"
+            pipe = redis.pipeline()
+            pipe.hset(key, mapping=encoded_state)
+            pipe.expire(key, 3600)
+            if moves:
+                pipe.rpush(f"moves:{room_code}", *[json.dumps(m) for m in moves])
+            await self._safe_execute(pipe.execute)
+            return True
+
+        def _fallback_save():
+            self.fallback_cache['game_states'][room_code] = game_state.copy()
+            self.logger.warning(f"Using fallback storage for game state {room_code}")
+            return True
+
+        result = await self.circuits['write'].call_async(
+            _redis_save,
+            fallback_func=_fallback_save,
+            cache_key=self._create_cache_key("game_state", room_code)
+        )
+        if result.success:
+            self.fallback_cache['game_states'][room_code] = game_state.copy()
+        else:
+            self.metrics['errors'] += 1
+        return result.success
+
+    async def update_game_state_fields(self, room_code: str, fields: dict, moves: List[dict] = None) -> bool:
+        """HSET only the given (already encoded) state fields, plus any moves, in one pipeline"""
+        async def _redis_update():
+            redis = await self._client()
+            key = f"game:{room_code}:state"
+            pipe = redis.pipeline()
+            pipe.hset(key, mapping=fields)
+            pipe.expire(key, 3600)
+            if moves:
+                pipe.rpush(f"moves:{room_code}", *[json.dumps(m) for m in moves])
+            await self._safe_execute(pipe.execute)
+            return True
+
+        def _fallback_update():
+            self.fallback_cache['game_states'].setdefault(room_code, {}).update(fields)
+            self.logger.warning(f"Using fallback storage for game state {room_code}")
+            return True
+
+        result = await self.circuits['write'].call_async(_redis_update, fallback_func=_fallback_update)
+        if result.success:
+            cached = self.fallback_cache['game_states'].get(room_code)
+            if cached is not None:
+                cached.update(fields)
+        else:
+            self.metrics['errors'] += 1
+        return result.success
+
+    async def get_game_state(self, room_code: str) -> dict:
+        """Get game state with circuit breaker protection"""
+        async def _redis_get():
+            redis = await self._client()
+            state = await self._safe_execute(redis.hgetall, f"game:{room_code}:state")
+            if not state:
+                return {}
+            state = dict(state)
+            for k, v in list(state.items()):
+                if k in ['teams', 'players', 'tricks', 'player_order'] or k.startswith('hand_'):
+                    try:
+                        state[k] = json.loads(v)
+                    except json.JSONDecodeError:
+                        pass  # Keep as string if not valid JSON
+            return state
+
+        result = await self.circuits['read'].call_async(
+            _redis_get,
+            fallback_func=lambda: self.fallback_cache['game_states'].get(room_code, {}),
+            cache_key=self._create_cache_key("game_state", room_code)
+        )
+        return result.value if result.success else {}
+
+    async def delete_game_state(self, room_code: str) -> bool:
+        """Delete game state for a room"""
+        async def _redis_delete():
+            redis = await self._client()
+            await self._safe_execute(redis.delete, f"game:{room_code}:state")
+            return True
+
+        result = await self.circuits['delete'].call_async(_redis_delete, fallback_func=lambda: True)
+        self.fallback_cache['game_states'].pop(room_code, None)
+        return result.success
+
+    async def append_room_event(self, room_code: str, event_id: str, msg_type: str, data: dict,
+                                maxlen: int = JOURNAL_MAXLEN) -> bool:
+        """Append a broadcast to the room's capped stream journal (room:{code}:journal)"""
+        async def _redis_append():
+            redis = await self._client()
+            key = f"room:{room_code}:journal"
+            pipe = redis.pipeline()
+            pipe.xadd(key, {
+                'type': msg_type,
+                'data': json.dumps(data),
+                'timestamp': str(time.time())
+            }, id=event_id, maxlen=maxlen, approximate=True)
+            pipe.expire(key, 3600)
+            await self._safe_execute(pipe.execute)
+            return True
+
+        result = await self.circuits['write'].call_async(_redis_append)
+        return result.success
+
+    async def read_room_events(self, room_code: str, after_id: str = '0-0', count: int = JOURNAL_MAXLEN) -> List[dict]:
+        """Journal entries strictly after after_id, oldest first"""
+        async def _redis_read():
+            redis = await self._client()
+            response = await self._safe_execute(redis.xread, {f"room:{room_code}:journal": after_id}, count=count)
+            events = []
+            for _, entries in response or []:
+                for entry_id, fields in entries:
+                    events.append({
+                        'event_id': entry_id,
+                        'type': fields.get('type'),
+                        'data': json.loads(fields.get('data', '{}')),
+                        'timestamp': float(fields.get('timestamp', 0))
+                    })
+            return events
+
+        result = await self.circuits['read'].call_async(_redis_read, fallback_func=lambda: [])
+        return result.value if result.success else []
+
+    async def append_game_events(self, room_code: str, events: List[dict], maxlen: int = EVENT_LOG_MAXLEN) -> bool:
+        """Append game events to room:{code}:events (entry id 0-<seq>) in one pipeline"""
+        async def _redis_append():
+            redis = await self._client()
+            key = f"room:{room_code}:events"
+            pipe = redis.pipeline()
+            for event in events:
+                pipe.xadd(key, {
+                    'type': event['type'],
+                    'data': json.dumps(event['data']),
+                    'timestamp': str(event['timestamp'])
+                }, id=f"0-{event['seq']}", maxlen=maxlen, approximate=True)
+            pipe.expire(key, 3600)
+            await self._safe_execute(pipe.execute)
+            return True
+
+        result = await self.circuits['write'].call_async(_redis_append)
+        return result.success
+
+    async def clear_game_events(self, room_code: str) -> bool:
+        """Delete the room's event log and snapshot (before a new game starts over at seq 1)"""
+        async def _redis_clear():
+            redis = await self._client()
+            await self._safe_execute(redis.delete, f"room:{room_code}:events", f"room:{room_code}:snapshot")
+            return True
+
+        result = await self.circuits['write'].call_async(_redis_clear)
+        return result.success
+
+    async def read_game_events(self, room_code: str, after_seq: int = 0) -> List[dict]:
+        """Game events with seq greater than after_seq, oldest first"""
+        async def _redis_read():
+            redis = await self._client()
+            entries = await self._safe_execute(redis.xrange, f"room:{room_code}:events", min=f"0-{after_seq + 1}", max='+')
+            events = []
+            for entry_id, fields in entries or []:
+                events.append({
+                    'seq': int(entry_id.split('-')[1]),
+                    'type': fields.get('type'),
+                    'data': json.loads(fields.get('data', '{}')),
+                    'timestamp': float(fields.get('timestamp', 0))
+                })
+            return events
+
+        result = await self.circuits['read'].call_async(_redis_read, fallback_func=lambda: [])
+        return result.value if result.success else []
+
+    async def save_game_snapshot(self, room_code: str, snapshot: dict) -> bool:
+        """Replace the room's snapshot (room:{code}:snapshot) with {'seq', 'state'}"""
+        async def _redis_save():
+            redis = await self._client()
+            key = f"room:{room_code}:snapshot"
+            pipe = redis.pipeline()
+            pipe.hset(key, mapping={'seq': str(snapshot['seq']), 'state': json.dumps(snapshot['state'])})
+            pipe.expire(key, 3600)
+            await self._safe_execute(pipe.execute)
+            return True
+
+        result = await self.circuits['write'].call_async(_redis_save)
+        return result.success
+
+    async def get_game_snapshot(self, room_code: str) -> Optional[dict]:
+        """Latest snapshot of a room as {'seq', 'state'}, or None"""
+        async def _redis_get():
+            redis = await self._client()
+            fields = await self._safe_execute(redis.hgetall, f"room:{room_code}:snapshot")
+            if not fields:
+                return None
+            return {'seq': int(fields['seq']), 'state': json.loads(fields['state'])}
+
+        result = await self.circuits['read'].call_async(_redis_get, fallback_func=lambda: None)
+        return result.value if result.success else None
+
+    async def last_game_event_seq(self, room_code: str) -> int:
+        """Seq of the newest event in the room's event log (0 if it has none)"""
+        async def _redis_last():
+            redis = await self._client()
+            entries = await self._safe_execute(redis.xrevrange, f"room:{room_code}:events", max='+', min='-', count=1)
+            return int(entries[0][0].split('-')[1]) if entries else 0
+
+        result = await self.circuits['read'].call_async(_redis_last, fallback_func=lambda: 0)
+        return result.value if result.success else 0
+
+    async def scan_game_rooms(self, cursor: int = 0, count: int = 100) -> Tuple[int, List[str]]:
+        """One SCAN step over game:*:state keys -> (next cursor, room codes); cursor 0 means done"""
+        async def _redis_scan():
+            redis = await self._client()
+            next_cursor, keys = await self._safe_execute(redis.scan, cursor=cursor, match="game:*:state", count=count)
+            return int(next_cursor), [key.split(':')[1] for key in keys]
+
+        result = await self.circuits['scan'].call_async(_redis_scan, fallback_func=lambda: (0, []))
+        return result.value if result.success else (0, [])
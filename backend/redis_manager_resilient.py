@@ -6,6 +6,9 @@ import logging
 from typing import Dict, List, Optional, Any, Tuple
 from circuit_breaker import CircuitBreaker, CircuitBreakerConfig, OperationResult
 
+JOURNAL_MAXLEN = 500  # Approximate cap on entries kept per room journal stream
+EVENT_LOG_MAXLEN = 2000  # Approximate cap on game events kept per room (about one full game)
+
 class ResilientRedisManager:
     """
     Enhanced RedisManager with circuit breaker pattern for resilience
@@ -26,7 +29,6 @@ class ResilientRedisManager:
         
         # Enable bypass mode for debugging
         self.bypass_circuit_breaker = True
-        print(f"[DEBUG] Circuit breaker bypass mode: {self.bypass_circuit_breaker}")
         
         # Circuit breaker configuration
         self.circuit_config = CircuitBreakerConfig(
@@ -73,6 +75,7 @@ class ResilientRedisManager:
         self.logger = logging.getLogger(__name__)
         
         self.logger.info("ResilientRedisManager initialized with circuit breaker protection")
+        self.logger.debug("Circuit breaker bypass mode: %s", self.bypass_circuit_breaker)
     
     def _measure_latency(self, start_time: float) -> None:
         """Update performance metrics (legacy compatibility)"""
@@ -162,15 +165,15 @@ class ResilientRedisManager:
     def get_player_session(self, player_id: str) -> dict:
         """Get player session with circuit breaker protection"""
         try:
-            print(f"[DEBUG] get_player_session: Direct Redis operation for {player_id[:8]}...")
+            self.logger.debug("get_player_session: Direct Redis operation for %s...", player_id[:8])
             key = f"session:{player_id}"
             raw_data = self.redis.hgetall(key)
-            print(f"[DEBUG] get_player_session: Raw data retrieved: {len(raw_data)} items")
+            self.logger.debug("get_player_session: Raw data retrieved: %s items", len(raw_data))
             result = {k.decode(): v.decode() for k, v in raw_data.items()}
-            print(f"[DEBUG] get_player_session: Decoded result: {result}")
+            self.logger.debug("get_player_session: Decoded result: %s", result)
             return result
         except Exception as e:
-            print(f"[DEBUG] get_player_session: Redis error: {e}")
+            self.logger.debug("get_player_session: Redis error: %s", e)
             return self._fallback_get_player_session(player_id)
     
     def add_player_to_room(self, room_code: str, player_data: dict):
@@ -199,15 +202,15 @@ class ResilientRedisManager:
             
             if new_username not in existing_players and new_player_id not in existing_players:
                 self.redis.rpush(key, json.dumps(player_data))
-                print(f"[DEBUG] add_player_to_room: Added player {new_username} to room {room_code}")
+                self.logger.debug("add_player_to_room: Added player %s to room %s", new_username, room_code)
             else:
-                print(f"[DEBUG] add_player_to_room: Player {new_username} already exists in room {room_code}, skipping")
+                self.logger.debug("add_player_to_room: Player %s already exists in room %s, skipping", new_username, room_code)
                 
             self.redis.expire(key, 3600)
             return True
             
         except Exception as e:
-            print(f"[ERROR] add_player_to_room: {e}")
+            self.logger.error("add_player_to_room: %s", e)
             # Fallback logic
             if room_code not in self.fallback_cache['room_players']:
                 self.fallback_cache['room_players'][room_code] = []
@@ -221,10 +224,10 @@ class ResilientRedisManager:
     def get_room_players(self, room_code: str) -> List[dict]:
         """Get room players with circuit breaker protection"""
         try:
-            print(f"[DEBUG] get_room_players: Getting players for room {room_code}...")
+            self.logger.debug("get_room_players: Getting players for room %s...", room_code)
             key = f"room:{room_code}:players"
             if not self.redis.exists(key):
-                print(f"[DEBUG] get_room_players: Room {room_code} players list does not exist")
+                self.logger.debug("get_room_players: Room %s players list does not exist", room_code)
                 return []
             
             players = self.redis.lrange(key, 0, -1)
@@ -236,17 +239,17 @@ class ResilientRedisManager:
                     if not player_data.get('placeholder'):
                         result.append(player_data)
                 except Exception as e:
-                    print(f"[DEBUG] get_room_players: Error decoding player data: {e}")
+                    self.logger.debug("get_room_players: Error decoding player data: %s", e)
                     continue
             
-            print(f"[DEBUG] get_room_players: Found {len(result)} valid players in room {room_code}")
+            self.logger.debug("get_room_players: Found %s valid players in room %s", len(result), room_code)
             return result
         except Exception as e:
-            print(f"[DEBUG] get_room_players: Redis error: {e}")
+            self.logger.debug("get_room_players: Redis error: %s", e)
             return self._fallback_get_room_players(room_code)
     
-    def save_game_state(self, room_code: str, game_state: dict) -> bool:
-        """Save game state with circuit breaker protection"""
+    def save_game_state(self, room_code: str, game_state: dict, moves: List[dict] = None) -> bool:
+        """Save game state (and append any moves to moves:{room}) in one pipeline"""
         start_time = time.time()
         
         def _redis_save():
@@ -275,6 +278,8 @@ class ResilientRedisManager:
             
             pipe.hset(key, mapping=encoded_state)
             pipe.expire(key, 3600)
+            if moves:
+                pipe.rpush(f"moves:{room_code}", *[json.dumps(m) for m in moves])
             pipe.execute()
             
             return True
@@ -301,28 +306,54 @@ class ResilientRedisManager:
         
         return result.success
     
+    def update_game_state_fields(self, room_code: str, fields: dict, moves: List[dict] = None) -> bool:
+        """HSET only the given (already encoded) state fields, plus any moves, in one pipeline"""
+        def _redis_update():
+            key = f"game:{room_code}:state"
+            pipe = self.redis.pipeline()
+            pipe.hset(key, mapping=fields)
+            pipe.expire(key, 3600)
+            if moves:
+                pipe.rpush(f"moves:{room_code}", *[json.dumps(m) for m in moves])
+            pipe.execute()
+            return True
+
+        def _fallback_update():
+            self.fallback_cache['game_states'].setdefault(room_code, {}).update(fields)
+            self.logger.warning(f"Using fallback storage for game state {room_code}")
+            return True
+
+        result = self.circuits['write'].call(_redis_update, fallback_func=_fallback_update)
+        if result.success:
+            cached = self.fallback_cache['game_states'].get(room_code)
+            if cached is not None:
+                cached.update(fields)
+        else:
+            self.metrics['errors'] += 1
+        return result.success
+
     def get_game_state(self, room_code: str) -> dict:
         """Get game state with circuit breaker protection"""
-        print(f'[DEBUG] === get_game_state START for {room_code} ===')
+        self.logger.debug('=== get_game_state START for %s ===', room_code)
         import time
         start_time = time.time()
         
         def _redis_get():
-            print(f'[DEBUG] _redis_get START')
+            self.logger.debug('_redis_get START')
             key = f"game:{room_code}:state"
-            print(f'[DEBUG] About to call hgetall on key: {key}')
+            self.logger.debug('About to call hgetall on key: %s', key)
             raw_state = self.redis.hgetall(key)
-            print(f'[DEBUG] hgetall completed, items: {len(raw_state)}')
+            self.logger.debug('hgetall completed, items: %s', len(raw_state))
             if not raw_state:
-                print(f'[DEBUG] No raw state found, returning empty dict')
+                self.logger.debug('No raw state found, returning empty dict')
                 return {}
             
-            print(f'[DEBUG] Decoding bytes to string...')
+            self.logger.debug('Decoding bytes to string...')
             # Decode bytes to string
             state = {k.decode(): v.decode() for k, v in raw_state.items()}
-            print(f'[DEBUG] Decoded {len(state)} state items')
+            self.logger.debug('Decoded %s state items', len(state))
             
-            print(f'[DEBUG] Parsing JSON values...')
+            self.logger.debug('Parsing JSON values...')
             # Decode JSON values
             for k, v in list(state.items()):
                 try:
@@ -331,26 +362,26 @@ class ResilientRedisManager:
                 except json.JSONDecodeError:
                     pass  # Keep as string if not valid JSON
             
-            print(f'[DEBUG] _redis_get completed successfully')
+            self.logger.debug('_redis_get completed successfully')
             return state
         
         cache_key = self._create_cache_key("game_state", room_code)
-        print(f'[DEBUG] Cache key: {cache_key}')
-        print(f'[DEBUG] Circuit breaker state: {self.circuits["read"].state}')
-        print(f'[DEBUG] About to call circuit breaker...')
+        self.logger.debug('Cache key: %s', cache_key)
+        self.logger.debug('Circuit breaker state: %s', self.circuits["read"].state)
+        self.logger.debug('About to call circuit breaker...')
         
         # Add emergency bypass for debugging
         if hasattr(self, 'bypass_circuit_breaker') and self.bypass_circuit_breaker:
-            print(f'[DEBUG] BYPASS MODE: Calling _redis_get directly')
+            self.logger.debug('BYPASS MODE: Calling _redis_get directly')
             try:
                 direct_result = _redis_get()
                 elapsed = time.time() - start_time
-                print(f'[DEBUG] === get_game_state END (BYPASS, {elapsed:.2f}s) ===')
+                self.logger.debug('=== get_game_state END (BYPASS, %.2fs) ===', elapsed)
                 return direct_result
             except Exception as e:
-                print(f'[ERROR] Direct Redis call failed: {e}')
+                self.logger.error('Direct Redis call failed: %s', e)
                 elapsed = time.time() - start_time
-                print(f'[DEBUG] === get_game_state END (BYPASS FAILED, {elapsed:.2f}s) ===')
+                self.logger.debug('=== get_game_state END (BYPASS FAILED, %.2fs) ===', elapsed)
                 return {}
         
         result = self.circuits['read'].call(
@@ -360,15 +391,15 @@ class ResilientRedisManager:
         )
         
         elapsed = time.time() - start_time
-        print(f'[DEBUG] Circuit call completed: success={result.success}')
-        print(f'[DEBUG] === get_game_state END ({elapsed:.2f}s) ===')
+        self.logger.debug('Circuit call completed: success=%s', result.success)
+        self.logger.debug('=== get_game_state END (%.2fs) ===', elapsed)
         
         return result.value if result.success else {}
     
     def room_exists(self, room_code: str) -> bool:
         """Check if room exists with circuit breaker protection"""
         try:
-            print(f"[DEBUG] room_exists: Checking if room {room_code} exists...")
+            self.logger.debug("room_exists: Checking if room %s exists...", room_code)
             state_key = f"game:{room_code}:state"
             players_key = f"room:{room_code}:players"
             
@@ -377,10 +408,10 @@ class ResilientRedisManager:
             players_exist = bool(self.redis.exists(players_key))
             exists = state_exists or players_exist
             
-            print(f"[DEBUG] room_exists: Room {room_code} - state:{state_exists}, players:{players_exist}, exists:{exists}")
+            self.logger.debug("room_exists: Room %s - state:%s, players:%s, exists:%s", room_code, state_exists, players_exist, exists)
             return exists
         except Exception as e:
-            print(f"[DEBUG] room_exists: Redis error: {e}")
+            self.logger.debug("room_exists: Redis error: %s", e)
             return self._fallback_room_exists(room_code)
     
     def create_room(self, room_code: str) -> bool:
@@ -391,7 +422,7 @@ class ResilientRedisManager:
             
             # Only create if room doesn't exist
             if self.redis.exists(state_key) or self.redis.exists(players_key):
-                print(f"[DEBUG] create_room: Room {room_code} already exists, skipping creation")
+                self.logger.debug("create_room: Room %s already exists, skipping creation", room_code)
                 return True
             
             # Initialize room state
@@ -400,7 +431,7 @@ class ResilientRedisManager:
             self.redis.expire(state_key, 3600)
             
             # Note: Don't initialize players list - let add_player_to_room handle it
-            print(f"[DEBUG] create_room: Created room {room_code}")
+            self.logger.debug("create_room: Created room %s", room_code)
             return True
         
         def _fallback_create():
@@ -479,6 +510,131 @@ class ResilientRedisManager:
         
         return result.value if result.success else []
     
+    def append_room_event(self, room_code: str, event_id: str, msg_type: str, data: dict,
+                          maxlen: int = JOURNAL_MAXLEN) -> bool:
+        """Append a broadcast to the room's capped stream journal (room:{code}:journal)"""
+        def _redis_append():
+            key = f"room:{room_code}:journal"
+            pipe = self.redis.pipeline()
+            pipe.xadd(key, {
+                'type': msg_type,
+                'data': json.dumps(data),
+                'timestamp': str(time.time())
+            }, id=event_id, maxlen=maxlen, approximate=True)
+            pipe.expire(key, 3600)
+            pipe.execute()
+            return True
+
+        result = self.circuits['write'].call(_redis_append)
+        return result.success
+
+    def read_room_events(self, room_code: str, after_id: str = '0-0', count: int = JOURNAL_MAXLEN) -> List[dict]:
+        """Journal entries strictly after after_id, oldest first"""
+        def _redis_read():
+            response = self.redis.xread({f"room:{room_code}:journal": after_id}, count=count)
+            events = []
+            for _, entries in response or []:
+                for entry_id, fields in entries:
+                    fields = {k.decode(): v.decode() for k, v in fields.items()}
+                    events.append({
+                        'event_id': entry_id.decode(),
+                        'type': fields.get('type'),
+                        'data': json.loads(fields.get('data', '{}')),
+                        'timestamp': float(fields.get('timestamp', 0))
+                    })
+            return events
+
+        result = self.circuits['read'].call(_redis_read, fallback_func=lambda: [])
+        return result.value if result.success else []
+
+    def append_game_events(self, room_code: str, events: List[dict], maxlen: int = EVENT_LOG_MAXLEN) -> bool:
+        """Append game events to room:{code}:events (entry id 0-<seq>) in one pipeline"""
+        def _redis_append():
+            key = f"room:{room_code}:events"
+            pipe = self.redis.pipeline()
+            for event in events:
+                pipe.xadd(key, {
+                    'type': event['type'],
+                    'data': json.dumps(event['data']),
+                    'timestamp': str(event['timestamp'])
+                }, id=f"0-{event['seq']}", maxlen=maxlen, approximate=True)
+            pipe.expire(key, 3600)
+            pipe.execute()
+            return True
+
+        result = self.circuits['write'].call(_redis_append)
+        return result.success
+
+    def clear_game_events(self, room_code: str) -> bool:
+        """Delete the room's event log and snapshot (before a new game starts over at seq 1)"""
+        def _redis_clear():
+            self.redis.delete(f"room:{room_code}:events", f"room:{room_code}:snapshot")
+            return True
+
+        result = self.circuits['write'].call(_redis_clear)
+        return result.success
+
+    def read_game_events(self, room_code: str, after_seq: int = 0) -> List[dict]:
+        """Game events with seq greater than after_seq, oldest first"""
+        def _redis_read():
+            entries = self.redis.xrange(f"room:{room_code}:events", min=f"0-{after_seq + 1}", max='+')
+            events = []
+            for entry_id, fields in entries or []:
+                fields = {k.decode(): v.decode() for k, v in fields.items()}
+                events.append({
+                    'seq': int(entry_id.decode().split('-')[1]),
+                    'type': fields.get('type'),
+                    'data': json.loads(fields.get('data', '{}')),
+                    'timestamp': float(fields.get('timestamp', 0))
+                })
+            return events
+
+        result = self.circuits['read'].call(_redis_read, fallback_func=lambda: [])
+        return result.value if result.success else []
+
+    def save_game_snapshot(self, room_code: str, snapshot: dict) -> bool:
+        """Replace the room's snapshot (room:{code}:snapshot) with {'seq', 'state'}"""
+        def _redis_save():
+            key = f"room:{room_code}:snapshot"
+            pipe = self.redis.pipeline()
+            pipe.hset(key, mapping={'seq': str(snapshot['seq']), 'state': json.dumps(snapshot['state'])})
+            pipe.expire(key, 3600)
+            pipe.execute()
+            return True
+
+        result = self.circuits['write'].call(_redis_save)
+        return result.success
+
+    def get_game_snapshot(self, room_code: str) -> Optional[dict]:
+        """Latest snapshot of a room as {'seq', 'state'}, or None"""
+        def _redis_get():
+            fields = self.redis.hgetall(f"room:{room_code}:snapshot")
+            if not fields:
+                return None
+            fields = {k.decode(): v.decode() for k, v in fields.items()}
+            return {'seq': int(fields['seq']), 'state': json.loads(fields['state'])}
+
+        result = self.circuits['read'].call(_redis_get, fallback_func=lambda: None)
+        return result.value if result.success else None
+
+    def last_game_event_seq(self, room_code: str) -> int:
+        """Seq of the newest event in the room's event log (0 if it has none)"""
+        def _redis_last():
+            entries = self.redis.xrevrange(f"room:{room_code}:events", max='+', min='-', count=1)
+            return int(entries[0][0].decode().split('-')[1]) if entries else 0
+
+        result = self.circuits['read'].call(_redis_last, fallback_func=lambda: 0)
+        return result.value if result.success else 0
+
+    def scan_game_rooms(self, cursor: int = 0, count: int = 100) -> Tuple[int, List[str]]:
+        """One SCAN step over game:*:state keys -> (next cursor, room codes); cursor 0 means done"""
+        def _redis_scan():
+            next_cursor, keys = self.redis.scan(cursor=cursor, match="game:*:state", count=count)
+            return int(next_cursor), [key.decode().split(':')[1] for key in keys]
+
+        result = self.circuits['scan'].call(_redis_scan, fallback_func=lambda: (0, []))
+        return result.value if result.success else (0, [])
+
     def get_circuit_breaker_status(self) -> Dict[str, Any]:
         """Get status of all circuit breakers"""
         status = {}
@@ -606,31 +762,31 @@ class ResilientRedisManager:
             tuple: (is_valid, session_data or error_info)
         """
         try:
-            print(f"[DEBUG] attempt_reconnect: Getting session for {player_id[:8]}...")
+            self.logger.debug("attempt_reconnect: Getting session for %s...", player_id[:8])
             # Get existing session
             session = self.get_player_session(player_id)
-            print(f"[DEBUG] attempt_reconnect: Session retrieved: {session is not None}")
+            self.logger.debug("attempt_reconnect: Session retrieved: %s", session is not None)
             
             if not session:
-                print(f"[DEBUG] attempt_reconnect: No session found")
+                self.logger.debug("attempt_reconnect: No session found")
                 return False, {'error': 'No session found for player'}
             
             # Check if session has required fields
-            print(f"[DEBUG] attempt_reconnect: Checking required fields...")
+            self.logger.debug("attempt_reconnect: Checking required fields...")
             required_fields = ['username', 'room_code']
             for field in required_fields:
                 if field not in session:
-                    print(f"[DEBUG] attempt_reconnect: Missing field: {field}")
+                    self.logger.debug("attempt_reconnect: Missing field: %s", field)
                     return False, {'error': f'Invalid session: missing {field}'}
             
             # Check if the room still exists
             room_code = session['room_code']
-            print(f"[DEBUG] attempt_reconnect: Checking if room {room_code} exists...")
+            self.logger.debug("attempt_reconnect: Checking if room %s exists...", room_code)
             if not self.room_exists(room_code):
-                print(f"[DEBUG] attempt_reconnect: Room {room_code} does not exist")
+                self.logger.debug("attempt_reconnect: Room %s does not exist", room_code)
                 return False, {'error': 'Game room no longer exists'}
             
-            print(f"[DEBUG] attempt_reconnect: Room exists, updating session...")
+            self.logger.debug("attempt_reconnect: Room exists, updating session...")
             # Update session with reconnection data
             if reconnect_data:
                 session.update(reconnect_data)
@@ -639,14 +795,14 @@ class ResilientRedisManager:
             session['connection_status'] = 'active'
             session['last_reconnect'] = str(int(time.time()))
             
-            print(f"[DEBUG] attempt_reconnect: Saving updated session...")
+            self.logger.debug("attempt_reconnect: Saving updated session...")
             # Save updated session
             if self.save_player_session(player_id, session):
-                print(f"[DEBUG] attempt_reconnect: Session saved successfully")
+                self.logger.debug("attempt_reconnect: Session saved successfully")
                 self.logger.info(f"Player {player_id[:8]}... successfully reconnected to room {room_code}")
                 return True, session
             else:
-                print(f"[DEBUG] attempt_reconnect: Failed to save session")
+                self.logger.debug("attempt_reconnect: Failed to save session")
                 return False, {'error': 'Failed to update session'}
                 
         except Exception as e:
@@ -664,12 +820,12 @@ class ResilientRedisManager:
             bool: True if session was closed successfully
         """
         try:
-            print(f"[DEBUG] close_player_session: Closing session for {player_id[:8]}...")
+            self.logger.debug("close_player_session: Closing session for %s...", player_id[:8])
             
             # Get existing session
             session = self.get_player_session(player_id)
             if not session:
-                print(f"[DEBUG] close_player_session: No session found for {player_id[:8]}...")
+                self.logger.debug("close_player_session: No session found for %s...", player_id[:8])
                 return True  # Already closed
             
             # Update session to mark as disconnected
@@ -679,15 +835,15 @@ class ResilientRedisManager:
             
             # Save updated session (don't delete - keep for reconnection)
             if self.save_player_session(player_id, session):
-                print(f"[DEBUG] close_player_session: Session marked as disconnected for {player_id[:8]}...")
+                self.logger.debug("close_player_session: Session marked as disconnected for %s...", player_id[:8])
                 self.logger.info(f"Player {player_id[:8]}... session closed due to exit")
                 return True
             else:
-                print(f"[DEBUG] close_player_session: Failed to update session for {player_id[:8]}...")
+                self.logger.debug("close_player_session: Failed to update session for %s...", player_id[:8])
                 return False
                 
         except Exception as e:
-            print(f"[ERROR] close_player_session: {e}")
+            self.logger.error("close_player_session: %s", e)
             self.logger.error(f"Error closing session for {player_id[:8]}...: {e}")
             return False
 
@@ -702,12 +858,12 @@ class ResilientRedisManager:
             bool: True if session was updated successfully
         """
         try:
-            print(f"[DEBUG] disconnect_player_session: Disconnecting session for {player_id[:8]}...")
+            self.logger.debug("disconnect_player_session: Disconnecting session for %s...", player_id[:8])
             
             # Get existing session
             session = self.get_player_session(player_id)
             if not session:
-                print(f"[DEBUG] disconnect_player_session: No session found for {player_id[:8]}...")
+                self.logger.debug("disconnect_player_session: No session found for %s...", player_id[:8])
                 return True
             
             # Update session to mark as disconnected
@@ -717,15 +873,15 @@ class ResilientRedisManager:
             
             # Save updated session
             if self.save_player_session(player_id, session):
-                print(f"[DEBUG] disconnect_player_session: Session marked as disconnected for {player_id[:8]}...")
+                self.logger.debug("disconnect_player_session: Session marked as disconnected for %s...", player_id[:8])
                 self.logger.info(f"Player {player_id[:8]}... session disconnected")
                 return True
             else:
-                print(f"[DEBUG] disconnect_player_session: Failed to update session for {player_id[:8]}...")
+                self.logger.debug("disconnect_player_session: Failed to update session for %s...", player_id[:8])
                 return False
                 
         except Exception as e:
-            print(f"[ERROR] disconnect_player_session: {e}")
+            self.logger.error("disconnect_player_session: %s", e)
             self.logger.error(f"Error disconnecting session for {player_id[:8]}...: {e}")
             return False
     
@@ -750,12 +906,12 @@ class ResilientRedisManager:
                     # Keep player if they're in the active list
                     if player_id in active_player_ids:
                         kept_players.append(p)
-                        print(f"[DEBUG] Keeping active player {username}")
+                        self.logger.debug("Keeping active player %s", username)
                     else:
                         removed_count += 1
-                        print(f"[DEBUG] Removing disconnected player {username}")
+                        self.logger.debug("Removing disconnected player %s", username)
                 except Exception as e:
-                    print(f"[DEBUG] Error processing player data: {e}")
+                    self.logger.debug("Error processing player data: %s", e)
                     continue
             
             if removed_count > 0:
@@ -765,28 +921,28 @@ class ResilientRedisManager:
                     self.redis.rpush(key, *kept_players)
                     self.redis.expire(key, 3600)
                 
-                print(f"[DEBUG] Cleaned up {removed_count} disconnected players from room {room_code}")
+                self.logger.debug("Cleaned up %s disconnected players from room %s", removed_count, room_code)
             
             return True
             
         except Exception as e:
-            print(f"[ERROR] Failed to cleanup disconnected players: {e}")
+            self.logger.error("Failed to cleanup disconnected players: %s", e)
             return False
     
     def update_player_in_room(self, room_code: str, player_id: str, updated_data: dict):
         """Update player data in room with circuit breaker protection"""
         try:
-            print(f"[DEBUG] update_player_in_room: Updating player {player_id[:8]}... in room {room_code}")
+            self.logger.debug("update_player_in_room: Updating player %s... in room %s", player_id[:8], room_code)
             key = f"room:{room_code}:players"
             
             # Get all players in the room
             players = self.redis.lrange(key, 0, -1)
             
             if not players:
-                print(f"[DEBUG] update_player_in_room: No players found in room {room_code}")
+                self.logger.debug("update_player_in_room: No players found in room %s", room_code)
                 return False
             
-            print(f"[DEBUG] update_player_in_room: room {room_code} has {len(players)} players before update")
+            self.logger.debug("update_player_in_room: room %s has %s players before update", room_code, len(players))
             
             # Find and update the specific player
             updated = False
@@ -799,14 +955,14 @@ class ResilientRedisManager:
                         # Replace the entry in Redis
                         self.redis.lset(key, i, json.dumps(player_data))
                         updated = True
-                        print(f"[DEBUG] update_player_in_room: Updated player {player_id[:8]}... in room {room_code}")
+                        self.logger.debug("update_player_in_room: Updated player %s... in room %s", player_id[:8], room_code)
                         break
                 except (json.JSONDecodeError, UnicodeDecodeError) as e:
-                    print(f"[DEBUG] update_player_in_room: Error decoding player data at index {i}: {e}")
+                    self.logger.debug("update_player_in_room: Error decoding player data at index %s: %s", i, e)
                     continue
             
             if not updated:
-                print(f"[DEBUG] update_player_in_room: Player {player_id[:8]}... not found in room {room_code}")
+                self.logger.debug("update_player_in_room: Player %s... not found in room %s", player_id[:8], room_code)
                 return False
             
             # Set expiration
@@ -814,17 +970,17 @@ class ResilientRedisManager:
             return True
             
         except Exception as e:
-            print(f"[ERROR] update_player_in_room: Redis error: {e}")
+            self.logger.error("update_player_in_room: Redis error: %s", e)
             # Fallback to in-memory cache
             try:
                 if room_code in self.fallback_cache['room_players']:
                     for player in self.fallback_cache['room_players'][room_code]:
                         if player.get('player_id') == player_id:
                             player.update(updated_data)
-                            print(f"[DEBUG] update_player_in_room: Updated player {player_id[:8]}... in fallback cache")
+                            self.logger.debug("update_player_in_room: Updated player %s... in fallback cache", player_id[:8])
                             return True
-                print(f"[DEBUG] update_player_in_room: Player {player_id[:8]}... not found in fallback cache")
+                self.logger.debug("update_player_in_room: Player %s... not found in fallback cache", player_id[:8])
                 return False
             except Exception as fallback_error:
-                print(f"[ERROR] update_player_in_room: Fallback failed: {fallback_error}")
+                self.logger.error("update_player_in_room: Fallback failed: %s", fallback_error)
                 return False
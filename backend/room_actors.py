@@ -0,0 +1,185 @@
+# room_actors.py
+"""
+Per-room actors for serial command processing.
+
+handle_connection awaited handle_message inline for each socket, so the
+commands of one room, arriving on four sockets, interleaved at every await
+inside the handlers: a play_card could validate a move, yield on a broadcast
+and find the board changed underneath it when it resumed. Each active room
+now has a RoomActor - one asyncio task draining a bounded mailbox - so the
+room's commands run one at a time in arrival order, and the board is only
+touched from that task.
+
+Submitting to a full mailbox raises MailboxFull instead of queueing without
+bound. Actors stop after idle_timeout seconds without commands and are
+recreated on the next one. A handler that is already running on its room's
+actor and calls run() for the same room executes inline instead of
+deadlocking on its own mailbox.
+"""
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+DEFAULT_MAILBOX_SIZE = 64      # Commands a room may have queued before new ones are rejected
+DEFAULT_IDLE_TIMEOUT = 300.0   # Seconds without commands before a room's actor stops
+
+Handler = Callable[..., Awaitable[Any]]
+
+
+class MailboxFull(Exception):
+    """Raised when a room's mailbox is at capacity"""
+
+
+class RoomActor:
+    """One room's mailbox and the task that processes it serially"""
+
+    def __init__(self, room_code: str, mailbox_size: int = DEFAULT_MAILBOX_SIZE,
+                 idle_timeout: float = DEFAULT_IDLE_TIMEOUT,
+                 on_stop: Optional[Callable[['RoomActor'], None]] = None):
+        self.room_code = room_code
+        self.idle_timeout = idle_timeout
+        self.mailbox: asyncio.Queue = asyncio.Queue(maxsize=mailbox_size)
+        self.task: Optional[asyncio.Task] = None
+        self._on_stop = on_stop
+
+        # Metrics
+        self.processed = 0
+        self.failed = 0
+        self.rejected = 0
+        self.max_depth = 0
+        self.wait_times = deque(maxlen=1000)      # Seconds a command sat in the mailbox
+        self.process_times = deque(maxlen=1000)   # Seconds spent running the handler
+
+    def start(self):
+        self.task = asyncio.create_task(self._run(), name=f"room-actor-{self.room_code}")
+
+    def submit(self, handler: Handler, *args) -> asyncio.Future:
+        """Queue handler(*args); the returned future resolves with its result"""
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.mailbox.put_nowait((handler, args, future, time.monotonic()))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise MailboxFull(f"Mailbox for room {self.room_code} is full ({self.mailbox.maxsize} commands)")
+        self.max_depth = max(self.max_depth, self.mailbox.qsize())
+        return future
+
+    async def _run(self):
+        try:
+            while True:
+                getter = asyncio.ensure_future(self.mailbox.get())
+                try:
+                    done, _ = await asyncio.wait({getter}, timeout=self.idle_timeout)
+                except asyncio.CancelledError:
+                    getter.cancel()
+                    raise
+                if not done:
+                    getter.cancel()
+                    if self.mailbox.empty():
+                        break
+                    continue
+                handler, args, future, enqueued_at = getter.result()
+                started = time.monotonic()
+                self.wait_times.append(started - enqueued_at)
+                try:
+                    result = await handler(*args)
+                except asyncio.CancelledError:
+                    future.cancel()
+                    raise
+                except Exception as e:
+                    self.failed += 1
+                    if not future.done():
+                        future.set_exception(e)
+                else:
+                    if not future.done():
+                        future.set_result(result)
+                finally:
+                    self.processed += 1
+                    self.process_times.append(time.monotonic() - started)
+        finally:
+            # Nothing can be queued between here and on_stop (no await), so no command is lost
+            while not self.mailbox.empty():
+                _, _, future, _ = self.mailbox.get_nowait()
+                future.cancel()
+            if self._on_stop is not None:
+                self._on_stop(self)
+
+    async def stop(self):
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Mailbox depth and latencies (milliseconds) for this room"""
+        wait_times = list(self.wait_times)
+        process_times = list(self.process_times)
+        return {
+            'depth': self.mailbox.qsize(),
+            'max_depth': self.max_depth,
+            'processed': self.processed,
+            'failed': self.failed,
+            'rejected': self.rejected,
+            'avg_wait_ms': (sum(wait_times) / len(wait_times) * 1000) if wait_times else 0.0,
+            'max_wait_ms': max(wait_times) * 1000 if wait_times else 0.0,
+            'avg_process_ms': (sum(process_times) / len(process_times) * 1000) if process_times else 0.0,
+            'max_process_ms': max(process_times) * 1000 if process_times else 0.0
+        }
+
+
+class RoomActorRegistry:
+    """Creates a RoomActor per active room on demand and routes commands to it"""
+
+    def __init__(self, mailbox_size: int = DEFAULT_MAILBOX_SIZE, idle_timeout: float = DEFAULT_IDLE_TIMEOUT):
+        self.mailbox_size = mailbox_size
+        self.idle_timeout = idle_timeout
+        self.actors: Dict[str, RoomActor] = {}
+        self.started = 0
+        self.stopped = 0
+        self.rejected = 0    # Rejections by actors that have since stopped
+
+    def get(self, room_code: str) -> RoomActor:
+        actor = self.actors.get(room_code)
+        if actor is None:
+            actor = RoomActor(room_code, self.mailbox_size, self.idle_timeout, on_stop=self._actor_stopped)
+            self.actors[room_code] = actor
+            actor.start()
+            self.started += 1
+        return actor
+
+    def _actor_stopped(self, actor: RoomActor):
+        if self.actors.get(actor.room_code) is actor:
+            del self.actors[actor.room_code]
+        self.stopped += 1
+        self.rejected += actor.rejected
+
+    async def run(self, room_code: str, handler: Handler, *args) -> Any:
+        """Run handler(*args) on the room's actor and wait for it; raises MailboxFull"""
+        actor = self.get(room_code)
+        if asyncio.current_task() is actor.task:
+            return await handler(*args)
+        return await actor.submit(handler, *args)
+
+    def submit(self, room_code: str, handler: Handler, *args) -> asyncio.Future:
+        """Queue handler(*args) on the room's actor without waiting; raises MailboxFull"""
+        return self.get(room_code).submit(handler, *args)
+
+    async def stop_all(self):
+        for actor in list(self.actors.values()):
+            await actor.stop()
+
+    def get_metrics(self) -> Dict[str, Any]:
+        rooms = {room_code: actor.get_metrics() for room_code, actor in self.actors.items()}
+        return {
+            'active_actors': len(rooms),
+            'started': self.started,
+            'stopped': self.stopped,
+            'mailbox_size': self.mailbox_size,
+            'queued_commands': sum(m['depth'] for m in rooms.values()),
+            'rejected': self.rejected + sum(m['rejected'] for m in rooms.values()),
+            'rooms': rooms
+        }
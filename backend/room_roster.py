@@ -0,0 +1,112 @@
+# room_roster.py
+"""
+Authoritative in-process roster for active rooms.
+
+GameServer keeps one RoomRoster per room so the hot path (card validation,
+turn notifications, broadcasts) can resolve websocket <-> player_id <->
+username without reading the room player list back from Redis. Redis stays
+the durable copy: the server writes roster changes through asynchronously.
+"""
+
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class RoomRoster:
+    """Players of one room in seat order, plus the sockets currently bound to them"""
+
+    def __init__(self, room_code: str):
+        self.room_code = room_code
+        self.players: Dict[str, Dict[str, Any]] = {}  # player_id -> player dict (join order)
+        self.username_index: Dict[str, str] = {}      # username -> player_id
+        self.socket_index: Dict[Any, str] = {}        # websocket -> player_id
+
+    def __len__(self) -> int:
+        return len(self.players)
+
+    def __contains__(self, player_id: str) -> bool:
+        return player_id in self.players
+
+    def add_player(self, player_id: str, username: str, websocket=None, **fields) -> Dict[str, Any]:
+        """Add or update a player; binds the websocket when given"""
+        player = self.players.get(player_id)
+        if player is None:
+            player = {'player_id': player_id, 'username': username, 'connection_status': 'disconnected'}
+            self.players[player_id] = player
+        elif player['username'] != username:
+            self.username_index.pop(player['username'], None)
+            player['username'] = username
+
+        player.update(fields)
+        self.username_index[username] = player_id
+        if websocket is not None:
+            self.bind_socket(websocket, player_id)
+        return player
+
+    def remove_player(self, player_id: str):
+        """Drop a player and any socket bound to them"""
+        player = self.players.pop(player_id, None)
+        if player is None:
+            return
+        self.username_index.pop(player['username'], None)
+        for ws in [ws for ws, pid in self.socket_index.items() if pid == player_id]:
+            del self.socket_index[ws]
+
+    def retain_players(self, player_ids) -> List[str]:
+        """Keep only the given players (e.g. the connected four at game start); returns removed ids"""
+        keep = set(player_ids)
+        removed = [pid for pid in self.players if pid not in keep]
+        for pid in removed:
+            self.remove_player(pid)
+        return removed
+
+    def bind_socket(self, websocket, player_id: str) -> bool:
+        """Attach a (new) websocket to a known player and mark them active"""
+        player = self.players.get(player_id)
+        if player is None:
+            return False
+        # A player has at most one live socket; drop the previous one on reconnect
+        for ws in [ws for ws, pid in self.socket_index.items() if pid == player_id and ws is not websocket]:
+            del self.socket_index[ws]
+        self.socket_index[websocket] = player_id
+        player['connection_status'] = 'active'
+        return True
+
+    def unbind_socket(self, websocket) -> Optional[str]:
+        """Detach a closed websocket; the player keeps their seat for reconnection"""
+        player_id = self.socket_index.pop(websocket, None)
+        if player_id is not None and player_id in self.players:
+            self.players[player_id]['connection_status'] = 'disconnected'
+        return player_id
+
+    def get_player_by_socket(self, websocket) -> Tuple[Optional[str], Optional[str]]:
+        """(username, player_id) for a bound websocket, or (None, None)"""
+        player_id = self.socket_index.get(websocket)
+        if player_id is None:
+            return None, None
+        return self.players[player_id]['username'], player_id
+
+    def get_player_id(self, username: str) -> Optional[str]:
+        return self.username_index.get(username)
+
+    def get_player(self, player_id: str) -> Optional[Dict[str, Any]]:
+        return self.players.get(player_id)
+
+    def active_count(self) -> int:
+        return sum(1 for p in self.players.values() if p.get('connection_status') == 'active')
+
+    def to_room_players(self) -> List[Dict[str, Any]]:
+        """Player dicts in seat order, shaped like the Redis room player list"""
+        return [dict(p) for p in self.players.values()]
+
+    @classmethod
+    def from_room_players(cls, room_code: str, room_players: List[Dict[str, Any]]) -> 'RoomRoster':
+        """Build a roster from Redis room player entries (no sockets bound)"""
+        roster = cls(room_code)
+        for entry in room_players:
+            player_id = entry.get('player_id')
+            username = entry.get('username')
+            if not player_id or not username:
+                continue
+            fields = {k: v for k, v in entry.items() if k not in ('player_id', 'username', 'connection_status')}
+            roster.add_player(player_id, username, **fields)
+        return roster
@@ -0,0 +1,390 @@
+# room_sharding.py
+"""
+Multi-process server with room-affinity sharding.
+
+One server process runs one asyncio loop on one core. ShardSupervisor
+(``python server.py --workers N``) starts N worker processes, each a normal
+server listening on a private port, and gives each a disjoint shard of room
+codes: ConsistentHashRing maps a room code to its owning worker, so adding a
+worker only moves about 1/N of the rooms.
+
+Clients keep connecting to the public port, where the supervisor runs a
+ShardAcceptor. The acceptor relays each connection to a worker and, when the
+client sends join/reconnect for a room owned by another worker, re-opens the
+relay to the owner: the connection's auth messages are replayed there (their
+responses are swallowed) before the join is forwarded. Existing clients need
+no changes. Workers also refuse rooms they do not own and answer with a
+'redirect' message naming the owner, so a misrouted connection can never
+split a room across processes.
+
+Crashed workers are restarted with exponential backoff; their rooms come back
+through lazy hydration from Redis (GameServer.get_game). Workers push stats
+to the supervisor, which aggregates them (get_stats, the 'shard_stats'
+message on the public port, and a periodic log line).
+"""
+
+import asyncio
+import bisect
+import hashlib
+import logging
+import multiprocessing
+import os
+import queue
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+import websockets
+
+import log_pipeline
+import wire_protocol
+
+log = logging.getLogger(__name__)
+
+AUTH_MESSAGE_TYPES = ('auth_login', 'auth_register', 'auth_token')
+ROUTED_MESSAGE_TYPES = ('join', 'reconnect')
+
+
+class ConsistentHashRing:
+    """Maps keys (room codes) to nodes with virtual nodes, stable across processes"""
+
+    def __init__(self, nodes: Iterable[Any], replicas: int = 64):
+        self.replicas = replicas
+        self._keys: List[int] = []
+        self._nodes: List[Any] = []
+        for node in nodes:
+            self.add(node)
+
+    @staticmethod
+    def _hash(value: str) -> int:
+        # Python's hash() is salted per process; every worker must agree on ownership
+        return int.from_bytes(hashlib.md5(value.encode()).digest()[:8], 'big')
+
+    def add(self, node: Any):
+        for replica in range(self.replicas):
+            point = self._hash(f"{node}#{replica}")
+            index = bisect.bisect(self._keys, point)
+            self._keys.insert(index, point)
+            self._nodes.insert(index, node)
+
+    def node_for(self, key: str) -> Any:
+        if not self._keys:
+            raise ValueError("Hash ring has no nodes")
+        index = bisect.bisect(self._keys, self._hash(key)) % len(self._keys)
+        return self._nodes[index]
+
+
+@dataclass
+class ShardConfig:
+    """Supervisor settings"""
+    workers: int = 2
+    host: str = '0.0.0.0'                  # public acceptor address
+    port: int = 8765
+    worker_host: str = '127.0.0.1'         # workers listen privately on worker_base_port + index
+    worker_base_port: int = 8800
+    worker_args: List[str] = field(default_factory=list)   # extra server.py arguments (e.g. --redis-mode)
+    restart_backoff: float = 1.0           # first restart delay; doubles per crash up to max_restart_backoff
+    max_restart_backoff: float = 30.0
+    stable_after: float = 60.0             # a worker up this long has its backoff reset
+    stats_interval: float = 5.0            # how often workers report stats
+    log_interval: float = 60.0             # how often the supervisor logs aggregated stats
+
+    def worker_urls(self) -> List[str]:
+        return [f"ws://{self.worker_host}:{self.worker_base_port + i}" for i in range(self.workers)]
+
+
+def _routing_fields(raw) -> Optional[Dict[str, Any]]:
+    """Parse a client frame only if it can affect routing (auth, join, reconnect)"""
+    if isinstance(raw, str) and ('auth_' not in raw and 'join' not in raw
+                                 and 'reconnect' not in raw and 'shard_stats' not in raw):
+        return None
+    try:
+        # Binary frames (wire_protocol) are small and have no cheap text pre-check
+        message = wire_protocol.decode(raw)
+    except wire_protocol.DECODE_ERRORS:
+        return None
+    return message if isinstance(message, dict) else None
+
+
+def _is_auth_response(raw) -> bool:
+    if isinstance(raw, str):
+        return '"auth_response"' in raw
+    message = _routing_fields(raw)
+    return message is not None and message.get('type') == 'auth_response'
+
+
+class _BackendLink:
+    """The acceptor's relay from one client connection to its current worker"""
+
+    def __init__(self, client, connect_timeout: float = 10.0):
+        self.client = client
+        self.connect_timeout = connect_timeout
+        self.url: Optional[str] = None
+        self.ws = None
+        self.pump: Optional[asyncio.Task] = None
+
+    async def open(self, url: str, replay: Iterable[str] = ()):
+        """Connect to url, replay auth frames (dropping their responses), then switch the relay over"""
+        # Relay frames verbatim: the worker must speak the wire protocol the client negotiated
+        subprotocol = getattr(self.client, 'subprotocol', None)
+        ws = await asyncio.wait_for(
+            websockets.connect(url, max_size=1024 * 1024, subprotocols=[subprotocol] if subprotocol else None),
+            timeout=self.connect_timeout
+        )
+        try:
+            for raw in replay:
+                await ws.send(raw)
+                await self._skip_until_auth_response(ws)
+        except Exception:
+            await ws.close()
+            raise
+        old_ws, old_pump = self.ws, self.pump
+        self.ws, self.url = ws, url
+        self.pump = asyncio.create_task(self._pump(ws))
+        if old_pump is not None:
+            old_pump.cancel()
+        if old_ws is not None:
+            await old_ws.close()
+
+    async def _skip_until_auth_response(self, ws):
+        while True:
+            raw = await asyncio.wait_for(ws.recv(), timeout=self.connect_timeout)
+            if _is_auth_response(raw):
+                return
+
+    async def _pump(self, ws):
+        try:
+            async for raw in ws:
+                await self.client.send(raw)
+        except asyncio.CancelledError:
+            raise  # switched to another worker; the client stays open
+        except websockets.ConnectionClosed:
+            pass
+        # The worker went away (crash or restart): close the client so it reconnects
+        await self.client.close(1012, "worker restarting")
+
+    async def send(self, raw):
+        await self.ws.send(raw)
+
+    async def close(self):
+        if self.pump is not None:
+            self.pump.cancel()
+        if self.ws is not None:
+            await self.ws.close()
+
+
+class ShardAcceptor:
+    """Public endpoint that relays each client to the worker owning its room"""
+
+    def __init__(self, worker_urls: List[str], ring: Optional[ConsistentHashRing] = None,
+                 stats_provider: Optional[Callable[[], Dict[str, Any]]] = None):
+        self.worker_urls = list(worker_urls)
+        self.ring = ring or ConsistentHashRing(range(len(self.worker_urls)))
+        self.stats_provider = stats_provider
+        self._next_home = 0
+
+        # Metrics
+        self.open_connections = 0
+        self.total_connections = 0
+        self.handoffs = 0
+        self.failed_handoffs = 0
+
+    def owner_url(self, room_code: str) -> str:
+        return self.worker_urls[self.ring.node_for(room_code)]
+
+    def _home_url(self) -> str:
+        # Connections that have not named a room yet are spread round-robin
+        url = self.worker_urls[self._next_home % len(self.worker_urls)]
+        self._next_home += 1
+        return url
+
+    async def handle(self, client):
+        self.open_connections += 1
+        self.total_connections += 1
+        link = _BackendLink(client)
+        auth_frames: List[str] = []
+        try:
+            await link.open(self._home_url())
+            async for raw in client:
+                message = _routing_fields(raw)
+                if message is not None:
+                    msg_type = message.get('type')
+                    if msg_type in AUTH_MESSAGE_TYPES:
+                        auth_frames.append(raw)
+                    elif msg_type in ROUTED_MESSAGE_TYPES and message.get('room_code'):
+                        owner = self.owner_url(str(message['room_code']))
+                        if owner != link.url:
+                            try:
+                                await link.open(owner, replay=auth_frames)
+                                self.handoffs += 1
+                            except Exception as e:
+                                # The current worker answers with a redirect instead
+                                self.failed_handoffs += 1
+                                log.error("Handoff to %s failed: %s", owner, e)
+                    elif msg_type == 'shard_stats' and self.stats_provider is not None:
+                        await client.send(wire_protocol.encode_for(client, {'type': 'shard_stats', 'data': self.stats_provider()}))
+                        continue
+                await link.send(raw)
+        except websockets.ConnectionClosed:
+            pass
+        except Exception as e:
+            log.error("Acceptor relay error: %s", e)
+        finally:
+            await link.close()
+            self.open_connections -= 1
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            'open_connections': self.open_connections,
+            'total_connections': self.total_connections,
+            'handoffs': self.handoffs,
+            'failed_handoffs': self.failed_handoffs
+        }
+
+
+def run_worker(index: int, config: ShardConfig, stats_queue):
+    """Worker process entry point: a normal server owning shard `index`"""
+    import server  # imported here so the supervisor process never builds a GameServer
+
+    argv = [
+        '--host', config.worker_host,
+        '--port', str(config.worker_base_port + index),
+        '--instance-name', f"shard-{index}",
+        '--shard-index', str(index),
+        '--shard-urls', ','.join(config.worker_urls()),
+        '--stats-interval', str(config.stats_interval),
+        *config.worker_args,
+    ]
+    args = server.build_arg_parser().parse_args(argv)
+    asyncio.run(server.main(args, stats_queue=stats_queue))
+
+
+class _WorkerSlot:
+    __slots__ = ('index', 'process', 'started_at', 'restarts', 'backoff', 'restart_at', 'stats')
+
+    def __init__(self, index: int, backoff: float):
+        self.index = index
+        self.process: Optional[multiprocessing.Process] = None
+        self.started_at = 0.0
+        self.restarts = 0
+        self.backoff = backoff
+        self.restart_at: Optional[float] = None
+        self.stats: Dict[str, Any] = {}
+
+
+class ShardSupervisor:
+    """Starts and restarts the shard workers and runs the public acceptor"""
+
+    def __init__(self, config: ShardConfig, worker_target: Callable = run_worker):
+        self.config = config
+        self.worker_target = worker_target
+        self._context = multiprocessing.get_context('fork' if hasattr(os, 'fork') else 'spawn')
+        self.stats_queue = self._context.Queue()
+        self.slots = [_WorkerSlot(i, config.restart_backoff) for i in range(config.workers)]
+        self.acceptor = ShardAcceptor(config.worker_urls(), stats_provider=self.get_stats)
+
+    def _start_worker(self, slot: _WorkerSlot):
+        slot.process = self._context.Process(
+            target=self.worker_target, args=(slot.index, self.config, self.stats_queue),
+            name=f"hokm-shard-{slot.index}", daemon=True
+        )
+        slot.process.start()
+        slot.started_at = time.time()
+        slot.restart_at = None
+        log.info("Shard worker %s started (pid %s)", slot.index, slot.process.pid)
+
+    def check_workers(self, now: Optional[float] = None):
+        """Schedule restarts for dead workers and start those whose backoff has expired"""
+        now = time.time() if now is None else now
+        for slot in self.slots:
+            process = slot.process
+            if process is not None and process.is_alive():
+                if now - slot.started_at >= self.config.stable_after:
+                    slot.backoff = self.config.restart_backoff
+                continue
+            if slot.restart_at is None:
+                exitcode = process.exitcode if process is not None else None
+                slot.restart_at = now + slot.backoff
+                log.error("Shard worker %s exited (code %s), restarting in %.1fs", slot.index, exitcode, slot.backoff)
+                slot.backoff = min(slot.backoff * 2, self.config.max_restart_backoff)
+            elif now >= slot.restart_at:
+                slot.restarts += 1
+                self._start_worker(slot)
+
+    def drain_stats(self):
+        while True:
+            try:
+                stats = self.stats_queue.get_nowait()
+            except queue.Empty:
+                return
+            index = stats.get('shard_index')
+            if index is not None and 0 <= index < len(self.slots):
+                self.slots[index].stats = stats
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-worker stats plus totals across the shard"""
+        workers = {}
+        for slot in self.slots:
+            alive = slot.process is not None and slot.process.is_alive()
+            workers[slot.index] = {
+                'pid': slot.process.pid if slot.process is not None else None,
+                'alive': alive,
+                'restarts': slot.restarts,
+                'uptime': time.time() - slot.started_at if alive else 0.0,
+                **slot.stats
+            }
+        return {
+            'workers': len(self.slots),
+            'alive_workers': sum(1 for w in workers.values() if w['alive']),
+            'restarts': sum(slot.restarts for slot in self.slots),
+            'active_games': sum(w.get('active_games', 0) for w in workers.values()),
+            'connections': sum(w.get('connections', 0) for w in workers.values()),
+            'acceptor': self.acceptor.get_metrics(),
+            'per_worker': workers
+        }
+
+    async def _monitor(self):
+        last_log = time.time()
+        while True:
+            await asyncio.sleep(1.0)
+            self.drain_stats()
+            self.check_workers()
+            if time.time() - last_log >= self.config.log_interval:
+                last_log = time.time()
+                stats = self.get_stats()
+                log.info("Shards: %s/%s alive, %s games, %s connections, %s restarts", stats['alive_workers'],
+                         stats['workers'], stats['active_games'], stats['connections'], stats['restarts'])
+
+    async def serve(self):
+        for slot in self.slots:
+            self._start_worker(slot)
+        monitor = asyncio.create_task(self._monitor())
+        try:
+            async with websockets.serve(self.acceptor.handle, self.config.host, self.config.port,
+                                        max_size=1024 * 1024, max_queue=100,
+                                        subprotocols=wire_protocol.server_subprotocols(),
+                                        select_subprotocol=wire_protocol.select_subprotocol,
+                                        **wire_protocol.server_compression()):
+                log.info("Shard acceptor listening on ws://%s:%s for %s workers",
+                         self.config.host, self.config.port, self.config.workers)
+                await asyncio.Future()
+        finally:
+            monitor.cancel()
+            self.stop_workers()
+
+    def stop_workers(self, timeout: float = 5.0):
+        for slot in self.slots:
+            if slot.process is not None and slot.process.is_alive():
+                slot.process.terminate()
+        for slot in self.slots:
+            if slot.process is not None:
+                slot.process.join(timeout)
+
+    def run(self):
+        log_pipeline.configure_logging()
+        try:
+            asyncio.run(self.serve())
+        except KeyboardInterrupt:
+            log.info("Shard supervisor shutting down...")
+        finally:
+            log_pipeline.shutdown_logging()
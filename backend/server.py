@@ -8,23 +8,40 @@ import uuid
 import random
 import time
 import os
-import concurrent.futures
 import traceback
+import itertools
+import logging
 
 # Add current directory to Python path for imports
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from network import NetworkManager
+from network_delta import DeltaNetworkManager
 from game_board import GameBoard
+from game_board_bits import BitGameBoard
+from game_board_compact import CompactGameBoard
+from game_events import GameEventLog, replay, take_snapshot
 from game_states import GameState
 from redis_manager_resilient import ResilientRedisManager as RedisManager
+from redis_manager_async_resilient import AsyncResilientRedisManager
 from circuit_breaker_monitor import CircuitBreakerMonitor
+from heartbeat import HeartbeatScheduler
+from io_executor import IOExecutor
+import log_pipeline
+from room_actors import MailboxFull, RoomActorRegistry
+from room_roster import RoomRoster
+from room_sharding import ConsistentHashRing, ShardConfig, ShardSupervisor
+from timer_wheel import TimerWheel
+import wire_protocol
+from write_behind import WriteBehindPersister
+
+log = logging.getLogger('server')
 try:
     from game_auth_manager import GameAuthManager
     DATABASE_AUTH_AVAILABLE = True
 except Exception as e:
-    print(f"[WARNING] Database authentication not available: {e}")
-    print("[INFO] Using simple file-based authentication as fallback")
+    log.warning("Database authentication not available: %s", e)
+    log.info("Using simple file-based authentication as fallback")
     from simple_auth_manager import SimpleAuthManager as GameAuthManager
     DATABASE_AUTH_AVAILABLE = False
 
@@ -32,83 +49,545 @@ except Exception as e:
 ROOM_SIZE = 4    # Single game storage system
 
 class GameServer:
-    def __init__(self):
-        self.redis_manager = RedisManager()
+    def __init__(self, redis_mode=None):
+        # 'sync' keeps ResilientRedisManager on the IOExecutor; 'async' awaits pooled redis.asyncio calls
+        self.redis_mode = redis_mode or os.getenv('HOKM_REDIS_MODE', 'sync')
+        if self.redis_mode == 'async':
+            self.redis_manager = AsyncResilientRedisManager()
+        else:
+            self.redis_manager = RedisManager()
         self.circuit_breaker_monitor = CircuitBreakerMonitor(self.redis_manager)
-        self.network_manager = NetworkManager()
+        # 'delta' also streams every state change to the players as sequenced deltas with periodic
+        # keyframes, acknowledged by clients and resumed on reconnect (network_delta.py)
+        self.state_sync = os.getenv('HOKM_STATE_SYNC', 'events')
+        self.delta_sync = self.state_sync == 'delta'
+        self.network_manager = DeltaNetworkManager() if self.delta_sync else NetworkManager()
+        self.io_executor = IOExecutor()  # Shared pool for blocking Redis calls
         
         # Initialize authentication manager with fallback
         try:
             self.auth_manager = GameAuthManager()  # Try database auth first
-            print(f"[AUTH] Authentication manager initialized (Database: {DATABASE_AUTH_AVAILABLE})")
+            log.info("Authentication manager initialized (Database: %s)", DATABASE_AUTH_AVAILABLE)
         except Exception as e:
-            print(f"[ERROR] Failed to initialize authentication manager: {e}")
+            log.error("Failed to initialize authentication manager: %s", e)
             from simple_auth_manager import SimpleAuthManager
             self.auth_manager = SimpleAuthManager()
-            print("[AUTH] Using simple authentication fallback")
+            log.info("Using simple authentication fallback")
             
         self.active_games = {}  # Maps room_code -> GameBoard for active games only
-        self.load_active_games_from_redis()  # Load active games on startup
+        # 'bits' stores hands/played cards as 52-bit masks (BitGameBoard); 'compact' also drops the
+        # per-player dicts for seat arrays (CompactGameBoard); 'strings' is the classic board
+        self.board_class = {
+            'bits': BitGameBoard,
+            'compact': CompactGameBoard,
+        }.get(os.getenv('HOKM_CARD_ENGINE', 'strings'), GameBoard)
+        # Game event log (room:{code}:events) gets a snapshot every this many events
+        self.snapshot_every = int(os.getenv('HOKM_SNAPSHOT_EVERY', '64'))
+        self.room_rosters = {}  # Maps room_code -> RoomRoster (authoritative while the room is live)
+        # Each active room's commands run serially on its own actor task (see room_actors.py)
+        self.room_actors = RoomActorRegistry(
+            mailbox_size=int(os.getenv('HOKM_ROOM_MAILBOX_SIZE', '64')),
+            idle_timeout=float(os.getenv('HOKM_ROOM_ACTOR_IDLE', '300'))
+        )
+        # Coalesces game state saves; flushed at phase boundaries and on shutdown
+        self.state_persister = WriteBehindPersister(
+            self._save_room_state, window=float(os.getenv('HOKM_PERSIST_WINDOW', '0.25'))
+        )
+        # Games are hydrated from Redis on first use (get_game); room_code -> in-flight load
+        self._hydrations = {}
+        self.hydration_metrics = {'hydrated': 0, 'not_found': 0, 'failed': 0, 'shared_loads': 0, 'warmed': 0}
+        # Optional background warm-up after a restart: at most this many rooms (0 disables it),
+        # only those active within the last HOKM_WARMUP_MAX_IDLE seconds
+        self.warmup_rooms = int(os.getenv('HOKM_WARMUP_ROOMS', '0'))
+        self.warmup_max_idle = int(os.getenv('HOKM_WARMUP_MAX_IDLE', '900'))
+        self.warmup_task = None
+        # Set by configure_sharding when this process is one worker of a ShardSupervisor
+        self.shard_index = None
+        self.shard_urls = []
+        self.shard_ring = None
+        # One task pings only sockets that have been silent for HOKM_HEARTBEAT_IDLE seconds
+        self.heartbeat = HeartbeatScheduler(
+            self.handle_dead_connection,
+            idle_timeout=float(os.getenv('HOKM_HEARTBEAT_IDLE', '30')),
+            pong_timeout=float(os.getenv('HOKM_HEARTBEAT_PONG_TIMEOUT', '10')),
+            max_parallel=int(os.getenv('HOKM_HEARTBEAT_PARALLEL', '64'))
+        )
+        # Turn and hokm-selection deadlines; on expiry a legal card / a suit is chosen for the
+        # stalled player (0 disables). room_code -> (turn token, timer sequence)
+        self.turn_timeout = float(os.getenv('HOKM_TURN_TIMEOUT', '30'))
+        self.hokm_timeout = float(os.getenv('HOKM_HOKM_TIMEOUT', '30'))
+        self.turn_timers = TimerWheel(tick=float(os.getenv('HOKM_TIMER_TICK', '0.1')))
+        self.turn_deadlines = {}
+        self._deadline_seq = itertools.count(1)
+        self.auto_play_metrics = {'cards': 0, 'hokm': 0, 'superseded': 0, 'failed': 0}
+
+    async def startup(self):
+        """Start the heartbeat and open the Redis connection pool when running in async mode"""
+        self.heartbeat.start()
+        self.turn_timers.start()
+        if getattr(self.redis_manager, 'is_async', False):
+            if await self.redis_manager.connect():
+                log.info("Async Redis pool ready (size=%s)", self.redis_manager.pool_size)
+            else:
+                log.error("Async Redis connection failed, circuit breaker fallbacks will be used")
+
+    async def shutdown(self):
+        """Flush pending game state and close the async Redis pool"""
+        if self.warmup_task is not None:
+            self.warmup_task.cancel()
+        await self.heartbeat.stop()
+        await self.turn_timers.stop()
+        await self.room_actors.stop_all()
+        await self.state_persister.flush_all()
+        if getattr(self.redis_manager, 'is_async', False):
+            await self.redis_manager.disconnect()
+
+    def configure_sharding(self, shard_index, shard_urls):
+        """Own only the rooms the consistent hash ring assigns to shard_index"""
+        self.shard_index = shard_index
+        self.shard_urls = list(shard_urls)
+        self.shard_ring = ConsistentHashRing(range(len(self.shard_urls)))
+        log.info("Shard worker %s of %s", shard_index, len(self.shard_urls))
+
+    async def check_room_owner(self, websocket, room_code):
+        """True if this process owns room_code; otherwise send the client a redirect to the owner"""
+        if self.shard_ring is None or not room_code:
+            return True
+        owner = self.shard_ring.node_for(str(room_code))
+        if owner == self.shard_index:
+            return True
+        log.info("Room %s belongs to shard %s, redirecting client", room_code, owner)
+        await self.network_manager.send_message(websocket, 'redirect', {
+            'room_code': room_code,
+            'shard': owner,
+            'url': self.shard_urls[owner]
+        })
+        return False
+
+    def get_shard_stats(self):
+        """Summary pushed to the ShardSupervisor"""
+        return {
+            'shard_index': self.shard_index,
+            'pid': os.getpid(),
+            'timestamp': time.time(),
+            'active_games': len(self.active_games),
+            'connections': len(self.network_manager.connection_metadata),
+            'room_actors': self.room_actors.get_metrics()['active_actors'],
+            'queued_commands': self.room_actors.get_metrics()['queued_commands'],
+            'hydrated_games': self.hydration_metrics['hydrated'],
+            'fast_reconnects': self.network_manager.reconnect_stats['fast'],
+            'slow_reconnects': self.network_manager.reconnect_stats['slow']
+        }
+
+    async def run_in_room(self, websocket, room_code, handler, *args):
+        """Run a room command on the room's actor, so commands for one room never interleave"""
+        try:
+            return await self.room_actors.run(room_code, handler, *args)
+        except MailboxFull:
+            log.info("Room %s mailbox full, rejecting command", room_code)
+            await self.network_manager.notify_error(websocket, "Room is busy, please try again.")
+
+    async def redis_call(self, func, *args, timeout=2.0):
+        """Run a redis_manager method natively (async mode) or on the shared IOExecutor (sync mode)"""
+        return await self.network_manager.redis_call(self.redis_manager, func, *args, timeout=timeout)
 
-    def load_active_games_from_redis(self):
-        """Load all active games from Redis into self.active_games on server startup."""
-        print("[LOG] Starting fresh - no Redis game loading for faster startup")
-        return  # Bypass Redis loading to avoid startup hang
+    def get_roster(self, room_code):
+        """Return the in-memory roster for a room, creating an empty one if needed"""
+        roster = self.room_rosters.get(room_code)
+        if roster is None:
+            roster = RoomRoster(room_code)
+            self.room_rosters[room_code] = roster
+        return roster
+
+    async def _ensure_roster(self, room_code):
+        """Return the roster for a room, hydrating it from Redis when the server has none (e.g. after restart)"""
+        roster = self.room_rosters.get(room_code)
+        if roster is not None and len(roster):
+            return roster
+        try:
+            room_players = await self.redis_call(self.redis_manager.get_room_players, room_code, timeout=2.0)
+        except Exception as e:
+            log.debug("Could not hydrate roster for room %s: %s", room_code, e)
+            room_players = []
+        roster = RoomRoster.from_room_players(room_code, room_players or [])
+        self.room_rosters[room_code] = roster
+        return roster
+
+    def drop_room_state(self, room_code):
+        """Forget the in-memory game, roster and journal sequence for a room"""
+        self.active_games.pop(room_code, None)
+        self.room_rosters.pop(room_code, None)
+        self.network_manager.journal_ids.pop(room_code, None)
+        self.state_persister.discard(room_code)
+        self.cancel_turn_deadline(room_code)
+        if self.delta_sync:
+            self.network_manager.cleanup_room_data(room_code)
+
+    def arm_turn_deadline(self, room_code):
+        """Arm the room's deadline for whoever must act now (hakem choosing hokm, or the current player)"""
+        game = self.active_games.get(room_code)
+        phase = getattr(game, 'game_phase', None)
+        if phase == GameState.WAITING_FOR_HOKM.value:
+            timeout = self.hokm_timeout
+        elif phase == GameState.GAMEPLAY.value:
+            timeout = self.turn_timeout
+        else:
+            timeout = 0
+        if timeout <= 0:
+            self.cancel_turn_deadline(room_code)
+            return
+        # Re-arming for the same turn (e.g. after a rejected play) keeps the original deadline
+        token = (phase, game.current_turn, game.hakem, len(game.played_cards))
+        armed = self.turn_deadlines.get(room_code)
+        if armed is not None and armed[0] == token and room_code in self.turn_timers:
+            return
+        seq = next(self._deadline_seq)
+        self.turn_deadlines[room_code] = (token, seq)
+        self.turn_timers.arm(room_code, timeout, self._turn_deadline_expired, room_code, seq)
+
+    def cancel_turn_deadline(self, room_code):
+        self.turn_timers.cancel(room_code)
+        self.turn_deadlines.pop(room_code, None)
+
+    def _turn_deadline_expired(self, room_code, seq):
+        """Timer callback: auto-play on the room's actor so it is ordered with the players' commands"""
+        try:
+            future = self.room_actors.submit(room_code, self.auto_play_turn, room_code, seq)
+        except MailboxFull:
+            log.error("Room %s mailbox full, retrying turn deadline", room_code)
+            self.turn_timers.arm(room_code, 1.0, self._turn_deadline_expired, room_code, seq)
+            return
+        future.add_done_callback(self._auto_play_done)
+
+    def _auto_play_done(self, future):
+        if not future.cancelled() and future.exception() is not None:
+            self.auto_play_metrics['failed'] += 1
+            log.error("Auto-play failed: %s", future.exception())
+
+    async def auto_play_turn(self, room_code, seq):
+        """Act for a player whose deadline expired: pick a suit for the hakem or play a legal card"""
+        armed = self.turn_deadlines.get(room_code)
+        if armed is None or armed[1] != seq:
+            # The player acted (or the room moved on) after the timer fired
+            self.auto_play_metrics['superseded'] += 1
+            return
+        del self.turn_deadlines[room_code]
+        game = self.active_games.get(room_code)
+        if game is None:
+            return
+        roster = self.get_roster(room_code)
+
+        if game.game_phase == GameState.WAITING_FOR_HOKM.value:
+            hakem = game.hakem
+            suit = self.choose_auto_hokm(game, hakem)
+            log.info("Hokm deadline expired for %s in room %s, choosing %s", hakem, room_code, suit)
+            self.auto_play_metrics['hokm'] += 1
+            await self.broadcast_to_room(room_code, 'turn_timeout', {'player': hakem, 'action': 'hokm', 'suit': suit})
+            websocket = self.network_manager.get_live_connection(roster.get_player_id(hakem))
+            await self.handle_hokm_selection(websocket, {'room_code': room_code, 'suit': suit})
+        elif game.game_phase == GameState.GAMEPLAY.value:
+            player = game.players[game.current_turn]
+            card = self.choose_auto_card(game, player)
+            if card is None:
+                log.error("No legal card for %s in room %s", player, room_code)
+                return
+            log.info("Turn deadline expired for %s in room %s, playing %s", player, room_code, card)
+            self.auto_play_metrics['cards'] += 1
+            await self.broadcast_to_room(room_code, 'turn_timeout', {'player': player, 'action': 'play_card', 'card': card})
+            player_id = roster.get_player_id(player)
+            websocket = self.network_manager.get_live_connection(player_id)
+            await self.apply_card_play(websocket, room_code, game, player, player_id, card)
+
+    @staticmethod
+    def choose_auto_card(game, player):
+        """Lowest-ranked card the player may legally play (validate_play enforces following suit)"""
+        legal = [card for card in game.hands.get(player, []) if game.validate_play(player, card)[0]]
+        if not legal:
+            return None
+        return min(legal, key=lambda card: game._card_value(card.split('_')[0]))
+
+    @staticmethod
+    def choose_auto_hokm(game, hakem):
+        """The suit the hakem holds most of (highest ranks break ties)"""
+        hand = game.hands.get(hakem, [])
+        def strength(suit):
+            ranks = [game._card_value(card.split('_')[0]) for card in hand if card.split('_')[1] == suit]
+            return (len(ranks), sum(ranks))
+        return max(('hearts', 'diamonds', 'clubs', 'spades'), key=strength)
+
+    async def broadcast_to_room(self, room_code, msg_type, data):
+        """Broadcast using the in-memory roster when available, avoiding a Redis player-list read"""
+        roster = self.room_rosters.get(room_code)
+        players = roster.to_room_players() if roster is not None and len(roster) else None
+        await self.network_manager.broadcast_to_room(room_code, msg_type, data, self.redis_manager, players=players)
+
+    async def sync_room_state(self, room_code, game=None):
+        """Delta sync: queue the room's latest state; bursts of changes go out as one sequence"""
+        if not self.delta_sync:
+            return
+        if game is None:
+            game = self.active_games.get(room_code)
+            if game is None:
+                return
+        players = await self.get_room_players_cached(room_code)
+        if room_code in self.network_manager.room_delta_managers:
+            update = {'changes': game.take_state_changes()}
+        else:
+            update = {'state': game.take_state_changes(full=True)}   # Starts the stream with a keyframe
+        update['players'] = players
+        await self.network_manager.batch_updates(room_code, update)
+
+    async def resume_state(self, websocket, last_sequence=None, epoch=None):
+        """Delta sync: send a reconnected socket only the state changes after its last sequence"""
+        metadata = self.network_manager.connection_metadata.get(websocket)
+        if not self.delta_sync or not metadata or not metadata.get('room_code'):
+            return
+        room_code = metadata['room_code']
+        if room_code not in self.network_manager.room_delta_managers:
+            # No stream since this process started (e.g. restart): its first state is a keyframe
+            await self.sync_room_state(room_code, await self.get_game(room_code))
+            return
+        await self.network_manager.resume_player(websocket, room_code, metadata['player_id'],
+                                                 metadata['username'], last_sequence, epoch)
+
+    async def get_room_players_cached(self, room_code):
+        """Room players from the roster; falls back to Redis, then to live connections"""
+        roster = self.room_rosters.get(room_code)
+        if roster is not None and len(roster):
+            return roster.to_room_players()
+        try:
+            room_players = await self.redis_call(self.redis_manager.get_room_players, room_code, timeout=2.0)
+            if room_players:
+                return room_players
+        except Exception as e:
+            log.debug("Redis lookup of room players failed: %s", e)
+        return [
+            {'player_id': meta['player_id'], 'username': meta['username'], 'connection_status': 'active'}
+            for _, meta in self.network_manager.get_room_connections(room_code)
+        ]
+
+    async def _save_room_state(self, room_code, game_state, moves):
+        """Write-behind target: game-event append, then one pipelined state write plus move history"""
+        success = False
+        game = self.active_games.get(room_code)
+        try:
+            # Events go first, so the event log that recovery replays is never behind the state hash,
+            # and a failed append is retried before any of these moves have been written
+            if game is not None and game.event_log is not None and not await self._append_game_events(room_code, game):
+                return False
+            if 'created_at' in game_state:
+                # Full snapshot (first write of a board, or recovery after a failed write)
+                success = await self.redis_call(self.redis_manager.save_game_state, room_code, game_state, moves, timeout=2.0)
+            else:
+                # Dirty-field delta from GameBoard.to_redis_delta
+                success = await self.redis_call(self.redis_manager.update_game_state_fields, room_code, game_state, moves, timeout=2.0)
+        finally:
+            if not success and game is not None:
+                # The delta was consumed; make the retry rewrite everything
+                game.mark_all_dirty()
+        return success
+
+    async def _append_game_events(self, room_code, game):
+        """Append the board's pending events to the room event log; store a snapshot when one is due"""
+        event_log = game.event_log
+        if event_log.clear_stored:
+            if not await self.redis_call(self.redis_manager.clear_game_events, room_code, timeout=2.0):
+                return False
+            event_log.clear_stored = False
+        events = event_log.take_pending()
+        if events:
+            appended = False
+            try:
+                appended = await self.redis_call(self.redis_manager.append_game_events, room_code, events, timeout=2.0)
+            finally:
+                if not appended:
+                    event_log.restore_pending(events)
+            if not appended:
+                return False
+        if event_log.snapshot_due():
+            snapshot = take_snapshot(game, event_log.seq)
+            try:
+                if await self.redis_call(self.redis_manager.save_game_snapshot, room_code, snapshot, timeout=2.0):
+                    event_log.mark_snapshot(snapshot['seq'])
+            except Exception as e:
+                # The event log is complete without it; try again after the next events
+                log.debug("Snapshot for room %s failed: %s", room_code, e)
+        return True
+
+    async def load_game_from_events(self, room_code):
+        """
+        Rebuild a room's board from its latest snapshot plus the event tail.
+        Returns None if the room has no event log; raises ValueError if it does not replay.
+        """
+        snapshot = await self.redis_call(self.redis_manager.get_game_snapshot, room_code, timeout=2.0)
+        after = snapshot['seq'] if snapshot else 0
+        # From the snapshot's own event on, so the newest event's time is known even without a tail
+        events = await self.redis_call(self.redis_manager.read_game_events, room_code, max(after - 1, 0), timeout=2.0)
+        if snapshot is None and not events:
+            return None
+        players = None if snapshot else events[0]['data'].get('players')
+        game = replay(events, snapshot=snapshot, players=players, board_class=self.board_class, room_code=room_code)
+        seq = max(after, events[-1]['seq']) if events else after
+        game.event_log = GameEventLog(room_code, self.snapshot_every, seq=seq)
+        game.event_log.mark_snapshot(after)
+        if events:
+            game.last_move_at = int(events[-1]['timestamp'])
+        # The board's first write is a full one, bringing a state hash that lags the log up to date
+        log.info("Rebuilt room %s from snapshot seq %s plus %s events", room_code, after, seq - after)
+        return game
+
+    async def _load_game_from_state(self, room_code):
+        """Rebuild a room's board from its full Redis state hash; None if there is none"""
+        state = await self.redis_call(self.redis_manager.get_game_state, room_code, timeout=2.0)
+        if not state or 'players' not in state:
+            return None
+        players = state['players']
+        if isinstance(players, str):
+            players = json.loads(players)
+        game = self.board_class.from_redis_dict(state, players, room_code)
+        game.last_move_at = int(float(state.get('last_activity') or 0))
+        # The hash already holds this state; only later changes need writing
+        game.to_redis_delta()
+        seq = await self.redis_call(self.redis_manager.last_game_event_seq, room_code, timeout=2.0)
+        game.event_log = GameEventLog(room_code, self.snapshot_every, seq=seq)
+        # A fresh snapshot makes the next recovery replay from here rather than from an unusable log
+        game.event_log.request_snapshot()
+        return game
+
+    async def get_game(self, room_code):
+        """
+        Return the room's board, hydrating it from Redis when this process has none
+        (e.g. after a restart). Concurrent callers for a room share one load.
+        Returns None if Redis has no unfinished game for the room.
+        """
+        game = self.active_games.get(room_code)
+        if game is not None or not room_code:
+            return game
+        task = self._hydrations.get(room_code)
+        if task is None:
+            task = self._start_hydration(room_code)
+        else:
+            self.hydration_metrics['shared_loads'] += 1
+        # A cancelled caller must not cancel the load other callers are waiting on
+        return await asyncio.shield(task)
+
+    def _start_hydration(self, room_code, max_idle=None):
+        task = asyncio.ensure_future(self._hydrate_game(room_code, max_idle))
+        self._hydrations[room_code] = task
+        task.add_done_callback(lambda _: self._hydrations.pop(room_code, None))
+        return task
+
+    async def _hydrate_game(self, room_code, max_idle=None):
+        """
+        Rebuild a room's board and register it (see get_game): replayed from its
+        snapshot and event tail, or loaded from the state hash when the room has
+        no event log (or one that does not replay).
+        """
+        try:
+            game = None
+            try:
+                game = await self.load_game_from_events(room_code)
+            except ValueError as e:
+                log.warning("Event log of room %s does not replay (%s), loading its state hash", room_code, e)
+            if game is None:
+                game = await self._load_game_from_state(room_code)
+            if game is None or game.game_phase in ('completed', GameState.GAME_OVER.value):
+                self.hydration_metrics['not_found'] += 1
+                return None
+            if max_idle is not None and time.time() - game.last_move_at > max_idle:
+                return None
+        except Exception as e:
+            self.hydration_metrics['failed'] += 1
+            log.error("Failed to hydrate game for room %s: %s", room_code, e)
+            return None
+
+        # A join handled while we were loading may have created a board already
+        game = self.active_games.setdefault(room_code, game)
+        await self._ensure_roster(room_code)
+        self.hydration_metrics['hydrated'] += 1
+        log.info("Hydrated room %s from Redis (phase: %s)", room_code, game.game_phase)
+        return game
+
+    async def warm_up_games(self, max_rooms=None, batch_size=100, concurrency=8):
+        """
+        Hydrate recently active games in the background after a restart.
+        SCANs game states in batches and loads at most max_rooms of them,
+        concurrency at a time, so startup and live traffic are not held up.
+        """
+        max_rooms = self.warmup_rooms if max_rooms is None else max_rooms
+        semaphore = asyncio.Semaphore(concurrency)
+        warmed = 0
+        cursor = 0
+
+        async def warm(room_code):
+            async with semaphore:
+                if room_code in self.active_games or room_code in self._hydrations:
+                    return False
+                task = self._start_hydration(room_code, max_idle=self.warmup_max_idle)
+                return await asyncio.shield(task) is not None
+
+        while warmed < max_rooms:
+            cursor, room_codes = await self.redis_call(self.redis_manager.scan_game_rooms, cursor, batch_size, timeout=5.0)
+            batch = room_codes[:max_rooms - warmed]
+            if batch:
+                results = await asyncio.gather(*(warm(code) for code in batch), return_exceptions=True)
+                warmed += sum(1 for result in results if result is True)
+            if cursor == 0:
+                break
+        self.hydration_metrics['warmed'] += warmed
+        log.info("Warm-up hydrated %s active games", warmed)
+        return warmed
+
+    def start_warmup(self):
+        """Start warm_up_games as a background task when HOKM_WARMUP_ROOMS is set"""
+        if self.warmup_rooms > 0 and self.warmup_task is None:
+            self.warmup_task = asyncio.create_task(self.warm_up_games())
+        return self.warmup_task
 
     async def handle_join(self, websocket, data):
         """Handle a new player joining with separated connection and state management"""
-        print(f"[DEBUG] handle_join called with data: {data}")
+        log.debug("handle_join called with data: %s", data)
         try:
             room_code = data.get('room_code', '9999')
-            print(f"[DEBUG] Room code: {room_code}")
+            log.debug("Room code: %s", room_code)
             
-            print(f"[DEBUG] About to check if room exists...")
+            log.debug("About to check if room exists...")
             # Check if room exists properly
             try:
-                executor = concurrent.futures.ThreadPoolExecutor()
-                loop = asyncio.get_event_loop()
-                room_exists = await asyncio.wait_for(
-                    loop.run_in_executor(executor, self.redis_manager.room_exists, room_code),
-                    timeout=2.0
-                )
-                print(f"[DEBUG] Room exists check result: {room_exists}")
+                room_exists = await self.redis_call(self.redis_manager.room_exists, room_code, timeout=2.0)
+                log.debug("Room exists check result: %s", room_exists)
             except Exception as e:
-                print(f"[DEBUG] Room check failed: {e}, assuming new room")
+                log.debug("Room check failed: %s, assuming new room", e)
                 room_exists = False
-            print(f"[DEBUG] Room exists check result: {room_exists}")
+            log.debug("Room exists check result: %s", room_exists)
             if not room_exists:
-                print(f"[DEBUG] Room {room_code} doesn't exist, creating it")
+                log.debug("Room %s doesn't exist, creating it", room_code)
                 try:
                     # Add timeout to Redis operations
-                    executor = concurrent.futures.ThreadPoolExecutor()
-                    loop = asyncio.get_event_loop()
-                    await asyncio.wait_for(
-                        loop.run_in_executor(executor, self.redis_manager.create_room, room_code),
-                        timeout=2.0
-                    )
-                    print(f"[LOG] Room {room_code} created successfully")
+                    await self.redis_call(self.redis_manager.create_room, room_code, timeout=2.0)
+                    log.info("Room %s created successfully", room_code)
                 except asyncio.TimeoutError:
-                    print(f"[DEBUG] Redis timeout when creating room, continuing anyway")
+                    log.debug("Redis timeout when creating room, continuing anyway")
                 except Exception as e:
-                    print(f"[ERROR] Failed to create room {room_code}: {str(e)}")
+                    log.error("Failed to create room %s: %s", room_code, e)
                     # Continue anyway - room creation is not critical for basic functionality
             else:
-                print(f"[DEBUG] Room {room_code} already exists")
+                log.debug("Room %s already exists", room_code)
 
             # Check if game is cancelled due to not enough players (after a disconnect)
             # BUT: Don't cancel if this is a reconnection request - give it a chance to complete
-            print(f"[DEBUG] Checking for existing game in room {room_code}")
-            game = self.active_games.get(room_code)
-            print(f"[DEBUG] Existing game found: {game is not None}")
+            log.debug("Checking for existing game in room %s", room_code)
+            game = await self.get_game(room_code)
+            log.debug("Existing game found: %s", game is not None)
             if game:
-                print(f"[DEBUG] Getting game phase...")
+                log.debug("Getting game phase...")
                 phase = getattr(game, 'game_phase', None)
-                print(f"[DEBUG] Game phase: {phase}")
-                print(f"[DEBUG] Getting room players...")
+                log.debug("Game phase: %s", phase)
+                log.debug("Getting room players...")
                 # connected_players = [p for p in self.redis_manager.get_room_players(room_code) if p.get('connection_status') == 'active']
                 # Temporarily bypass this Redis call that might be hanging
                 connected_players = []
-                print(f"[DEBUG] Connected players: {len(connected_players)}")
+                log.debug("Connected players: %s", len(connected_players))
                 
                 # Only cancel if:
                 # 1. Not enough active players AND
@@ -122,55 +601,48 @@ class GameServer:
                 
                 if len(connected_players) < ROOM_SIZE and is_critical_phase:
                     # Check if this might be a reconnection by looking for disconnected players
-                    disconnected_players = [p for p in self.redis_manager.get_room_players(room_code) if p.get('connection_status') != 'active']
+                    room_players = await self.redis_call(self.redis_manager.get_room_players, room_code, timeout=2.0)
+                    disconnected_players = [p for p in room_players if p.get('connection_status') != 'active']
                     
                     # If there are disconnected players, give them a chance to reconnect
                     # Only cancel if no disconnected players exist (meaning players truly left)
                     if not disconnected_players:
-                        print(f"[LOG] Not enough players in room {room_code} during join (phase: {phase}). No disconnected players to reconnect. Cancelling game.")
+                        log.info("Not enough players in room %s during join (phase: %s). No disconnected players to reconnect. Cancelling game.", room_code, phase)
                         await self.network_manager.notify_error(websocket, "Game was cancelled due to player disconnect.")
-                        await self.network_manager.broadcast_to_room(
+                        await self.broadcast_to_room(
                             room_code,
                             'game_cancelled',
-                            {'message': 'A player disconnected and not enough players remain. The game has been cancelled.'},
-                            self.redis_manager
+                            {'message': 'A player disconnected and not enough players remain. The game has been cancelled.'}
                         )
-                        if room_code in self.active_games:
-                            del self.active_games[room_code]
+                        self.drop_room_state(room_code)
                         
                         # Delete game state with timeout to avoid hanging
                         try:
-                            executor = concurrent.futures.ThreadPoolExecutor()
-                            loop = asyncio.get_event_loop()
-                            await asyncio.wait_for(
-                                loop.run_in_executor(executor, self.redis_manager.delete_game_state, room_code),
-                                timeout=2.0
-                            )
-                            print(f"[DEBUG] Deleted game state for room {room_code}")
+                            await self.redis_call(self.redis_manager.delete_game_state, room_code, timeout=2.0)
+                            log.debug("Deleted game state for room %s", room_code)
                         except asyncio.TimeoutError:
-                            print(f"[DEBUG] Redis timeout when deleting game state, continuing anyway")
+                            log.debug("Redis timeout when deleting game state, continuing anyway")
                         except Exception as e:
-                            print(f"[DEBUG] Could not delete game state: {e}, continuing anyway")
+                            log.debug("Could not delete game state: %s, continuing anyway", e)
                         
                         return None
                     else:
-                        print(f"[LOG] Room {room_code} has disconnected players who might reconnect. Not cancelling game yet.")
+                        log.info("Room %s has disconnected players who might reconnect. Not cancelling game yet.", room_code)
 
             # Check if room is full (count only active players for new joins)
-            print(f"[DEBUG] Getting room players...")
+            log.debug("Getting room players...")
             
             # SIMPLIFIED: Use only network manager connections for now to avoid Redis hangs
             room_players = []
-            for ws, metadata in self.network_manager.connection_metadata.items():
-                if metadata.get('room_code') == room_code:
-                    room_players.append({
-                        'player_id': metadata.get('player_id'),
-                        'username': f"Player {len(room_players) + 1}",
-                        'connection_status': 'active'
-                    })
-            print(f"[DEBUG] Room players from network manager: {len(room_players)}")
+            for ws, metadata in self.network_manager.get_room_connections(room_code):
+                room_players.append({
+                    'player_id': metadata.get('player_id'),
+                    'username': f"Player {len(room_players) + 1}",
+                    'connection_status': 'active'
+                })
+            log.debug("Room players from network manager: %s", len(room_players))
             active_players = [p for p in room_players if p.get('connection_status') == 'active']
-            print(f"[DEBUG] Active players: {len(active_players)}")
+            log.debug("Active players: %s", len(active_players))
             
             # For regular join requests, don't automatically reconnect to disconnected slots
             # Only allow reconnection through explicit "reconnect" messages
@@ -197,18 +669,15 @@ class GameServer:
             
             # Check if this player is already in Redis for this room
             try:
-                existing_redis_players = self.redis_manager.get_room_players(room_code)
+                existing_redis_players = await self.redis_call(self.redis_manager.get_room_players, room_code, timeout=2.0)
                 player_already_in_redis = any(p.get('player_id') == player_id for p in existing_redis_players)
-                print(f"[DEBUG] Player {username} already in Redis for room {room_code}: {player_already_in_redis}")
+                log.debug("Player %s already in Redis for room %s: %s", username, room_code, player_already_in_redis)
             except Exception as e:
-                print(f"[DEBUG] Could not check Redis for existing player: {e}")
+                log.debug("Could not check Redis for existing player: %s", e)
                 player_already_in_redis = False
             
             # Count current players in this room to assign correct player number
-            current_room_count = 0
-            for ws, metadata in self.network_manager.connection_metadata.items():
-                if metadata.get('room_code') == room_code:
-                    current_room_count += 1
+            current_room_count = self.network_manager.count_room_connections(room_code)
             player_number = current_room_count + 1  # This player will be the next number
 
             # Save session data to Redis
@@ -224,27 +693,23 @@ class GameServer:
                 'rating': player_info.get('rating', 1000)
             }
             try:
-                executor = concurrent.futures.ThreadPoolExecutor()
-                loop = asyncio.get_event_loop()
-                await asyncio.wait_for(
-                    loop.run_in_executor(executor, self.redis_manager.save_player_session, player_id, session_data),
-                    timeout=2.0
-                )
-                print(f"[DEBUG] Saved session data for {username}")
+                await self.redis_call(self.redis_manager.save_player_session, player_id, session_data, timeout=2.0)
+                log.debug("Saved session data for %s", username)
             except asyncio.TimeoutError:
-                print(f"[DEBUG] Redis timeout when saving session, continuing anyway")
+                log.debug("Redis timeout when saving session, continuing anyway")
             except Exception as e:
-                print(f"[DEBUG] Could not save session data: {e}, continuing anyway")
+                log.debug("Could not save session data: %s, continuing anyway", e)
 
             # Register live connection
             self.network_manager.register_connection(websocket, player_id, room_code, username)
+            self.get_roster(room_code).add_player(
+                player_id, username, websocket,
+                player_number=player_number, joined_at=str(int(time.time()))
+            )
             
             # Debug: check connection count immediately after registration
-            debug_count = 0
-            for ws, metadata in self.network_manager.connection_metadata.items():
-                if metadata.get('room_code') == room_code:
-                    debug_count += 1
-            print(f"[DEBUG] Connections for room {room_code} after registration: {debug_count}")
+            debug_count = self.network_manager.count_room_connections(room_code)
+            log.debug("Connections for room %s after registration: %s", room_code, debug_count)
 
             # Add to room or update existing entry
             room_data = {
@@ -255,39 +720,27 @@ class GameServer:
                 'connection_status': 'active'
             }
             try:
-                executor = concurrent.futures.ThreadPoolExecutor()
-                loop = asyncio.get_event_loop()
-                
                 if player_already_in_redis:
                     # Update existing player instead of adding duplicate
-                    await asyncio.wait_for(
-                        loop.run_in_executor(executor, self.redis_manager.update_player_in_room, room_code, player_id, room_data),
-                        timeout=2.0
-                    )
-                    print(f"[DEBUG] Updated {username} in room {room_code} (reconnection)")
+                    await self.redis_call(self.redis_manager.update_player_in_room, room_code, player_id, room_data, timeout=2.0)
+                    log.debug("Updated %s in room %s (reconnection)", username, room_code)
                 else:
                     # Add new player
-                    await asyncio.wait_for(
-                        loop.run_in_executor(executor, self.redis_manager.add_player_to_room, room_code, room_data),
-                        timeout=2.0
-                    )
-                    print(f"[DEBUG] Added {username} to room {room_code} (new join)")
+                    await self.redis_call(self.redis_manager.add_player_to_room, room_code, room_data, timeout=2.0)
+                    log.debug("Added %s to room %s (new join)", username, room_code)
             except asyncio.TimeoutError:
-                print(f"[DEBUG] Redis timeout when adding/updating player in room, continuing anyway")
+                log.debug("Redis timeout when adding/updating player in room, continuing anyway")
             except Exception as e:
-                print(f"[DEBUG] Could not add/update player in room: {e}, continuing anyway")
+                log.debug("Could not add/update player in room: %s, continuing anyway", e)
 
             # Get updated player count after adding this player
             # Use simple counting based on network manager connections
-            current_player_count = 0
-            for ws, metadata in self.network_manager.connection_metadata.items():
-                if metadata.get('room_code') == room_code:
-                    current_player_count += 1
+            current_player_count = self.network_manager.count_room_connections(room_code)
             
-            print(f"[DEBUG] Updated player count: {current_player_count}")
+            log.debug("Updated player count: %s", current_player_count)
 
             # Send join confirmation
-            print(f"[LOG] Room {room_code}: {username} joined [PHASE: {GameState.WAITING_FOR_PLAYERS.value}] - Players: {current_player_count}/4")
+            log.info("Room %s: %s joined [PHASE: %s] - Players: %s/4", room_code, username, GameState.WAITING_FOR_PLAYERS.value, current_player_count)
             await self.network_manager.send_message(
                 websocket,
                 'join_success',
@@ -295,15 +748,15 @@ class GameServer:
                     'username': username,
                     'player_id': player_id,
                     'room_code': room_code,
-                    'player_number': player_number
+                    'player_number': player_number,
+                    'resume_token': self.network_manager.issue_resume_token(player_id, username, room_code)
                 }
             )
 
             # Send room status update to all players in the room
             room_players = []
-            for ws, metadata in self.network_manager.connection_metadata.items():
-                if metadata.get('room_code') == room_code:
-                    room_players.append(metadata.get('username', f"Player {metadata.get('player_number', '?')}"))
+            for ws, metadata in self.network_manager.get_room_connections(room_code):
+                room_players.append(metadata.get('username', f"Player {metadata.get('player_number', '?')}"))
             
             room_status_message = {
                 'usernames': room_players,
@@ -313,16 +766,15 @@ class GameServer:
             }
             
             # Broadcast room status to all players in the room
-            await self.network_manager.broadcast_to_room(
+            await self.broadcast_to_room(
                 room_code,
                 'room_status',
-                room_status_message,
-                self.redis_manager
+                room_status_message
             )
 
             # Start game if room is full
             if current_player_count >= ROOM_SIZE:
-                print(f"[LOG] Room {room_code} is full, ready to play! [PHASE: {GameState.TEAM_ASSIGNMENT.value}]")
+                log.info("Room %s is full, ready to play! [PHASE: %s]", room_code, GameState.TEAM_ASSIGNMENT.value)
                 # Add a small delay to ensure all connections are registered
                 await asyncio.sleep(0.5)
                 await self.handle_game_start(room_code)
@@ -334,17 +786,16 @@ class GameServer:
                     'required_players': ROOM_SIZE,
                     'room_code': room_code
                 }
-                await self.network_manager.broadcast_to_room(
+                await self.broadcast_to_room(
                     room_code,
                     'waiting_for_players',
-                    waiting_message,
-                    self.redis_manager
+                    waiting_message
                 )
 
             return True
 
         except Exception as e:
-            print(f"[ERROR] Failed to handle join: {str(e)}")
+            log.error("Failed to handle join: %s", e)
             import traceback
             traceback.print_exc()
             await self.network_manager.notify_error(websocket, "Failed to join room")
@@ -358,19 +809,13 @@ class GameServer:
                 existing_game = self.active_games[room_code]
                 # Only restart if the game is in waiting_for_players phase
                 if existing_game.game_phase != GameState.WAITING_FOR_PLAYERS.value:
-                    print(f"[LOG] Game already in progress in room {room_code} (phase: {existing_game.game_phase}), skipping initialization")
+                    log.info("Game already in progress in room %s (phase: %s), skipping initialization", room_code, existing_game.game_phase)
                     return
             
             # Get all players in room with timeout and fallback
-            print(f"[DEBUG] Getting players for room {room_code} to start game")
-            executor = concurrent.futures.ThreadPoolExecutor()
-            loop = asyncio.get_event_loop()
-            
+            log.debug("Getting players for room %s to start game", room_code)
             try:
-                room_players_data = await asyncio.wait_for(
-                    loop.run_in_executor(executor, self.redis_manager.get_room_players, room_code),
-                    timeout=2.0
-                )
+                room_players_data = await self.redis_call(self.redis_manager.get_room_players, room_code, timeout=2.0)
                 
                 # Filter for only currently connected players
                 connected_players = []
@@ -380,212 +825,174 @@ class GameServer:
                     username = player_data.get('username')
                     
                     # Check if player has an active connection
-                    has_active_connection = False
-                    for ws, metadata in self.network_manager.connection_metadata.items():
-                        if (metadata.get('player_id') == player_id and 
-                            metadata.get('room_code') == room_code):
-                            has_active_connection = True
-                            break
-                    
-                    if has_active_connection:
+                    if self.network_manager.is_player_connected(player_id, room_code):
                         connected_players.append(username)
                         active_player_ids.append(player_id)
-                        print(f"[DEBUG] Player {username} is connected and active")
+                        log.debug("Player %s is connected and active", username)
                     else:
-                        print(f"[DEBUG] Player {username} is not connected, skipping")
+                        log.debug("Player %s is not connected, skipping", username)
                 
                 # Clean up disconnected players from Redis
-                await asyncio.wait_for(
-                    loop.run_in_executor(executor, self.redis_manager.cleanup_disconnected_players, room_code, active_player_ids),
-                    timeout=2.0
-                )
+                await self.redis_call(self.redis_manager.cleanup_disconnected_players, room_code, active_player_ids, timeout=2.0)
+                self.get_roster(room_code).retain_players(active_player_ids)
                 
                 players = connected_players
-                print(f"[DEBUG] Got {len(players)} connected players from Redis: {players}")
+                log.debug("Got %s connected players from Redis: %s", len(players), players)
                 
                 # Ensure we have exactly 4 connected players
                 if len(players) != 4:
-                    print(f"[ERROR] Invalid connected player count: {len(players)}, expected 4 players")
-                    print(f"[DEBUG] All players in Redis: {[p['username'] for p in room_players_data]}")
-                    print(f"[DEBUG] Connected players: {players}")
+                    log.error("Invalid connected player count: %s, expected 4 players", len(players))
+                    log.debug("All players in Redis: %s", [p['username'] for p in room_players_data])
+                    log.debug("Connected players: %s", players)
                     return
             except asyncio.TimeoutError:
-                print(f"[DEBUG] Redis timeout when getting room players, using network manager fallback")
+                log.debug("Redis timeout when getting room players, using network manager fallback")
                 # Fallback: get players from network manager connections
                 players = []
-                for ws, metadata in self.network_manager.connection_metadata.items():
-                    if metadata.get('room_code') == room_code:
-                        username = metadata.get('username', f'Player{len(players)+1}')
-                        players.append(username)
+                fallback_player_ids = []
+                for ws, metadata in self.network_manager.get_room_connections(room_code):
+                    username = metadata.get('username', f'Player{len(players)+1}')
+                    players.append(username)
+                    fallback_player_ids.append(metadata.get('player_id'))
                 
                 if len(players) >= ROOM_SIZE:
-                    print(f"[DEBUG] Using fallback players from network manager: {players}")
+                    self.get_roster(room_code).retain_players(fallback_player_ids)
+                    log.debug("Using fallback players from network manager: %s", players)
                 else:
-                    print(f"[ERROR] Not enough connected players for fallback: {len(players)}")
+                    log.error("Not enough connected players for fallback: %s", len(players))
                     return
             except Exception as e:
-                print(f"[ERROR] Could not get room players: {e}")
+                log.error("Could not get room players: %s", e)
                 return
             
             # Create new game instance
-            game = GameBoard(players, room_code)
+            game = self.board_class(players, room_code)
+            game.event_log = GameEventLog(room_code, self.snapshot_every, new_game=True)
             self.active_games[room_code] = game
             
             # Assign teams and get initial state
-            team_result = game.assign_teams_and_hakem(self.redis_manager)
+            team_result = game.assign_teams_and_hakem()
             
             # Save initial game state with timeout
             try:
-                game_state = game.to_redis_dict()
-                await asyncio.wait_for(
-                    loop.run_in_executor(executor, self.redis_manager.save_game_state, room_code, game_state),
-                    timeout=2.0
-                )
-                print(f"[DEBUG] Saved initial game state to Redis")
+                await self.state_persister.save_now(room_code, game.to_redis_delta)
+                await self.sync_room_state(room_code, game)
+                log.debug("Saved initial game state to Redis")
             except asyncio.TimeoutError:
-                print(f"[DEBUG] Redis timeout when saving initial game state, continuing anyway")
+                log.debug("Redis timeout when saving initial game state, continuing anyway")
             except Exception as e:
-                print(f"[DEBUG] Could not save initial game state: {e}, continuing anyway")
+                log.debug("Could not save initial game state: %s, continuing anyway", e)
             
             # Broadcast phase change to TEAM_ASSIGNMENT with timeout protection
-            print(f"[DEBUG] Broadcasting TEAM_ASSIGNMENT phase change...")
+            log.debug("Broadcasting TEAM_ASSIGNMENT phase change...")
             try:
                 await asyncio.wait_for(
-                    self.network_manager.broadcast_to_room(
+                    self.broadcast_to_room(
                         room_code,
                         'phase_change',
-                        {'new_phase': GameState.TEAM_ASSIGNMENT.value},
-                        self.redis_manager
+                        {'new_phase': GameState.TEAM_ASSIGNMENT.value}
                     ),
                     timeout=3.0
                 )
-                print(f"[DEBUG] TEAM_ASSIGNMENT phase change broadcasted")
+                log.debug("TEAM_ASSIGNMENT phase change broadcasted")
             except asyncio.TimeoutError:
-                print(f"[DEBUG] Timeout broadcasting TEAM_ASSIGNMENT phase change, trying direct network broadcast")
+                log.debug("Timeout broadcasting TEAM_ASSIGNMENT phase change, trying direct network broadcast")
                 # Fallback: broadcast directly to network connections
-                for ws, metadata in self.network_manager.connection_metadata.items():
-                    if metadata.get('room_code') == room_code:
-                        try:
-                            await self.network_manager.send_message(
-                                ws,
-                                'phase_change',
-                                {'new_phase': GameState.TEAM_ASSIGNMENT.value}
-                            )
-                        except Exception as e:
-                            print(f"[DEBUG] Failed to send phase change to individual connection: {e}")
+                for ws, metadata in self.network_manager.get_room_connections(room_code):
+                    try:
+                        await self.network_manager.send_message(
+                            ws,
+                            'phase_change',
+                            {'new_phase': GameState.TEAM_ASSIGNMENT.value}
+                        )
+                    except Exception as e:
+                        log.debug("Failed to send phase change to individual connection: %s", e)
             except Exception as e:
-                print(f"[DEBUG] Error broadcasting TEAM_ASSIGNMENT phase change: {e}")
+                log.debug("Error broadcasting TEAM_ASSIGNMENT phase change: %s", e)
             
             # Broadcast team assignments with timeout protection
-            print(f"[DEBUG] Broadcasting team assignments...")
+            log.debug("Broadcasting team assignments...")
             try:
                 await asyncio.wait_for(
-                    self.network_manager.broadcast_to_room(
+                    self.broadcast_to_room(
                         room_code,
                         'team_assignment',
-                        team_result,
-                        self.redis_manager
+                        team_result
                     ),
                     timeout=3.0
                 )
-                print(f"[DEBUG] Team assignments broadcasted")
+                log.debug("Team assignments broadcasted")
             except asyncio.TimeoutError:
-                print(f"[DEBUG] Timeout broadcasting team assignments, trying direct network broadcast")
+                log.debug("Timeout broadcasting team assignments, trying direct network broadcast")
                 # Fallback: broadcast directly to network connections
-                for ws, metadata in self.network_manager.connection_metadata.items():
-                    if metadata.get('room_code') == room_code:
-                        try:
-                            await self.network_manager.send_message(
-                                ws,
-                                'team_assignment',
-                                team_result
-                            )
-                        except Exception as e:
-                            print(f"[DEBUG] Failed to send team assignment to individual connection: {e}")
+                for ws, metadata in self.network_manager.get_room_connections(room_code):
+                    try:
+                        await self.network_manager.send_message(
+                            ws,
+                            'team_assignment',
+                            team_result
+                        )
+                    except Exception as e:
+                        log.debug("Failed to send team assignment to individual connection: %s", e)
             except Exception as e:
-                print(f"[DEBUG] Error broadcasting team assignments: {e}")
+                log.debug("Error broadcasting team assignments: %s", e)
             
             # Deal initial cards
-            print(f"[DEBUG] Dealing initial cards...")
+            log.debug("Dealing initial cards...")
             initial_hands = game.initial_deal()
-            print(f"[DEBUG] Initial cards dealt, hands: {len(initial_hands)}")
+            log.debug("Initial cards dealt, hands: %s", len(initial_hands))
             
             # Transition to waiting for hokm phase
             game.game_phase = GameState.WAITING_FOR_HOKM.value
-            print(f"[DEBUG] Game phase set to WAITING_FOR_HOKM")
+            log.debug("Game phase set to WAITING_FOR_HOKM")
             
             # Save game state with timeout
             try:
-                game_state = game.to_redis_dict()
-                await asyncio.wait_for(
-                    loop.run_in_executor(executor, self.redis_manager.save_game_state, room_code, game_state),
-                    timeout=2.0
-                )
-                print(f"[DEBUG] Saved WAITING_FOR_HOKM game state to Redis")
+                await self.state_persister.save_now(room_code, game.to_redis_delta)
+                await self.sync_room_state(room_code, game)
+                log.debug("Saved WAITING_FOR_HOKM game state to Redis")
             except asyncio.TimeoutError:
-                print(f"[DEBUG] Redis timeout when saving WAITING_FOR_HOKM state, continuing anyway")
+                log.debug("Redis timeout when saving WAITING_FOR_HOKM state, continuing anyway")
             except Exception as e:
-                print(f"[DEBUG] Could not save WAITING_FOR_HOKM state: {e}, continuing anyway")
+                log.debug("Could not save WAITING_FOR_HOKM state: %s, continuing anyway", e)
             
             # Broadcast phase change to WAITING_FOR_HOKM - CRITICAL for hokm selection
-            print(f"[LOG] Broadcasting phase change to WAITING_FOR_HOKM in room {room_code}")
+            log.info("Broadcasting phase change to WAITING_FOR_HOKM in room %s", room_code)
             try:
                 await asyncio.wait_for(
-                    self.network_manager.broadcast_to_room(
+                    self.broadcast_to_room(
                         room_code,
                         'phase_change',
-                        {'new_phase': GameState.WAITING_FOR_HOKM.value},
-                        self.redis_manager
+                        {'new_phase': GameState.WAITING_FOR_HOKM.value}
                     ),
                     timeout=3.0
                 )
-                print(f"[DEBUG] WAITING_FOR_HOKM phase change broadcasted")
+                log.debug("WAITING_FOR_HOKM phase change broadcasted")
             except asyncio.TimeoutError:
-                print(f"[DEBUG] Timeout broadcasting WAITING_FOR_HOKM phase change, trying direct network broadcast")
+                log.debug("Timeout broadcasting WAITING_FOR_HOKM phase change, trying direct network broadcast")
                 # Fallback: broadcast directly to network connections
-                for ws, metadata in self.network_manager.connection_metadata.items():
-                    if metadata.get('room_code') == room_code:
-                        try:
-                            await self.network_manager.send_message(
-                                ws,
-                                'phase_change',
-                                {'new_phase': GameState.WAITING_FOR_HOKM.value}
-                            )
-                        except Exception as e:
-                            print(f"[DEBUG] Failed to send phase change to individual connection: {e}")
+                for ws, metadata in self.network_manager.get_room_connections(room_code):
+                    try:
+                        await self.network_manager.send_message(
+                            ws,
+                            'phase_change',
+                            {'new_phase': GameState.WAITING_FOR_HOKM.value}
+                        )
+                    except Exception as e:
+                        log.debug("Failed to send phase change to individual connection: %s", e)
             except Exception as e:
-                print(f"[DEBUG] Error broadcasting WAITING_FOR_HOKM phase change: {e}")
+                log.debug("Error broadcasting WAITING_FOR_HOKM phase change: %s", e)
             
             # Send initial hands to players
-            print(f"[DEBUG] About to send initial hands to players...")
-            try:
-                room_players_for_hands = await asyncio.wait_for(
-                    loop.run_in_executor(executor, self.redis_manager.get_room_players, room_code),
-                    timeout=2.0
-                )
-                print(f"[DEBUG] Got room players for sending hands: {len(room_players_for_hands)}")
-            except asyncio.TimeoutError:
-                print(f"[DEBUG] Redis timeout when getting room players for hands, using connected players")
-                # Fallback: use network manager to get connections
-                room_players_for_hands = []
-                for ws, metadata in self.network_manager.connection_metadata.items():
-                    if metadata.get('room_code') == room_code:
-                        room_players_for_hands.append({
-                            'username': metadata.get('username', f'Player{len(room_players_for_hands)+1}'),
-                            'player_id': metadata.get('player_id')
-                        })
-                        if len(room_players_for_hands) >= len(players):
-                            break
-            except Exception as e:
-                print(f"[DEBUG] Could not get room players for hands: {e}, using basic fallback")
-                room_players_for_hands = [{'username': name, 'player_id': f'fallback_{i}'} for i, name in enumerate(players)]
+            log.debug("About to send initial hands to players...")
+            room_players_for_hands = await self.get_room_players_cached(room_code)
             
-            print(f"[DEBUG] Got room players for hands, starting to send messages...")
+            log.debug("Got room players for hands, starting to send messages...")
             for i, player in enumerate(room_players_for_hands):
-                print(f"[DEBUG] Sending hand to player {i+1}: {player.get('username', 'unknown')}")
+                log.debug("Sending hand to player %s: %s", i+1, player.get('username', 'unknown'))
                 ws = self.network_manager.get_live_connection(player['player_id'])
                 if ws:
-                    print(f"[DEBUG] Found live connection for player {player.get('username')}")
+                    log.debug("Found live connection for player %s", player.get('username'))
                     await self.network_manager.send_message(
                         ws,
                         'initial_deal',
@@ -596,24 +1003,35 @@ class GameServer:
                             'message': "You are the Hakem. Choose hokm." if player['username'] == game.hakem else f"Waiting for {game.hakem} to choose hokm."
                         }
                     )
-                    print(f"[DEBUG] Sent initial hand to {player.get('username')}")
+                    log.debug("Sent initial hand to %s", player.get('username'))
                 else:
-                    print(f"[DEBUG] No live connection found for player {player.get('username')}")
+                    log.debug("No live connection found for player %s", player.get('username'))
             
-            print(f"[LOG] Game started in room {room_code}")
+            log.info("Game started in room %s", room_code)
+            self.arm_turn_deadline(room_code)
             
         except Exception as e:
-            print(f"[ERROR] Failed to start game in room {room_code}: {str(e)}")
+            log.error("Failed to start game in room %s: %s", room_code, e)
             # Notify all players in the room of the error
             try:
-                await self.network_manager.broadcast_to_room(
+                await self.broadcast_to_room(
                     room_code,
                     'error',
-                    {'message': f'Failed to start game: {str(e)}'},
-                    self.redis_manager
+                    {'message': f'Failed to start game: {str(e)}'}
                 )
             except Exception as notify_err:
-                print(f"[ERROR] Failed to notify users of game start error: {notify_err}")
+                log.error("Failed to notify users of game start error: %s", notify_err)
+
+    async def handle_dead_connection(self, websocket):
+        """Heartbeat callback: clean up a socket that stopped answering pings and drop its transport"""
+        log.info("Heartbeat failed - connection lost for %s", websocket.remote_address)
+        try:
+            await self.handle_connection_closed(websocket)
+        finally:
+            # Ends the socket's receive loop without waiting for a close handshake from a dead peer
+            transport = getattr(websocket, 'transport', None)
+            if transport is not None:
+                transport.abort()
 
     async def handle_connection_closed(self, websocket):
         """Handle WebSocket connection closure"""
@@ -623,88 +1041,203 @@ class GameServer:
             
             # Check if websocket exists in connection metadata
             if websocket not in self.network_manager.connection_metadata:
-                print(f"[LOG] Connection closed but websocket not in metadata: {websocket.remote_address}")
+                log.info("Connection closed but websocket not in metadata: %s", websocket.remote_address)
                 return
                 
             metadata = self.network_manager.connection_metadata[websocket]
             room_code = metadata.get('room_code')
             player_id = metadata.get('player_id')
             
-            print(f"[LOG] Handling connection closed for player {player_id} in room {room_code}")
+            log.info("Handling connection closed for player %s in room %s", player_id, room_code)
             
             if room_code:
-                # First, handle the disconnection properly through network manager
-                await self.network_manager.handle_player_disconnected(
-                    websocket,
-                    room_code,
-                    self.redis_manager
-                )
-                
-                # Then, check if game should be cancelled (but only after disconnection is processed)
-                # Give a small delay to ensure disconnection processing is complete
-                await asyncio.sleep(0.1)
-                
-                # Check if game is in TEAM_ASSIGNMENT or hokm selection phase and not enough live connections in this room
-                game = self.active_games.get(room_code)
-                if game:
-                    phase = getattr(game, 'game_phase', None)
-                    
-                    # Count ACTUAL room players who are still active (not just network connections)
-                    room_players = self.redis_manager.get_room_players(room_code)
-                    active_players = [p for p in room_players if p.get('connection_status') == 'active']
-                    active_count = len(active_players)
-                    
-                    print(f"[LOG] Room {room_code} has {active_count} active players after disconnect (phase: {phase})")
-                    
-                    # Be more conservative about cancelling games during critical phases
-                    # Give players time to reconnect before cancelling
-                    if active_count < ROOM_SIZE and phase in (
-                        GameState.TEAM_ASSIGNMENT.value,
-                        GameState.WAITING_FOR_HOKM.value
-                    ):
-                        # Check if there are disconnected players who might reconnect
-                        disconnected_players = [p for p in room_players if p.get('connection_status') != 'active']
-                        
-                        # Only cancel if there are no disconnected players (meaning players permanently left)
-                        # If there are disconnected players, they might reconnect soon
-                        if not disconnected_players:
-                            print(f"[LOG] Not enough active players ({active_count}/{ROOM_SIZE}) during {phase} in room {room_code}. No disconnected players to reconnect. Cancelling game.")
-                            await self.network_manager.broadcast_to_room(
-                                room_code,
-                                'game_cancelled',
-                                {'message': 'A player disconnected and not enough players remain. The game has been cancelled.'},
-                                self.redis_manager
-                            )
-                            # Clean up game
-                            self.active_games.pop(room_code, None)
-                        else:
-                            print(f"[LOG] Not enough active players ({active_count}/{ROOM_SIZE}) in room {room_code}, but {len(disconnected_players)} disconnected players might reconnect. Keeping game alive.")
+                try:
+                    await self.room_actors.run(room_code, self._handle_room_disconnect, websocket, room_code)
+                except MailboxFull:
+                    # Never lose a disconnect: handle it outside the actor rather than not at all
+                    await self._handle_room_disconnect(websocket, room_code)
                 
             # Note: connection metadata is already cleaned up by network manager
                 
         except Exception as e:
-            print(f"[ERROR] Error handling connection closed: {str(e)}")
+            log.error("Error handling connection closed: %s", e)
             import traceback
             traceback.print_exc()
             # Try to clean up metadata anyway
             try:
-                if websocket in self.network_manager.connection_metadata:
-                    del self.network_manager.connection_metadata[websocket]
+                self.network_manager.remove_connection(websocket)
             except Exception:
                 pass
         except Exception as e:
-            print(f"[ERROR] Error handling connection closure: {str(e)}")
+            log.error("Error handling connection closure: %s", e)
+
+    async def _handle_room_disconnect(self, websocket, room_code):
+        """Room part of a disconnect: mark the player disconnected, cancel the game if too few remain"""
+        roster = self.room_rosters.get(room_code)
+        if roster is not None:
+            roster.unbind_socket(websocket)
+
+        # First, handle the disconnection properly through network manager
+        await self.network_manager.handle_player_disconnected(
+            websocket,
+            room_code,
+            self.redis_manager
+        )
+
+        # Check if game is in TEAM_ASSIGNMENT or hokm selection phase and not enough live connections in this room
+        game = self.active_games.get(room_code)
+        if game:
+            # Record the activity with the room's other writes (every delta carries last_activity)
+            self.state_persister.submit(room_code, game.to_redis_delta)
+            phase = getattr(game, 'game_phase', None)
+
+            # Count ACTUAL room players who are still active (not just network connections)
+            room_players = await self.get_room_players_cached(room_code)
+            active_players = [p for p in room_players if p.get('connection_status') == 'active']
+            active_count = len(active_players)
+
+            log.info("Room %s has %s active players after disconnect (phase: %s)", room_code, active_count, phase)
+
+            # Be more conservative about cancelling games during critical phases
+            # Give players time to reconnect before cancelling
+            if active_count < ROOM_SIZE and phase in (
+                GameState.TEAM_ASSIGNMENT.value,
+                GameState.WAITING_FOR_HOKM.value
+            ):
+                # Check if there are disconnected players who might reconnect
+                disconnected_players = [p for p in room_players if p.get('connection_status') != 'active']
+
+                # Only cancel if there are no disconnected players (meaning players permanently left)
+                # If there are disconnected players, they might reconnect soon
+                if not disconnected_players:
+                    log.info("Not enough active players (%s/%s) during %s in room %s. No disconnected players to reconnect. Cancelling game.", active_count, ROOM_SIZE, phase, room_code)
+                    await self.broadcast_to_room(
+                        room_code,
+                        'game_cancelled',
+                        {'message': 'A player disconnected and not enough players remain. The game has been cancelled.'}
+                    )
+                    # Clean up game
+                    self.drop_room_state(room_code)
+                else:
+                    log.info("Not enough active players (%s/%s) in room %s, but %s disconnected players might reconnect. Keeping game alive.", active_count, ROOM_SIZE, room_code, len(disconnected_players))
+
+    async def _bind_reconnected_player(self, websocket):
+        """Point the room roster at a socket the network manager just reconnected"""
+        metadata = self.network_manager.connection_metadata.get(websocket)
+        if not metadata or not metadata.get('room_code'):
+            return
+        roster = await self._ensure_roster(metadata['room_code'])
+        if not roster.bind_socket(websocket, metadata['player_id']):
+            roster.add_player(metadata['player_id'], metadata['username'], websocket)
+
+    async def reconnect_room(self, message, claims):
+        """Room whose actor runs a reconnect: the token's, else the message's, else the player's Redis session"""
+        if claims is not None:
+            return claims.room_code
+        if message.get('room_code') or 'player_id' not in message:
+            return message.get('room_code')
+        try:
+            session = await self.redis_call(self.redis_manager.get_player_session, message['player_id'], timeout=2.0)
+        except Exception as e:
+            log.debug("Could not look up the session room for a reconnect: %s", e)
+            return None
+        return session.get('room_code') if isinstance(session, dict) else None
+
+    async def handle_reconnect(self, websocket, message, claims):
+        """Reconnect a player, from a verified resume token when possible, else through the Redis session"""
+        if claims is not None:
+            success = await self.reconnect_with_token(websocket, message, claims)
+            if success is not None:
+                if success and message.get('last_event_id'):
+                    await self.send_missed_events(websocket, message['last_event_id'])
+                return
+        if 'player_id' not in message:
+            await self.network_manager.notify_error(websocket, "Malformed reconnect message: missing 'player_id'.")
+            return
+        if not await self.check_room_owner(websocket, message.get('room_code')):
+            return
+        player_id = message.get('player_id')
+        log.info("Reconnection attempt for player_id: %s...", player_id[:8])
+        # The network manager handles the full reconnection process
+        success = await self.network_manager.handle_player_reconnected(
+            websocket,
+            player_id,
+            self.redis_manager,
+            include_state=not self.delta_sync
+        )
+        if not success:
+            log.info("Reconnection failed for player_id: %s..., falling back to join", player_id[:8])
+        else:
+            log.info("Reconnection successful for player_id: %s...", player_id[:8])
+            await self._bind_reconnected_player(websocket)
+            await self.resume_state(websocket, message.get('last_seq'), message.get('epoch'))
+            if message.get('last_event_id'):
+                await self.send_missed_events(websocket, message['last_event_id'])
+
+    async def reconnect_with_token(self, websocket, message, claims):
+        """
+        Reconnect fast path (resume_tokens.py): a verified token, the room's board
+        and roster in memory, and the board's cached view of the player. After a
+        restart the first reconnect to a room loads it once for everyone.
+        Returns None when the token cannot be used (issued to another player, or
+        the seat is gone) and the caller should take the Redis-validated path.
+        """
+        if message.get('player_id', claims.player_id) != claims.player_id:
+            return None
+        if not await self.check_room_owner(websocket, claims.room_code):
+            return False
+        game = await self.get_game(claims.room_code)
+        if game is None or claims.username not in game.players:
+            return None
+        roster = await self._ensure_roster(claims.room_code)
+        player = roster.get_player(claims.player_id)
+        if player is None or player['username'] != claims.username:
+            return None
+
+        success = await self.network_manager.handle_token_reconnected(
+            websocket, claims, player, game.player_view(claims.username), self.redis_manager,
+            include_state=not self.delta_sync, players=roster.to_room_players()
+        )
+        if success:
+            await self._bind_reconnected_player(websocket)
+            if message.get('last_seq') is not None:
+                await self.resume_state(websocket, message['last_seq'], message.get('epoch'))
+            else:
+                # A client that lost its sync file still resumes from where the token was issued
+                await self.resume_state(websocket, claims.sequence or None, claims.epoch)
+        return success
+
+    async def send_missed_events(self, websocket, last_event_id):
+        """Replay room journal entries after last_event_id to a reconnected socket"""
+        metadata = self.network_manager.connection_metadata.get(websocket)
+        if not metadata or not metadata.get('room_code'):
+            return
+        room_code = metadata['room_code']
+        try:
+            events = await self.redis_call(self.redis_manager.read_room_events, room_code, last_event_id, timeout=2.0)
+        except asyncio.TimeoutError:
+            log.debug("Redis timeout reading journal for room %s, skipping replay", room_code)
+            return
+        except Exception as e:
+            log.debug("Could not read journal for room %s: %s", room_code, e)
+            return
+        log.debug("Replaying %s missed event(s) to %s in room %s", len(events), metadata.get('username'), room_code)
+        await self.network_manager.send_message(websocket, 'event_replay', {
+            'room_code': room_code,
+            'after_event_id': last_event_id,
+            'events': events
+        })
 
     async def handle_message(self, websocket, message):
         """Handle incoming WebSocket messages"""
-        print(f"[DEBUG] Received message: {message}")
+        log.debug("Received message: %s", message)
         try:
             if not isinstance(message, dict):
-                print(f"[DEBUG] Message is not dict: {type(message)}")
+                log.debug("Message is not dict: %s", type(message))
                 await self.network_manager.notify_error(websocket, "Malformed message: not a JSON object.")
                 return
             msg_type = message.get('type')
-            print(f"[DEBUG] Message type: {msg_type}")
+            log.debug("Message type: %s", msg_type)
             if not msg_type:
                 await self.network_manager.notify_error(websocket, "Malformed message: missing 'type' field.")
                 return
@@ -720,57 +1253,70 @@ class GameServer:
                 return
             
             if msg_type == 'join':
-                print(f"[DEBUG] Handling join message")
+                log.debug("Handling join message")
                 # Validate required fields for join
                 if 'room_code' not in message:
                     await self.network_manager.notify_error(websocket, "Malformed join message: missing 'room_code'.")
                     return
-                await self.handle_join(websocket, message)
-            elif msg_type == 'reconnect':
-                if 'player_id' not in message:
-                    await self.network_manager.notify_error(websocket, "Malformed reconnect message: missing 'player_id'.")
+                if not await self.check_room_owner(websocket, message['room_code']):
                     return
-                player_id = message.get('player_id')
-                print(f"[LOG] Reconnection attempt for player_id: {player_id[:8]}...")
-                # The network manager handles the full reconnection process
-                success = await self.network_manager.handle_player_reconnected(
-                    websocket,
-                    player_id,
-                    self.redis_manager
-                )
-                if not success:
-                    print(f"[LOG] Reconnection failed for player_id: {player_id[:8]}..., falling back to join")
+                await self.run_in_room(websocket, message['room_code'], self.handle_join, websocket, message)
+            elif msg_type == 'reconnect':
+                claims = None
+                if message.get('resume_token'):
+                    claims = self.network_manager.resume_tokens.verify(message['resume_token'])
+                # Reconnects change the roster and the player's status, so they queue behind the
+                # room's other commands (including the old socket's disconnect)
+                room_code = await self.reconnect_room(message, claims)
+                if room_code:
+                    await self.run_in_room(websocket, room_code, self.handle_reconnect, websocket, message, claims)
                 else:
-                    print(f"[LOG] Reconnection successful for player_id: {player_id[:8]}...")
+                    await self.handle_reconnect(websocket, message, claims)
             elif msg_type == 'hokm_selected':
                 if 'room_code' not in message or 'suit' not in message:
                     await self.network_manager.notify_error(websocket, "Malformed hokm_selected message: missing 'room_code' or 'suit'.")
                     return
-                await self.handle_hokm_selection(websocket, message)
+                await self.run_in_room(websocket, message['room_code'], self.handle_hokm_selection, websocket, message)
             elif msg_type == 'play_card':
                 if 'room_code' not in message or 'player_id' not in message or 'card' not in message:
                     await self.network_manager.notify_error(websocket, "Malformed play_card message: missing 'room_code', 'player_id', or 'card'.")
                     return
-                await self.handle_play_card(websocket, message)
+                await self.run_in_room(websocket, message['room_code'], self.handle_play_card, websocket, message)
+            elif msg_type in ('state_ack', 'state_resync'):
+                if not self.delta_sync:
+                    await self.network_manager.notify_error(websocket, "State sync is not enabled on this server.")
+                    return
+                field = 'seq' if msg_type == 'state_ack' else 'last_seq'
+                if 'room_code' not in message or not isinstance(message.get(field), int):
+                    await self.network_manager.notify_error(websocket, f"Malformed {msg_type} message: missing 'room_code' or '{field}'.")
+                    return
+                if msg_type == 'state_ack':
+                    self.network_manager.acknowledge(websocket, message['seq'], message.get('epoch'))
+                else:
+                    await self.run_in_room(websocket, message['room_code'], self.network_manager.resync_player,
+                                           websocket, message['last_seq'], message.get('epoch'))
             elif msg_type == 'clear_room':
-                await self.handle_clear_room(websocket, message)
+                if message.get('room_code'):
+                    await self.run_in_room(websocket, message['room_code'], self.handle_clear_room, websocket, message)
+                else:
+                    await self.handle_clear_room(websocket, message)
                 return
             elif msg_type == 'health_check':
                 await self.handle_health_check(websocket, message)
                 return
             else:
-                print(f"[WARNING] Unknown message type: {msg_type}")
+                log.warning("Unknown message type: %s", msg_type)
                 await self.network_manager.notify_error(websocket, f"Unknown message type: {msg_type}")
         except Exception as e:
-            print(f"[ERROR] Failed to handle message: {str(e)}")
+            log.error("Failed to handle message: %s", e)
             try:
                 await self.network_manager.notify_error(websocket, f"Internal server error: {str(e)}")
             except Exception as notify_err:
-                print(f"[ERROR] Failed to notify user of message error: {notify_err}")
+                log.error("Failed to notify user of message error: %s", notify_err)
 
     async def handle_authentication(self, websocket, message):
         """Handle authentication messages (Phase 0)"""
-        print(f"[DEBUG] Handling authentication message: {message.get('type')}")
+        log.debug("Handling authentication message: %s", message.get('type'))
         
         try:
             msg_type = message.get('type')
@@ -786,7 +1332,7 @@ class GameServer:
                         'success': False,
                         'message': 'Username and password are required'
                     }
-                    await websocket.send(json.dumps(response))
+                    await websocket.send(wire_protocol.encode_for(websocket, response))
                     return
                 
                 auth_data = {
@@ -798,7 +1344,7 @@ class GameServer:
                 try:
                     result = await self.auth_manager.authenticate_player(websocket, auth_data)
                 except Exception as auth_error:
-                    print(f"[ERROR] Authentication manager error: {auth_error}")
+                    log.error("Authentication manager error: %s", auth_error)
                     result = {
                         'success': False,
                         'message': f'Authentication failed: {str(auth_error)}'
@@ -814,9 +1360,9 @@ class GameServer:
                     response['player_info'] = result['player_info']
                     if 'token' in result:
                         response['token'] = result['token']
-                    print(f"[LOG] Player authenticated: {username} (ID: {result['player_info']['player_id'][:8]}...)")
+                    log.info("Player authenticated: %s (ID: %s...)", username, result['player_info']['player_id'][:8])
                 
-                await websocket.send(json.dumps(response))
+                await websocket.send(wire_protocol.encode_for(websocket, response))
                 
             elif msg_type == 'auth_register':
                 # Handle user registration
@@ -831,7 +1377,7 @@ class GameServer:
                         'success': False,
                         'message': 'Username and password are required'
                     }
-                    await websocket.send(json.dumps(response))
+                    await websocket.send(wire_protocol.encode_for(websocket, response))
                     return
                 
                 auth_data = {
@@ -845,7 +1391,7 @@ class GameServer:
                 try:
                     result = await self.auth_manager.authenticate_player(websocket, auth_data)
                 except Exception as auth_error:
-                    print(f"[ERROR] Registration error: {auth_error}")
+                    log.error("Registration error: %s", auth_error)
                     result = {
                         'success': False,
                         'message': f'Registration failed: {str(auth_error)}'
@@ -861,9 +1407,9 @@ class GameServer:
                     response['player_info'] = result['player_info']
                     if 'token' in result:
                         response['token'] = result['token']
-                    print(f"[LOG] Player registered and authenticated: {username} (ID: {result['player_info']['player_id'][:8]}...)")
+                    log.info("Player registered and authenticated: %s (ID: %s...)", username, result['player_info']['player_id'][:8])
                 
-                await websocket.send(json.dumps(response))
+                await websocket.send(wire_protocol.encode_for(websocket, response))
                 
             elif msg_type == 'auth_token':
                 # Handle JWT token authentication
@@ -875,7 +1421,7 @@ class GameServer:
                         'success': False,
                         'message': 'Token is required'
                     }
-                    await websocket.send(json.dumps(response))
+                    await websocket.send(wire_protocol.encode_for(websocket, response))
                     return
                 
                 auth_data = {
@@ -886,7 +1432,7 @@ class GameServer:
                 try:
                     result = await self.auth_manager.authenticate_player(websocket, auth_data)
                 except Exception as auth_error:
-                    print(f"[ERROR] Token authentication error: {auth_error}")
+                    log.error("Token authentication error: %s", auth_error)
                     result = {
                         'success': False,
                         'message': f'Token authentication failed: {str(auth_error)}'
@@ -902,12 +1448,12 @@ class GameServer:
                     response['player_info'] = result['player_info']
                     if 'token' in result:
                         response['token'] = result['token']
-                    print(f"[LOG] Player authenticated via token: {result['player_info']['username']} (ID: {result['player_info']['player_id'][:8]}...)")
+                    log.info("Player authenticated via token: %s (ID: %s...)", result['player_info']['username'], result['player_info']['player_id'][:8])
                 
-                await websocket.send(json.dumps(response))
+                await websocket.send(wire_protocol.encode_for(websocket, response))
                 
         except Exception as e:
-            print(f"[ERROR] Authentication error: {str(e)}")
+            log.error("Authentication error: %s", e)
             import traceback
             traceback.print_exc()
             
@@ -917,184 +1463,150 @@ class GameServer:
                     'success': False,
                     'message': f'Authentication failed: {str(e)}'
                 }
-                await websocket.send(json.dumps(error_response))
+                await websocket.send(wire_protocol.encode_for(websocket, error_response))
             except Exception as send_error:
-                print(f"[ERROR] Failed to send error response: {send_error}")
+                log.error("Failed to send error response: %s", send_error)
                 # If we can't send the error response, the WebSocket is probably closed
                 # Don't raise another exception here
 
     async def handle_hokm_selection(self, websocket, message):
         """Handle hokm selection by the Hakem, save state, broadcast, and deal remaining cards."""
         try:
-            # Create executor and loop for timeout operations
-            executor = concurrent.futures.ThreadPoolExecutor()
-            loop = asyncio.get_event_loop()
-            
             room_code = message.get('room_code')
             suit = message.get('suit')
             if not room_code or not suit:
                 await self.network_manager.notify_error(websocket, "Missing room_code or suit for hokm selection.")
                 return
-            if room_code not in self.active_games:
+            game = await self.get_game(room_code)
+            if game is None:
                 await self.network_manager.notify_error(websocket, "Game not found for hokm selection.")
                 return
                 
-            game = self.active_games[room_code]
-            print(f"[LOG] Received hokm selection '{suit}' in room {room_code} [Current phase: {game.game_phase}]")
+            log.info("Received hokm selection '%s' in room %s [Current phase: %s]", suit, room_code, game.game_phase)
             
             # Set hokm and update phase
-            if not game.set_hokm(suit, self.redis_manager, room_code):
+            if not game.set_hokm(suit):
                 await self.network_manager.notify_error(websocket, "Invalid hokm selection or wrong phase.")
                 return
             # Save state after hokm selection with timeout
             try:
-                game_state = game.to_redis_dict()
-                await asyncio.wait_for(
-                    loop.run_in_executor(executor, self.redis_manager.save_game_state, room_code, game_state),
-                    timeout=2.0
-                )
-                print(f"[DEBUG] Saved hokm state to Redis")
+                await self.state_persister.save_now(room_code, game.to_redis_delta)
+                await self.sync_room_state(room_code, game)
+                log.debug("Saved hokm state to Redis")
             except asyncio.TimeoutError:
-                print(f"[DEBUG] Redis timeout when saving hokm state, continuing anyway")
+                log.debug("Redis timeout when saving hokm state, continuing anyway")
             except Exception as e:
-                print(f"[DEBUG] Could not save hokm state: {e}, continuing anyway")
+                log.debug("Could not save hokm state: %s, continuing anyway", e)
                 
             # Broadcast hokm selection with timeout protection
             try:
                 await asyncio.wait_for(
-                    self.network_manager.broadcast_to_room(
+                    self.broadcast_to_room(
                         room_code,
                         'hokm_selected',
-                        {'suit': game.hokm, 'hakem': game.hakem},
-                        self.redis_manager
+                        {'suit': game.hokm, 'hakem': game.hakem}
                     ),
                     timeout=3.0
                 )
-                print(f"[DEBUG] Hokm selection broadcasted")
+                log.debug("Hokm selection broadcasted")
             except asyncio.TimeoutError:
-                print(f"[DEBUG] Timeout broadcasting hokm selection, trying direct network broadcast")
+                log.debug("Timeout broadcasting hokm selection, trying direct network broadcast")
                 # Fallback: broadcast directly to network connections
-                for ws, metadata in self.network_manager.connection_metadata.items():
-                    if metadata.get('room_code') == room_code:
-                        try:
-                            await self.network_manager.send_message(
-                                ws,
-                                'hokm_selected',
-                                {'suit': game.hokm, 'hakem': game.hakem}
-                            )
-                        except Exception as e:
-                            print(f"[DEBUG] Failed to send hokm selection to individual connection: {e}")
+                for ws, metadata in self.network_manager.get_room_connections(room_code):
+                    try:
+                        await self.network_manager.send_message(
+                            ws,
+                            'hokm_selected',
+                            {'suit': game.hokm, 'hakem': game.hakem}
+                        )
+                    except Exception as e:
+                        log.debug("Failed to send hokm selection to individual connection: %s", e)
             except Exception as e:
-                print(f"[DEBUG] Error broadcasting hokm selection: {e}")
+                log.debug("Error broadcasting hokm selection: %s", e)
                 
             # Phase change: FINAL_DEAL
             game.game_phase = GameState.FINAL_DEAL.value if hasattr(GameState, 'FINAL_DEAL') else 'final_deal'
             
             # Save state after phase change with timeout
             try:
-                game_state = game.to_redis_dict()
-                await asyncio.wait_for(
-                    loop.run_in_executor(executor, self.redis_manager.save_game_state, room_code, game_state),
-                    timeout=2.0
-                )
-                print(f"[DEBUG] Saved FINAL_DEAL phase state to Redis")
+                await self.state_persister.save_now(room_code, game.to_redis_delta)
+                await self.sync_room_state(room_code, game)
+                log.debug("Saved FINAL_DEAL phase state to Redis")
             except asyncio.TimeoutError:
-                print(f"[DEBUG] Redis timeout when saving FINAL_DEAL state, continuing anyway")
+                log.debug("Redis timeout when saving FINAL_DEAL state, continuing anyway")
             except Exception as e:
-                print(f"[DEBUG] Could not save FINAL_DEAL state: {e}, continuing anyway")
+                log.debug("Could not save FINAL_DEAL state: %s, continuing anyway", e)
             
             # Broadcast phase change - CRITICAL for game progression
-            print(f"[LOG] Broadcasting phase change to FINAL_DEAL in room {room_code}")
+            log.info("Broadcasting phase change to FINAL_DEAL in room %s", room_code)
             try:
                 await asyncio.wait_for(
-                    self.network_manager.broadcast_to_room(
+                    self.broadcast_to_room(
                         room_code,
                         'phase_change',
-                        {'new_phase': game.game_phase},
-                        self.redis_manager
+                        {'new_phase': game.game_phase}
                     ),
                     timeout=3.0
                 )
-                print(f"[DEBUG] FINAL_DEAL phase change broadcasted")
+                log.debug("FINAL_DEAL phase change broadcasted")
             except asyncio.TimeoutError:
-                print(f"[DEBUG] Timeout broadcasting FINAL_DEAL phase change, trying direct network broadcast")
+                log.debug("Timeout broadcasting FINAL_DEAL phase change, trying direct network broadcast")
                 # Fallback: broadcast directly to network connections
-                for ws, metadata in self.network_manager.connection_metadata.items():
-                    if metadata.get('room_code') == room_code:
-                        try:
-                            await self.network_manager.send_message(
-                                ws,
-                                'phase_change',
-                                {'new_phase': game.game_phase}
-                            )
-                        except Exception as e:
-                            print(f"[DEBUG] Failed to send phase change to individual connection: {e}")
+                for ws, metadata in self.network_manager.get_room_connections(room_code):
+                    try:
+                        await self.network_manager.send_message(
+                            ws,
+                            'phase_change',
+                            {'new_phase': game.game_phase}
+                        )
+                    except Exception as e:
+                        log.debug("Failed to send phase change to individual connection: %s", e)
             except Exception as e:
-                print(f"[DEBUG] Error broadcasting FINAL_DEAL phase change: {e}")
+                log.debug("Error broadcasting FINAL_DEAL phase change: %s", e)
             # Deal remaining cards and save state
-            final_hands = game.final_deal(self.redis_manager)
-            print(f"[DEBUG] Final deal completed, hands: {len(final_hands) if final_hands else 0}")
+            final_hands = game.final_deal()
+            log.debug("Final deal completed, hands: %s", len(final_hands) if final_hands else 0)
             
             # Use broadcast instead of individual sends to handle disconnected players
             try:
                 await asyncio.wait_for(
-                    self.network_manager.broadcast_to_room(
+                    self.broadcast_to_room(
                         room_code,
                         'final_deal',
                         {
                             'hokm': game.hokm,
                             'message': f'Hokm is {game.hokm}. Final deal completed.'
-                        },
-                        self.redis_manager
+                        }
                     ),
                     timeout=3.0
                 )
-                print(f"[DEBUG] Final deal message broadcasted")
+                log.debug("Final deal message broadcasted")
             except asyncio.TimeoutError:
-                print(f"[DEBUG] Timeout broadcasting final deal message, trying direct network broadcast")
+                log.debug("Timeout broadcasting final deal message, trying direct network broadcast")
                 # Fallback: broadcast directly to network connections
-                for ws, metadata in self.network_manager.connection_metadata.items():
-                    if metadata.get('room_code') == room_code:
-                        try:
-                            await self.network_manager.send_message(
-                                ws,
-                                'final_deal',
-                                {
-                                    'hokm': game.hokm,
-                                    'message': f'Hokm is {game.hokm}. Final deal completed.'
-                                }
-                            )
-                        except Exception as e:
-                            print(f"[DEBUG] Failed to send final deal message to individual connection: {e}")
+                for ws, metadata in self.network_manager.get_room_connections(room_code):
+                    try:
+                        await self.network_manager.send_message(
+                            ws,
+                            'final_deal',
+                            {
+                                'hokm': game.hokm,
+                                'message': f'Hokm is {game.hokm}. Final deal completed.'
+                            }
+                        )
+                    except Exception as e:
+                        log.debug("Failed to send final deal message to individual connection: %s", e)
             except Exception as e:
-                print(f"[DEBUG] Error broadcasting final deal message: {e}")
+                log.debug("Error broadcasting final deal message: %s", e)
             
             # Send individual hands to each player (this will store hands for disconnected players)
-            try:
-                room_players_for_final = await asyncio.wait_for(
-                    loop.run_in_executor(executor, self.redis_manager.get_room_players, room_code),
-                    timeout=2.0
-                )
-                print(f"[DEBUG] Got room players for final hands: {len(room_players_for_final)}")
-            except asyncio.TimeoutError:
-                print(f"[DEBUG] Redis timeout when getting room players for final hands, using connected players")
-                # Fallback: use network manager to get connections
-                room_players_for_final = []
-                for ws, metadata in self.network_manager.connection_metadata.items():
-                    if metadata.get('room_code') == room_code:
-                        room_players_for_final.append({
-                            'username': metadata.get('username', f'Player{len(room_players_for_final)+1}'),
-                            'player_id': metadata.get('player_id')
-                        })
-            except Exception as e:
-                print(f"[DEBUG] Could not get room players for final hands: {e}, using basic fallback")
-                room_players_for_final = []
+            room_players_for_final = await self.get_room_players_cached(room_code)
                 
             for player in room_players_for_final:
                 player_username = player['username']
                 player_hand = final_hands.get(player_username, [])
                 
-                print(f"[DEBUG] Sending final hand to player {player_username}: {len(player_hand)} cards")
+                log.debug("Sending final hand to player %s: %s cards", player_username, len(player_hand))
                 ws = self.network_manager.get_live_connection(player['player_id'])
                 if ws:
                     try:
@@ -1106,29 +1618,26 @@ class GameServer:
                                 'hokm': game.hokm
                             }
                         )
-                        print(f"[DEBUG] Final hand sent to {player_username}")
+                        log.debug("Final hand sent to %s", player_username)
                     except Exception as e:
-                        print(f"[DEBUG] Failed to send final hand to {player_username}: {e}")
+                        log.debug("Failed to send final hand to %s: %s", player_username, e)
                 else:
-                    print(f"[DEBUG] Player {player_username} is disconnected, hand saved in Redis for later retrieval")
+                    log.debug("Player %s is disconnected, hand saved in Redis for later retrieval", player_username)
                     
             # Save state after final deal with timeout
             try:
-                game_state = game.to_redis_dict()
-                await asyncio.wait_for(
-                    loop.run_in_executor(executor, self.redis_manager.save_game_state, room_code, game_state),
-                    timeout=2.0
-                )
-                print(f"[DEBUG] Saved final deal state to Redis")
+                await self.state_persister.save_now(room_code, game.to_redis_delta)
+                await self.sync_room_state(room_code, game)
+                log.debug("Saved final deal state to Redis")
             except asyncio.TimeoutError:
-                print(f"[DEBUG] Redis timeout when saving final deal state, continuing anyway")
+                log.debug("Redis timeout when saving final deal state, continuing anyway")
             except Exception as e:
-                print(f"[DEBUG] Could not save final deal state: {e}, continuing anyway")
+                log.debug("Could not save final deal state: %s, continuing anyway", e)
                 
             # Start first trick (which will send phase_change to GAMEPLAY)
             await self.start_first_trick(room_code)
         except Exception as e:
-            print(f"[ERROR] Failed to handle hokm selection: {str(e)}")
+            log.error("Failed to handle hokm selection: %s", e)
             await self.network_manager.notify_error(websocket, f"Failed to handle hokm selection: {str(e)}")
 
     async def handle_play_card(self, websocket, message):
@@ -1140,16 +1649,28 @@ class GameServer:
             if not room_code or not player_id or not card:
                 await self.network_manager.notify_error(websocket, "Missing room_code, player_id, or card for play_card.")
                 return
-            if room_code not in self.active_games:
+            game = await self.get_game(room_code)
+            if game is None:
                 await self.network_manager.notify_error(websocket, "Game not found for play_card.")
                 return
-            game = self.active_games[room_code]
             
-            # Enhanced player lookup with debugging and fallback
-            player, player_id = await self.find_player_by_websocket(websocket, room_code)
+            # Resolve the player from the in-memory roster. The room actor is the only
+            # writer of this room's state, so the roster and board need no Redis re-read;
+            # a socket the roster does not know yet (e.g. after a restart) is bound from
+            # its connection metadata, and the Redis lookup is only a last resort.
+            roster = self.get_roster(room_code)
+            player, player_id = roster.get_player_by_socket(websocket)
+            if not player:
+                metadata = self.network_manager.connection_metadata.get(websocket) or {}
+                if metadata.get('room_code') == room_code and roster.bind_socket(websocket, metadata.get('player_id')):
+                    player, player_id = roster.get_player_by_socket(websocket)
+            if not player:
+                player, player_id = await self.find_player_by_websocket(websocket, room_code)
+                if player and player_id:
+                    roster.add_player(player_id, player, websocket)
             if not player:
                 error_msg = f"Player not found in room. player_id='{player_id}', room='{room_code}'"
-                print(f"[ERROR] {error_msg}")
+                log.error("%s", error_msg)
                 await self.network_manager.notify_error(websocket, 
                     "Connection lost. Please exit and rejoin the game, or try reconnecting.")
                 return
@@ -1164,23 +1685,37 @@ class GameServer:
             if player not in game.hands or card not in game.hands[player]:
                 await self.network_manager.notify_error(websocket, "Invalid card play: card not in your hand.")
                 return
+            await self.apply_card_play(websocket, room_code, game, player, player_id, card)
+        except Exception as e:
+            log.error("Failed to handle play_card: %s", e)
+            import traceback
+            traceback.print_exc()  # Print full stack trace for debugging
+            try:
+                await self.network_manager.notify_error(websocket, f"Failed to handle play_card: {str(e)}")
+            except Exception as notify_err:
+                log.error("Failed to notify play_card error: %s", notify_err)
+                # Don't re-raise - just log and continue
+
+    async def apply_card_play(self, websocket, room_code, game, player, player_id, card):
+        """Play a checked card for player, persist, broadcast and move the game on (also used by auto-play)"""
+        try:
             # Play card and update state
             try:
-                result = game.play_card(player, card, self.redis_manager)
-                print(f"[DEBUG] play_card result: {result}")
-                print(f"[DEBUG] trick_complete: {result.get('trick_complete')}")
-                print(f"[DEBUG] next_turn: {result.get('next_turn')}")
-                print(f"[DEBUG] current_turn after play: {getattr(game, 'current_turn', 'MISSING')}")
+                result = game.play_card(player, card)
+                log.debug("play_card result: %s", result)
+                log.debug("trick_complete: %s", result.get('trick_complete'))
+                log.debug("next_turn: %s", result.get('next_turn'))
+                log.debug("current_turn after play: %s", getattr(game, 'current_turn', 'MISSING'))
             except ValueError as ve:
                 # This catches invalid game state errors (e.g., invalid trick resolution)
                 error_msg = f"Invalid game state during card play: {str(ve)}"
-                print(f"[ERROR] {error_msg}")
+                log.error("%s", error_msg)
                 await self.network_manager.notify_error(websocket, "Game state error. Please restart the game.")
                 return
             except Exception as e:
                 # Catch any other unexpected errors during card play
                 error_msg = f"Unexpected error during card play: {str(e)}"
-                print(f"[ERROR] {error_msg}")
+                log.error("%s", error_msg)
                 await self.network_manager.notify_error(websocket, "Unexpected error. Please try again.")
                 return
                 
@@ -1188,76 +1723,51 @@ class GameServer:
             if not result.get('valid', True):
                 await self.network_manager.notify_error(websocket, result.get('message', 'Invalid move'))
                 return
-            # Save state after card play with timeout protection
-            try:
-                executor = concurrent.futures.ThreadPoolExecutor()
-                loop = asyncio.get_event_loop()
-                game_state = game.to_redis_dict()
-                await asyncio.wait_for(
-                    loop.run_in_executor(executor, self.redis_manager.save_game_state, room_code, game_state),
-                    timeout=2.0
-                )
-                print(f"[DEBUG] Saved card play state to Redis")
-            except asyncio.TimeoutError:
-                print(f"[DEBUG] Redis timeout when saving card play state, continuing anyway")
-            except Exception as e:
-                print(f"[DEBUG] Could not save card play state: {e}, continuing anyway")
+            # Queue the move and state for write-behind so broadcasts are not held up by Redis
+            move_data = {
+                'player': player,
+                'card': card,
+                'timestamp': str(int(time.time())),
+                'trick_number': len(game.played_cards) // 4
+            }
+            self.state_persister.submit(room_code, game.to_redis_delta, moves=[move_data])
+            await self.sync_room_state(room_code, game)
                 
             # Broadcast card play with timeout protection
             try:
                 await asyncio.wait_for(
-                    self.network_manager.broadcast_to_room(
+                    self.broadcast_to_room(
                         room_code,
                         'card_played',
-                        {'player': player, 'card': card, 'team': game.teams.get(player, 0) + 1, 'player_id': player_id},
-                        self.redis_manager
+                        {'player': player, 'card': card, 'team': game.teams.get(player, 0) + 1, 'player_id': player_id}
                     ),
                     timeout=3.0
                 )
-                print(f"[DEBUG] Card play broadcasted")
+                log.debug("Card play broadcasted")
             except asyncio.TimeoutError:
-                print(f"[DEBUG] Timeout broadcasting card play, trying direct network broadcast")
+                log.debug("Timeout broadcasting card play, trying direct network broadcast")
                 # Fallback: broadcast directly to network connections
-                for ws, metadata in self.network_manager.connection_metadata.items():
-                    if metadata.get('room_code') == room_code:
-                        try:
-                            await self.network_manager.send_message(
-                                ws,
-                                'card_played',
-                                {'player': player, 'card': card, 'team': game.teams.get(player, 0) + 1, 'player_id': player_id}
-                            )
-                        except Exception as e:
-                            print(f"[DEBUG] Failed to send card play to individual connection: {e}")
+                for ws, metadata in self.network_manager.get_room_connections(room_code):
+                    try:
+                        await self.network_manager.send_message(
+                            ws,
+                            'card_played',
+                            {'player': player, 'card': card, 'team': game.teams.get(player, 0) + 1, 'player_id': player_id}
+                        )
+                    except Exception as e:
+                        log.debug("Failed to send card play to individual connection: %s", e)
             except Exception as e:
-                print(f"[DEBUG] Error broadcasting card play: {e}")
+                log.debug("Error broadcasting card play: %s", e)
             
             # Send turn_start for next player if trick is not complete
             if not result.get('trick_complete'):
                 next_player = result.get('next_turn')
-                print(f"[DEBUG] Trick not complete, next_player: {next_player}")
+                log.debug("Trick not complete, next_player: %s", next_player)
                 if next_player:
-                    print(f"[DEBUG] About to send turn_start to next player: {next_player}")
-                    try:
-                        room_players_for_turn = await asyncio.wait_for(
-                            loop.run_in_executor(executor, self.redis_manager.get_room_players, room_code),
-                            timeout=2.0
-                        )
-                        print(f"[DEBUG] Got room players for next turn: {len(room_players_for_turn)}")
-                    except asyncio.TimeoutError:
-                        print(f"[DEBUG] Redis timeout when getting room players for next turn, using connected players")
-                        # Fallback: use network manager to get connections
-                        room_players_for_turn = []
-                        for ws, metadata in self.network_manager.connection_metadata.items():
-                            if metadata.get('room_code') == room_code:
-                                room_players_for_turn.append({
-                                    'username': metadata.get('username', f'Player{len(room_players_for_turn)+1}'),
-                                    'player_id': metadata.get('player_id')
-                                })
-                    except Exception as e:
-                        print(f"[DEBUG] Could not get room players for next turn: {e}, using basic fallback")
-                        room_players_for_turn = []
+                    log.debug("About to send turn_start to next player: %s", next_player)
+                    room_players_for_turn = await self.get_room_players_cached(room_code)
                     
-                    print(f"[DEBUG] Sending turn_start to {len(room_players_for_turn)} players")
+                    log.debug("Sending turn_start to %s players", len(room_players_for_turn))
                     for player_info in room_players_for_turn:
                         ws = self.network_manager.get_live_connection(player_info['player_id'])
                         if ws and player_info['username'] in game.hands:
@@ -1273,61 +1783,40 @@ class GameServer:
                                         "message": f"It's {next_player}'s turn"
                                     }
                                 )
-                                print(f"[DEBUG] Sent turn_start to {player_info['username']} for next player {next_player}")
+                                log.debug("Sent turn_start to %s for next player %s", player_info['username'], next_player)
                             except Exception as e:
-                                print(f"[DEBUG] Failed to send turn_start to {player_info['username']}: {e}")
+                                log.debug("Failed to send turn_start to %s: %s", player_info['username'], e)
                         else:
                             if not ws:
-                                print(f"[DEBUG] Player {player_info['username']} is disconnected during turn transition")
+                                log.debug("Player %s is disconnected during turn transition", player_info['username'])
                             if player_info['username'] not in game.hands:
-                                print(f"[DEBUG] Player {player_info['username']} has no hand data during turn transition")
+                                log.debug("Player %s has no hand data during turn transition", player_info['username'])
                 else:
-                    print(f"[DEBUG] No next_player found in result!")
+                    log.debug("No next_player found in result!")
             else:
-                print(f"[DEBUG] Trick is complete, not sending turn_start")
+                log.debug("Trick is complete, not sending turn_start")
             
-            # If trick complete, broadcast trick result and save state
+            # If trick complete, broadcast trick result
             if result.get('trick_complete'):
                 try:
-                    await self.network_manager.broadcast_to_room(
+                    await self.broadcast_to_room(
                         room_code,
                         'trick_result',
                         {
                             'winner': result.get('trick_winner'),
                             'team1_tricks': (result.get('team_tricks') or {}).get(0, 0),
                             'team2_tricks': (result.get('team_tricks') or {}).get(1, 0)
-                        },
-                        self.redis_manager
+                        }
                     )
                 except Exception as e:
-                    print(f"[ERROR] trick_result broadcast failed: {e}")
-                # Save state after trick
-                game_state = game.to_redis_dict()
-                self.redis_manager.save_game_state(room_code, game_state)
+                    log.error("trick_result broadcast failed: %s", e)
+                # State after the trick was already queued for write-behind right after play_card
                 
                 # Send turn_start for trick winner to start next trick (unless hand is complete)
                 if not result.get('hand_complete'):
                     trick_winner = result.get('trick_winner')
                     if trick_winner:
-                        try:
-                            room_players_for_next_trick = await asyncio.wait_for(
-                                loop.run_in_executor(executor, self.redis_manager.get_room_players, room_code),
-                                timeout=2.0
-                            )
-                            print(f"[DEBUG] Got room players for next trick: {len(room_players_for_next_trick)}")
-                        except asyncio.TimeoutError:
-                            print(f"[DEBUG] Redis timeout when getting room players for next trick, using connected players")
-                            # Fallback: use network manager to get connections
-                            room_players_for_next_trick = []
-                            for ws, metadata in self.network_manager.connection_metadata.items():
-                                if metadata.get('room_code') == room_code:
-                                    room_players_for_next_trick.append({
-                                        'username': metadata.get('username', f'Player{len(room_players_for_next_trick)+1}'),
-                                        'player_id': metadata.get('player_id')
-                                    })
-                        except Exception as e:
-                            print(f"[DEBUG] Could not get room players for next trick: {e}, using basic fallback")
-                            room_players_for_next_trick = []
+                        room_players_for_next_trick = await self.get_room_players_cached(room_code)
                         
                         for player_info in room_players_for_next_trick:
                             ws = self.network_manager.get_live_connection(player_info['player_id'])
@@ -1344,16 +1833,16 @@ class GameServer:
                                             "message": f"{trick_winner} won the trick and leads next"
                                         }
                                     )
-                                    print(f"[DEBUG] Sent turn_start to {player_info['username']} for trick winner {trick_winner}")
+                                    log.debug("Sent turn_start to %s for trick winner %s", player_info['username'], trick_winner)
                                 except Exception as e:
-                                    print(f"[DEBUG] Failed to send turn_start to {player_info['username']}: {e}")
+                                    log.debug("Failed to send turn_start to %s: %s", player_info['username'], e)
                             else:
                                 if not ws:
-                                    print(f"[DEBUG] Player {player_info['username']} is disconnected during trick transition")
+                                    log.debug("Player %s is disconnected during trick transition", player_info['username'])
                                 if player_info['username'] not in game.hands:
-                                    print(f"[DEBUG] Player {player_info['username']} has no hand data during trick transition")
+                                    log.debug("Player %s has no hand data during trick transition", player_info['username'])
                 
-                # If hand complete, broadcast hand and round completion and save state
+                # If hand complete, broadcast hand and round completion
                 if result.get('hand_complete'):
                     # Fix the winning_team calculation to prevent negative values
                     round_winner = result.get('round_winner', 1)  # Default to team 1 if missing
@@ -1362,7 +1851,7 @@ class GameServer:
                     team_tricks = result.get('team_tricks') or {0: 0, 1: 0}
                     round_scores = result.get('round_scores') or {0: 0, 1: 0}
                     try:
-                        await self.network_manager.broadcast_to_room(
+                        await self.broadcast_to_room(
                             room_code,
                             'hand_complete',
                             {
@@ -1371,135 +1860,95 @@ class GameServer:
                                 'round_winner': round_winner,
                                 'round_scores': round_scores,
                                 'game_complete': bool(result.get('game_complete', False))
-                            },
-                            self.redis_manager
+                            }
                         )
                     except Exception as e:
-                        print(f"[ERROR] hand_complete broadcast failed: {e}")
-                    # Save state after hand completion
-                    game_state = game.to_redis_dict()
-                    self.redis_manager.save_game_state(room_code, game_state)
+                        log.error("hand_complete broadcast failed: %s", e)
+                    # Hand end is a phase boundary: make the final state durable now
+                    await self.state_persister.flush(room_code)
 
                     # Broadcast game_over if game is complete, otherwise start next round
                     if result.get('game_complete'):
-                        await self.network_manager.broadcast_to_room(
+                        await self.broadcast_to_room(
                             room_code,
                             'game_over',
-                            {'winner_team': result.get('round_winner')},
-                            self.redis_manager
+                            {'winner_team': result.get('round_winner')}
                         )
                     else:
                         # Start next round after 3 seconds delay
-                        print(f"[LOG] Scheduling next round for room {room_code}")
+                        log.info("Scheduling next round for room %s", room_code)
                         asyncio.create_task(self.start_next_round_delayed(room_code, 3.0))
-        except Exception as e:
-            print(f"[ERROR] Failed to handle play_card: {str(e)}")
-            import traceback
-            traceback.print_exc()  # Print full stack trace for debugging
-            try:
-                await self.network_manager.notify_error(websocket, f"Failed to handle play_card: {str(e)}")
-            except Exception as notify_err:
-                print(f"[ERROR] Failed to notify play_card error: {notify_err}")
-                # Don't re-raise - just log and continue
+        finally:
+            # Whoever has to act next gets a fresh deadline (cancelled when no one does)
+            self.arm_turn_deadline(room_code)
 
     async def start_first_trick(self, room_code):
         """Initialize the first trick after hokm selection"""
         try:
-            executor = concurrent.futures.ThreadPoolExecutor()
-            loop = asyncio.get_event_loop()
-            
             game = self.active_games[room_code]
             
             # Find the hakem's index in the players list
             try:
                 hakem_index = game.players.index(game.hakem)
             except ValueError:
-                print(f"[ERROR] Hakem {game.hakem} not found in players list {game.players}")
+                log.error("Hakem %s not found in players list %s", game.hakem, game.players)
                 # Fallback: assume hakem is at index 0
                 hakem_index = 0
                 
             game.current_turn = hakem_index  # Hakem leads first trick
             first_player = game.players[game.current_turn]
             
-            print(f"\n=== Starting first trick in room {room_code} ===")
-            print(f"Hakem: {game.hakem}")
-            print(f"Players order: {game.players}")
-            print(f"Hakem index: {hakem_index}")
-            print(f"{first_player} (Hakem) leads the first trick")
-            print(f"Current turn set to: {game.current_turn}")
+            log.debug("Starting first trick in room %s: hakem %s at index %s of %s, %s leads (current_turn=%s)",
+                      room_code, game.hakem, hakem_index, game.players, first_player, game.current_turn)
             
             # Verify that the first player is actually the hakem
             if first_player != game.hakem:
-                print(f"[WARNING] First player {first_player} is not the hakem {game.hakem}!")
+                log.warning("First player %s is not the hakem %s!", first_player, game.hakem)
                 # Force the hakem to be the current player
                 game.current_turn = game.players.index(game.hakem)
                 first_player = game.hakem
-                print(f"[FIX] Corrected current_turn to {game.current_turn} for hakem {game.hakem}")
+                log.warning("Corrected current_turn to %s for hakem %s", game.current_turn, game.hakem)
             
             # Update phase to gameplay
             game.game_phase = GameState.GAMEPLAY.value
             
             # Save updated game state after initiating first trick with timeout
             try:
-                game_state = game.to_redis_dict()
-                await asyncio.wait_for(
-                    loop.run_in_executor(executor, self.redis_manager.save_game_state, room_code, game_state),
-                    timeout=2.0
-                )
-                print(f"[DEBUG] Saved gameplay phase state to Redis")
+                await self.state_persister.save_now(room_code, game.to_redis_delta)
+                await self.sync_room_state(room_code, game)
+                log.debug("Saved gameplay phase state to Redis")
             except asyncio.TimeoutError:
-                print(f"[DEBUG] Redis timeout when saving gameplay state, continuing anyway")
+                log.debug("Redis timeout when saving gameplay state, continuing anyway")
             except Exception as e:
-                print(f"[DEBUG] Could not save gameplay state: {e}, continuing anyway")
+                log.debug("Could not save gameplay state: %s, continuing anyway", e)
             
             # Broadcast phase change to gameplay with timeout protection
             try:
                 await asyncio.wait_for(
-                    self.network_manager.broadcast_to_room(
+                    self.broadcast_to_room(
                         room_code,
                         'phase_change',
-                        {'new_phase': GameState.GAMEPLAY.value},
-                        self.redis_manager
+                        {'new_phase': GameState.GAMEPLAY.value}
                     ),
                     timeout=3.0
                 )
-                print(f"[DEBUG] GAMEPLAY phase change broadcasted")
+                log.debug("GAMEPLAY phase change broadcasted")
             except asyncio.TimeoutError:
-                print(f"[DEBUG] Timeout broadcasting GAMEPLAY phase change, trying direct network broadcast")
+                log.debug("Timeout broadcasting GAMEPLAY phase change, trying direct network broadcast")
                 # Fallback: broadcast directly to network connections
-                for ws, metadata in self.network_manager.connection_metadata.items():
-                    if metadata.get('room_code') == room_code:
-                        try:
-                            await self.network_manager.send_message(
-                                ws,
-                                'phase_change',
-                                {'new_phase': GameState.GAMEPLAY.value}
-                            )
-                        except Exception as e:
-                            print(f"[DEBUG] Failed to send phase change to individual connection: {e}")
+                for ws, metadata in self.network_manager.get_room_connections(room_code):
+                    try:
+                        await self.network_manager.send_message(
+                            ws,
+                            'phase_change',
+                            {'new_phase': GameState.GAMEPLAY.value}
+                        )
+                    except Exception as e:
+                        log.debug("Failed to send phase change to individual connection: %s", e)
             except Exception as e:
-                print(f"[DEBUG] Error broadcasting GAMEPLAY phase change: {e}")
+                log.debug("Error broadcasting GAMEPLAY phase change: %s", e)
             
-            # Get room players with timeout protection
-            try:
-                room_players = await asyncio.wait_for(
-                    loop.run_in_executor(executor, self.redis_manager.get_room_players, room_code),
-                    timeout=2.0
-                )
-                print(f"[DEBUG] Got room players for turn start: {len(room_players)}")
-            except asyncio.TimeoutError:
-                print(f"[DEBUG] Redis timeout when getting room players for turn start, using connected players")
-                # Fallback: use network manager to get connections
-                room_players = []
-                for ws, metadata in self.network_manager.connection_metadata.items():
-                    if metadata.get('room_code') == room_code:
-                        room_players.append({
-                            'username': metadata.get('username', f'Player{len(room_players)+1}'),
-                            'player_id': metadata.get('player_id')
-                        })
-            except Exception as e:
-                print(f"[DEBUG] Could not get room players for turn start: {e}, using basic fallback")
-                room_players = []
+            room_players = await self.get_room_players_cached(room_code)
             
             # Send individual turn info to each player with hand data
             for player in room_players:
@@ -1520,17 +1969,18 @@ class GameServer:
                                 "message": f"{first_player} (Hakem) leads the first trick"
                             }
                         )
-                        print(f"[DEBUG] Sent turn_start with hand to {player_username}: {len(game.hands[player_username])} cards")
+                        log.debug("Sent turn_start with hand to %s: %s cards", player_username, len(game.hands[player_username]))
                     except Exception as e:
-                        print(f"[DEBUG] Failed to send turn_start to {player_username}: {e}")
+                        log.debug("Failed to send turn_start to %s: %s", player_username, e)
                 else:
                     if not ws:
-                        print(f"[DEBUG] Player {player_username} is disconnected during first trick start")
+                        log.debug("Player %s is disconnected during first trick start", player_username)
                     if player_username not in game.hands:
-                        print(f"[DEBUG] Player {player_username} has no hand data")
+                        log.debug("Player %s has no hand data", player_username)
+            self.arm_turn_deadline(room_code)
                         
         except Exception as e:
-            print(f"[ERROR] Failed to start first trick: {str(e)}")
+            log.error("Failed to start first trick: %s", e)
             traceback.print_exc()
 
     async def handle_clear_room(self, websocket, message):
@@ -1540,89 +1990,77 @@ class GameServer:
         if not room_code:
             await self.network_manager.notify_error(websocket, "Missing room_code for clear_room command.")
             return
-        self.redis_manager.delete_room(room_code)
-        if room_code in self.active_games:
-            del self.active_games[room_code]
+        await self.redis_call(self.redis_manager.delete_room, room_code, timeout=2.0)
+        self.drop_room_state(room_code)
         await self.network_manager.notify_info(websocket, f"Room {room_code} has been cleared.")
 
     async def find_player_by_websocket(self, websocket, room_code):
         """Enhanced player lookup with multiple fallback mechanisms"""
-        print(f"[DEBUG] find_player_by_websocket called for room {room_code}")
-        print(f"[DEBUG] About to call redis_manager.get_room_players...")
-        
-        # Create executor and loop for timeout operations
-        executor = concurrent.futures.ThreadPoolExecutor()
-        loop = asyncio.get_event_loop()
+        log.debug("find_player_by_websocket called for room %s", room_code)
+        log.debug("About to call redis_manager.get_room_players...")
         
         try:
-            room_players = await asyncio.wait_for(
-                loop.run_in_executor(executor, self.redis_manager.get_room_players, room_code),
-                timeout=2.0
-            )
-            print(f"[DEBUG] get_room_players returned {len(room_players)} players")
+            room_players = await self.redis_call(self.redis_manager.get_room_players, room_code, timeout=2.0)
+            log.debug("get_room_players returned %s players", len(room_players))
         except asyncio.TimeoutError:
-            print(f"[DEBUG] Redis timeout when getting room players, using fallback")
+            log.debug("Redis timeout when getting room players, using fallback")
             # Fallback: use network manager to get connections
             room_players = []
-            for ws, metadata in self.network_manager.connection_metadata.items():
-                if metadata.get('room_code') == room_code:
-                    room_players.append({
-                        'username': metadata.get('username'),
-                        'player_id': metadata.get('player_id'),
-                        'connection_status': 'active'
-                    })
-            print(f"[DEBUG] Using {len(room_players)} fallback players")
+            for ws, metadata in self.network_manager.get_room_connections(room_code):
+                room_players.append({
+                    'username': metadata.get('username'),
+                    'player_id': metadata.get('player_id'),
+                    'connection_status': 'active'
+                })
+            log.debug("Using %s fallback players", len(room_players))
         except Exception as e:
-            print(f"[DEBUG] Error getting room players: {e}, using fallback")
+            log.debug("Error getting room players: %s, using fallback", e)
             # Fallback: use network manager to get connections
             room_players = []
-            for ws, metadata in self.network_manager.connection_metadata.items():
-                if metadata.get('room_code') == room_code:
-                    room_players.append({
-                        'username': metadata.get('username'),
-                        'player_id': metadata.get('player_id'),
-                        'connection_status': 'active'
-                    })
-            print(f"[DEBUG] Using {len(room_players)} fallback players")
+            for ws, metadata in self.network_manager.get_room_connections(room_code):
+                room_players.append({
+                    'username': metadata.get('username'),
+                    'player_id': metadata.get('player_id'),
+                    'connection_status': 'active'
+                })
+            log.debug("Using %s fallback players", len(room_players))
         
         # Method 1: Check connection metadata
         if websocket in self.network_manager.connection_metadata:
             conn_data = self.network_manager.connection_metadata[websocket]
             player_id = conn_data.get('player_id')
-            print(f"[DEBUG] Found connection metadata with player_id: {player_id}")
+            log.debug("Found connection metadata with player_id: %s", player_id)
             if player_id:
                 for p in room_players:
-                    print(f"[DEBUG] Checking room player: {p}")
+                    log.debug("Checking room player: %s", p)
                     if p.get('player_id') == player_id:
-                        print(f"[DEBUG] Method 1 success: Found player {p.get('username')}")
+                        log.debug("Method 1 success: Found player %s", p.get('username'))
                         return p.get('username'), player_id
         else:
-            print(f"[DEBUG] Websocket not in connection_metadata")
+            log.debug("Websocket not in connection_metadata")
         
         # Method 2: Check live connections
         if websocket in self.network_manager.live_connections:
             player_id = self.network_manager.live_connections[websocket]
-            print(f"[DEBUG] Found in live_connections with player_id: {player_id}")
+            log.debug("Found in live_connections with player_id: %s", player_id)
             for p in room_players:
                 if p.get('player_id') == player_id:
-                    print(f"[DEBUG] Method 2 success: Found player {p.get('username')}")
+                    log.debug("Method 2 success: Found player %s", p.get('username'))
                     return p.get('username'), player_id
         else:
-            print(f"[DEBUG] Websocket not in live_connections")
+            log.debug("Websocket not in live_connections")
         
-        # Method 3: Find by room code match in connection metadata
-        print(f"[DEBUG] Trying method 3...")
+        # Method 3: Find by room code match in the player -> socket index
+        log.debug("Trying method 3...")
         for p in room_players:
             if p.get('connection_status') == 'active':
-                # Try to find websocket for this player
-                for ws, conn_data in self.network_manager.connection_metadata.items():
-                    if (conn_data.get('room_code') == room_code and 
-                        conn_data.get('player_id') == p.get('player_id')):
-                        if ws == websocket:
-                            print(f"[DEBUG] Method 3 success: Found player {p.get('username')}")
-                            return p.get('username'), p.get('player_id')
+                player_id = p.get('player_id')
+                if (self.network_manager.get_live_connection(player_id) is websocket and
+                        self.network_manager.is_player_connected(player_id, room_code)):
+                    log.debug("Method 3 success: Found player %s", p.get('username'))
+                    return p.get('username'), player_id
         
-        print(f"[DEBUG] All methods failed - player not found!")
+        log.debug("All methods failed - player not found!")
         return None, None
 
     def repair_player_connection(self, websocket, room_code, username):
@@ -1649,72 +2087,73 @@ class GameServer:
             # Update network manager
             self.network_manager.register_connection(websocket, new_player_id, room_code, username)
             
-            print(f"[LOG] Repaired connection for {username} in room {room_code}")
+            log.info("Repaired connection for %s in room %s", username, room_code)
             return new_player_id
             
         except Exception as e:
-            print(f"[ERROR] Failed to repair connection for {username}: {str(e)}")
+            log.error("Failed to repair connection for %s: %s", username, e)
             return None
 
     async def start_next_round_delayed(self, room_code, delay_seconds):
-        """Start next round after a delay"""
+        """Start next round after a delay (on the room's actor, like any other room command)"""
         await asyncio.sleep(delay_seconds)
-        await self.start_next_round(room_code)
+        try:
+            await self.room_actors.run(room_code, self.start_next_round, room_code)
+        except MailboxFull:
+            log.error("Room %s mailbox full, could not start next round", room_code)
 
     async def start_next_round(self, room_code):
         """Start the next round with new hakem selection"""
         try:
-            if room_code not in self.active_games:
-                print(f"[ERROR] Room {room_code} not found for next round")
+            game = await self.get_game(room_code)
+            if game is None:
+                log.error("Room %s not found for next round", room_code)
                 return
-
-            game = self.active_games[room_code]
             
             if game.game_phase == "completed":
-                print(f"[LOG] Game in room {room_code} is already completed")
+                log.info("Game in room %s is already completed", room_code)
                 return
 
-            print(f"[LOG] Starting next round in room {room_code}")
+            log.info("Starting next round in room %s", room_code)
             
             # Start new round (this handles hakem selection and initial deal)
-            initial_hands = game.start_new_round(self.redis_manager)
+            initial_hands = game.start_new_round()
             
             if isinstance(initial_hands, dict) and "error" in initial_hands:
-                print(f"[ERROR] Failed to start new round: {initial_hands['error']}")
+                log.error("Failed to start new round: %s", initial_hands['error'])
                 return
 
             # Get round info for broadcast
             round_info = game.get_new_round_info()
-            print(f"[LOG] Round info: {round_info}")
+            log.info("Round info: %s", round_info)
             
             # Broadcast phase change to hokm selection
-            await self.network_manager.broadcast_to_room(
+            await self.broadcast_to_room(
                 room_code,
                 'phase_change',
-                {'new_phase': GameState.WAITING_FOR_HOKM.value},
-                self.redis_manager
+                {'new_phase': GameState.WAITING_FOR_HOKM.value}
             )
             
             # Broadcast new round start to all players
-            await self.network_manager.broadcast_to_room(
+            await self.broadcast_to_room(
                 room_code,
                 'new_round_start',
-                round_info,
-                self.redis_manager
+                round_info
             )
 
             # Send individual initial hands to each player
-            print(f"[LOG] Broadcasting initial hands: {list(initial_hands.keys())}")
+            log.info("Broadcasting initial hands: %s", list(initial_hands.keys()))
             await self.broadcast_initial_hands(room_code, initial_hands)
 
             # Update game state in Redis
-            game_state = game.to_redis_dict()
-            self.redis_manager.save_game_state(room_code, game_state)
+            await self.state_persister.save_now(room_code, game.to_redis_delta)
+            await self.sync_room_state(room_code, game)
+            self.arm_turn_deadline(room_code)
 
-            print(f"[LOG] Next round started successfully in room {room_code}")
+            log.info("Next round started successfully in room %s", room_code)
             
         except Exception as e:
-            print(f"[ERROR] Failed to start next round in room {room_code}: {str(e)}")
+            log.error("Failed to start next round in room %s: %s", room_code, e)
             import traceback
             traceback.print_exc()
 
@@ -1722,10 +2161,10 @@ class GameServer:
         """Broadcast initial hands (5 cards) to players for hokm selection"""
         try:
             game = self.active_games[room_code]
+            room_players = await self.get_room_players_cached(room_code)
             
             for player_name, hand in hands.items():
                 # Find the player info
-                room_players = self.redis_manager.get_room_players(room_code)
                 player_info = next((p for p in room_players if p['username'] == player_name), None)
                 
                 if player_info:
@@ -1746,12 +2185,12 @@ class GameServer:
                                 'phase': 'hokm_selection'
                             }
                         )
-                        print(f"[LOG] Sent initial hand to {player_name} (hakem: {is_hakem})")
+                        log.info("Sent initial hand to %s (hakem: %s)", player_name, is_hakem)
                     else:
-                        print(f"[ERROR] No websocket connection found for {player_name} (player_id: {player_id})")
+                        log.error("No websocket connection found for %s (player_id: %s)", player_name, player_id)
                         
         except Exception as e:
-            print(f"[ERROR] Failed to broadcast initial hands: {str(e)}")
+            log.error("Failed to broadcast initial hands: %s", e)
             import traceback
             traceback.print_exc()
 
@@ -1762,7 +2201,7 @@ class GameServer:
             username = disconnected_player['username']
             player_number = disconnected_player['player_number']
             
-            print(f"[LOG] Player reconnection: {username} rejoining room {room_code}")
+            log.info("Player reconnection: %s rejoining room %s", username, room_code)
             
             # Update player status to active
             updated_player_data = disconnected_player.copy()
@@ -1778,13 +2217,14 @@ class GameServer:
                 'player_number': player_number,
                 'connection_status': 'active'
             }
-            self.redis_manager.save_player_session(player_id, session_data)
+            await self.redis_call(self.redis_manager.save_player_session, player_id, session_data, timeout=2.0)
             
             # Register live connection
             self.network_manager.register_connection(websocket, player_id, room_code, username)
+            await self._bind_reconnected_player(websocket)
             
             # Update room player data
-            self.redis_manager.update_player_in_room(room_code, player_id, updated_player_data)
+            await self.redis_call(self.redis_manager.update_player_in_room, room_code, player_id, updated_player_data, timeout=2.0)
             
             # Send reconnection success message
             await self.network_manager.send_message(
@@ -1796,32 +2236,36 @@ class GameServer:
                     'room_code': room_code,
                     'player_number': player_number,
                     'reconnected': True,
-                    'message': f'Reconnected as {username}'
+                    'message': f'Reconnected as {username}',
+                    'resume_token': self.network_manager.issue_resume_token(player_id, username, room_code)
                 }
             )
             
             # Send current game state if game is in progress
-            game = self.active_games.get(room_code)
-            if game:
+            game = await self.get_game(room_code)
+            if game and self.delta_sync:
+                # Only the changes since the player's last acknowledged sequence
+                await self.resume_state(websocket)
+                await self.send_reconnect_prompt(websocket, game, username)
+            elif game:
                 await self.send_game_state_to_reconnected_player(websocket, room_code, game, username)
             
             # Notify other players about reconnection
-            await self.network_manager.broadcast_to_room(
+            await self.broadcast_to_room(
                 room_code,
                 'player_reconnected',
                 {
                     'username': username,
                     'player_number': player_number,
                     'message': f'{username} has reconnected'
-                },
-                self.redis_manager
+                }
             )
             
-            print(f"[LOG] {username} successfully reconnected to room {room_code}")
+            log.info("%s successfully reconnected to room %s", username, room_code)
             return True
             
         except Exception as e:
-            print(f"[ERROR] Failed to handle player reconnection: {str(e)}")
+            log.error("Failed to handle player reconnection: %s", e)
             await self.network_manager.notify_error(websocket, f"Reconnection failed: {str(e)}")
             return False
 
@@ -1887,36 +2331,41 @@ class GameServer:
                 )
             
             # Handle hokm selection phase for reconnected players
-            elif game.game_phase in ['waiting_for_hokm', GameState.WAITING_FOR_HOKM.value] and hasattr(game, 'hakem'):
-                if game.hakem == username:
-                    # Send hokm selection prompt to the hakem
-                    await self.network_manager.send_message(
-                        websocket,
-                        'hokm_selection_prompt',
-                        {
-                            'message': 'You are the Hakem. Please select the hokm suit.',
-                            'hakem': game.hakem,
-                            'you': username,
-                            'phase': game.game_phase
-                        }
-                    )
-                    print(f"[LOG] Sent hokm selection prompt to reconnected hakem: {username}")
-                else:
-                    # Send waiting message to non-hakem players
-                    await self.network_manager.send_message(
-                        websocket,
-                        'waiting_for_hokm',
-                        {
-                            'message': f'Waiting for {game.hakem} to select hokm.',
-                            'hakem': game.hakem,
-                            'you': username,
-                            'phase': game.game_phase
-                        }
-                    )
-                    print(f"[LOG] Sent waiting for hokm message to reconnected player: {username}")
+            else:
+                await self.send_reconnect_prompt(websocket, game, username)
                 
         except Exception as e:
-            print(f"[ERROR] Failed to send game state to reconnected player: {str(e)}")
+            log.error("Failed to send game state to reconnected player: %s", e)
+
+    async def send_reconnect_prompt(self, websocket, game, username):
+        """During hokm selection, prompt a reconnected hakem or tell others who is choosing"""
+        if game.game_phase in ['waiting_for_hokm', GameState.WAITING_FOR_HOKM.value] and hasattr(game, 'hakem'):
+            if game.hakem == username:
+                # Send hokm selection prompt to the hakem
+                await self.network_manager.send_message(
+                    websocket,
+                    'hokm_selection_prompt',
+                    {
+                        'message': 'You are the Hakem. Please select the hokm suit.',
+                        'hakem': game.hakem,
+                        'you': username,
+                        'phase': game.game_phase
+                    }
+                )
+                log.info("Sent hokm selection prompt to reconnected hakem: %s", username)
+            else:
+                # Send waiting message to non-hakem players
+                await self.network_manager.send_message(
+                    websocket,
+                    'waiting_for_hokm',
+                    {
+                        'message': f'Waiting for {game.hakem} to select hokm.',
+                        'hakem': game.hakem,
+                        'you': username,
+                        'phase': game.game_phase
+                    }
+                )
+                log.info("Sent waiting for hokm message to reconnected player: %s", username)
 
     async def handle_health_check(self, websocket, message):
         """Handle health check requests - returns circuit breaker and system status"""
@@ -1931,7 +2380,17 @@ class GameServer:
                 },
                 'circuit_breakers': self.circuit_breaker_monitor.get_circuit_breaker_status(),
                 'redis_health': self.circuit_breaker_monitor.check_redis_health(),
-                'performance_metrics': self.redis_manager.get_performance_metrics()
+                'performance_metrics': self.redis_manager.get_performance_metrics(),
+                'io_executor': self.io_executor.get_metrics(),
+                'broadcast': self.network_manager.fanout.get_metrics(),
+                'outbound': self.network_manager.outbound.get_metrics() if self.network_manager.outbound else None,
+                'state_persister': self.state_persister.get_metrics(),
+                'hydration': dict(self.hydration_metrics, in_flight=len(self._hydrations)),
+                'room_actors': self.room_actors.get_metrics(),
+                'heartbeat': self.heartbeat.get_metrics(),
+                'logging': log_pipeline.get_metrics(),
+                'state_sync': self.network_manager.get_bandwidth_statistics() if self.delta_sync else None,
+                'turn_timers': dict(self.turn_timers.get_metrics(), auto_play=dict(self.auto_play_metrics))
             }
             
             # Determine overall health status
@@ -1943,21 +2402,18 @@ class GameServer:
             ):
                 health_data['status'] = 'degraded'
             
-            # Send health check response
-            await websocket.send(json.dumps({
-                'type': 'health_check_response',
-                'data': health_data
-            }))
+            # Send health check response (through the outbound queue, keeping frame order)
+            await self.network_manager.send_message(websocket, 'health_check_response', {'data': health_data})
             
         except Exception as e:
-            print(f"[ERROR] Health check failed: {str(e)}")
+            log.error("Health check failed: %s", e)
             await self.network_manager.notify_error(websocket, f"Health check failed: {str(e)}")
 
 async def cleanup_task(server_instance):
-    """Periodic task to cleanup expired sessions, inactive rooms, and stale connections"""
+    """Periodic task to cleanup expired sessions and inactive rooms (dead sockets are the heartbeat's job)"""
     # Wait for server to fully start before beginning cleanup
     await asyncio.sleep(30)
-    print("[LOG] Cleanup task starting periodic maintenance...")
+    log.info("Cleanup task starting periodic maintenance...")
     
     while True:
         try:
@@ -1966,151 +2422,162 @@ async def cleanup_task(server_instance):
                 await asyncio.sleep(300)
                 continue
                 
-            # Check for dead connections by attempting to ping them
-            dead_connections = []
-            for ws, metadata in list(server_instance.network_manager.connection_metadata.items()):
-                try:
-                    # Try to ping the connection
-                    pong_waiter = await ws.ping()
-                    await asyncio.wait_for(pong_waiter, timeout=5)  # Short timeout for cleanup
-                except (websockets.ConnectionClosed, asyncio.TimeoutError, Exception):
-                    print(f"[LOG] Found dead connection for player {metadata.get('player_id')} in room {metadata.get('room_code')}")
-                    dead_connections.append(ws)
-            
-            # Handle dead connections
-            for ws in dead_connections:
-                try:
-                    await server_instance.handle_connection_closed(ws)
-                except Exception as e:
-                    print(f"[ERROR] Error handling dead connection: {str(e)}")
-            
             # Cleanup expired sessions from Redis
-            server_instance.redis_manager.cleanup_expired_sessions()
+            await server_instance.redis_call(server_instance.redis_manager.cleanup_expired_sessions, timeout=10.0)
             
             current_time = int(time.time())
             
-            # Check and cleanup stale connections (fallback)
-            for ws, metadata in list(server_instance.network_manager.connection_metadata.items()):
-                connected_at = metadata.get('connected_at', 0)
-                if current_time - connected_at > 7200:  # 2 hours without activity
-                    print(f"[LOG] Removing stale connection for player {metadata.get('player_id')}")
-                    try:
-                        await server_instance.handle_connection_closed(ws)
-                    except Exception as e:
-                        print(f"[ERROR] Error removing stale connection: {str(e)}")
-            
-            # Check for inactive rooms in Redis by scanning for room keys
-            for key in server_instance.redis_manager.redis.scan_iter("room:*:players"):
+            # Check for inactive rooms in Redis
+            redis_manager = server_instance.redis_manager
+            room_codes = await server_instance.redis_call(redis_manager.get_active_rooms, timeout=10.0)
+            for room_code in room_codes:
                 try:
-                    room_code = key.decode().split(':')[1]  # Extract room code from key
-                    if server_instance.redis_manager.room_exists(room_code):
-                        game_state = server_instance.redis_manager.get_game_state(room_code)
-                        if game_state:
-                            last_activity = int(game_state.get('last_activity', '0'))
-                            if current_time - last_activity > 3600:  # 1 hour inactivity
-                                print(f"[LOG] Cleaning up inactive room {room_code}")
-                                server_instance.redis_manager.delete_room(room_code)
-                                
-                                # Remove from active games if exists
-                                if room_code in server_instance.active_games:
-                                    del server_instance.active_games[room_code]
+                    game_state = await server_instance.redis_call(redis_manager.get_game_state, room_code)
+                    if game_state:
+                        last_activity = int(game_state.get('last_activity', '0'))
+                        if current_time - last_activity > 3600:  # 1 hour inactivity
+                            log.info("Cleaning up inactive room %s", room_code)
+                            await server_instance.redis_call(redis_manager.delete_room, room_code)
+                            
+                            # Remove from active games if exists
+                            if room_code in server_instance.active_games:
+                                del server_instance.active_games[room_code]
                 except Exception as e:
-                    print(f"[ERROR] Error checking room {room_code}: {str(e)}")
+                    log.error("Error checking room %s: %s", room_code, e)
                     
         except Exception as e:
-            print(f"[ERROR] Error in cleanup task: {str(e)}")
+            log.error("Error in cleanup task: %s", e)
             import traceback
             traceback.print_exc()
             
         await asyncio.sleep(60)  # Run every minute for better responsiveness
 
-async def main():
+def build_arg_parser():
     import argparse
     
-    # Parse command line arguments
     parser = argparse.ArgumentParser(description='Hokm Game WebSocket Server')
     parser.add_argument('--port', type=int, default=8765, help='Port to listen on (default: 8765)')
     parser.add_argument('--instance-name', type=str, default='primary', help='Instance name (default: primary)')
     parser.add_argument('--host', type=str, default='0.0.0.0', help='Host to bind to (default: 0.0.0.0)')
+    parser.add_argument('--io-workers', type=int, default=None, help='Worker threads for blocking Redis calls (default: min(32, cpus + 4))')
+    parser.add_argument('--redis-mode', choices=['sync', 'async'], default=os.getenv('HOKM_REDIS_MODE', 'sync'),
+                        help='Redis client: sync (ResilientRedisManager on the IO executor) or async (pooled redis.asyncio)')
+    parser.add_argument('--workers', type=int, default=int(os.getenv('HOKM_WORKERS', '1')),
+                        help='Run a supervisor with this many room-sharded worker processes (default: 1, no sharding)')
+    parser.add_argument('--worker-base-port', type=int, default=8800,
+                        help='Worker i listens on 127.0.0.1:<worker-base-port + i> (supervisor mode)')
+    # Set by the supervisor for each worker
+    parser.add_argument('--shard-index', type=int, default=None, help=argparse.SUPPRESS)
+    parser.add_argument('--shard-urls', type=str, default='', help=argparse.SUPPRESS)
+    parser.add_argument('--stats-interval', type=float, default=5.0, help=argparse.SUPPRESS)
+    return parser
+
+
+def run_supervisor(args):
+    """Supervisor mode: N room-sharded worker processes behind one public acceptor"""
+    worker_args = ['--redis-mode', args.redis_mode]
+    if args.io_workers:
+        worker_args += ['--io-workers', str(args.io_workers)]
+    config = ShardConfig(
+        workers=args.workers,
+        host=args.host,
+        port=args.port,
+        worker_base_port=args.worker_base_port,
+        worker_args=worker_args
+    )
+    print(f"Starting Hokm shard supervisor ({args.workers} workers) on ws://{args.host}:{args.port}")
+    ShardSupervisor(config).run()
+
+
+async def publish_shard_stats(game_server, stats_queue, interval):
+    """Push this worker's stats to the supervisor every interval seconds"""
+    while True:
+        try:
+            stats_queue.put_nowait(game_server.get_shard_stats())
+        except Exception as e:
+            log.debug("Could not publish shard stats: %s", e)
+        await asyncio.sleep(interval)
+
+
+async def main(args=None, stats_queue=None):
+    # Parse command line arguments
+    if args is None:
+        args = build_arg_parser().parse_args()
     
-    args = parser.parse_args()
-    
-    print(f"Starting Hokm WebSocket server ({args.instance_name}) on ws://{args.host}:{args.port}")
-    print("[DEBUG] Creating GameServer instance...")
-    game_server = GameServer()
-    print("[DEBUG] Loading games from Redis...")
-    game_server.load_active_games_from_redis()
-    print("[DEBUG] Server initialization complete")
+    # Leveled logging through a queue so log output never blocks the event loop
+    log_pipeline.configure_logging()
+    log.info("Starting Hokm WebSocket server (%s) on ws://%s:%s", args.instance_name, args.host, args.port)
+    io_executor = IOExecutor(max_workers=args.io_workers)
+    log.debug("IO executor ready with %s workers", io_executor.max_workers)
+    log.debug("Creating GameServer instance...")
+    game_server = GameServer(redis_mode=args.redis_mode)
+    if args.shard_index is not None:
+        game_server.configure_sharding(args.shard_index, args.shard_urls.split(','))
+    stats_task = None
+    if stats_queue is not None:
+        stats_task = asyncio.create_task(publish_shard_stats(game_server, stats_queue, args.stats_interval))
+    await game_server.startup()
+    log.debug("Redis mode: %s", game_server.redis_mode)
+    # Games are hydrated on first use; optionally warm recently active ones in the background
+    game_server.start_warmup()
+    log.debug("Server initialization complete")
 
     async def handle_connection(websocket):
-        """Handle new WebSocket connections with ping/pong health checks"""
-        ping_task = None
+        """Handle new WebSocket connections; liveness is checked by the shared heartbeat"""
+        heartbeat = game_server.heartbeat
         try:
-            print(f"[LOG] New connection from {websocket.remote_address}")
-            
-            # Start ping task to detect disconnections
-            async def ping_client():
-                try:
-                    while True:
-                        await asyncio.sleep(30)  # Ping every 30 seconds
-                        try:
-                            pong_waiter = await websocket.ping()
-                            await asyncio.wait_for(pong_waiter, timeout=10)  # Wait up to 10 seconds for pong
-                        except (websockets.ConnectionClosed, asyncio.TimeoutError):
-                            print(f"[LOG] Ping failed - connection lost for {websocket.remote_address}")
-                            break
-                        except Exception as e:
-                            print(f"[ERROR] Ping error: {str(e)}")
-                            break
-                except asyncio.CancelledError:
-                    pass
-
-            ping_task = asyncio.create_task(ping_client())
+            log.info("New connection from %s", websocket.remote_address)
+            heartbeat.register(websocket)
             
             # Handle all incoming messages
             async for message in websocket:
+                heartbeat.touch(websocket)
                 try:
-                    data = json.loads(message)
+                    # Text frames are JSON; binary frames use the negotiated compact protocol
+                    data = wire_protocol.decode(message)
                     await game_server.handle_message(websocket, data)
-                except json.JSONDecodeError:
-                    print(f"[ERROR] Invalid JSON from {websocket.remote_address}: {message}")
-                    await game_server.send_error(websocket, "Invalid JSON message")
+                except wire_protocol.DECODE_ERRORS:
+                    log.error("Invalid message frame from %s: %r", websocket.remote_address, message[:200])
+                    await game_server.network_manager.notify_error(websocket, "Invalid message frame")
                 except Exception as e:
-                    print(f"[ERROR] Error processing message from {websocket.remote_address}: {str(e)}")
-                    await game_server.send_error(websocket, "Error processing message")
+                    log.error("Error processing message from %s: %s", websocket.remote_address, e)
+                    await game_server.network_manager.notify_error(websocket, "Error processing message")
                     
         except websockets.ConnectionClosed:
-            print(f"[LOG] Connection closed for {websocket.remote_address}")
+            log.info("Connection closed for %s", websocket.remote_address)
         except Exception as e:
-            print(f"[ERROR] Connection error: {str(e)}")
+            log.error("Connection error: %s", e)
         finally:
-            if ping_task:
-                ping_task.cancel()
-                try:
-                    await ping_task
-                except asyncio.CancelledError:
-                    pass
-            
+            heartbeat.unregister(websocket)
             await game_server.handle_connection_closed(websocket)
 
     try:
         # Start the WebSocket server
-        print(f"[DEBUG] Starting WebSocket server ({args.instance_name})...")
+        log.debug("Starting WebSocket server (%s)...", args.instance_name)
         server = await websockets.serve(
             handle_connection,
             args.host,
             args.port,
-            ping_interval=60,      # Send ping every 60 seconds
-            ping_timeout=300,      # 5 minutes timeout for ping response
+            ping_interval=None,    # Keepalive pings come from GameServer.heartbeat
+            subprotocols=wire_protocol.server_subprotocols(),   # msgpack when offered, JSON otherwise
+            select_subprotocol=wire_protocol.select_subprotocol,
+            **wire_protocol.server_compression(),   # permessage-deflate per HOKM_WS_DEFLATE
             close_timeout=300,     # 5 minutes timeout for close handshake
             max_size=1024*1024,    # 1MB max message size
             max_queue=100          # Max queued messages
         )
-        print(f"[LOG] WebSocket server ({args.instance_name}) is now listening on ws://{args.host}:{args.port}")
-        print(f"[LOG] WebSocket timeouts: ping_timeout=300s, close_timeout=300s")
+        log.info("WebSocket server (%s) is now listening on ws://%s:%s", args.instance_name, args.host, args.port)
+        log.info("Heartbeat: idle_timeout=%ss, pong_timeout=%ss, close_timeout=300s",
+                 game_server.heartbeat.idle_timeout, game_server.heartbeat.pong_timeout)
         await server.wait_closed()
     except Exception as e:
-        print(f"[ERROR] Server error: {str(e)}")
+        log.error("Server error: %s", e)
+    finally:
+        if stats_task is not None:
+            stats_task.cancel()
+        await game_server.shutdown()
+        io_executor.shutdown(wait=False)
+        log_pipeline.shutdown_logging()
     # finally:
     #     cleanup_loop.cancel()
     #     try:
@@ -2119,10 +2586,14 @@ async def main():
     #         pass
 
 if __name__ == "__main__":
+    cli_args = build_arg_parser().parse_args()
+    if cli_args.workers > 1:
+        run_supervisor(cli_args)
+        sys.exit(0)
     try:
-        asyncio.run(main())
+        asyncio.run(main(cli_args))
     except KeyboardInterrupt:
         print("\nServer shutting down...")
     except Exception as e:
-        print(f"[ERROR] Fatal error: {str(e)}")
+        log.error("Fatal error: %s", e)
         sys.exit(1)
@@ -0,0 +1,193 @@
+# timer_wheel.py
+"""
+Hierarchical timing wheel for server-wide deadlines.
+
+Turn deadlines are armed and cancelled on every card play, so a per-timer
+asyncio task (or a heap with O(log n) cancellation) would dominate once tens
+of thousands of tables are open. The wheel keeps each timer in a bucket of
+one of ``levels`` wheels of ``wheel_size`` slots: level 0 slots are one tick
+wide, each higher level's slots span a whole turn of the level below.
+Arming and cancelling are a dict insert/delete. One task advances the wheel
+every tick, fires level 0's current slot and, when a lower wheel wraps,
+cascades the next slot of the level above down into finer slots.
+
+Timers are keyed (e.g. by room code): arming a key replaces its previous
+timer. Callbacks run synchronously on the loop; a returned awaitable is
+scheduled as a task.
+"""
+
+import asyncio
+import inspect
+import logging
+import math
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional
+
+log = logging.getLogger(__name__)
+
+DEFAULT_TICK = 0.1        # Seconds per level-0 slot
+DEFAULT_WHEEL_BITS = 6    # 64 slots per level
+DEFAULT_LEVELS = 4        # 64**4 ticks (~19 days at 0.1s) before delays are clamped
+
+
+class TimerHandle:
+    """One armed timer"""
+
+    __slots__ = ('key', 'expires', 'callback', 'args', 'bucket')
+
+    def __init__(self, key: Hashable, expires: int, callback: Callable, args: tuple):
+        self.key = key
+        self.expires = expires       # Absolute tick
+        self.callback = callback
+        self.args = args
+        self.bucket: Optional[Dict['TimerHandle', None]] = None
+
+    @property
+    def active(self) -> bool:
+        return self.bucket is not None
+
+
+class TimerWheel:
+    """Keyed timers with O(1) arm and cancel"""
+
+    def __init__(self, tick: float = DEFAULT_TICK, wheel_bits: int = DEFAULT_WHEEL_BITS,
+                 levels: int = DEFAULT_LEVELS):
+        self.tick = tick
+        self.bits = wheel_bits
+        self.size = 1 << wheel_bits
+        self.mask = self.size - 1
+        self.levels = levels
+        self.max_ticks = (1 << (wheel_bits * levels)) - 1
+        self._wheels: List[List[Dict[TimerHandle, None]]] = [
+            [{} for _ in range(self.size)] for _ in range(levels)
+        ]
+        self._by_key: Dict[Hashable, TimerHandle] = {}
+        self.current_tick = 0
+        self._started_at: Optional[float] = None
+        self.task: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.armed = 0
+        self.fired = 0
+        self.cancelled = 0
+        self.cascaded = 0
+        self.callback_errors = 0
+
+    def __len__(self) -> int:
+        return len(self._by_key)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._by_key
+
+    def _place(self, handle: TimerHandle):
+        remaining = max(0, handle.expires - self.current_tick)
+        level = 0
+        while level < self.levels - 1 and remaining >= (1 << (self.bits * (level + 1))):
+            level += 1
+        slot = (handle.expires >> (self.bits * level)) & self.mask
+        bucket = self._wheels[level][slot]
+        bucket[handle] = None
+        handle.bucket = bucket
+
+    def arm(self, key: Hashable, delay: float, callback: Callable, *args) -> TimerHandle:
+        """Run callback(*args) after about delay seconds, replacing any timer for key"""
+        self.cancel(key)
+        ticks = min(self.max_ticks, max(1, math.ceil(delay / self.tick)))
+        handle = TimerHandle(key, self.current_tick + ticks, callback, args)
+        self._place(handle)
+        self._by_key[key] = handle
+        self.armed += 1
+        return handle
+
+    def cancel(self, key: Hashable) -> bool:
+        handle = self._by_key.pop(key, None)
+        if handle is None:
+            return False
+        if handle.bucket is not None:
+            del handle.bucket[handle]
+            handle.bucket = None
+        self.cancelled += 1
+        return True
+
+    def remaining(self, key: Hashable) -> Optional[float]:
+        """Seconds until key's timer fires, or None if it is not armed"""
+        handle = self._by_key.get(key)
+        if handle is None:
+            return None
+        return (handle.expires - self.current_tick) * self.tick
+
+    def advance(self, ticks: int = 1) -> int:
+        """Move the wheel forward, firing due timers; returns how many fired"""
+        fired = 0
+        for _ in range(ticks):
+            if not self._by_key:
+                # Nothing armed: skipping ahead cannot miss a cascade
+                self.current_tick += 1
+                continue
+            self.current_tick += 1
+            now = self.current_tick
+            for level in range(1, self.levels):
+                if now & ((1 << (self.bits * level)) - 1):
+                    break
+                slot = (now >> (self.bits * level)) & self.mask
+                bucket = self._wheels[level][slot]
+                if bucket:
+                    self._wheels[level][slot] = {}
+                    for handle in bucket:
+                        self._place(handle)
+                        self.cascaded += 1
+            slot = now & self.mask
+            bucket = self._wheels[0][slot]
+            if not bucket:
+                continue
+            self._wheels[0][slot] = {}
+            for handle in bucket:
+                handle.bucket = None
+                if self._by_key.get(handle.key) is handle:
+                    del self._by_key[handle.key]
+                self._fire(handle)
+                fired += 1
+        return fired
+
+    def _fire(self, handle: TimerHandle):
+        self.fired += 1
+        try:
+            result = handle.callback(*handle.args)
+            if inspect.isawaitable(result):
+                asyncio.ensure_future(result)
+        except Exception as e:
+            self.callback_errors += 1
+            log.error("Timer callback for %s failed: %s", handle.key, e)
+
+    async def _run(self):
+        self._started_at = time.monotonic() - self.current_tick * self.tick
+        while True:
+            await asyncio.sleep(self.tick)
+            target = int((time.monotonic() - self._started_at) / self.tick)
+            if target > self.current_tick:
+                self.advance(target - self.current_tick)
+
+    def start(self):
+        if self.task is None or self.task.done():
+            self.task = asyncio.create_task(self._run(), name="timer-wheel")
+        return self.task
+
+    async def stop(self):
+        if self.task is not None and not self.task.done():
+            self.task.cancel()
+            try:
+                await self.task
+            except asyncio.CancelledError:
+                pass
+
+    def get_metrics(self) -> Dict[str, Any]:
+        return {
+            'pending': len(self._by_key),
+            'tick': self.tick,
+            'current_tick': self.current_tick,
+            'armed': self.armed,
+            'fired': self.fired,
+            'cancelled': self.cancelled,
+            'cascaded': self.cascaded,
+            'callback_errors': self.callback_errors
+        }
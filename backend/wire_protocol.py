@@ -0,0 +1,582 @@
+# wire_protocol.py
+"""
+Optional compact binary wire protocol, negotiated per connection.
+
+Every frame used to be JSON text, repeating keys such as "player", "card",
+"team" and "player_id" and spelling out card names ("10_diamonds") and
+36-character player UUIDs. Clients may now offer the ``hokm.msgpack.v1``
+WebSocket subprotocol at the handshake; connections that do are sent
+binary MessagePack frames, everyone else keeps the JSON text protocol
+unchanged (``hokm.json.v1`` may be offered to ask for it explicitly).
+
+A binary frame is a MessagePack map whose top-level keys and values are
+compacted with fixed tables, so no per-connection state is needed (frames
+can be conflated or dropped by the outbound queue without desynchronising
+anything):
+
+- known keys are sent as small integers (FIELDS), others as strings;
+- the message type is a small integer (MESSAGE_TYPES) when known;
+- 'card' values are card indexes 0..51 (card_bits order), and hands are a
+  bytes object with one byte per card;
+- 'player_id' values that are canonical UUIDs are sent as 16 raw bytes.
+
+Nested values are plain MessagePack. Dict keys are turned into strings
+first, as json.dumps does, so both protocols decode to the same objects.
+The tables are append-only; changing an entry needs a new protocol name.
+
+The server decodes by frame type (text frames are JSON, binary frames are
+MessagePack), so either kind is accepted on any connection. MessagePack is
+an optional dependency: without it only JSON is offered.
+
+Compressed frames: clients offering ``hokm.json.z1`` / ``hokm.msgpack.z1``
+also accept binary frames that start with 0xc1 (a byte MessagePack never
+uses), then a flags byte, then a raw deflate stream of the frame they would
+otherwise have been sent (JSON text or MessagePack). Deflate is primed with
+a preset dictionary of typical Hokm messages, so even one small message
+compresses. FrameCompressor decides per message from its size and the ratio
+measured so far for that kind of message. It is not used on connections
+that negotiated permessage-deflate, which already compresses every frame
+with context kept across messages (see server_compression for tuning it).
+
+Run ``python wire_protocol.py`` for bytes and encode/decode CPU per full
+game in both protocols.
+"""
+
+import json
+import os
+import uuid
+import zlib
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from card_bits import CARD_INDEX, CARD_NAMES
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    msgpack = None
+    MSGPACK_AVAILABLE = False
+
+SUBPROTOCOL_JSON = 'hokm.json.v1'
+SUBPROTOCOL_MSGPACK = 'hokm.msgpack.v1'
+SUBPROTOCOL_JSON_Z = 'hokm.json.z1'          # ... and accepts compressed frames
+SUBPROTOCOL_MSGPACK_Z = 'hokm.msgpack.z1'
+BINARY_SUBPROTOCOLS = frozenset({SUBPROTOCOL_MSGPACK, SUBPROTOCOL_MSGPACK_Z})
+COMPRESSING_SUBPROTOCOLS = frozenset({SUBPROTOCOL_JSON_Z, SUBPROTOCOL_MSGPACK_Z})
+
+COMPRESSED_FRAME = 0xc1        # Never used by MessagePack, so no plain binary frame starts with it
+FLAG_MSGPACK = 0x01            # The compressed frame is MessagePack (else JSON text)
+FLAG_PRESET = 0x02             # Deflate was primed with the preset dictionary
+MAX_INFLATED = 1024 * 1024     # Same as the server's max_size
+DEFAULT_COMPRESS_MIN = 128     # Smaller frames are sent as they are
+DEFAULT_MAX_RATIO = 0.9        # Compressed frames must be at most this fraction of the original
+
+# Append-only: the index is the wire code
+MESSAGE_TYPES = (
+    'error', 'info', 'auth_login', 'auth_register', 'auth_token', 'auth_response',
+    'join', 'join_success', 'reconnect', 'reconnect_success', 'room_status', 'room_full',
+    'waiting_for_players', 'team_assignment', 'initial_deal', 'hokm_request', 'hokm_selected',
+    'final_deal', 'phase_change', 'turn_start', 'play_card', 'card_played', 'trick_result',
+    'hand_complete', 'new_round_start', 'game_over', 'game_cancelled', 'game_state',
+    'player_reconnected', 'player_disconnected', 'turn_timeout', 'event_replay', 'redirect',
+    'clear_room', 'health_check', 'health_check_response', 'exit',
+    'state_sync', 'state_ack', 'state_resync'
+)
+FIELDS = (
+    'type', 'player', 'card', 'team', 'player_id', 'room_code', 'suit', 'hand', 'you',
+    'player_number', 'event_id', 'message', 'username', 'hakem', 'hokm', 'phase',
+    'current_player', 'your_turn', 'is_hakem', 'winner', 'team1_tricks', 'team2_tricks',
+    'round_winner', 'round_scores', 'game_complete', 'tricks', 'teams', 'success',
+    'token', 'player_info', 'current_turn', 'your_team', 'new_phase', 'action',
+    'winning_team', 'connection_status', 'trick_number', 'events', 'after_event_id',
+    'epoch', 'seq', 'base', 'keyframe', 'changes', 'compressed', 'data', 'resume', 'last_seq'
+)
+TYPE_CODES: Dict[str, int] = {name: code for code, name in enumerate(MESSAGE_TYPES)}
+FIELD_CODES: Dict[str, int] = {name: code for code, name in enumerate(FIELDS)}
+
+CARD_FIELDS = frozenset({'card'})
+CARD_LIST_FIELDS = frozenset({'hand', 'cards'})
+UUID_FIELDS = frozenset({'player_id'})
+
+
+class WireFormatError(ValueError):
+    """A frame that cannot be decoded"""
+
+
+# Errors decode() raises for a malformed frame
+DECODE_ERRORS = (json.JSONDecodeError, WireFormatError)
+
+
+def server_subprotocols() -> List[str]:
+    """Subprotocols to pass to websockets.serve, preferred first"""
+    if MSGPACK_AVAILABLE:
+        return [SUBPROTOCOL_MSGPACK_Z, SUBPROTOCOL_MSGPACK, SUBPROTOCOL_JSON_Z, SUBPROTOCOL_JSON]
+    return [SUBPROTOCOL_JSON_Z, SUBPROTOCOL_JSON]
+
+
+def select_subprotocol(first, second) -> Optional[str]:
+    """
+    websockets.serve select_subprotocol hook: our preferred protocol among
+    those offered, else none (plain JSON) rather than refusing the handshake.
+    Called as (client_subprotocols, server_subprotocols) by the legacy server
+    and as (connection, client_subprotocols) by the newer one.
+    """
+    offered = first if isinstance(first, (list, tuple)) else second
+    for subprotocol in server_subprotocols():
+        if subprotocol in (offered or ()):
+            return subprotocol
+    return None
+
+
+def client_subprotocols(preferred: Optional[str], compress: bool = False) -> Optional[List[str]]:
+    """
+    Subprotocols a client offers for 'msgpack' or 'json' (None: plain JSON,
+    no offer unless compress), with the compressed-frame variants if compress
+    """
+    json_offer = [SUBPROTOCOL_JSON_Z, SUBPROTOCOL_JSON] if compress else [SUBPROTOCOL_JSON]
+    if preferred == 'msgpack':
+        if not MSGPACK_AVAILABLE:
+            raise RuntimeError("The msgpack wire protocol needs the msgpack package")
+        return ([SUBPROTOCOL_MSGPACK_Z] if compress else []) + [SUBPROTOCOL_MSGPACK] + json_offer
+    if preferred == 'json' or compress:
+        return json_offer
+    return None
+
+
+def server_compression() -> Dict[str, Any]:
+    """
+    websockets.serve keyword arguments for permessage-deflate, from
+    HOKM_WS_DEFLATE: 'on' (websockets' defaults: 12-bit windows kept across
+    messages), 'off', or a window size in bits (9-15; larger windows find
+    more repeats across state messages, at more memory per connection)
+    """
+    mode = os.getenv('HOKM_WS_DEFLATE', 'on').lower()
+    if mode == 'on':
+        return {}
+    if mode == 'off':
+        return {'compression': None}
+    from websockets.extensions.permessage_deflate import ServerPerMessageDeflateFactory
+    bits = int(mode)
+    if not 9 <= bits <= 15:
+        raise ValueError(f"HOKM_WS_DEFLATE window bits must be 9-15, got {bits}")
+    return {
+        'compression': None,
+        'extensions': [ServerPerMessageDeflateFactory(
+            server_max_window_bits=bits, client_max_window_bits=bits,
+            compress_settings={'memLevel': 8 if bits > 12 else 5}
+        )]
+    }
+
+
+def uses_binary(websocket) -> bool:
+    """True if the connection negotiated the MessagePack protocol"""
+    return getattr(websocket, 'subprotocol', None) in BINARY_SUBPROTOCOLS
+
+
+def uses_frame_compression(websocket) -> bool:
+    """
+    True if compressed frames should be considered for this connection: it
+    accepts them and is not already deflating every frame
+    """
+    if getattr(websocket, 'subprotocol', None) not in COMPRESSING_SUBPROTOCOLS:
+        return False
+    extensions = getattr(getattr(websocket, 'protocol', None), 'extensions', None) or ()
+    return not any(getattr(extension, 'name', None) == 'permessage-deflate' for extension in extensions)
+
+
+def _json_keys(value: Any) -> Any:
+    """Dict keys as json.dumps writes them, so both protocols decode alike"""
+    if isinstance(value, dict):
+        return {
+            (k if isinstance(k, str) else json.dumps(k) if k is None or isinstance(k, bool) else str(k)): _json_keys(v)
+            for k, v in value.items()
+        }
+    if isinstance(value, (list, tuple)):
+        return [_json_keys(v) for v in value]
+    return value
+
+
+def _pack_card(value: Any) -> Any:
+    return CARD_INDEX.get(value, value) if isinstance(value, str) else _json_keys(value)
+
+
+def _pack_cards(value: Any) -> Any:
+    if isinstance(value, list):
+        try:
+            return bytes(CARD_INDEX[card] for card in value)
+        except (KeyError, TypeError):
+            pass
+    return _json_keys(value)
+
+
+def _pack_uuid(value: Any) -> Any:
+    if isinstance(value, str) and len(value) == 36:
+        try:
+            packed = uuid.UUID(value)
+        except ValueError:
+            return value
+        return packed.bytes if str(packed) == value else value
+    return _json_keys(value)
+
+
+def _unpack_card(value: Any) -> Any:
+    return CARD_NAMES[value] if isinstance(value, int) else value
+
+
+def _unpack_cards(value: Any) -> Any:
+    return [CARD_NAMES[i] for i in value] if isinstance(value, bytes) else value
+
+
+def _unpack_uuid(value: Any) -> Any:
+    return str(uuid.UUID(bytes=value)) if isinstance(value, bytes) else value
+
+
+_SCALARS = (str, int, float, type(None))
+_PACKERS = {'type': lambda value: TYPE_CODES.get(value, value) if isinstance(value, str) else value}
+_UNPACKERS = {'type': lambda value: MESSAGE_TYPES[value] if isinstance(value, int) else value}
+for _field in CARD_FIELDS:
+    _PACKERS[_field], _UNPACKERS[_field] = _pack_card, _unpack_card
+for _field in CARD_LIST_FIELDS:
+    _PACKERS[_field], _UNPACKERS[_field] = _pack_cards, _unpack_cards
+for _field in UUID_FIELDS:
+    _PACKERS[_field], _UNPACKERS[_field] = _pack_uuid, _unpack_uuid
+
+
+def _pack_value(key: str, value: Any) -> Any:
+    packer = _PACKERS.get(key)
+    if packer is not None:
+        return packer(value)
+    if isinstance(value, _SCALARS):
+        return value
+    return _json_keys(value)
+
+
+def _unpack_value(key: str, value: Any) -> Any:
+    unpacker = _UNPACKERS.get(key)
+    return value if unpacker is None else unpacker(value)
+
+
+def pack_field(key: str, value: Any) -> bytes:
+    """One encoded map entry (key and value) of a binary frame"""
+    return msgpack.packb(FIELD_CODES.get(key, key)) + msgpack.packb(_pack_value(key, value), use_bin_type=True)
+
+
+def map_header(size: int) -> bytes:
+    """MessagePack map header for size entries (entries are packed separately)"""
+    if size < 16:
+        return bytes((0x80 | size,))
+    if size < 0x10000:
+        return b'\xde' + size.to_bytes(2, 'big')
+    return b'\xdf' + size.to_bytes(4, 'big')
+
+
+def encode_binary(message: Dict[str, Any]) -> bytes:
+    return msgpack.packb({FIELD_CODES.get(key, key): _pack_value(key, value) for key, value in message.items()},
+                         use_bin_type=True)
+
+
+def decode_binary(frame: Union[bytes, bytearray, memoryview]) -> Any:
+    if frame[:1] == bytes((COMPRESSED_FRAME,)):
+        return decode(decompress_frame(frame))
+    if not MSGPACK_AVAILABLE:
+        raise WireFormatError("Binary frames need the msgpack package")
+    try:
+        raw = msgpack.unpackb(frame, raw=False, strict_map_key=False)
+    except Exception as e:
+        raise WireFormatError(f"Invalid MessagePack frame: {e}") from e
+    if not isinstance(raw, dict):
+        return raw
+    message = {}
+    try:
+        for key, value in raw.items():
+            name = FIELDS[key] if isinstance(key, int) else key
+            message[name] = _unpack_value(name, value)
+    except (IndexError, ValueError, TypeError) as e:
+        raise WireFormatError(f"Invalid field in MessagePack frame: {e}") from e
+    return message
+
+
+def encode(message: Dict[str, Any], binary: bool = False) -> Union[str, bytes]:
+    """A JSON text frame, or a binary frame when binary is set"""
+    if binary:
+        return encode_binary(message)
+    return json.dumps(message)
+
+
+def encode_for(websocket, message: Dict[str, Any]) -> Union[str, bytes]:
+    """Frame for message in the protocol websocket negotiated"""
+    return encode(message, uses_binary(websocket))
+
+
+def decode(frame: Union[str, bytes, bytearray, memoryview]) -> Any:
+    """Parse a frame: text frames are JSON, binary frames MessagePack (or compressed); raises DECODE_ERRORS"""
+    if isinstance(frame, (bytes, bytearray, memoryview)):
+        return decode_binary(frame)
+    return json.loads(frame)
+
+
+# --- compressed frames ---
+
+def _preset_samples() -> List[Dict[str, Any]]:
+    """
+    Typical messages the preset dictionary is built from, rarest first
+    (deflate finds the end of the dictionary cheapest). Changing them changes
+    the dictionary, which needs a new protocol name (z2).
+    """
+    players = ['player_1', 'player_2', 'player_3', 'player_4']
+    state = {
+        'phase': 'gameplay', 'hokm': 'hearts', 'hakem': 'player_1', 'players': players,
+        'teams': {name: seat % 2 for seat, name in enumerate(players)}, 'current_turn': 1,
+        'tricks': {'0': 3, '1': 2}, 'round_scores': {'0': 1, '1': 0},
+        'player_tricks': {name: 1 for name in players}, 'completed_tricks': 5, 'led_suit': 'spades',
+        'current_trick': [['player_1', 'K_spades'], ['player_2', '10_spades']],
+        'played_cards': ['A_hearts', 'Q_diamonds', '7_clubs', 'J_spades'],
+        'hand': ['2_hearts', '9_hearts', 'A_diamonds', '4_clubs', 'K_clubs', '8_spades', '3_spades']
+    }
+    sync = {'type': 'state_sync', 'room_code': 'ROOM1', 'epoch': '5f0c2e9a'}
+    return [
+        {'cards': list(CARD_NAMES)},
+        dict(sync, seq=40, keyframe=True, changes=state),
+        dict(sync, seq=41, keyframe=False, base=40, resume=True,
+             changes={key: state[key] for key in ('current_turn', 'current_trick', 'played_cards', 'hand')}),
+        {'type': 'turn_start', 'current_player': 'player_2', 'your_turn': True, 'hokm': 'hearts',
+         'hand': state['hand']},
+        dict(sync, seq=42, keyframe=False, base=41,
+             changes={'current_turn': 2, 'led_suit': 'hearts', 'current_trick': [['player_3', 'A_hearts']],
+                      'played_cards': state['played_cards'], 'hand': state['hand'][1:]}),
+    ]
+
+
+_preset_dictionaries: Dict[bool, bytes] = {}
+
+
+def preset_dictionary(binary: bool) -> bytes:
+    """The zlib preset dictionary for compressed JSON (or MessagePack) frames"""
+    zdict = _preset_dictionaries.get(binary)
+    if zdict is None:
+        samples = _preset_samples()
+        if binary:
+            zdict = b''.join(encode_binary(sample) for sample in samples)
+        else:
+            zdict = ''.join(json.dumps(sample) for sample in samples).encode()
+        _preset_dictionaries[binary] = zdict
+    return zdict
+
+
+def compress_frame(frame: Union[str, bytes], level: int = 6, preset: bool = True) -> bytes:
+    """Wrap an encoded frame (JSON text or MessagePack) in a compressed binary frame"""
+    binary = isinstance(frame, (bytes, bytearray))
+    data = bytes(frame) if binary else frame.encode()
+    flags = (FLAG_MSGPACK if binary else 0) | (FLAG_PRESET if preset else 0)
+    if preset:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15, zdict=preset_dictionary(binary))
+    else:
+        compressor = zlib.compressobj(level, zlib.DEFLATED, -15)
+    return bytes((COMPRESSED_FRAME, flags)) + compressor.compress(data) + compressor.flush()
+
+
+def decompress_frame(frame: Union[bytes, bytearray, memoryview]) -> Union[str, bytes]:
+    """The frame a compressed frame carries; raises WireFormatError"""
+    frame = bytes(frame)
+    if len(frame) < 3 or frame[0] != COMPRESSED_FRAME:
+        raise WireFormatError("Truncated compressed frame")
+    flags = frame[1]
+    binary = bool(flags & FLAG_MSGPACK)
+    try:
+        if flags & FLAG_PRESET:
+            inflater = zlib.decompressobj(-15, zdict=preset_dictionary(binary))
+        else:
+            inflater = zlib.decompressobj(-15)
+        data = inflater.decompress(frame[2:], MAX_INFLATED)
+    except zlib.error as e:
+        raise WireFormatError(f"Invalid compressed frame: {e}") from e
+    if not inflater.eof or inflater.unconsumed_tail:
+        raise WireFormatError("Compressed frame is truncated or too large")
+    if binary:
+        return data
+    try:
+        return data.decode()
+    except UnicodeDecodeError as e:
+        raise WireFormatError(f"Compressed frame is not UTF-8 text: {e}") from e
+
+
+class FrameCompressor:
+    """
+    Decides per frame whether to send it compressed: frames under min_size
+    never are, and a kind of message whose measured ratio (moving average) is
+    above max_ratio is only re-tried every probe_every frames
+    """
+
+    def __init__(self, min_size: int = DEFAULT_COMPRESS_MIN, max_ratio: float = DEFAULT_MAX_RATIO,
+                 probe_every: int = 16, level: int = 6, preset: bool = True):
+        self.min_size = min_size
+        self.max_ratio = max_ratio
+        self.probe_every = max(1, probe_every)
+        self.level = level
+        self.preset = preset
+        self.kinds: Dict[str, Dict[str, Any]] = {}
+
+    def _kind(self, kind: str) -> Dict[str, Any]:
+        stats = self.kinds.get(kind)
+        if stats is None:
+            stats = self.kinds[kind] = {
+                'frames': 0, 'compressed': 0, 'bytes_in': 0, 'bytes_out': 0,
+                'skipped_small': 0, 'skipped_ratio': 0, 'tried': 0, 'ratio': 0.0, 'since_probe': 0
+            }
+        return stats
+
+    def compress(self, frame: Union[str, bytes], kind: str = 'message') -> Union[str, bytes]:
+        """The frame to send: compressed, or frame itself"""
+        stats = self._kind(kind)
+        size = len(frame)   # Characters for text frames; close enough to decide
+        stats['frames'] += 1
+        stats['bytes_in'] += size
+        if size < self.min_size:
+            stats['skipped_small'] += 1
+            stats['bytes_out'] += size
+            return frame
+        if stats['ratio'] > self.max_ratio and stats['since_probe'] < self.probe_every:
+            stats['since_probe'] += 1
+            stats['skipped_ratio'] += 1
+            stats['bytes_out'] += size
+            return frame
+        stats['since_probe'] = 0
+
+        compressed = compress_frame(frame, self.level, self.preset)
+        ratio = len(compressed) / size
+        stats['ratio'] = 0.8 * stats['ratio'] + 0.2 * ratio if stats['tried'] else ratio
+        stats['tried'] += 1
+        if ratio > self.max_ratio:
+            stats['skipped_ratio'] += 1
+            stats['bytes_out'] += size
+            return frame
+        stats['compressed'] += 1
+        stats['bytes_out'] += len(compressed)
+        return compressed
+
+    def get_stats(self) -> Dict[str, Any]:
+        totals = {'frames': 0, 'compressed': 0, 'bytes_in': 0, 'bytes_out': 0, 'skipped_small': 0, 'skipped_ratio': 0}
+        kinds = {}
+        for kind, stats in self.kinds.items():
+            for key in totals:
+                totals[key] += stats[key]
+            kinds[kind] = {key: value for key, value in stats.items() if key != 'since_probe'}
+            kinds[kind]['ratio'] = round(stats['ratio'], 3)
+        totals['ratio'] = round(totals['bytes_out'] / totals['bytes_in'], 3) if totals['bytes_in'] else 1.0
+        totals['kinds'] = kinds
+        return totals
+
+
+# --- wire benchmark ---
+
+def game_messages(seed: int = 1) -> List[Tuple[Dict[str, Any], List[Dict[str, Any]]]]:
+    """
+    The frames a room receives during one full game (to 7 hands), as
+    (shared body, per-recipient fields for each of the 4 players), shaped
+    like the server's broadcasts and turn_start messages.
+    """
+    import random
+    from game_board import GameBoard
+
+    random.seed(seed)
+    names = [f"player_{seat}" for seat in range(4)]
+    ids = {name: str(uuid.UUID(int=random.getrandbits(128), version=4)) for name in names}
+    board = GameBoard(names, "ROOM1")
+    board.assign_teams_and_hakem()
+    messages = []
+    event_id = 0
+
+    def room(msg_type, data, per_player=None):
+        nonlocal event_id
+        event_id += 1
+        body = dict(data, type=msg_type, event_id=f"{event_id}-0")
+        fields = [dict({'you': name, 'player_number': seat + 1}, **(per_player(name) if per_player else {}))
+                  for seat, name in enumerate(board.players)]
+        messages.append((body, fields))
+
+    room('team_assignment', {'teams': {'1': [p for p in board.players if board.teams[p] == 0],
+                                       '2': [p for p in board.players if board.teams[p] == 1]},
+                             'hakem': board.hakem})
+    while True:
+        board.initial_deal()
+        room('initial_deal', {'hakem': board.hakem, 'is_hakem': False},
+             lambda name: {'hand': list(board.hands[name]), 'is_hakem': name == board.hakem})
+        suit = max(('hearts', 'diamonds', 'clubs', 'spades'),
+                   key=lambda s: sum(card.endswith('_' + s) for card in board.hands[board.hakem]))
+        board.set_hokm(suit)
+        room('hokm_selected', {'suit': suit, 'hakem': board.hakem})
+        board.final_deal()
+        room('final_deal', {'hokm': suit, 'message': f"Hokm is {suit}. Final deal completed."},
+             lambda name: {'hand': list(board.hands[name])})
+        while True:
+            player = board.players[board.current_turn]
+            for name in board.players:
+                messages.append(({'type': 'turn_start', 'current_player': player, 'your_turn': name == player,
+                                  'hokm': suit, 'hand': list(board.hands[name])}, [{}]))
+            card = next(c for c in board.hands[player] if board.validate_play(player, c)[0])
+            result = board.play_card(player, card)
+            room('card_played', {'player': player, 'card': card, 'team': board.teams[player] + 1,
+                                 'player_id': ids[player]})
+            if result.get('trick_complete'):
+                tricks = result['team_tricks']
+                room('trick_result', {'winner': result['trick_winner'], 'team1_tricks': tricks[0],
+                                      'team2_tricks': tricks[1]})
+            if result.get('hand_complete'):
+                room('hand_complete', {'winning_team': result['round_winner'], 'tricks': result['team_tricks'],
+                                       'round_winner': result['round_winner'],
+                                       'round_scores': result['round_scores'],
+                                       'game_complete': result.get('game_complete', False)})
+                break
+        if result.get('game_complete'):
+            room('game_over', {'winner_team': result['round_winner']})
+            return messages
+
+
+def measure_game_traffic(binary: bool, messages, repeat: int = 5) -> Dict[str, float]:
+    """Bytes, encode and decode CPU (ms) to deliver one game's frames to every recipient"""
+    import time
+
+    frames = []
+    encode_time = decode_time = 0.0
+    for _ in range(repeat):
+        frames = []
+        start = time.process_time()
+        for body, recipients in messages:
+            for fields in recipients:
+                frames.append(encode(dict(body, **fields), binary))
+        encode_time += time.process_time() - start
+        start = time.process_time()
+        for frame in frames:
+            decode(frame)
+        decode_time += time.process_time() - start
+    return {
+        'frames': len(frames),
+        'bytes': sum(len(frame) for frame in frames),
+        'encode_ms': encode_time / repeat * 1000,
+        'decode_ms': decode_time / repeat * 1000
+    }
+
+
+def main():
+    import argparse
+    import logging
+
+    parser = argparse.ArgumentParser(description="Bytes and codec CPU per full game for each wire protocol")
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    logging.getLogger('game_board').setLevel(logging.WARNING)
+    messages = game_messages(args.seed)
+    results = {'json': measure_game_traffic(False, messages, args.repeat)}
+    if MSGPACK_AVAILABLE:
+        results['msgpack'] = measure_game_traffic(True, messages, args.repeat)
+        results['msgpack']['bytes_vs_json'] = round(results['msgpack']['bytes'] / results['json']['bytes'], 3)
+    for stats in results.values():
+        for key in ('encode_ms', 'decode_ms'):
+            stats[key] = round(stats[key], 2)
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
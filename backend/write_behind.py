@@ -0,0 +1,224 @@
+# write_behind.py
+"""
+Coalescing write-behind persistence for game state.
+
+Card plays used to serialize and save the whole board on every move, and the
+move history went out as a separate write. The persister instead keeps the
+latest snapshot per room plus the moves recorded since the last write, and
+writes them together (one pipelined save) once the coalescing window expires.
+A trick's four plays therefore usually cost a single Redis round trip.
+
+Callers flush explicitly at phase boundaries (save_now/flush) and on
+shutdown (flush_all). All writes for a room are serialized, so a slow write
+can never land on top of a newer one.
+"""
+
+import asyncio
+import logging
+import threading
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
+
+log = logging.getLogger(__name__)
+
+DEFAULT_WINDOW = 0.25  # Seconds a snapshot may wait for more changes before it is written
+
+Snapshot = Union[Dict[str, Any], Callable[[], Dict[str, Any]]]
+
+
+class WriteBehindMetrics:
+    """Counters and lag measurements for the write-behind persister"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        """Reset all metrics"""
+        with self._lock:
+            self.submits = 0
+            self.writes = 0
+            self.failed_writes = 0
+            self.moves_written = 0
+            self.discarded = 0
+            self.lags = deque(maxlen=1000)          # Seconds from first unsaved change to durable write
+            self.write_times = deque(maxlen=1000)   # Seconds spent in the save call
+            self.max_lag = 0.0
+
+    def record_submit(self):
+        with self._lock:
+            self.submits += 1
+
+    def record_write(self, success: bool, lag: float, write_time: float, moves: int):
+        with self._lock:
+            self.write_times.append(write_time)
+            if success:
+                self.writes += 1
+                self.moves_written += moves
+                self.lags.append(lag)
+                self.max_lag = max(self.max_lag, lag)
+            else:
+                self.failed_writes += 1
+
+    def record_discard(self):
+        with self._lock:
+            self.discarded += 1
+
+    def get_metrics_dict(self) -> Dict[str, Any]:
+        """Get all metrics as dictionary (times in milliseconds)"""
+        with self._lock:
+            lags = list(self.lags)
+            write_times = list(self.write_times)
+            return {
+                'submits': self.submits,
+                'writes': self.writes,
+                'failed_writes': self.failed_writes,
+                'coalesced': max(0, self.submits - self.writes - self.failed_writes - self.discarded),
+                'moves_written': self.moves_written,
+                'discarded': self.discarded,
+                'avg_lag_ms': (sum(lags) / len(lags) * 1000) if lags else 0.0,
+                'max_lag_ms': self.max_lag * 1000,
+                'avg_write_ms': (sum(write_times) / len(write_times) * 1000) if write_times else 0.0
+            }
+
+
+class _PendingRoom:
+    """Unsaved state for one room"""
+
+    __slots__ = ('snapshot', 'moves', 'dirty_since', 'timer', 'lock')
+
+    def __init__(self):
+        self.snapshot: Optional[Snapshot] = None
+        self.moves: List[Dict[str, Any]] = []
+        self.dirty_since: Optional[float] = None
+        self.timer: Optional[asyncio.Task] = None
+        self.lock = asyncio.Lock()
+
+
+class WriteBehindPersister:
+    """
+    Per-room coalescing writer.
+
+    ``save_func(room_code, state, moves)`` performs the actual write and
+    returns True on success. Snapshots may be dicts or zero-argument callables
+    (e.g. ``game.to_redis_dict``); callables are only evaluated at write time,
+    so coalesced changes are serialized once.
+    """
+
+    def __init__(self, save_func: Callable[[str, Dict[str, Any], List[Dict[str, Any]]], Awaitable[bool]],
+                 window: float = DEFAULT_WINDOW):
+        self.save_func = save_func
+        self.window = window
+        self.rooms: Dict[str, _PendingRoom] = {}
+        self.metrics = WriteBehindMetrics()
+
+    def _room(self, room_code: str) -> _PendingRoom:
+        pending = self.rooms.get(room_code)
+        if pending is None:
+            pending = _PendingRoom()
+            self.rooms[room_code] = pending
+        return pending
+
+    def submit(self, room_code: str, snapshot: Snapshot, moves: Optional[List[Dict[str, Any]]] = None):
+        """Record the latest state (and any new moves); written within the coalescing window"""
+        pending = self._room(room_code)
+        pending.snapshot = snapshot
+        if moves:
+            pending.moves.extend(moves)
+        if pending.dirty_since is None:
+            pending.dirty_since = time.time()
+        self.metrics.record_submit()
+
+        if pending.timer is None:
+            pending.timer = asyncio.create_task(self._flush_after(room_code, pending, self.window))
+
+    async def _flush_after(self, room_code: str, pending: _PendingRoom, delay: float):
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            return
+        # Once the window has expired the timer is no longer cancellable, so an
+        # explicit flush can never interrupt a write that is already running
+        if pending.timer is asyncio.current_task():
+            pending.timer = None
+        await self._write(room_code)
+
+    async def flush(self, room_code: str) -> bool:
+        """Write any pending state for a room now"""
+        pending = self.rooms.get(room_code)
+        if pending is None:
+            return True
+        if pending.timer is not None:
+            pending.timer.cancel()
+            pending.timer = None
+        return await self._write(room_code)
+
+    async def save_now(self, room_code: str, snapshot: Snapshot,
+                       moves: Optional[List[Dict[str, Any]]] = None) -> bool:
+        """Submit and flush immediately (phase boundaries)"""
+        self.submit(room_code, snapshot, moves)
+        return await self.flush(room_code)
+
+    async def flush_all(self) -> bool:
+        """Flush every room with pending state (shutdown)"""
+        results = await asyncio.gather(*(self.flush(room_code) for room_code in list(self.rooms)))
+        return all(results)
+
+    def discard(self, room_code: str):
+        """Drop unsaved state for a room that is being deleted"""
+        pending = self.rooms.pop(room_code, None)
+        if pending is None:
+            return
+        if pending.timer is not None:
+            pending.timer.cancel()
+        if pending.snapshot is not None:
+            self.metrics.record_discard()
+
+    async def _write(self, room_code: str) -> bool:
+        pending = self.rooms.get(room_code)
+        if pending is None:
+            return True
+
+        async with pending.lock:
+            if pending.snapshot is None:
+                return True
+            snapshot, moves, dirty_since = pending.snapshot, pending.moves, pending.dirty_since
+            pending.snapshot, pending.moves, pending.dirty_since = None, [], None
+
+            start = time.time()
+            try:
+                state = snapshot() if callable(snapshot) else snapshot
+                success = bool(await self.save_func(room_code, state, moves))
+            except asyncio.TimeoutError:
+                log.debug("Redis timeout in write-behind save for room %s", room_code)
+                success = False
+            except Exception as e:
+                log.error("Write-behind save failed for room %s: %s", room_code, e)
+                success = False
+            now = time.time()
+            self.metrics.record_write(success, now - (dirty_since or start), now - start, len(moves))
+
+            if not success and self.rooms.get(room_code) is pending:
+                # Keep the data for the next attempt; newer snapshots still win
+                if pending.snapshot is None:
+                    pending.snapshot = snapshot
+                pending.moves[:0] = moves
+                pending.dirty_since = min(dirty_since or start, pending.dirty_since or now)
+                if pending.timer is None:
+                    pending.timer = asyncio.create_task(self._flush_after(room_code, pending, self.window))
+            elif self.rooms.get(room_code) is pending and pending.snapshot is None and pending.timer is None:
+                # Nothing new arrived while writing; forget the room until its next change
+                self.rooms.pop(room_code, None)
+            return success
+
+    def get_metrics(self) -> Dict[str, Any]:
+        metrics = self.metrics.get_metrics_dict()
+        now = time.time()
+        lags = [now - p.dirty_since for p in self.rooms.values() if p.dirty_since is not None]
+        metrics.update({
+            'window_ms': self.window * 1000,
+            'pending_rooms': len(lags),
+            'current_max_lag_ms': max(lags) * 1000 if lags else 0.0
+        })
+        return metrics
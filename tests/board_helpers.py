@@ -0,0 +1,37 @@
+"""
+Shared game-board setup for the unit tests.
+
+Usage:
+    from board_helpers import PLAYERS, deal_to_gameplay, lowest_legal
+"""
+
+import random
+
+# Add backend directory to path for imports
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from card_bits import CARD_INDEX
+from game_board import GameBoard
+
+PLAYERS = ["P1", "P2", "P3", "P4"]
+SUITS = ['hearts', 'diamonds', 'clubs', 'spades']
+
+
+def deal_to_gameplay(board_class=GameBoard, seed=1, hokm=None):
+    """Board of the given class dealt to the gameplay phase with a fixed seed (random hokm unless given)."""
+    random.seed(seed)
+    board = board_class(PLAYERS, "ROOM")
+    board.assign_teams_and_hakem()
+    board.initial_deal()
+    board.set_hokm(hokm or random.choice(SUITS))
+    board.final_deal()
+    return board
+
+
+def lowest_legal(board):
+    """Deterministic move choice independent of hand ordering."""
+    player = board.players[board.current_turn]
+    legal = [c for c in board.hands[player] if board.validate_play(player, c)[0]]
+    return player, min(legal, key=CARD_INDEX.__getitem__)
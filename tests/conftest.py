@@ -113,6 +113,12 @@ def faker_instance() -> Faker:
     Faker.seed(42)  # For reproducible test data
     return fake
 
+@pytest.fixture
+def tmp_cwd(tmp_path, monkeypatch):
+    """Run in a scratch directory, so GameServer's file-backed auth (simple_users.json) stays out of the repo."""
+    monkeypatch.chdir(tmp_path)
+    return tmp_path
+
 @pytest.fixture
 async def sample_player(db_session, faker_instance) -> Player:
     """Create a sample player for testing."""
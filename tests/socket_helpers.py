@@ -0,0 +1,35 @@
+"""
+Shared websocket stand-ins for the unit tests.
+
+Usage:
+    from socket_helpers import RecordingSocket
+"""
+
+import asyncio
+import json
+
+import websockets
+
+
+class RecordingSocket:
+    """Websocket stand-in that keeps the JSON frames it is sent, raw and decoded; can be slow or closed."""
+
+    subprotocol = None
+
+    def __init__(self, name='ws', delay=0.0, closed=False):
+        self.name = name
+        self.delay = delay
+        self.closed = closed
+        self.frames = []
+        self.sent = []
+
+    async def send(self, frame):
+        if self.closed:
+            raise websockets.ConnectionClosed(None, None)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.frames.append(frame)
+        self.sent.append(json.loads(frame))
+
+    def of_type(self, msg_type):
+        return [message for message in self.sent if message['type'] == msg_type]
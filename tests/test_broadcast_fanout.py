@@ -0,0 +1,154 @@
+"""
+Unit tests for the serialize-once broadcast fan-out.
+
+Tests cover:
+1. SharedPayload encoding and per-recipient field splicing
+2. Concurrent sends with per-recipient timeouts
+3. Failure reporting and fan-out metrics
+4. NetworkManager.broadcast_to_room using the fan-out
+
+Usage:
+    pytest tests/test_broadcast_fanout.py
+    pytest tests/test_broadcast_fanout.py -v  # verbose output
+"""
+
+import pytest
+import asyncio
+import json
+import time
+
+# Add backend directory to path for imports
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from broadcast_fanout import BroadcastFanout, SharedPayload
+from network import NetworkManager
+from socket_helpers import RecordingSocket
+
+
+class TestSharedPayload:
+    """Test encode-once payloads."""
+
+    def test_render_matches_per_recipient_dumps(self):
+        """Spliced output decodes to the same message as a per-recipient dict."""
+        data = {'winner': 'alice', 'tricks': {'0': 3, '1': 4}, 'note': 'say "hi", {ok}'}
+        payload = SharedPayload('trick_result', data, ('you', 'player_number'))
+
+        message = json.loads(payload.render(you='bob', player_number=2))
+
+        expected = {'type': 'trick_result', **data, 'you': 'bob', 'player_number': 2}
+        assert message == expected
+
+    def test_recipient_fields_override_shared_keys(self):
+        """Per-recipient keys replace same-named keys in the shared data."""
+        payload = SharedPayload('info', {'you': 'stale', 'message': 'hello'}, ('you',))
+
+        message = json.loads(payload.render(you='carol'))
+
+        assert message == {'type': 'info', 'message': 'hello', 'you': 'carol'}
+
+    def test_empty_data_and_no_fields(self):
+        """A payload with no data or fields is still valid JSON."""
+        assert json.loads(SharedPayload('ping').render()) == {'type': 'ping'}
+        assert json.loads(SharedPayload('ping').render(you='dan')) == {'type': 'ping', 'you': 'dan'}
+
+
+class TestBroadcastFanout:
+    """Test concurrent sending."""
+
+    @pytest.mark.asyncio
+    async def test_slow_client_does_not_delay_others(self):
+        """Sends run concurrently; a slow socket times out on its own."""
+        fanout = BroadcastFanout(send_timeout=0.2)
+        fast = [RecordingSocket(i) for i in range(3)]
+        slow = RecordingSocket('slow', delay=1.0)
+        recipients = [(ws, {'you': ws.name}) for ws in fast + [slow]]
+
+        start = time.perf_counter()
+        outcome = await fanout.broadcast('card_played', {'card': 'A_hearts'}, recipients)
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.8
+        assert outcome['timed_out'] == [slow]
+        assert outcome['failed'] == []
+        assert all(len(ws.sent) == 1 for ws in fast)
+        assert fast[1].sent[0]['you'] == 1
+
+    @pytest.mark.asyncio
+    async def test_closed_socket_reported_as_failed(self):
+        """Closed sockets are reported back to the caller."""
+        fanout = BroadcastFanout()
+        ok, closed = RecordingSocket('ok'), RecordingSocket('closed', closed=True)
+
+        outcome = await fanout.broadcast('info', {}, [(ok, {}), (closed, {})])
+
+        assert outcome['failed'] == [closed]
+        assert len(ok.sent) == 1
+
+    @pytest.mark.asyncio
+    async def test_metrics_count_messages_and_bytes(self):
+        """Metrics record sent messages, bytes and latency per type."""
+        fanout = BroadcastFanout()
+        sockets = [RecordingSocket(i) for i in range(4)]
+
+        await fanout.broadcast('hand_complete', {'round_winner': 1}, [(ws, {'you': str(ws.name)}) for ws in sockets])
+
+        metrics = fanout.get_metrics()
+        assert metrics['broadcasts'] == 1
+        assert metrics['messages_sent'] == 4
+        assert metrics['bytes_sent'] == sum(len(ws.frames[0]) for ws in sockets)
+        assert metrics['per_type']['hand_complete']['count'] == 1
+
+
+class TestNetworkManagerBroadcast:
+    """Test broadcast_to_room on top of the fan-out."""
+
+    @pytest.fixture
+    def network(self):
+        manager = NetworkManager()
+        manager.live_connections.clear()
+        manager.connection_metadata.clear()
+        manager.room_connections.clear()
+        yield manager
+        for ws in list(manager.connection_metadata):
+            manager.remove_connection(ws)
+        manager.live_connections.clear()
+        manager.connection_metadata.clear()
+        manager.room_connections.clear()
+
+    @pytest.mark.asyncio
+    async def test_broadcast_with_roster_players(self, network):
+        """Each live player gets the shared body plus their own fields."""
+        sockets = [RecordingSocket(i) for i in range(2)]
+        players = []
+        for i, ws in enumerate(sockets):
+            network.register_connection(ws, f"p{i}", "ROOM", f"user{i}")
+            players.append({'player_id': f"p{i}", 'username': f"user{i}", 'player_number': i + 1})
+        players.append({'player_id': 'gone', 'username': 'offline', 'player_number': 3})
+
+        class NoRedis:
+            redis = None
+
+        await network.broadcast_to_room("ROOM", 'phase_change', {'new_phase': 'gameplay'}, NoRedis(), players=players)
+
+        messages = [ws.sent[0] for ws in sockets]
+        assert [m['you'] for m in messages] == ['user0', 'user1']
+        assert [m['player_number'] for m in messages] == [1, 2]
+        assert all(m['type'] == 'phase_change' and m['new_phase'] == 'gameplay' for m in messages)
+
+    @pytest.mark.asyncio
+    async def test_broadcast_drops_closed_connection(self, network):
+        """Sockets whose writer found them closed are removed on the next fan-out."""
+        closed = RecordingSocket('closed', closed=True)
+        network.register_connection(closed, "p0", "ROOM", "user0")
+
+        class NoRedis:
+            redis = None
+
+        for _ in range(2):
+            await network.broadcast_to_room("ROOM", 'info', {}, NoRedis(),
+                                            players=[{'player_id': 'p0', 'username': 'user0'}])
+            await asyncio.sleep(0.01)
+
+        assert network.get_live_connection("p0") is None
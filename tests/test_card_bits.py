@@ -0,0 +1,142 @@
+"""
+Unit tests for the bitmask card engine.
+
+Tests cover:
+1. Card mask encoding and decoding
+2. Follow-suit masks and trick resolution bit operations
+3. BitGameBoard playing identically to the string-based GameBoard
+4. Serialization at the protocol boundary
+
+Usage:
+    pytest tests/test_card_bits.py
+    pytest tests/test_card_bits.py -v  # verbose output
+"""
+
+import pytest
+import json
+
+# Add backend directory to path for imports
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from card_bits import (
+    CARD_NAMES, CARD_INDEX, SUIT_MASK_BY_NAME, FULL_DECK_MASK,
+    cards_to_mask, mask_to_cards, card_count, legal_cards_mask, trick_winner_bit, card_bit
+)
+from game_board import GameBoard
+from game_board_bits import BitGameBoard
+from board_helpers import PLAYERS, deal_to_gameplay, lowest_legal
+
+
+class TestEncoding:
+    """Test mask encoding."""
+
+    def test_round_trip_in_deck_order(self):
+        """Decoding returns the same cards in deck order."""
+        cards = ['A_spades', '2_hearts', '10_clubs', 'K_diamonds']
+
+        mask = cards_to_mask(cards)
+
+        assert card_count(mask) == 4
+        assert mask_to_cards(mask) == sorted(cards, key=CARD_INDEX.__getitem__)
+
+    def test_full_deck(self):
+        """The full deck mask holds all 52 distinct cards."""
+        assert cards_to_mask(CARD_NAMES) == FULL_DECK_MASK
+        assert len(set(CARD_NAMES)) == 52
+
+    def test_suit_masks_partition_deck(self):
+        """Suit masks are disjoint and cover the deck."""
+        masks = list(SUIT_MASK_BY_NAME.values())
+        assert sum(card_count(m) for m in masks) == 52
+        combined = 0
+        for m in masks:
+            assert combined & m == 0
+            combined |= m
+        assert combined == FULL_DECK_MASK
+
+
+class TestRules:
+    """Test follow-suit and trick resolution."""
+
+    def test_must_follow_led_suit(self):
+        """Holding the led suit restricts legal cards to it."""
+        hand = cards_to_mask(['2_hearts', 'K_hearts', 'A_spades'])
+
+        assert mask_to_cards(legal_cards_mask(hand, 'hearts')) == ['2_hearts', 'K_hearts']
+        assert legal_cards_mask(hand, 'clubs') == hand
+        assert legal_cards_mask(hand, None) == hand
+
+    def test_trump_beats_led_suit(self):
+        """Any trump beats the highest led-suit card."""
+        trick = cards_to_mask(['A_hearts', '2_spades', 'K_hearts', '5_clubs'])
+
+        assert trick_winner_bit(trick, 'hearts', 'spades') == card_bit('2_spades')
+        assert trick_winner_bit(trick, 'hearts', 'diamonds') == card_bit('A_hearts')
+
+    def test_off_suit_cards_never_win(self):
+        """Discards of a third suit do not win."""
+        trick = cards_to_mask(['3_hearts', 'A_clubs', 'A_diamonds', '4_hearts'])
+
+        assert trick_winner_bit(trick, 'hearts', 'spades') == card_bit('4_hearts')
+
+
+class TestBitGameBoard:
+    """Test BitGameBoard against the classic GameBoard."""
+
+    @pytest.mark.parametrize("seed", [1, 2, 3, 4, 5])
+    def test_same_game_as_string_engine(self, seed):
+        """Both engines produce identical results for the same deal and moves."""
+        classic = deal_to_gameplay(GameBoard, seed)
+        bits = deal_to_gameplay(BitGameBoard, seed)
+
+        for player in PLAYERS:
+            assert sorted(classic.hands[player]) == sorted(bits.hands[player])
+
+        for _ in range(52):
+            if classic.game_phase != "gameplay":
+                break
+            move = lowest_legal(classic)
+            assert move == lowest_legal(bits)
+            assert classic.play_card(*move) == bits.play_card(*move)
+            assert classic.tricks == bits.tricks
+            assert classic.current_turn == bits.current_turn
+
+        assert classic.round_scores == bits.round_scores
+
+    def test_rejects_invalid_plays(self):
+        """Card-not-in-hand and follow-suit violations are rejected."""
+        board = deal_to_gameplay(BitGameBoard, 11)
+        player = board.players[board.current_turn]
+        other = board.players[(board.current_turn + 1) % 4]
+
+        assert board.validate_play(player, board.hands[other][0]) == (False, "Card not in hand")
+        assert board.validate_play(player, "not_a_card") == (False, "Card not in hand")
+
+        lead = board.hands[player][0]
+        board.play_card(player, lead)
+        led_suit = lead.split('_')[1]
+        follower = board.players[board.current_turn]
+        hand = board.hands[follower]
+        if any(c.endswith(led_suit) for c in hand) and not all(c.endswith(led_suit) for c in hand):
+            off_suit = next(c for c in hand if not c.endswith(led_suit))
+            valid, message = board.validate_play(follower, off_suit)
+            assert not valid and message == f"You must follow suit: {led_suit}"
+        assert set(board.legal_cards(follower)) == {
+            c for c in hand if board.validate_play(follower, c)[0]
+        }
+
+    def test_serializes_like_classic_board(self):
+        """to_redis_dict/from_redis_dict work through the string views."""
+        board = deal_to_gameplay(BitGameBoard, 21)
+        player, card = lowest_legal(board)
+        board.play_card(player, card)
+
+        state = board.to_redis_dict()
+        assert json.loads(state['played_cards']) == [card]
+        assert card not in json.loads(state[f'hand_{player}'])
+
+        restored = BitGameBoard.from_redis_dict(state, board.players)
+        assert restored.hand_mask(player) == board.hand_mask(player)
+        assert restored.played_mask == board.played_mask
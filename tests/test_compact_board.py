@@ -0,0 +1,162 @@
+"""
+Unit tests for the compact, slotted game board.
+
+Tests cover:
+1. No per-instance __dict__ and seat-indexed storage
+2. CompactGameBoard playing whole games identically to GameBoard
+3. Redis serialization, incremental deltas and restore
+4. Bytes per table against the classic board
+
+Usage:
+    pytest tests/test_compact_board.py
+    pytest tests/test_compact_board.py -v  # verbose output
+"""
+
+import pytest
+import random
+import json
+
+# Add backend directory to path for imports
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from card_bits import CARD_INDEX
+from game_board import GameBoard
+from game_board_compact import CompactGameBoard, measure_table_bytes
+from board_helpers import PLAYERS, deal_to_gameplay, lowest_legal
+TIMESTAMP_FIELDS = {'created_at', 'last_activity', 'last_updated'}
+
+
+def comparable(state):
+    """Redis state without timestamps, with card lists in a canonical order."""
+    result = {}
+    for key, value in state.items():
+        if key in TIMESTAMP_FIELDS:
+            continue
+        if key.startswith('hand_') or key == 'played_cards':
+            value = sorted(json.loads(value), key=CARD_INDEX.__getitem__)
+        elif key in ('teams', 'player_tricks'):
+            value = json.loads(value)
+        result[key] = value
+    return result
+
+
+class TestLayout:
+    """Test the compact storage layout."""
+
+    def test_has_no_instance_dict(self):
+        """Every attribute lives in a slot."""
+        board = CompactGameBoard(PLAYERS, "ROOM")
+
+        assert not hasattr(board, '__dict__')
+        with pytest.raises(AttributeError):
+            board.unknown_attribute = 1
+
+    def test_views_behave_like_dicts(self):
+        """teams, tricks and hands read and write like the classic dicts."""
+        board = deal_to_gameplay(CompactGameBoard, 3)
+
+        assert set(board.teams) == set(PLAYERS)
+        assert sorted(board.teams.values()) == [0, 0, 1, 1]
+        assert board.tricks.copy() == {0: 0, 1: 0}
+        assert all(len(board.hands[p]) == 13 for p in PLAYERS)
+        assert board.hands.get("nobody", []) == []
+
+        board.tricks[1] += 2
+        assert board.tricks == {0: 0, 1: 2}
+
+
+class TestRules:
+    """Test CompactGameBoard against the classic GameBoard."""
+
+    @pytest.mark.parametrize("seed", [1, 2, 3])
+    def test_whole_game_matches_game_board(self, seed):
+        """Both boards produce identical results over a whole game."""
+        classic = deal_to_gameplay(GameBoard, seed)
+        compact = deal_to_gameplay(CompactGameBoard, seed)
+
+        for _ in range(13 * 52):
+            if classic.game_phase == "completed":
+                break
+            if classic.game_phase == "initial_deal":
+                rng_state = random.getstate()
+                classic.initial_deal()
+                random.setstate(rng_state)
+                compact.initial_deal()
+                suit = min(classic.hands[classic.hakem], key=CARD_INDEX.__getitem__).split('_')[1]
+                classic.set_hokm(suit)
+                compact.set_hokm(suit)
+                classic.final_deal()
+                compact.final_deal()
+            move = lowest_legal(classic)
+            assert move == lowest_legal(compact)
+            assert classic.play_card(*move) == compact.play_card(*move)
+            assert comparable(classic.to_redis_dict()) == comparable(compact.to_redis_dict())
+
+        assert classic.game_phase == compact.game_phase == "completed"
+        assert classic.round_scores == compact.round_scores
+
+    def test_rejects_invalid_plays(self):
+        """Turn order, card ownership and follow-suit are enforced."""
+        board = deal_to_gameplay(CompactGameBoard, 11)
+        player = board.players[board.current_turn]
+        other = board.players[(board.current_turn + 1) % 4]
+
+        assert board.validate_play(other, board.hands[other][0]) == (False, "Not your turn")
+        assert board.validate_play(player, board.hands[other][0]) == (False, "Card not in hand")
+
+
+class TestPersistence:
+    """Test Redis serialization of the compact board."""
+
+    def test_merged_deltas_match_full_state(self):
+        """Dirty flags produce the same deltas as the classic board's sets."""
+        board = deal_to_gameplay(CompactGameBoard, 7)
+        stored = board.to_redis_delta()
+
+        for _ in range(10):
+            board.play_card(*lowest_legal(board))
+            delta = board.to_redis_delta()
+            stored.update(delta)
+            assert comparable(stored) == comparable(board.to_redis_dict())
+
+        player, card = lowest_legal(board)
+        board.play_card(player, card)
+        assert set(board.to_redis_delta()) - TIMESTAMP_FIELDS <= {
+            f'hand_{player}', 'current_trick', 'current_turn', 'played_cards',
+            'tricks', 'completed_tricks', 'led_suit',
+        }
+
+    def test_state_changes_use_flags(self):
+        """The delta stream's change tracking works on the slotted board too."""
+        board = deal_to_gameplay(CompactGameBoard, 7)
+        stored = board.take_state_changes()
+
+        for _ in range(6):
+            board.play_card(*lowest_legal(board))
+            stored.update(board.take_state_changes())
+            assert comparable(stored) == comparable(board.to_redis_dict())
+
+    def test_round_trip(self):
+        """from_redis_dict restores the same state."""
+        board = deal_to_gameplay(CompactGameBoard, 9)
+        board.play_card(*lowest_legal(board))
+
+        restored = CompactGameBoard.from_redis_dict(board.to_redis_dict(), PLAYERS)
+
+        assert restored.hand_mask("P1") == board.hand_mask("P1")
+        assert dict(restored.teams) == dict(board.teams)
+        assert restored.played_cards == board.played_cards
+        assert restored.validate_state()
+
+
+class TestMemory:
+    """Test the memory footprint per table."""
+
+    def test_smaller_than_classic_board(self):
+        """A live compact table uses well under half the classic board's bytes."""
+        classic = measure_table_bytes(GameBoard, tables=200)
+        compact = measure_table_bytes(CompactGameBoard, tables=200)
+
+        assert compact < classic / 2
@@ -0,0 +1,506 @@
+"""
+Unit tests for the sequenced state-delta stream.
+
+Tests cover:
+1. One sequence per state change, shared by every player
+2. Per-player views (no other players' hands) and periodic keyframes
+3. Resuming from a sequence: merged changes, or a keyframe when too old
+4. The client-side SyncedState: applying, gap detection, resync
+5. DeltaNetworkManager sending, acknowledging and per-room bandwidth
+6. GameServer in HOKM_STATE_SYNC=delta mode (state_ack, state_resync, reconnect)
+7. Coalescing bursts of updates into one sequence per room
+8. Incremental checksums and change-driven deltas (no full diff)
+9. Compressed binary frames on the hokm.json.z1 subprotocol
+
+Usage:
+    pytest tests/test_delta_sync.py
+    pytest tests/test_delta_sync.py -v  # verbose output
+"""
+
+import pytest
+import asyncio
+import json
+import random
+
+# Add backend directory to path for imports
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from game_board import GameBoard
+from game_state_delta import GameStateDeltaManager, SyncedState, measure_sync_costs
+from network import NetworkManager
+from network_delta import DeltaNetworkManager
+from room_roster import RoomRoster
+from wire_protocol import decode
+from server import GameServer
+from socket_helpers import RecordingSocket
+
+# GameServer() writes simple_users.json to the working directory
+pytestmark = pytest.mark.usefixtures('tmp_cwd')
+
+PLAYERS = ["P1", "P2", "P3", "P4"]
+
+
+def game_states(count, seed=5):
+    """to_redis_dict() after dealing and after each of the first card plays"""
+    random.seed(seed)
+    board = GameBoard(PLAYERS, "ROOM")
+    board.assign_teams_and_hakem()
+    board.initial_deal()
+    board.set_hokm('hearts')
+    board.final_deal()
+    states = [board.to_redis_dict()]
+    for _ in range(count - 1):
+        player = board.players[board.current_turn]
+        board.play_card(player, next(c for c in board.hands[player] if board.validate_play(player, c)[0]))
+        states.append(board.to_redis_dict())
+    return board, states
+
+
+class FrameSocket:
+    """Websocket stand-in on a given subprotocol that keeps raw frames."""
+
+    def __init__(self, subprotocol):
+        self.subprotocol = subprotocol
+        self.frames = []
+
+    async def send(self, frame):
+        self.frames.append(frame)
+
+
+class TestDeltaStream:
+    """Test sequencing, views and resume in GameStateDeltaManager."""
+
+    def test_one_sequence_per_change(self):
+        """Each changed state is the next sequence; unchanged states are skipped."""
+        _, states = game_states(3)
+        manager = GameStateDeltaManager()
+
+        first = manager.advance(states[0])
+        second = manager.advance(states[1])
+        assert manager.advance(dict(states[1], last_activity='later')) is None
+        third = manager.advance(states[2])
+
+        assert [first.sequence_id, second.sequence_id, third.sequence_id] == [1, 2, 3]
+        assert first.keyframe and not second.keyframe
+        # Building every player's message does not move the stream
+        for player in PLAYERS:
+            assert manager.player_message(third, player)['seq'] == 3
+        assert manager.sequence_counter == 3
+
+    def test_player_view_hides_other_hands(self):
+        """A player sees their own hand as 'hand' and nobody else's."""
+        board, states = game_states(1)
+        manager = GameStateDeltaManager()
+        manager.advance(states[0])
+
+        view = manager.keyframe_message("P2")['changes']
+
+        assert view['hand'] == board.hands["P2"]
+        assert not any(key.startswith('hand_') for key in view)
+        assert view['players'] == board.players
+
+    def test_keyframe_interval(self):
+        """Every Nth sequence is sent as a full view."""
+        _, states = game_states(8)
+        manager = GameStateDeltaManager(keyframe_interval=3)
+
+        keyframes = [manager.advance(state).keyframe for state in states]
+
+        assert keyframes == [True, False, False, True, False, False, True, False]
+
+    def test_resume_merges_missed_changes(self):
+        """A client a few sequences behind gets one merged patch from its sequence."""
+        _, states = game_states(5)
+        manager = GameStateDeltaManager()
+        for state in states:
+            manager.advance(state)
+
+        message = manager.resume_message("P1", 2, manager.epoch)
+
+        assert message['resume'] and not message['keyframe']
+        assert message['base'] == 2 and message['seq'] == 5
+        assert message['changes']['current_trick'] == json.loads(states[4]['current_trick'])
+        assert manager.resume_message("P1", 5, manager.epoch) is None
+
+    def test_resume_falls_back_to_keyframe(self):
+        """Too-old sequences and other epochs get a keyframe."""
+        _, states = game_states(6)
+        manager = GameStateDeltaManager(max_history=2)
+        for state in states:
+            manager.advance(state)
+
+        assert manager.resume_message("P1", 4, manager.epoch)['keyframe'] is False
+        assert manager.resume_message("P1", 2, manager.epoch)['keyframe'] is True
+        assert manager.resume_message("P1", 5, "oldepoch")['keyframe'] is True
+        assert manager.resume_message("P1", None, None)['keyframe'] is True
+
+    def test_acknowledge(self):
+        """Acks never go backwards, past the stream, or across epochs."""
+        _, states = game_states(3)
+        manager = GameStateDeltaManager()
+        for state in states:
+            manager.advance(state)
+
+        assert manager.acknowledge("p1", 2, manager.epoch)
+        assert manager.acknowledge("p1", 1)
+        assert manager.get_player_last_sequence("p1") == 2
+        manager.acknowledge("p1", 99)
+        assert manager.get_player_last_sequence("p1") == 3
+        assert not manager.acknowledge("p1", 1, "oldepoch")
+
+
+class TestIncrementalChecksum:
+    """Test checksums updated per changed field."""
+
+    def test_matches_full_recompute(self):
+        """After any mix of full states and change sets the checksum equals a from-scratch one."""
+        _, states = game_states(6)
+        manager = GameStateDeltaManager()
+        manager.advance(states[0])
+        manager.advance_changes({'current_turn': states[1]['current_turn'], 'hokm': 'spades'})
+        manager.advance(states[2])
+        manager.record_changes({'trick_winner': 'P1'}, manager.classify_changes({}))
+
+        assert manager.checksum == manager.compute_state_checksum(manager.last_state)
+        assert manager.delta_history[-1].checksum == manager.checksum
+        assert manager.compute_state_checksum(states[5]) != manager.checksum
+
+    def test_ignores_timestamps_and_order(self):
+        """Bookkeeping fields and key order do not change the checksum."""
+        _, states = game_states(1)
+        manager = GameStateDeltaManager()
+        shuffled = dict(reversed(list(states[0].items())), last_activity='0')
+
+        assert manager.compute_state_checksum(states[0]) == manager.compute_state_checksum(shuffled)
+
+    def test_board_changes_drive_the_stream(self):
+        """take_state_changes + advance_changes produce the same stream as diffing full states."""
+        random.seed(11)
+        board = GameBoard(PLAYERS, "ROOM")
+        board.assign_teams_and_hakem()
+        board.initial_deal()
+        by_changes, by_diff = GameStateDeltaManager(), GameStateDeltaManager()
+
+        def step():
+            a = by_changes.advance_changes(board.take_state_changes())
+            b = by_diff.advance(board.to_redis_dict())
+            assert (a is None) == (b is None)
+            if a is not None:
+                assert a.changes == b.changes and a.checksum == b.checksum
+
+        step()
+        board.set_hokm('clubs')
+        step()
+        board.final_deal()
+        step()
+        step()   # Nothing changed
+        for _ in range(8):
+            player = board.players[board.current_turn]
+            board.play_card(player, next(c for c in board.hands[player] if board.validate_play(player, c)[0]))
+            step()
+        assert by_changes.sequence_counter == by_diff.sequence_counter == 11
+
+    def test_benchmark_runs(self):
+        """The benchmark plays a whole game through both paths."""
+        legacy = measure_sync_costs(False, seed=2, repeat=1)
+        incremental = measure_sync_costs(True, seed=2, repeat=1)
+
+        assert legacy['changes'] == incremental['changes'] > 50
+        assert legacy['sequences'] == incremental['sequences']
+
+
+class TestSyncedState:
+    """Test the client's copy of the stream."""
+
+    def test_follows_the_stream(self):
+        """Applying every message rebuilds the player's view of the latest state."""
+        _, states = game_states(6)
+        manager = GameStateDeltaManager()
+        synced = SyncedState(ack_every=4)
+
+        for state in states:
+            assert synced.apply(manager.player_message(manager.advance(state), "P3"))
+
+        assert synced.sequence_id == 6
+        assert synced.state == manager.player_view(states[-1], "P3")
+        assert synced.ack_due()
+        assert synced.ack_message("ROOM") == {'type': 'state_ack', 'room_code': "ROOM",
+                                              'epoch': manager.epoch, 'seq': 6}
+        assert not synced.ack_due()
+
+    def test_gap_requires_resync(self):
+        """A missed sequence is detected and a resume closes it."""
+        _, states = game_states(4)
+        manager = GameStateDeltaManager()
+        synced = SyncedState()
+        synced.apply(manager.player_message(manager.advance(states[0]), "P1"))
+        manager.advance(states[1])   # Lost
+
+        assert not synced.apply(manager.player_message(manager.advance(states[2]), "P1"))
+        request = synced.resync_message("ROOM")
+        assert request['last_seq'] == 1
+
+        assert synced.apply(manager.resume_message("P1", request['last_seq'], request['epoch']))
+        assert synced.state == manager.player_view(states[2], "P1")
+
+    def test_new_epoch_requires_resync(self):
+        """Deltas from a restarted stream are refused until its keyframe."""
+        _, states = game_states(2)
+        old, new = GameStateDeltaManager(), GameStateDeltaManager()
+        synced = SyncedState()
+        synced.apply(old.player_message(old.advance(states[0]), "P1"))
+        new.advance(states[0])
+
+        assert not synced.apply(new.player_message(new.advance(states[1]), "P1"))
+        assert synced.apply(new.resume_message("P1", synced.sequence_id, synced.epoch))
+        assert synced.epoch == new.epoch
+
+    def test_round_trips_through_session_file(self):
+        """A saved SyncedState resumes from where it was."""
+        synced = SyncedState()
+        synced.apply({'epoch': 'e1', 'seq': 7, 'keyframe': True, 'changes': {'hokm': 'spades'}})
+
+        restored = SyncedState.from_dict(json.loads(json.dumps(synced.to_dict())))
+
+        assert (restored.epoch, restored.sequence_id, restored.state) == ('e1', 7, {'hokm': 'spades'})
+
+
+@pytest.fixture
+def delta_network(monkeypatch):
+    """A fresh DeltaNetworkManager singleton, sending directly (no outbound queues)"""
+    monkeypatch.setenv('HOKM_OUTBOUND_QUEUE', '0')
+    previous = NetworkManager._instance
+    NetworkManager._instance = None
+    manager = DeltaNetworkManager()
+    yield manager
+    NetworkManager._instance = previous
+
+
+class TestDeltaNetworkManager:
+    """Test sending the stream to connections."""
+
+    @pytest.mark.asyncio
+    async def test_broadcast_sends_each_player_their_view(self, delta_network):
+        """Every live player gets the same sequence with only their own hand."""
+        board, states = game_states(2)
+        sockets = {}
+        for i, name in enumerate(PLAYERS):
+            sockets[name] = RecordingSocket()
+            delta_network.register_connection(sockets[name], f"id-{name}", "ROOM", name)
+
+        for state in states:
+            await delta_network.broadcast_game_state_delta("ROOM", state)
+
+        for name, ws in sockets.items():
+            keyframe, delta = ws.of_type('state_sync')
+            assert keyframe['keyframe'] and (keyframe['seq'], delta['seq']) == (1, 2)
+            assert delta['room_code'] == "ROOM" and delta['base'] == 1
+            synced = SyncedState()
+            assert synced.apply(keyframe) and synced.apply(delta)
+            assert synced.state['hand'] == board.hands[name]
+        report = delta_network.get_room_report("ROOM")
+        assert report['keyframes'] == 4 and report['deltas'] == 4
+        assert report['delta_bytes'] < report['keyframe_bytes']
+        assert report['bytes_saved'] > 0
+
+    @pytest.mark.asyncio
+    async def test_ack_and_reconnect_resume(self, delta_network):
+        """A reconnecting player is resumed from their last ack."""
+        _, states = game_states(5)
+        ws = RecordingSocket()
+        delta_network.register_connection(ws, "id-P1", "ROOM", "P1")
+        await delta_network.broadcast_game_state_delta("ROOM", states[0])
+        await delta_network.broadcast_game_state_delta("ROOM", states[1])
+        assert delta_network.acknowledge(ws, 2, ws.sent[-1]['epoch'])
+        delta_network.remove_connection(ws)
+        for state in states[2:]:
+            await delta_network.broadcast_game_state_delta("ROOM", state)
+
+        again = RecordingSocket()
+        delta_network.register_connection(again, "id-P1", "ROOM", "P1")
+        assert await delta_network.resume_player(again, "ROOM", "id-P1", "P1")
+
+        resume = again.sent[0]
+        assert resume['resume'] and resume['base'] == 2 and resume['seq'] == 5
+        assert delta_network.get_room_report("ROOM")['resumes'] == 1
+        delta_network.cleanup_room_data("ROOM")
+        assert "ROOM" not in delta_network.room_delta_managers
+
+    @pytest.mark.asyncio
+    async def test_compressing_subprotocol_gets_binary_keyframes(self, delta_network):
+        """On hokm.json.z1 keyframes go out as compressed binary frames; small deltas stay text."""
+        _, states = game_states(2)
+        ws = FrameSocket('hokm.json.z1')
+        delta_network.register_connection(ws, "id-P1", "ROOM", "P1")
+
+        for state in states:
+            await delta_network.broadcast_game_state_delta("ROOM", state)
+
+        keyframe, delta = ws.frames
+        assert isinstance(keyframe, bytes) and keyframe[0] == 0xc1
+        synced = SyncedState()
+        assert synced.apply(decode(keyframe)) and synced.apply(decode(delta))
+        assert synced.sequence_id == 2
+        frames = delta_network.get_room_delta_manager("ROOM").get_compression_stats()['frames']
+        assert frames['compressed'] >= 1 and frames['bytes_out'] < frames['bytes_in']
+        assert delta_network.get_room_report("ROOM")['compressed'] == frames['compressed']
+
+
+class TestCoalescing:
+    """Test batch_updates merging bursts into single sequences."""
+
+    @pytest.fixture
+    def room(self, delta_network):
+        sockets = {}
+        for name in PLAYERS:
+            sockets[name] = RecordingSocket()
+            delta_network.register_connection(sockets[name], f"id-{name}", "ROOM", name)
+        delta_network.batch_delay = 0.02
+        delta_network.batch_max_latency = 0.1
+        delta_network.batch_max_updates = 16
+        return delta_network, sockets
+
+    @pytest.mark.asyncio
+    async def test_burst_is_one_sequence(self, room):
+        """Card plays within the window go out once, last writer winning."""
+        network, sockets = room
+        _, states = game_states(4)
+        await network.batch_updates("ROOM", {'state': states[0]})   # First state: a phase change, sent now
+
+        for state in states[1:]:
+            assert await network.batch_updates("ROOM", {'state': state}) is None
+        assert len(sockets["P1"].sent) == 1
+        assert len(network.pending_updates) == 1
+        await asyncio.sleep(0.06)
+
+        for ws in sockets.values():
+            keyframe, delta = ws.of_type('state_sync')
+            assert delta['seq'] == 2 and delta['base'] == 1
+            assert delta['changes']['current_trick'] == json.loads(states[3]['current_trick'])
+        assert network.get_room_report("ROOM")['coalesced'] == 2
+        assert network.batch_stats['by_timer'] == 1
+        assert network.pending_updates == {}
+
+    @pytest.mark.asyncio
+    async def test_hands_stay_private_when_merged(self, room):
+        """Merged hand updates reach each player as their own hand only."""
+        network, sockets = room
+        await network.batch_updates("ROOM", {'changes': {'hand_P1': ['A_hearts']}, 'update_type': 'hand_update'})
+        await network.batch_updates("ROOM", {'changes': {'hand_P2': ['K_spades'], 'hand_P1': ['2_clubs']}})
+        await network.flush_updates("ROOM")
+
+        assert sockets["P1"].sent[0]['changes'] == {'hand': ['2_clubs']}
+        assert sockets["P2"].sent[0]['changes'] == {'hand': ['K_spades']}
+        assert sockets["P3"].sent[0]['changes'] == {}
+
+    @pytest.mark.asyncio
+    async def test_phase_change_and_size_cap_flush_at_once(self, room):
+        """A phase change sends the batch including it; so does reaching the size cap."""
+        network, sockets = room
+        network.batch_max_updates = 3
+        await network.batch_updates("ROOM", {'changes': {'current_turn': 1}})
+        stats = await network.batch_updates("ROOM", {'changes': {'phase': 'gameplay', 'current_turn': 2}})
+
+        assert stats['sequence_id'] == 1 and stats['sent'] == 4
+        assert sockets["P1"].sent[0]['changes'] == {'current_turn': 2, 'phase': 'gameplay'}
+
+        for turn in range(3, 6):
+            await network.batch_updates("ROOM", {'changes': {'current_turn': turn}})
+        assert [m['seq'] for m in sockets["P1"].sent] == [1, 2]
+        assert network.batch_stats['by_phase'] == 1 and network.batch_stats['by_size'] == 1
+
+    @pytest.mark.asyncio
+    async def test_latency_cap(self, room):
+        """A steady stream of updates is still sent within the max latency."""
+        network, sockets = room
+        for turn in range(8):
+            await network.batch_updates("ROOM", {'changes': {'current_turn': turn}})
+            await asyncio.sleep(0.015)   # Always inside the quiet window
+
+        assert len(sockets["P1"].sent) >= 1
+        await network.flush_updates("ROOM")
+        assert sockets["P1"].sent[-1]['changes'] == {'current_turn': 7}
+
+    @pytest.mark.asyncio
+    async def test_resume_flushes_pending_batch(self, room):
+        """A resume is built from the latest state, after the pending batch was sent."""
+        network, sockets = room
+        _, states = game_states(2)
+        await network.batch_updates("ROOM", {'state': states[0]})
+        await network.batch_updates("ROOM", {'state': states[1]})
+
+        again = RecordingSocket()
+        await network.resume_player(again, "ROOM", "id-P1", "P1", 1, sockets["P1"].sent[0]['epoch'])
+
+        assert [m['seq'] for m in sockets["P1"].sent] == [1, 2]
+        assert again.sent[0]['seq'] == 2 and again.sent[0]['resume']
+
+
+class TestServerDeltaMode:
+    """Test GameServer with HOKM_STATE_SYNC=delta."""
+
+    @pytest.fixture
+    def server(self, monkeypatch):
+        monkeypatch.setenv('HOKM_STATE_SYNC', 'delta')
+        monkeypatch.setenv('HOKM_OUTBOUND_QUEUE', '0')
+        previous = NetworkManager._instance
+        NetworkManager._instance = None
+        server = GameServer()
+        server.auth_manager.is_authenticated = lambda websocket: True
+        board, _ = game_states(1)
+        server.active_games["ROOM"] = board
+        server.room_rosters["ROOM"] = RoomRoster.from_room_players(
+            "ROOM", [{'player_id': f"id-{name}", 'username': name} for name in PLAYERS]
+        )
+        yield server
+        NetworkManager._instance = previous
+
+    @pytest.mark.asyncio
+    async def test_state_changes_are_streamed(self, server):
+        """sync_room_state sends a keyframe, then deltas."""
+        assert isinstance(server.network_manager, DeltaNetworkManager)
+        ws = RecordingSocket()
+        server.network_manager.register_connection(ws, "id-P1", "ROOM", "P1")
+        board = server.active_games["ROOM"]
+
+        await server.sync_room_state("ROOM")
+        player = board.players[board.current_turn]
+        board.play_card(player, next(c for c in board.hands[player] if board.validate_play(player, c)[0]))
+        await server.sync_room_state("ROOM")
+        await server.network_manager.flush_updates("ROOM")   # Card plays wait in the batch window
+
+        keyframe, delta = ws.of_type('state_sync')
+        assert keyframe['keyframe'] and not delta['keyframe']
+        assert delta['changes']['current_trick']
+
+    @pytest.mark.asyncio
+    async def test_ack_and_resync_messages(self, server):
+        """state_ack is recorded; state_resync gets a resume; malformed ones are errors."""
+        ws = RecordingSocket()
+        server.network_manager.register_connection(ws, "id-P1", "ROOM", "P1")
+        await server.sync_room_state("ROOM")
+        epoch = ws.sent[0]['epoch']
+
+        await server.handle_message(ws, {'type': 'state_ack', 'room_code': "ROOM", 'seq': 1, 'epoch': epoch})
+        await server.handle_message(ws, {'type': 'state_resync', 'room_code': "ROOM", 'last_seq': 0,
+                                         'epoch': 'stale'})
+        await server.handle_message(ws, {'type': 'state_ack', 'room_code': "ROOM", 'seq': 'x'})
+        await server.room_actors.stop_all()
+
+        assert server.network_manager.room_delta_managers["ROOM"].get_player_last_sequence("id-P1") == 1
+        resumes = [m for m in ws.of_type('state_sync') if m.get('resume')]
+        assert len(resumes) == 1 and resumes[0]['keyframe']
+        assert ws.of_type('error')
+
+    @pytest.mark.asyncio
+    async def test_resume_without_stream_sends_keyframe(self, server):
+        """After a restart the first resume starts the room's stream."""
+        ws = RecordingSocket()
+        server.network_manager.register_connection(ws, "id-P2", "ROOM", "P2")
+
+        await server.resume_state(ws, last_sequence=12, epoch='before-restart')
+
+        (message,) = ws.of_type('state_sync')
+        assert message['keyframe'] and message['seq'] == 1
@@ -0,0 +1,384 @@
+"""
+Unit tests for the event-sourced game log.
+
+Tests cover:
+1. Boards recording typed, sequenced events for every state change
+2. Replaying a whole game from the event log
+3. Replaying from a snapshot plus the event tail
+4. Event log storage in ResilientRedisManager (stream + snapshot hash)
+5. GameServer persisting a room's events across games and failed appends
+6. Restart recovery replaying the event log, with the state hash as fallback
+
+Usage:
+    pytest tests/test_game_events.py
+    pytest tests/test_game_events.py -v  # verbose output
+"""
+
+import pytest
+import random
+import json
+from redis.exceptions import ResponseError
+
+# Add backend directory to path for imports
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from card_bits import CARD_INDEX
+from game_board import GameBoard
+from game_board_compact import CompactGameBoard
+from game_events import GameEventLog, replay, take_snapshot
+from redis_manager_resilient import ResilientRedisManager
+from server import GameServer
+
+PLAYERS = ["P1", "P2", "P3", "P4"]
+TIMESTAMP_FIELDS = {'created_at', 'last_activity', 'last_updated'}
+
+
+def comparable(board):
+    """Board state without timestamps, with card lists in a canonical order."""
+    result = {}
+    for key, value in board.to_redis_dict().items():
+        if key in TIMESTAMP_FIELDS:
+            continue
+        if key.startswith('hand_') or key == 'played_cards':
+            value = sorted(json.loads(value), key=CARD_INDEX.__getitem__)
+        elif key in ('teams', 'tricks', 'round_scores'):
+            value = json.loads(value)
+        result[key] = value
+    result['player_tricks'] = dict(board.player_tricks)
+    return result
+
+
+def play(board, moves):
+    """Drive a logged board through the given number of card plays, dealing new hands as needed."""
+    for _ in range(moves):
+        if board.game_phase == "completed":
+            return
+        if board.game_phase == "initial_deal":
+            board.initial_deal()
+            board.set_hokm(random.choice(['hearts', 'diamonds', 'clubs', 'spades']))
+            board.final_deal()
+        player = board.players[board.current_turn]
+        card = min((c for c in board.hands[player] if board.validate_play(player, c)[0]),
+                   key=CARD_INDEX.__getitem__)
+        board.play_card(player, card)
+
+
+@pytest.fixture
+def logged_board():
+    """Board with an event log attached, teams assigned."""
+    random.seed(5)
+    board = GameBoard(PLAYERS, "ROOM")
+    board.event_log = GameEventLog("ROOM", snapshot_every=50)
+    board.assign_teams_and_hakem()
+    return board
+
+
+class TestRecording:
+    """Test event recording by the board."""
+
+    def test_first_trick_event_sequence(self, logged_board):
+        """Deal, hokm and a trick produce the expected typed events."""
+        play(logged_board, 4)
+
+        events = logged_board.event_log.take_pending()
+
+        assert [e['type'] for e in events] == [
+            'teams_assigned', 'deal', 'hokm_set', 'deal',
+            'card_played', 'card_played', 'card_played', 'card_played', 'trick_resolved',
+        ]
+        assert [e['seq'] for e in events] == list(range(1, 10))
+        assert events[1]['data']['stage'] == 'initial'
+        assert all(len(cards) == 5 for cards in events[1]['data']['hands'].values())
+        assert all(len(cards) == 13 for cards in events[3]['data']['hands'].values())
+
+    def test_hand_complete_is_logged(self, logged_board):
+        """A finished hand logs its winner and the running score."""
+        play(logged_board, 52)
+
+        events = [e for e in logged_board.event_log.take_pending() if e['type'] == 'hand_complete']
+
+        assert events
+        assert sum(events[0]['data']['round_scores'].values()) == 1
+
+    def test_failed_write_keeps_order(self):
+        """Events put back after a failed write stay ahead of newer ones."""
+        log = GameEventLog("ROOM")
+        log.append('hokm_set', {'suit': 'hearts'})
+        taken = log.take_pending()
+        log.append('card_played', {'player': 'P1', 'card': 'A_hearts'})
+
+        log.restore_pending(taken)
+
+        assert [e['seq'] for e in log.pending] == [1, 2]
+
+    def test_unknown_event_type_rejected(self):
+        """Only the documented event types can be appended."""
+        with pytest.raises(ValueError):
+            GameEventLog("ROOM").append('bogus', {})
+
+
+class TestReplay:
+    """Test rebuilding boards from events."""
+
+    @pytest.mark.parametrize("board_class", [GameBoard, CompactGameBoard])
+    def test_replay_whole_game(self, logged_board, board_class):
+        """Replaying every event rebuilds the same board, for any board class."""
+        play(logged_board, 13 * 52)
+        events = logged_board.event_log.take_pending()
+
+        rebuilt = replay(events, players=PLAYERS, board_class=board_class)
+
+        assert logged_board.game_phase == "completed"
+        assert comparable(rebuilt) == comparable(logged_board)
+
+    def test_snapshot_plus_tail(self, logged_board):
+        """A mid-hand snapshot plus the later events matches a full replay."""
+        play(logged_board, 30)
+        snapshot = take_snapshot(logged_board, logged_board.event_log.seq)
+        play(logged_board, 40)
+        events = logged_board.event_log.take_pending()
+        tail = [e for e in events if e['seq'] > snapshot['seq']]
+
+        rebuilt = replay(tail, snapshot=json.loads(json.dumps(snapshot)))
+
+        assert comparable(rebuilt) == comparable(logged_board)
+        assert comparable(rebuilt) == comparable(replay(events, players=PLAYERS))
+
+    def test_tampered_derived_event_detected(self, logged_board):
+        """A trick winner that disagrees with the rules is rejected."""
+        play(logged_board, 4)
+        events = logged_board.event_log.take_pending()
+        trick = next(e for e in events if e['type'] == 'trick_resolved')
+        trick['data']['winner'] = next(p for p in PLAYERS if p != trick['data']['winner'])
+
+        with pytest.raises(ValueError):
+            replay(events, players=PLAYERS)
+
+    def test_gap_detected(self, logged_board):
+        """A missing event is reported instead of silently skipped."""
+        play(logged_board, 4)
+        events = logged_board.event_log.take_pending()
+        del events[4]
+
+        with pytest.raises(ValueError, match="gap"):
+            replay(events, players=PLAYERS)
+
+
+class EventStoreClient:
+    """Minimal in-memory stand-in for the stream and hash commands used by the event log."""
+
+    def __init__(self):
+        self.streams = {}
+        self.hashes = {}
+
+    def pipeline(self):
+        return self
+
+    def xadd(self, key, fields, id='*', maxlen=None, approximate=True):
+        stream = self.streams.setdefault(key, [])
+        # Like Redis, explicit ids must grow (all ids used here are 0-<seq>)
+        if stream and int(id.split('-')[1]) <= int(stream[-1][0].decode().split('-')[1]):
+            raise ResponseError("The ID specified in XADD is equal or smaller than the target stream top item")
+        stream.append((id.encode(), {k.encode(): v.encode() for k, v in fields.items()}))
+
+    def xrange(self, key, min='-', max='+'):
+        low = int(min.split('-')[1])
+        return [e for e in self.streams.get(key, []) if int(e[0].decode().split('-')[1]) >= low]
+
+    def xrevrange(self, key, max='+', min='-', count=None):
+        return self.streams.get(key, [])[::-1][:count]
+
+    def delete(self, *keys):
+        for key in keys:
+            self.streams.pop(key, None)
+            self.hashes.pop(key, None)
+
+    def hset(self, key, mapping):
+        self.hashes.setdefault(key, {}).update({k.encode(): v.encode() for k, v in mapping.items()})
+
+    def hgetall(self, key):
+        return self.hashes.get(key, {})
+
+    def expire(self, key, seconds):
+        pass
+
+    def execute(self):
+        return []
+
+
+class TestEventStorage:
+    """Test the Redis stream and snapshot storage."""
+
+    @pytest.fixture
+    def manager(self):
+        manager = ResilientRedisManager()
+        manager.redis = EventStoreClient()
+        return manager
+
+    def test_append_read_tail_and_replay(self, manager, logged_board):
+        """Stored events after the snapshot replay to the live board."""
+        play(logged_board, 20)
+        assert manager.append_game_events("ROOM", logged_board.event_log.take_pending())
+        snapshot = take_snapshot(logged_board, logged_board.event_log.seq)
+        assert manager.save_game_snapshot("ROOM", snapshot)
+        play(logged_board, 20)
+        assert manager.append_game_events("ROOM", logged_board.event_log.take_pending())
+
+        stored = manager.get_game_snapshot("ROOM")
+        tail = manager.read_game_events("ROOM", after_seq=stored['seq'])
+
+        assert stored['seq'] == snapshot['seq']
+        assert tail[0]['seq'] == snapshot['seq'] + 1
+        assert comparable(replay(tail, snapshot=stored)) == comparable(logged_board)
+
+    def test_missing_snapshot(self, manager):
+        """Rooms without a snapshot return None."""
+        assert manager.get_game_snapshot("NONE") is None
+        assert manager.read_game_events("NONE") == []
+
+    def test_new_game_clears_previous_log(self, manager, logged_board):
+        """Appends restarting at seq 1 are refused until the earlier game's keys are cleared."""
+        play(logged_board, 8)
+        assert manager.append_game_events("ROOM", logged_board.event_log.take_pending())
+        assert manager.save_game_snapshot("ROOM", take_snapshot(logged_board, logged_board.event_log.seq))
+        next_game = GameEventLog("ROOM", new_game=True)
+        next_game.append('hokm_set', {'suit': 'hearts'})
+
+        assert not manager.append_game_events("ROOM", list(next_game.pending))
+        assert manager.clear_game_events("ROOM")
+        assert manager.append_game_events("ROOM", next_game.take_pending())
+        assert [e['seq'] for e in manager.read_game_events("ROOM")] == [1]
+        assert manager.get_game_snapshot("ROOM") is None
+
+
+class StoreRedis:
+    """Async manager stand-in: game events go to an EventStoreClient, state hashes and moves to dicts."""
+
+    is_async = True
+
+    def __init__(self):
+        self.store = ResilientRedisManager()
+        self.store.redis = EventStoreClient()
+        self.states = {}
+        self.moves = []
+        self.fail_appends = False
+        self.state_reads = 0
+
+    async def save_game_state(self, room_code, state, moves=None):
+        self.states.setdefault(room_code, {}).update(state)
+        self.moves.extend(moves or [])
+        return True
+
+    update_game_state_fields = save_game_state
+
+    async def get_game_state(self, room_code):
+        self.state_reads += 1
+        return dict(self.states.get(room_code, {}))
+
+    async def get_room_players(self, room_code):
+        return [{'player_id': f"id-{name}", 'username': name} for name in PLAYERS]
+
+    async def append_game_events(self, room_code, events):
+        return not self.fail_appends and self.store.append_game_events(room_code, events)
+
+    def __getattr__(self, name):
+        method = getattr(self.store, name)
+
+        async def call(*args):
+            return method(*args)
+        return call
+
+
+def new_game(server):
+    """Board started in the server's room the way handle_game_start does."""
+    board = GameBoard(PLAYERS, "ROOM")
+    board.event_log = GameEventLog("ROOM", server.snapshot_every, new_game=True)
+    server.active_games["ROOM"] = board
+    board.assign_teams_and_hakem()
+    return board
+
+
+@pytest.mark.usefixtures('tmp_cwd')
+class TestServerPersistence:
+    """Test GameServer writing a room's event log through the write-behind persister."""
+
+    @pytest.fixture
+    def server(self):
+        server = GameServer()
+        server.redis_manager = StoreRedis()
+        return server
+
+    @pytest.mark.asyncio
+    async def test_next_game_in_room_starts_a_fresh_log(self, server):
+        """A second game in the same room replaces the first game's events and snapshot."""
+        first = new_game(server)
+        play(first, 12)
+        assert await server.state_persister.save_now("ROOM", first.to_redis_delta)
+        server.redis_manager.store.save_game_snapshot("ROOM", take_snapshot(first, first.event_log.seq))
+
+        second = new_game(server)
+        assert await server.state_persister.save_now("ROOM", second.to_redis_delta)
+
+        assert [e['type'] for e in server.redis_manager.store.read_game_events("ROOM")] == ['teams_assigned']
+        assert server.redis_manager.store.get_game_snapshot("ROOM") is None
+        assert not second.event_log.pending
+
+    @pytest.mark.asyncio
+    async def test_failed_event_append_does_not_repeat_moves(self, server):
+        """Events are appended before the state write, so a failed append is retried before any move is written."""
+        board = new_game(server)
+        server.redis_manager.fail_appends = True
+
+        assert not await server.state_persister.save_now("ROOM", board.to_redis_delta, moves=[{'card': 'A_hearts'}])
+        assert board.event_log.pending and server.redis_manager.moves == []
+
+        server.redis_manager.fail_appends = False
+        assert await server.state_persister.flush("ROOM")
+
+        assert server.redis_manager.moves == [{'card': 'A_hearts'}]
+        assert not board.event_log.pending
+        assert [e['seq'] for e in server.redis_manager.store.read_game_events("ROOM")] == [1]
+
+
+@pytest.mark.usefixtures('tmp_cwd')
+class TestServerRecovery:
+    """Test GameServer rebuilding a room after a restart."""
+
+    async def persisted_game(self, moves):
+        """A played game written through the persister, and a fresh server sharing its store."""
+        before = GameServer()
+        before.redis_manager = StoreRedis()
+        board = new_game(before)
+        for _ in range(moves // 10):
+            play(board, 10)
+            assert await before.state_persister.save_now("ROOM", board.to_redis_delta)
+        after = GameServer()
+        after.redis_manager = before.redis_manager
+        return board, after
+
+    @pytest.mark.asyncio
+    async def test_replays_snapshot_and_tail(self, monkeypatch):
+        """A room with an event log is rebuilt from its snapshot and tail, without reading the state hash."""
+        monkeypatch.setenv('HOKM_SNAPSHOT_EVERY', '16')
+        board, server = await self.persisted_game(40)
+        assert server.redis_manager.store.get_game_snapshot("ROOM") is not None
+
+        game = await server.get_game("ROOM")
+
+        assert comparable(game) == comparable(board)
+        assert server.redis_manager.state_reads == 0
+        assert game.event_log.seq == board.event_log.seq and not game.event_log.pending
+        assert server.hydration_metrics['hydrated'] == 1
+
+    @pytest.mark.asyncio
+    async def test_falls_back_to_state_hash(self):
+        """A log that does not replay is ignored in favour of the state hash."""
+        board, server = await self.persisted_game(20)
+        del server.redis_manager.store.redis.streams["room:ROOM:events"][3]
+
+        game = await server.get_game("ROOM")
+
+        assert comparable(game) == comparable(board)
+        assert server.redis_manager.state_reads == 1
@@ -0,0 +1,205 @@
+"""
+Unit tests for the consolidated heartbeat scheduler.
+
+Tests cover:
+1. Deadline ordering and lazy rescheduling of active sockets
+2. Probing only idle sockets, in parallel
+3. Bounded parallel dead-connection handling
+4. The background task and GameServer wiring
+
+Usage:
+    pytest tests/test_heartbeat.py
+    pytest tests/test_heartbeat.py -v  # verbose output
+"""
+
+import pytest
+import asyncio
+import time
+
+# Add backend directory to path for imports
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from heartbeat import HeartbeatScheduler
+from server import GameServer
+
+# GameServer() writes simple_users.json to the working directory
+pytestmark = pytest.mark.usefixtures('tmp_cwd')
+
+
+class FakeSocket:
+    """WebSocket stand-in whose ping is answered after pong_delay (never if None)."""
+
+    def __init__(self, name, pong_delay=0.0):
+        self.name = name
+        self.pong_delay = pong_delay
+        self.pings = 0
+        self.remote_address = (name, 0)
+
+    async def ping(self):
+        self.pings += 1
+        pong = asyncio.get_running_loop().create_future()
+        if self.pong_delay is not None:
+            asyncio.get_running_loop().call_later(self.pong_delay, pong.set_result, None)
+        return pong
+
+    def __repr__(self):
+        return f"FakeSocket({self.name})"
+
+
+class DeadRecorder:
+    """on_dead callback that records sockets and peak concurrency."""
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.dead = []
+        self.running = 0
+        self.max_running = 0
+
+    async def __call__(self, websocket):
+        self.running += 1
+        self.max_running = max(self.max_running, self.running)
+        try:
+            await asyncio.sleep(self.delay)
+            self.dead.append(websocket)
+        finally:
+            self.running -= 1
+
+
+class TestScheduling:
+    """Test deadline bookkeeping."""
+
+    def test_only_silent_sockets_are_due(self):
+        """A socket touched since registration is rescheduled, not returned."""
+        heartbeat = HeartbeatScheduler(DeadRecorder(), idle_timeout=30.0)
+        quiet, busy = FakeSocket('quiet'), FakeSocket('busy')
+        heartbeat.register(quiet, now=0.0)
+        heartbeat.register(busy, now=0.0)
+        heartbeat.touch(busy, now=20.0)
+
+        assert heartbeat.due(now=30.0) == [quiet]
+        assert heartbeat.next_deadline() == 50.0
+        assert heartbeat.due(now=49.0) == []
+        assert heartbeat.due(now=50.0) == [busy]
+
+    def test_unregistered_sockets_are_dropped(self):
+        """Closed sockets are never probed."""
+        heartbeat = HeartbeatScheduler(DeadRecorder(), idle_timeout=30.0)
+        socket = FakeSocket('gone')
+        heartbeat.register(socket, now=0.0)
+        heartbeat.unregister(socket)
+
+        assert heartbeat.due(now=100.0) == []
+        assert heartbeat.get_metrics()['scheduled'] == 0
+
+    def test_touch_ignores_unknown_sockets(self):
+        """Frames from unregistered sockets do not start tracking them."""
+        heartbeat = HeartbeatScheduler(DeadRecorder())
+        heartbeat.touch(FakeSocket('stranger'))
+
+        assert heartbeat.get_metrics()['tracked'] == 0
+
+
+class TestSweep:
+    """Test probing and dead-connection handling."""
+
+    @pytest.mark.asyncio
+    async def test_live_sockets_are_rescheduled(self):
+        """A socket answering its ping gets a fresh deadline."""
+        recorder = DeadRecorder()
+        heartbeat = HeartbeatScheduler(recorder, idle_timeout=0.01, pong_timeout=0.5)
+        socket = FakeSocket('alive')
+        heartbeat.register(socket)
+        await asyncio.sleep(0.02)
+
+        assert await heartbeat.sweep() == []
+        assert socket.pings == 1
+        assert recorder.dead == []
+        assert heartbeat.next_deadline() > time.monotonic()
+
+    @pytest.mark.asyncio
+    async def test_probes_run_in_parallel(self):
+        """Many silent sockets cost about one pong timeout, not one each."""
+        recorder = DeadRecorder()
+        heartbeat = HeartbeatScheduler(recorder, idle_timeout=0.0, pong_timeout=0.1, max_parallel=100)
+        sockets = [FakeSocket(f"dead{i}", pong_delay=None) for i in range(50)]
+        for socket in sockets:
+            heartbeat.register(socket)
+
+        started = time.monotonic()
+        dead = await heartbeat.sweep()
+        elapsed = time.monotonic() - started
+
+        assert set(dead) == set(sockets)
+        assert set(recorder.dead) == set(sockets)
+        assert elapsed < 1.0
+        assert heartbeat.get_metrics()['tracked'] == 0
+
+    @pytest.mark.asyncio
+    async def test_dead_handling_is_bounded(self):
+        """At most max_parallel disconnect handlers run at once."""
+        recorder = DeadRecorder(delay=0.01)
+        heartbeat = HeartbeatScheduler(recorder, idle_timeout=0.0, pong_timeout=0.01, max_parallel=4)
+        for i in range(10):
+            heartbeat.register(FakeSocket(f"dead{i}", pong_delay=None))
+
+        await heartbeat.sweep()
+
+        assert len(recorder.dead) == 10
+        assert recorder.max_running == 4
+
+    @pytest.mark.asyncio
+    async def test_handler_errors_do_not_stop_the_batch(self):
+        """A failing on_dead is counted and the rest still run."""
+        handled = []
+
+        async def on_dead(websocket):
+            if websocket.name == 'bad':
+                raise RuntimeError("boom")
+            handled.append(websocket)
+
+        heartbeat = HeartbeatScheduler(on_dead, idle_timeout=0.0, pong_timeout=0.01)
+        bad, good = FakeSocket('bad', pong_delay=None), FakeSocket('good', pong_delay=None)
+        heartbeat.register(bad)
+        heartbeat.register(good)
+
+        await heartbeat.sweep()
+
+        assert handled == [good]
+        assert heartbeat.get_metrics()['handler_errors'] == 1
+
+
+class TestBackgroundTask:
+    """Test the scheduler task and server wiring."""
+
+    @pytest.mark.asyncio
+    async def test_task_finds_dead_socket(self):
+        """The running task probes a socket once it has been idle."""
+        recorder = DeadRecorder()
+        heartbeat = HeartbeatScheduler(recorder, idle_timeout=0.05, pong_timeout=0.05)
+        heartbeat.start()
+        socket = FakeSocket('silent', pong_delay=None)
+        heartbeat.register(socket)
+
+        await asyncio.sleep(0.3)
+        await heartbeat.stop()
+
+        assert recorder.dead == [socket]
+
+    @pytest.mark.asyncio
+    async def test_server_dead_handler_aborts_transport(self):
+        """GameServer cleans up the connection and drops its transport."""
+        class Transport:
+            aborted = False
+
+            def abort(self):
+                self.aborted = True
+
+        server = GameServer()
+        socket = FakeSocket('player')
+        socket.transport = Transport()
+
+        await server.handle_dead_connection(socket)
+
+        assert socket.transport.aborted
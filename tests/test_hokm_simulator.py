@@ -0,0 +1,120 @@
+"""
+Unit tests for the headless Hokm simulator.
+
+Tests cover:
+1. Vectorized bit helpers and bot policies
+2. Batched games cross-checked move by move against GameBoard
+3. Playing whole games through GameBoard and BitGameBoard
+4. Report counters and phase timings
+
+Usage:
+    pytest tests/test_hokm_simulator.py
+    pytest tests/test_hokm_simulator.py -v  # verbose output
+"""
+
+import pytest
+
+# Add backend directory to path for imports
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+np = pytest.importorskip("numpy")
+
+from card_bits import cards_to_mask, SUIT_MASKS
+from game_board_bits import BitGameBoard
+from hokm_simulator import (
+    HokmSimulator, RandomPolicy, LowestCardPolicy, HighestCardPolicy,
+    verify_table, _highest_index, _lowest_index
+)
+
+
+class TestBitHelpers:
+    """Test vectorized mask helpers and policies."""
+
+    def test_highest_and_lowest_index(self):
+        """Indices are exact, including masks just below a power of two."""
+        masks = np.array([1, 0b1010, (1 << 52) - 1, (1 << 51) | 1, SUIT_MASKS[3]], dtype=np.int64)
+
+        assert _highest_index(masks).tolist() == [0, 3, 51, 51, 51]
+        assert _lowest_index(masks).tolist() == [0, 1, 0, 0, 39]
+
+    @pytest.mark.parametrize("policy", [RandomPolicy(), LowestCardPolicy(), HighestCardPolicy()])
+    def test_policies_pick_legal_cards(self, policy):
+        """Batched and scalar choices are always inside the legal mask."""
+        rng = np.random.default_rng(3)
+        legal = rng.integers(1, 1 << 52, size=200, dtype=np.int64)
+
+        chosen = policy.choose_cards(legal, rng)
+
+        assert all(int(m) >> int(c) & 1 for m, c in zip(legal, chosen))
+        assert all(int(m) >> policy.choose_card(int(m), rng) & 1 for m in legal[:20])
+
+    def test_default_hokm_is_longest_suit(self):
+        """The hakem picks the suit they hold most of, batched and scalar alike."""
+        initial = cards_to_mask(['2_hearts', 'A_spades', 'K_spades', '3_clubs', '9_spades'])
+        policy = LowestCardPolicy()
+
+        assert policy.choose_hokm(np.array([initial], dtype=np.int64), None).tolist() == [3]
+        assert policy.choose_hokm_suit(initial, None) == 3
+
+
+class TestBatchedSimulator:
+    """Test batched games against GameBoard."""
+
+    @pytest.mark.parametrize("policy", [RandomPolicy(), LowestCardPolicy(), HighestCardPolicy()])
+    def test_matches_game_board(self, policy):
+        """Recorded tables replay through GameBoard with identical results."""
+        simulator = HokmSimulator(policy, seed=5, batch_size=16)
+
+        report = simulator.run(40, verify=10)
+
+        assert report.verified_tables == 10
+        assert report.mismatches == []
+
+    def test_matches_bit_game_board(self):
+        """The cross-check also holds for the bitmask engine."""
+        report = HokmSimulator(seed=8, batch_size=8).run(8, verify=8, board_class=BitGameBoard)
+
+        assert report.mismatches == []
+
+    def test_verify_detects_divergence(self):
+        """A tampered log is reported instead of silently passing."""
+        log = HokmSimulator(LowestCardPolicy(), seed=1).record(1)[0]
+        assert verify_table(log) == []
+        log['hands'][0]['trick_winners'][0] = (log['hands'][0]['trick_winners'][0] + 1) % 4
+
+        problems = verify_table(log)
+
+        assert problems and 'trick winner' in problems[0]
+
+    def test_report_counters(self):
+        """Every game ends with a team on 7 hands and counters add up."""
+        report = HokmSimulator(seed=2, batch_size=50).run(120)
+
+        assert report.games == 120
+        assert sum(report.team_wins) == 120
+        assert report.moves == 4 * report.tricks
+        assert 7 * 120 <= report.hands <= 13 * 120
+        assert set(report.phase_seconds) == {'deal', 'hokm', 'play', 'resolve', 'score'}
+        assert report.games_per_second > 0
+
+
+class TestBoardEngine:
+    """Test whole games played through the board classes."""
+
+    def test_game_board_games_complete(self):
+        """run_board plays complete games through GameBoard."""
+        report = HokmSimulator(LowestCardPolicy(), seed=4).run_board(3)
+
+        assert report.engine == "GameBoard"
+        assert report.games == 3 and sum(report.team_wins) == 3
+        assert report.moves == 4 * report.tricks
+        assert report.move_cost_us > 0
+
+    def test_bit_game_board_games_complete(self):
+        """run_board works with BitGameBoard too."""
+        report = HokmSimulator(RandomPolicy(), seed=4).run_board(3, board_class=BitGameBoard)
+
+        assert report.engine == "BitGameBoard"
+        assert report.hands >= 3 * 7
@@ -0,0 +1,142 @@
+"""
+Unit tests for GameBoard dirty-field tracking and incremental Redis writes.
+
+Tests cover:
+1. First delta is a full snapshot; later deltas contain only changed fields
+2. A single card play emits one hand, current_trick, current_turn and played_cards
+3. Merging every delta reproduces to_redis_dict (no lost updates)
+4. mark_all_dirty forces a full rewrite
+5. take_state_changes tracking changes for the delta stream separately
+
+Usage:
+    pytest tests/test_incremental_state.py
+    pytest tests/test_incremental_state.py -v  # verbose output
+"""
+
+import pytest
+import random
+
+# Add backend directory to path for imports
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from game_board import GameBoard
+
+TIMESTAMP_FIELDS = {'created_at', 'last_activity', 'last_updated'}
+
+
+def without_timestamps(state):
+    return {k: v for k, v in state.items() if k not in TIMESTAMP_FIELDS}
+
+
+@pytest.fixture
+def game():
+    """Board in the gameplay phase with the initial full snapshot already taken."""
+    random.seed(7)
+    board = GameBoard(["P1", "P2", "P3", "P4"], "ROOM")
+    board.assign_teams_and_hakem()
+    board.initial_deal()
+    board.set_hokm("hearts")
+    board.final_deal()
+    board.to_redis_delta()
+    return board
+
+
+def legal_card(board):
+    """First legal card for the player whose turn it is."""
+    player = board.players[board.current_turn]
+    for card in board.hands[player]:
+        if board.validate_play(player, card)[0]:
+            return player, card
+    raise AssertionError("no legal card")
+
+
+class TestDeltaContents:
+    """Test which fields a delta contains."""
+
+    def test_first_delta_is_full_snapshot(self):
+        """A new board's first delta equals to_redis_dict."""
+        board = GameBoard(["P1", "P2", "P3", "P4"], "ROOM")
+
+        delta = board.to_redis_delta()
+
+        assert 'created_at' in delta
+        assert without_timestamps(delta) == without_timestamps(board.to_redis_dict())
+
+    def test_no_changes_yields_only_timestamps(self, game):
+        """Nothing dirty means only activity timestamps are written."""
+        assert set(game.to_redis_delta()) == {'last_activity', 'last_updated'}
+
+    def test_mid_trick_play_writes_minimal_fields(self, game):
+        """Playing a card that does not end a trick touches only the expected fields."""
+        player, card = legal_card(game)
+        game.play_card(player, card)
+        player, card = legal_card(game)
+        game.to_redis_delta()
+
+        game.play_card(player, card)
+        delta = game.to_redis_delta()
+
+        assert set(delta) - {'last_activity', 'last_updated'} == {
+            f'hand_{player}', 'current_trick', 'current_turn', 'played_cards'
+        }
+
+    def test_phase_change_is_tracked(self, game):
+        """Reassigning game_phase marks the phase field."""
+        game.game_phase = "completed"
+
+        assert game.to_redis_delta()['phase'] == "completed"
+
+
+class TestDeltaConsistency:
+    """Test that deltas add up to the full state."""
+
+    def test_merged_deltas_match_full_state(self, game):
+        """Applying every delta in order reproduces to_redis_dict through a whole hand."""
+        stored = without_timestamps(game.to_redis_dict())
+
+        while game.game_phase == "gameplay" and any(game.hands.values()):
+            player, card = legal_card(game)
+            result = game.play_card(player, card)
+            stored.update(game.to_redis_delta())
+            assert without_timestamps(stored) == without_timestamps(game.to_redis_dict())
+            if result.get('hand_complete'):
+                break
+
+    def test_mark_all_dirty_forces_full_write(self, game):
+        """After mark_all_dirty the next delta is a full snapshot."""
+        game.mark_all_dirty()
+
+        delta = game.to_redis_delta()
+
+        assert 'created_at' in delta
+        assert without_timestamps(delta) == without_timestamps(game.to_redis_dict())
+
+
+class TestStateChanges:
+    """Test take_state_changes, the delta stream's own change tracking."""
+
+    def test_independent_of_persistence(self, game):
+        """Taking a persistence delta does not consume the stream's changes, or vice versa."""
+        assert without_timestamps(game.take_state_changes()) == without_timestamps(game.to_redis_dict())
+        player, card = legal_card(game)
+        game.play_card(player, card)
+        game.to_redis_delta()
+
+        changes = game.take_state_changes()
+
+        assert set(changes) == {f'hand_{player}', 'current_trick', 'current_turn', 'played_cards', 'led_suit'}
+        assert game.take_state_changes() == {}
+
+    def test_merged_changes_match_full_state(self, game):
+        """Applying every change set in order reproduces to_redis_dict through a whole hand."""
+        stored = without_timestamps(game.take_state_changes(full=True))
+
+        while True:
+            player, card = legal_card(game)
+            result = game.play_card(player, card)
+            stored.update(game.take_state_changes())
+            assert stored == without_timestamps(game.to_redis_dict())
+            if result.get('hand_complete'):
+                break
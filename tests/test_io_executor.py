@@ -0,0 +1,147 @@
+"""
+Unit tests for the shared IOExecutor.
+
+Tests cover:
+1. Singleton construction and worker sizing
+2. Running blocking calls and propagating results/errors
+3. Timeout handling and abandoned work
+4. Metrics (queue depth, per-operation stats)
+5. Shutdown
+
+Usage:
+    pytest tests/test_io_executor.py
+    pytest tests/test_io_executor.py -v  # verbose output
+"""
+
+import pytest
+import asyncio
+import threading
+import time
+
+# Add backend directory to path for imports
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from io_executor import IOExecutor
+
+
+@pytest.fixture(autouse=True)
+def fresh_executor():
+    """Give every test its own executor instance."""
+    IOExecutor.reset_instance()
+    yield
+    IOExecutor.reset_instance()
+
+
+class TestIOExecutorConstruction:
+    """Test singleton behaviour and configuration."""
+
+    def test_singleton_keeps_first_configuration(self):
+        """Later constructions return the same instance and pool size."""
+        first = IOExecutor(max_workers=3)
+        second = IOExecutor(max_workers=10)
+
+        assert first is second
+        assert second.max_workers == 3
+
+    def test_worker_count_from_environment(self, monkeypatch):
+        """HOKM_IO_WORKERS sets the pool size when no explicit value is given."""
+        monkeypatch.setenv('HOKM_IO_WORKERS', '5')
+        executor = IOExecutor()
+
+        assert executor.max_workers == 5
+
+
+class TestIOExecutorRun:
+    """Test running blocking calls on the shared pool."""
+
+    @pytest.mark.asyncio
+    async def test_returns_result(self):
+        """run() returns the callable's return value."""
+        executor = IOExecutor(max_workers=2)
+        result = await executor.run(lambda a, b=0: a + b, 2, b=3, timeout=1.0)
+
+        assert result == 5
+
+    @pytest.mark.asyncio
+    async def test_propagates_exceptions(self):
+        """Exceptions raised in the worker reach the caller and count as failures."""
+        executor = IOExecutor(max_workers=2)
+
+        def boom():
+            raise ValueError("redis down")
+
+        with pytest.raises(ValueError):
+            await executor.run(boom, timeout=1.0)
+
+        metrics = executor.get_metrics()
+        assert metrics['failed'] == 1
+        assert metrics['operations']['boom']['errors'] == 1
+
+    @pytest.mark.asyncio
+    async def test_timeout_raises_asyncio_timeout(self):
+        """Slow calls raise asyncio.TimeoutError so existing fallbacks still apply."""
+        executor = IOExecutor(max_workers=1)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await executor.run(time.sleep, 0.3, timeout=0.05, op_name='slow_op')
+
+        metrics = executor.get_metrics()
+        assert metrics['timeouts'] == 1
+        assert metrics['operations']['slow_op']['timeouts'] == 1
+
+    @pytest.mark.asyncio
+    async def test_abandoned_call_is_not_executed(self):
+        """Work that times out while still queued is skipped by the worker."""
+        executor = IOExecutor(max_workers=1)
+        release = threading.Event()
+        executed = []
+
+        blocker = asyncio.ensure_future(executor.run(release.wait, 1.0, timeout=2.0))
+        await asyncio.sleep(0.02)
+
+        with pytest.raises(asyncio.TimeoutError):
+            await executor.run(executed.append, 'stale', timeout=0.05)
+
+        release.set()
+        await blocker
+        await asyncio.sleep(0.02)
+
+        assert executed == []
+        assert executor.get_metrics()['abandoned'] == 1
+
+
+class TestIOExecutorMetrics:
+    """Test executor metrics."""
+
+    @pytest.mark.asyncio
+    async def test_tracks_queue_depth(self):
+        """Calls beyond the worker count are reported as queued."""
+        executor = IOExecutor(max_workers=1)
+
+        await asyncio.gather(*[
+            executor.run(time.sleep, 0.02, timeout=2.0) for _ in range(4)
+        ])
+
+        metrics = executor.get_metrics()
+        assert metrics['submitted'] == 4
+        assert metrics['completed'] == 4
+        assert metrics['queue_depth'] == 0
+        assert metrics['in_flight'] == 0
+        assert metrics['max_queue_depth'] >= 3
+        assert metrics['max_workers'] == 1
+
+
+class TestIOExecutorShutdown:
+    """Test shutdown behaviour."""
+
+    @pytest.mark.asyncio
+    async def test_rejects_work_after_shutdown(self):
+        """run() refuses new work once the executor is closed."""
+        executor = IOExecutor(max_workers=1)
+        executor.shutdown()
+
+        assert executor.closed
+        with pytest.raises(RuntimeError):
+            await executor.run(lambda: None)
@@ -0,0 +1,199 @@
+"""
+Unit tests for lazy hydration of games after a restart.
+
+Tests cover:
+1. Rebuilding a board from the Redis state hash (phase, scores, hands)
+2. Concurrent first messages for a room sharing one Redis load
+3. Event log continuity for hydrated boards
+4. Bounded background warm-up of recently active rooms
+
+Usage:
+    pytest tests/test_lazy_hydration.py
+    pytest tests/test_lazy_hydration.py -v  # verbose output
+"""
+
+import pytest
+import asyncio
+import json
+import random
+import time
+
+# Add backend directory to path for imports
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from card_bits import CARD_INDEX
+from game_board import GameBoard
+from server import GameServer
+
+# GameServer() writes simple_users.json to the working directory
+pytestmark = pytest.mark.usefixtures('tmp_cwd')
+
+PLAYERS = ["P1", "P2", "P3", "P4"]
+
+
+def mid_hand_board(room_code, moves=10, seed=4):
+    """Board in gameplay with a few tricks played."""
+    random.seed(seed)
+    board = GameBoard(PLAYERS, room_code)
+    board.assign_teams_and_hakem()
+    board.initial_deal()
+    board.set_hokm('hearts')
+    board.final_deal()
+    for _ in range(moves):
+        player = board.players[board.current_turn]
+        card = min((c for c in board.hands[player] if board.validate_play(player, c)[0]),
+                   key=CARD_INDEX.__getitem__)
+        board.play_card(player, card)
+    return board
+
+
+class FakeRedisManager:
+    """Async manager stand-in serving stored game state hashes."""
+
+    is_async = True
+
+    def __init__(self, delay=0.01):
+        self.states = {}
+        self.event_seqs = {}
+        self.state_reads = 0
+        self.delay = delay
+
+    def store(self, board, last_activity=None):
+        state = board.to_redis_dict()
+        if last_activity is not None:
+            state['last_activity'] = str(last_activity)
+        self.states[board.room_code] = state
+
+    async def get_game_state(self, room_code):
+        self.state_reads += 1
+        await asyncio.sleep(self.delay)
+        state = dict(self.states.get(room_code, {}))
+        # Like the real managers, some JSON fields come back decoded
+        for key in list(state):
+            if key in ('teams', 'players', 'tricks') or key.startswith('hand_'):
+                state[key] = json.loads(state[key])
+        return state
+
+    async def last_game_event_seq(self, room_code):
+        return self.event_seqs.get(room_code, 0)
+
+    async def get_game_snapshot(self, room_code):
+        return None
+
+    async def read_game_events(self, room_code, after_seq=0):
+        return []   # No event log: boards come from the state hash
+
+    async def get_room_players(self, room_code):
+        return [{'player_id': f"id_{name}", 'username': name, 'player_number': i + 1}
+                for i, name in enumerate(PLAYERS)]
+
+    async def scan_game_rooms(self, cursor=0, count=100):
+        rooms = sorted(self.states)
+        batch = rooms[cursor:cursor + count]
+        next_cursor = cursor + count if cursor + count < len(rooms) else 0
+        return next_cursor, batch
+
+
+@pytest.fixture
+def server():
+    game_server = GameServer()
+    game_server.redis_manager = FakeRedisManager()
+    return game_server
+
+
+class TestFromRedisDict:
+    """Test restoring boards from stored state."""
+
+    def test_round_trip_restores_phase_and_scores(self):
+        """The phase stored under 'phase' and the per-player trick counts survive a round trip."""
+        board = mid_hand_board("ROOM")
+
+        restored = GameBoard.from_redis_dict(board.to_redis_dict(), PLAYERS, "ROOM")
+
+        assert restored.game_phase == "gameplay"
+        assert restored.tricks == board.tricks
+        assert dict(restored.player_tricks) == dict(board.player_tricks)
+        assert restored.hands == board.hands
+        assert restored.room_code == "ROOM"
+
+
+class TestGetGame:
+    """Test on-demand hydration through GameServer.get_game."""
+
+    @pytest.mark.asyncio
+    async def test_concurrent_requests_share_one_load(self, server):
+        """Several first messages for a room trigger a single Redis read."""
+        server.redis_manager.store(mid_hand_board("ROOM"))
+
+        games = await asyncio.gather(*(server.get_game("ROOM") for _ in range(5)))
+
+        assert server.redis_manager.state_reads == 1
+        assert all(game is games[0] for game in games)
+        assert server.active_games["ROOM"] is games[0]
+        assert server.hydration_metrics['hydrated'] == 1
+        assert server.hydration_metrics['shared_loads'] == 4
+        assert not server._hydrations
+
+    @pytest.mark.asyncio
+    async def test_hydrated_game_continues(self, server):
+        """A hydrated board plays on and only writes its own changes."""
+        original = mid_hand_board("ROOM")
+        server.redis_manager.store(original)
+
+        game = await server.get_game("ROOM")
+        player = game.players[game.current_turn]
+        card = min((c for c in game.hands[player] if game.validate_play(player, c)[0]),
+                   key=CARD_INDEX.__getitem__)
+
+        assert game.play_card(player, card)['valid']
+        assert 'created_at' not in game.to_redis_delta()
+        assert len(server.room_rosters["ROOM"]) == 4
+
+    @pytest.mark.asyncio
+    async def test_event_log_continues_and_snapshots(self, server):
+        """The event log picks up after the stored stream and asks for a fresh snapshot."""
+        server.redis_manager.store(mid_hand_board("ROOM"))
+        server.redis_manager.event_seqs["ROOM"] = 17
+
+        game = await server.get_game("ROOM")
+
+        assert game.event_log.seq == 17
+        assert game.event_log.snapshot_due()
+
+    @pytest.mark.asyncio
+    async def test_unknown_and_finished_rooms(self, server):
+        """Rooms without an unfinished game are not hydrated."""
+        finished = mid_hand_board("DONE")
+        finished.game_phase = "completed"
+        server.redis_manager.store(finished)
+
+        assert await server.get_game("NONE") is None
+        assert await server.get_game("DONE") is None
+        assert server.hydration_metrics['not_found'] == 2
+        assert not server.active_games
+
+
+class TestWarmUp:
+    """Test the bounded background warm-up."""
+
+    @pytest.mark.asyncio
+    async def test_warm_up_is_bounded_and_skips_idle_rooms(self, server):
+        """Warm-up loads at most max_rooms recently active rooms, scanning in batches."""
+        now = int(time.time())
+        for n in range(6):
+            server.redis_manager.store(mid_hand_board(f"HOT{n}"), last_activity=now)
+        server.redis_manager.store(mid_hand_board("COLD"), last_activity=now - 3600)
+        server.warmup_max_idle = 600
+
+        warmed = await server.warm_up_games(max_rooms=4, batch_size=3)
+
+        assert warmed == 4
+        assert len(server.active_games) == 4
+        assert "COLD" not in server.active_games
+
+    @pytest.mark.asyncio
+    async def test_warm_up_disabled_by_default(self, server):
+        """Without HOKM_WARMUP_ROOMS nothing is started."""
+        assert server.start_warmup() is None
@@ -0,0 +1,158 @@
+"""
+Unit tests for the queue-based logging pipeline.
+
+Tests cover:
+1. Global and per-module levels from configuration strings
+2. Per-call-site sampling of DEBUG records
+3. Dropping (not blocking) when the queue is full
+4. Text and JSON output written by the listener thread
+5. Hot-path debug traces costing nothing when DEBUG is off
+
+Usage:
+    pytest tests/test_log_pipeline.py
+    pytest tests/test_log_pipeline.py -v  # verbose output
+"""
+
+import pytest
+import io
+import json
+import logging
+import random
+
+# Add backend directory to path for imports
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import log_pipeline
+from game_board import GameBoard
+from log_pipeline import DebugSampler, configure_logging, parse_module_levels, shutdown_logging
+
+
+@pytest.fixture
+def stream():
+    output = io.StringIO()
+    yield output
+    shutdown_logging()
+
+
+def lines(stream):
+    shutdown_logging()   # Flushes the listener thread
+    return [line for line in stream.getvalue().splitlines() if line]
+
+
+class TestConfiguration:
+    """Test levels and module switches."""
+
+    def test_parse_module_levels(self):
+        """Module specs map names to numeric levels."""
+        assert parse_module_levels("game_board=debug, network=WARNING,") == {
+            'game_board': logging.DEBUG, 'network': logging.WARNING
+        }
+        with pytest.raises(ValueError):
+            parse_module_levels("network=LOUD")
+
+    def test_module_override(self, stream):
+        """A module can be more verbose or quieter than the global level."""
+        configure_logging(level='INFO', modules='game_board=DEBUG,network=ERROR', stream=stream)
+
+        logging.getLogger('game_board').debug("trace %s", 1)
+        logging.getLogger('network').warning("hidden")
+        logging.getLogger('server').debug("hidden")
+        logging.getLogger('server').info("shown %s", 2)
+
+        output = lines(stream)
+        assert len(output) == 2
+        assert output[0].endswith("[DEBUG] game_board: trace 1")
+        assert output[1].endswith("[INFO] server: shown 2")
+
+    def test_shutdown_restores_module_levels(self, stream):
+        """Module overrides do not outlive the pipeline."""
+        configure_logging(level='INFO', modules='game_board=DEBUG', stream=stream)
+        shutdown_logging()
+
+        assert logging.getLogger('game_board').level == logging.NOTSET
+        assert log_pipeline.get_metrics() == {'configured': False}
+
+
+class TestSamplingAndBackpressure:
+    """Test sampling and the bounded queue."""
+
+    def test_debug_sampled_per_call_site(self, stream):
+        """Every Nth DEBUG record of a call site is kept; INFO always is."""
+        pipeline = configure_logging(level='DEBUG', debug_every=10, stream=stream)
+        logger = logging.getLogger('game_board')
+
+        for i in range(25):
+            logger.debug("turn %d", i)
+        for i in range(3):
+            logger.info("round %d", i)
+
+        output = lines(stream)
+        assert [line.split(': ', 1)[1] for line in output] == [
+            "turn 0", "turn 10", "turn 20", "round 0", "round 1", "round 2"
+        ]
+        assert pipeline.sampler.sampled_out == 22
+
+    def test_sampler_ignores_other_levels(self):
+        """The sampler only thins DEBUG records."""
+        sampler = DebugSampler(every=100)
+        record = logging.LogRecord('x', logging.WARNING, 'f.py', 1, 'w', (), None)
+
+        assert all(sampler.filter(record) for _ in range(5))
+
+    def test_full_queue_drops_instead_of_blocking(self, stream):
+        """Records beyond capacity are counted as dropped."""
+        pipeline = configure_logging(level='INFO', queue_size=5, stream=stream)
+        pipeline.listener.stop()   # Nothing drains the queue
+
+        for i in range(20):
+            logging.getLogger('server').info("m%d", i)
+        metrics = log_pipeline.get_metrics()
+
+        assert metrics['enqueued'] == 5
+        assert metrics['dropped'] == 15
+        assert metrics['configured']
+
+
+class TestOutput:
+    """Test the formatters."""
+
+    def test_json_lines_include_extra_fields(self, stream):
+        """JSON output carries level, logger, message and extra= fields."""
+        configure_logging(level='INFO', fmt='json', stream=stream)
+
+        logging.getLogger('server').info("card %s played", "A_hearts", extra={'room_code': 'ROOM'})
+        try:
+            raise RuntimeError("boom")
+        except RuntimeError:
+            logging.getLogger('server').exception("failed")
+
+        first, second = [json.loads(line) for line in lines(stream)]
+        assert first['level'] == 'INFO' and first['logger'] == 'server'
+        assert first['msg'] == "card A_hearts played"
+        assert first['room_code'] == 'ROOM'
+        assert "RuntimeError: boom" in second['exc']
+
+
+class TestHotPaths:
+    """Test that converted call sites stay quiet at INFO."""
+
+    def test_card_play_traces_not_emitted_at_info(self, stream):
+        """GameBoard turn traces are DEBUG and never reach the queue at INFO."""
+        pipeline = configure_logging(level='INFO', stream=stream)
+        random.seed(1)
+        board = GameBoard(["P1", "P2", "P3", "P4"], "ROOM")
+        board.assign_teams_and_hakem()
+        board.initial_deal()
+        board.set_hokm('hearts')
+        board.final_deal()
+        before = pipeline.handler.enqueued
+
+        for _ in range(4):
+            player = board.players[board.current_turn]
+            card = next(c for c in board.hands[player] if board.validate_play(player, c)[0])
+            board.play_card(player, card)
+
+        assert pipeline.handler.enqueued == before
+        assert not any('Turn transition' in line for line in lines(stream))
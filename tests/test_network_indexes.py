@@ -0,0 +1,123 @@
+"""
+Unit tests for the NetworkManager connection indexes.
+
+Tests cover:
+1. Room and player indexes maintained by register/remove_connection
+2. Re-registration and reconnection edge cases
+3. Room-scoped lookups used by broadcasts and fallbacks
+
+Usage:
+    pytest tests/test_network_indexes.py
+    pytest tests/test_network_indexes.py -v  # verbose output
+"""
+
+import pytest
+
+# Add backend directory to path for imports
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from network import NetworkManager
+
+
+class FakeSocket:
+    """Hashable stand-in for a websocket (only identity is used by the indexes)."""
+
+    def __init__(self, name):
+        self.name = name
+
+    def __repr__(self):
+        return f"FakeSocket({self.name})"
+
+
+@pytest.fixture
+def network():
+    """NetworkManager singleton with empty connection tables."""
+    manager = NetworkManager()
+    manager.live_connections.clear()
+    manager.connection_metadata.clear()
+    manager.room_connections.clear()
+    yield manager
+    manager.live_connections.clear()
+    manager.connection_metadata.clear()
+    manager.room_connections.clear()
+
+
+class TestRoomIndex:
+    """Test room_code -> sockets index."""
+
+    def test_register_adds_to_room_in_join_order(self, network):
+        """Connections are listed per room in the order they joined."""
+        sockets = [FakeSocket(i) for i in range(4)]
+        for i, ws in enumerate(sockets):
+            network.register_connection(ws, f"p{i}", "ROOM", f"user{i}")
+        network.register_connection(FakeSocket('other'), "px", "OTHER", "userx")
+
+        room = network.get_room_connections("ROOM")
+
+        assert [ws for ws, _ in room] == sockets
+        assert [meta['username'] for _, meta in room] == ['user0', 'user1', 'user2', 'user3']
+        assert network.count_room_connections("ROOM") == 4
+        assert network.count_room_connections("OTHER") == 1
+
+    def test_remove_updates_index_and_drops_empty_rooms(self, network):
+        """Removing the last socket of a room removes the room entry."""
+        ws = FakeSocket('a')
+        network.register_connection(ws, "p1", "ROOM", "alice")
+        network.remove_connection(ws)
+
+        assert network.get_room_connections("ROOM") == []
+        assert network.count_room_connections("ROOM") == 0
+        assert "ROOM" not in network.room_connections
+        assert network.get_live_connection("p1") is None
+
+    def test_unknown_room_is_empty(self, network):
+        """Lookups for rooms without connections return empty results."""
+        assert network.get_room_connections("NOPE") == []
+        assert network.count_room_connections("NOPE") == 0
+
+    def test_snapshot_is_safe_to_mutate_during_iteration(self, network):
+        """Removing connections while iterating a room snapshot does not raise."""
+        for i in range(3):
+            network.register_connection(FakeSocket(i), f"p{i}", "ROOM", f"user{i}")
+
+        for ws, _ in network.get_room_connections("ROOM"):
+            network.remove_connection(ws)
+
+        assert network.count_room_connections("ROOM") == 0
+
+
+class TestPlayerIndex:
+    """Test player_id -> socket index and reconnection behaviour."""
+
+    def test_reregistering_socket_moves_rooms(self, network):
+        """Registering the same socket again replaces its previous index entries."""
+        ws = FakeSocket('a')
+        network.register_connection(ws, "p1", "ROOM1", "alice")
+        network.register_connection(ws, "p1", "ROOM2", "alice")
+
+        assert network.count_room_connections("ROOM1") == 0
+        assert network.count_room_connections("ROOM2") == 1
+        assert network.is_player_connected("p1", "ROOM2")
+        assert not network.is_player_connected("p1", "ROOM1")
+
+    def test_removing_stale_socket_keeps_reconnected_player(self, network):
+        """Closing an old socket must not unmap a player who already reconnected."""
+        old_ws, new_ws = FakeSocket('old'), FakeSocket('new')
+        network.register_connection(old_ws, "p1", "ROOM", "alice")
+        network.register_connection(new_ws, "p1", "ROOM", "alice")
+
+        network.remove_connection(old_ws)
+
+        assert network.get_live_connection("p1") is new_ws
+        assert [ws for ws, _ in network.get_room_connections("ROOM")] == [new_ws]
+
+    def test_is_player_connected(self, network):
+        """is_player_connected checks presence and, optionally, the room."""
+        network.register_connection(FakeSocket('a'), "p1", "ROOM", "alice")
+
+        assert network.is_player_connected("p1")
+        assert network.is_player_connected("p1", "ROOM")
+        assert not network.is_player_connected("p1", "OTHER")
+        assert not network.is_player_connected("p2")
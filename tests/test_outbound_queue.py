@@ -0,0 +1,265 @@
+"""
+Unit tests for per-connection outbound queues.
+
+Tests cover:
+1. In-order delivery by the writer task without blocking senders
+2. Conflation of game_state frames
+3. Dropping when full and slow-consumer eviction (at once for frames that cannot be conflated)
+4. NetworkManager wiring (send_message, broadcasts, metrics)
+
+Usage:
+    pytest tests/test_outbound_queue.py
+    pytest tests/test_outbound_queue.py -v  # verbose output
+"""
+
+import pytest
+import asyncio
+import json
+import time
+
+# Add backend directory to path for imports
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import websockets
+
+from network import NetworkManager
+from outbound_queue import OutboundQueue, OutboundQueues
+
+
+class GatedSocket:
+    """Websocket stand-in whose sends wait until the gate is opened."""
+
+    def __init__(self, name='ws', open_gate=True):
+        self.name = name
+        self.gate = asyncio.Event()
+        if open_gate:
+            self.gate.set()
+        self.sent = []
+        self.closed = False
+
+    async def send(self, message):
+        if self.closed:
+            raise websockets.ConnectionClosed(None, None)
+        await self.gate.wait()
+        self.sent.append(message)
+
+
+class MeteredSocket:
+    """Websocket stand-in that sends one frame per released credit."""
+
+    def __init__(self):
+        self.credits = asyncio.Semaphore(0)
+        self.sent = []
+
+    async def send(self, message):
+        await self.credits.acquire()
+        self.sent.append(message)
+
+
+class TestOutboundQueue:
+    """Test a single connection's queue."""
+
+    @pytest.mark.asyncio
+    async def test_frames_are_written_in_order(self):
+        """The writer task sends queued frames in offer order."""
+        ws = GatedSocket()
+        queue = OutboundQueue(ws)
+
+        for i in range(5):
+            assert queue.offer('info', f"m{i}") == 'queued'
+        await queue.drain()
+
+        assert ws.sent == [f"m{i}" for i in range(5)]
+        assert queue.sent == 5
+
+    @pytest.mark.asyncio
+    async def test_offer_does_not_wait_for_a_stalled_socket(self):
+        """A socket that never drains does not block the sender."""
+        ws = GatedSocket(open_gate=False)
+        queue = OutboundQueue(ws, capacity=4)
+
+        start = time.perf_counter()
+        results = [queue.offer('info' if i < 4 else 'game_state', f"m{i}") for i in range(10)]
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.05
+        assert results.count('dropped') == 10 - 4
+        assert queue.dropped == 6 and not queue.closed
+        queue.close()
+
+    @pytest.mark.asyncio
+    async def test_game_state_is_conflated(self):
+        """Waiting game_state frames are replaced by the newest one."""
+        ws = GatedSocket(open_gate=False)
+        queue = OutboundQueue(ws)
+
+        queue.offer('info', 'first')
+        await asyncio.sleep(0)   # Writer takes 'first' and blocks on the gate
+        queue.offer('game_state', 'state1')
+        queue.offer('turn_start', 'turn')
+        assert queue.offer('game_state', 'state2') == 'conflated'
+        ws.gate.set()
+        await queue.drain()
+
+        assert ws.sent == ['first', 'state2', 'turn']
+        assert queue.conflated == 1
+
+    @pytest.mark.asyncio
+    async def test_full_queue_past_deadline_is_evicted(self):
+        """A queue that stays full past slow_after is closed and reported."""
+        evicted = []
+        ws = GatedSocket(open_gate=False)
+        queue = OutboundQueue(ws, capacity=2, slow_after=0.05, on_slow=evicted.append)
+
+        for i in range(2):
+            queue.offer('info', f"m{i}")
+        assert queue.offer('game_state', 'state') == 'dropped'
+        await asyncio.sleep(0.15)
+
+        assert evicted == [queue]
+        assert queue.slow and queue.closed
+        assert queue.offer('info', 'late') == 'closed'
+
+    @pytest.mark.asyncio
+    async def test_queue_that_drains_in_time_is_kept(self):
+        """Catching up before the deadline avoids eviction."""
+        evicted = []
+        ws = GatedSocket(open_gate=False)
+        queue = OutboundQueue(ws, capacity=2, slow_after=0.5, on_slow=evicted.append)
+
+        for i in range(2):
+            queue.offer('info', f"m{i}")
+        assert queue.offer('game_state', 'state') == 'dropped'
+        await asyncio.sleep(0.02)
+        ws.gate.set()
+        await asyncio.sleep(0.6)
+
+        assert evicted == []
+        assert not queue.closed
+        queue.close()
+
+    @pytest.mark.asyncio
+    async def test_dropping_a_frame_that_cannot_be_conflated_evicts(self):
+        """A client that missed a card_played cannot follow the game, so it is dropped at once."""
+        evicted = []
+        queue = OutboundQueue(GatedSocket(open_gate=False), capacity=2, on_slow=evicted.append)
+
+        for i in range(2):
+            queue.offer('card_played', f"c{i}")
+
+        assert queue.offer('card_played', 'c2') == 'dropped'
+        assert evicted == [queue]
+        assert queue.slow and queue.closed
+
+    @pytest.mark.asyncio
+    async def test_trickling_client_is_still_evicted(self):
+        """Taking a frame now and then does not stop the slow timer until the queue drains to low water."""
+        evicted = []
+        ws = MeteredSocket()
+        queue = OutboundQueue(ws, capacity=4, slow_after=0.1, on_slow=evicted.append)
+        for i in range(4):
+            queue.offer('info', f"m{i}")
+        await asyncio.sleep(0)   # Writer takes m0 and waits for a credit
+
+        assert queue.offer('game_state', 'state1') == 'dropped'
+        ws.credits.release()
+        await asyncio.sleep(0.01)
+        assert ws.sent == ['m0'] and queue.full_since is not None
+        assert queue.offer('game_state', 'state2') == 'queued'
+        await asyncio.sleep(0.15)
+
+        assert evicted == [queue]
+        assert queue.slow
+
+    @pytest.mark.asyncio
+    async def test_closed_socket_closes_queue(self):
+        """A send failing with ConnectionClosed stops the writer."""
+        ws = GatedSocket()
+        ws.closed = True
+        queue = OutboundQueue(ws)
+
+        queue.offer('info', 'm')
+        await asyncio.sleep(0.01)
+
+        assert queue.closed
+        assert queue.offer('info', 'again') == 'closed'
+
+
+class TestOutboundQueues:
+    """Test the registry."""
+
+    @pytest.mark.asyncio
+    async def test_unregistered_socket_has_no_queue(self):
+        """offer() returns None so callers fall back to a direct send."""
+        queues = OutboundQueues()
+
+        assert queues.offer(GatedSocket(), 'info', 'm') is None
+
+    @pytest.mark.asyncio
+    async def test_eviction_calls_on_slow_and_forgets_queue(self):
+        """Evicted connections are removed and counted."""
+        evicted = []
+        queues = OutboundQueues(capacity=1, slow_after=0.05, on_slow=evicted.append)
+        ws = GatedSocket(open_gate=False)
+        queues.open(ws)
+
+        for i in range(3):
+            queues.offer(ws, 'info', f"m{i}")
+        await asyncio.sleep(0.15)
+        metrics = queues.get_metrics()
+
+        assert evicted == [ws]
+        assert queues.get(ws) is None
+        assert metrics['evicted'] == 1
+        assert metrics['dropped'] >= 1
+
+
+class TestNetworkManagerOutbound:
+    """Test NetworkManager sending through the queues."""
+
+    @pytest.fixture
+    def network(self):
+        manager = NetworkManager()
+        yield manager
+        for ws in list(manager.connection_metadata):
+            manager.remove_connection(ws)
+
+    @pytest.mark.asyncio
+    async def test_slow_player_does_not_delay_broadcast(self, network):
+        """A stalled socket leaves the broadcast and the other players unaffected."""
+        fast = [GatedSocket(f"fast{i}") for i in range(3)]
+        slow = GatedSocket('slow', open_gate=False)
+        players = []
+        for i, ws in enumerate(fast + [slow]):
+            network.register_connection(ws, f"p{i}", "ROOM", f"user{i}")
+            players.append({'player_id': f"p{i}", 'username': f"user{i}", 'player_number': i + 1})
+
+        class NoRedis:
+            redis = None
+
+        start = time.perf_counter()
+        await network.broadcast_to_room("ROOM", 'card_played', {'card': 'A_hearts'}, NoRedis(), players=players)
+        elapsed = time.perf_counter() - start
+        for ws in fast:
+            await network.outbound.get(ws).drain()
+
+        assert elapsed < 0.5
+        assert all(json.loads(ws.sent[0])['card'] == 'A_hearts' for ws in fast)
+        assert slow.sent == []
+
+    @pytest.mark.asyncio
+    async def test_send_message_uses_queue_for_registered_socket(self, network):
+        """send_message enqueues for registered sockets and sends directly otherwise."""
+        registered, stranger = GatedSocket('reg', open_gate=False), GatedSocket('stranger')
+        network.register_connection(registered, "p0", "ROOM", "user0")
+
+        assert await asyncio.wait_for(network.send_message(registered, 'info', {'message': 'hi'}), 0.5)
+        assert await network.send_message(stranger, 'info', {'message': 'hello'})
+        registered.gate.set()
+        await network.outbound.get(registered).drain()
+
+        assert json.loads(registered.sent[0])['message'] == 'hi'
+        assert json.loads(stranger.sent[0])['message'] == 'hello'
+        assert network.outbound.get(stranger) is None
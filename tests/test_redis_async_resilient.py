@@ -0,0 +1,183 @@
+"""
+Unit tests for the async Redis path.
+
+Tests cover:
+1. CircuitBreaker.call_async success, retry and fallback behaviour
+2. AsyncResilientRedisManager fallback cache when Redis is unreachable
+3. NetworkManager.redis_call dispatch between async and sync managers
+
+These tests do not need a running Redis server: the manager is pointed at a
+closed port so every operation exercises the circuit breaker fallbacks.
+
+Usage:
+    pytest tests/test_redis_async_resilient.py
+    pytest tests/test_redis_async_resilient.py -v  # verbose output
+"""
+
+import pytest
+
+# Add backend directory to path for imports
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from circuit_breaker import CircuitBreaker, CircuitBreakerConfig, CircuitState
+from redis_manager_async_resilient import AsyncResilientRedisManager
+from network import NetworkManager
+
+
+def fast_config(**overrides):
+    """Circuit config without backoff delays so tests stay fast."""
+    values = dict(failure_threshold=2, success_threshold=1, timeout=60.0,
+                  time_window=60.0, max_retry_attempts=2,
+                  base_backoff_delay=0.0, max_backoff_delay=0.0)
+    values.update(overrides)
+    return CircuitBreakerConfig(**values)
+
+
+@pytest.fixture
+def offline_manager():
+    """AsyncResilientRedisManager pointed at a port nothing listens on."""
+    manager = AsyncResilientRedisManager(host='127.0.0.1', port=1)
+    manager.circuit_config.base_backoff_delay = 0.0
+    manager.circuit_config.max_backoff_delay = 0.0
+    return manager
+
+
+class TestCircuitBreakerAsync:
+    """Test CircuitBreaker.call_async."""
+
+    @pytest.mark.asyncio
+    async def test_success_returns_value(self):
+        """A successful coroutine result is returned and recorded."""
+        breaker = CircuitBreaker('test_async', fast_config())
+
+        async def op(x):
+            return x * 2
+
+        result = await breaker.call_async(op, 21)
+
+        assert result.success
+        assert result.value == 42
+        assert breaker.get_metrics()['total_successes'] == 1
+
+    @pytest.mark.asyncio
+    async def test_retries_before_succeeding(self):
+        """Transient failures are retried up to max_retry_attempts."""
+        breaker = CircuitBreaker('test_async', fast_config())
+        attempts = []
+
+        async def flaky():
+            attempts.append(1)
+            if len(attempts) == 1:
+                raise ConnectionError("transient")
+            return 'ok'
+
+        result = await breaker.call_async(flaky)
+
+        assert result.success
+        assert result.value == 'ok'
+        assert len(attempts) == 2
+
+    @pytest.mark.asyncio
+    async def test_failure_uses_fallback_and_opens_circuit(self):
+        """Repeated failures use the fallback and eventually open the circuit."""
+        breaker = CircuitBreaker('test_async', fast_config())
+
+        async def broken():
+            raise ConnectionError("down")
+
+        for _ in range(2):
+            result = await breaker.call_async(broken, fallback_func=lambda: 'fallback')
+            assert result.success
+            assert result.value == 'fallback'
+
+        assert breaker.get_state() == CircuitState.OPEN
+
+        # Open circuit skips the operation entirely
+        called = []
+
+        async def should_not_run():
+            called.append(1)
+
+        result = await breaker.call_async(should_not_run, fallback_func=lambda: 'fallback')
+        assert result.value == 'fallback'
+        assert called == []
+
+
+class TestAsyncResilientRedisManagerFallback:
+    """Test fallback semantics of the async manager without Redis."""
+
+    @pytest.mark.asyncio
+    async def test_room_lifecycle_uses_fallback_cache(self, offline_manager):
+        """Room creation and player membership survive a Redis outage."""
+        room_code = 'ROOM1'
+        player = {'player_id': 'p1', 'username': 'alice', 'connection_status': 'active'}
+
+        assert await offline_manager.create_room(room_code)
+        assert await offline_manager.room_exists(room_code)
+        assert await offline_manager.add_player_to_room(room_code, player)
+        # Duplicate usernames are skipped like the sync manager
+        assert await offline_manager.add_player_to_room(room_code, dict(player))
+
+        players = await offline_manager.get_room_players(room_code)
+        assert [p['username'] for p in players] == ['alice']
+
+        assert await offline_manager.update_player_in_room(room_code, 'p1', {'connection_status': 'disconnected'})
+        players = await offline_manager.get_room_players(room_code)
+        assert players[0]['connection_status'] == 'disconnected'
+
+    @pytest.mark.asyncio
+    async def test_game_state_round_trip_through_fallback(self, offline_manager):
+        """Saved game state is served from the fallback cache."""
+        state = {'phase': 'gameplay', 'hokm': 'hearts'}
+
+        assert await offline_manager.save_game_state('ROOM2', state)
+        loaded = await offline_manager.get_game_state('ROOM2')
+
+        assert loaded['hokm'] == 'hearts'
+        assert loaded['phase'] == 'gameplay'
+
+    @pytest.mark.asyncio
+    async def test_delete_room_clears_fallback(self, offline_manager):
+        """delete_room always clears the fallback cache."""
+        await offline_manager.create_room('ROOM3')
+        await offline_manager.delete_room('ROOM3')
+
+        assert await offline_manager.get_room_players('ROOM3') == []
+        assert 'ROOM3' not in offline_manager.fallback_cache['game_states']
+
+    def test_health_and_metrics_are_synchronous(self, offline_manager):
+        """Monitor-facing methods work from a plain thread."""
+        assert offline_manager.is_healthy() is False
+        status = offline_manager.get_circuit_breaker_status()
+        assert set(status.keys()) == {'read', 'write', 'delete', 'scan'}
+        assert 'circuit_breakers' in offline_manager.get_performance_metrics()
+
+
+class TestRedisCallDispatch:
+    """Test NetworkManager.redis_call."""
+
+    @pytest.mark.asyncio
+    async def test_async_manager_is_awaited_directly(self, offline_manager):
+        """Coroutines from async managers are awaited on the loop."""
+        network = NetworkManager()
+        await offline_manager.create_room('ROOM4')
+
+        exists = await network.redis_call(offline_manager, offline_manager.room_exists, 'ROOM4')
+
+        assert exists is True
+
+    @pytest.mark.asyncio
+    async def test_sync_manager_runs_on_executor(self):
+        """Plain callables run on the shared IOExecutor."""
+        network = NetworkManager()
+
+        class SyncManager:
+            def get_room_players(self, room_code):
+                return [room_code]
+
+        manager = SyncManager()
+        players = await network.redis_call(manager, manager.get_room_players, 'ROOM5')
+
+        assert players == ['ROOM5']
@@ -0,0 +1,249 @@
+"""
+Unit tests for the resume-token reconnect fast path.
+
+Tests cover:
+1. Issuing and verifying tokens; tampered, foreign, expired and malformed ones
+2. The board's cached per-player view and when it is rebuilt
+3. GameServer reconnects with a token answered without Redis reads
+4. Falling back to the Redis-validated path when the token cannot be used
+5. Delta sync: resuming the state stream from the token's sequence
+
+Usage:
+    pytest tests/test_resume_tokens.py
+    pytest tests/test_resume_tokens.py -v  # verbose output
+"""
+
+import pytest
+import asyncio
+
+# Add backend directory to path for imports
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from game_board import GameBoard
+from game_board_compact import CompactGameBoard
+from network import NetworkManager
+from resume_tokens import ResumeTokenSigner
+from room_roster import RoomRoster
+from server import GameServer
+from board_helpers import PLAYERS, deal_to_gameplay, lowest_legal
+from socket_helpers import RecordingSocket
+
+# GameServer() writes simple_users.json to the working directory
+pytestmark = pytest.mark.usefixtures('tmp_cwd')
+
+
+def dealt_board(board_class=GameBoard):
+    return deal_to_gameplay(board_class, seed=3, hokm='hearts')
+
+
+def play_one(board):
+    board.play_card(*lowest_legal(board))
+
+
+class CountingRedis:
+    """Async Redis manager stand-in that records which methods were called."""
+
+    is_async = True
+
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        async def call(*args):
+            self.calls.append(name)
+            return (False, {'error': 'No session found for player'}) if name == 'attempt_reconnect' else []
+        return call
+
+
+class TestTokens:
+    """Test signing and verification."""
+
+    def test_round_trip(self):
+        """A token carries the player, room and stream position it was issued with."""
+        signer = ResumeTokenSigner(b'secret')
+
+        claims = signer.verify(signer.issue("id-P1", "P1", "4821", 17, "a1b2c3d4"))
+
+        assert claims[:5] == ("id-P1", "P1", "4821", 17, "a1b2c3d4")
+        assert signer.stats['issued'] == 1 and signer.stats['verified'] == 1
+
+    def test_shared_key_survives_restart(self):
+        """Processes with the same secret accept each other's tokens."""
+        token = ResumeTokenSigner(b'secret').issue("id-P1", "P1", "4821")
+
+        assert ResumeTokenSigner(b'secret').verify(token) is not None
+        assert ResumeTokenSigner(b'other').verify(token) is None
+
+    def test_tampered_and_malformed(self):
+        """Changing the payload, the MAC or the shape of the token is rejected."""
+        signer = ResumeTokenSigner(b'secret')
+        body, mac = signer.issue("id-P1", "P1", "4821").split('.')
+        forged = ResumeTokenSigner(b'other').issue("id-P2", "P2", "4821").split('.')[0]
+
+        for token in (forged + '.' + mac, body + '.' + mac[::-1], body, '', '.', '!!.!!', None, 42, 'a.' * 600):
+            assert signer.verify(token) is None
+        assert signer.stats['rejected'] == 9
+
+    def test_expiry(self):
+        """Tokens stop working after the TTL."""
+        signer = ResumeTokenSigner(b'secret', ttl=60)
+        token = signer.issue("id-P1", "P1", "4821", now=1000)
+
+        assert signer.verify(token, now=1059) is not None
+        assert signer.verify(token, now=1061) is None
+        assert signer.stats['expired'] == 1
+
+
+class TestPlayerView:
+    """Test BaseGameBoard.player_view caching."""
+
+    @pytest.mark.parametrize("board_class", [GameBoard, CompactGameBoard])
+    def test_view_is_cached_until_state_changes(self, board_class):
+        """Repeated lookups return the same view; a card play rebuilds it."""
+        board = dealt_board(board_class)
+        view = board.player_view("P2")
+
+        assert board.player_view("P2") is view
+        assert view['hand'] == list(board.hands["P2"]) and view['you'] == "P2"
+        assert view['your_team'] == str(board.teams["P2"] + 1)
+        assert 'hands' not in view
+
+        play_one(board)
+        fresh = board.player_view("P2")
+        assert fresh is not view
+        assert fresh['current_trick'] == list(board.current_trick)
+        assert fresh['current_turn'] == board.current_turn
+
+    def test_hand_change_drops_only_that_view(self):
+        """A change to one hand keeps the other players' cached views."""
+        board = dealt_board()
+        views = {name: board.player_view(name) for name in PLAYERS}
+
+        board._mark_dirty('hands', "P3")
+
+        assert board.player_view("P3") is not views["P3"]
+        assert all(board.player_view(name) is views[name] for name in PLAYERS if name != "P3")
+
+
+@pytest.fixture
+def make_server(monkeypatch):
+    """Builds a GameServer holding one dealt room in memory, with a recording Redis stand-in"""
+    monkeypatch.setenv('HOKM_OUTBOUND_QUEUE', '0')
+    monkeypatch.setenv('HOKM_RESUME_SECRET', 'test-secret')
+    previous = NetworkManager._instance
+
+    def make(state_sync='events'):
+        monkeypatch.setenv('HOKM_STATE_SYNC', state_sync)
+        NetworkManager._instance = None
+        server = GameServer()
+        server.auth_manager.is_authenticated = lambda websocket: True
+        server.redis_manager = CountingRedis()
+        server.active_games["ROOM"] = dealt_board()
+        server.room_rosters["ROOM"] = RoomRoster.from_room_players(
+            "ROOM", [{'player_id': f"id-{name}", 'username': name} for name in PLAYERS]
+        )
+        return server
+
+    yield make
+    NetworkManager._instance = previous
+
+
+@pytest.fixture
+def server(make_server):
+    return make_server()
+
+
+def token_for(server, name, sequence=0, epoch=None):
+    return server.network_manager.resume_tokens.issue(f"id-{name}", name, "ROOM", sequence, epoch)
+
+
+class TestServerFastPath:
+    """Test reconnects presenting a resume token."""
+
+    @pytest.mark.asyncio
+    async def test_reconnect_storm_reads_nothing_from_redis(self, server):
+        """Every player of the room reconnects from memory; Redis only sees background writes."""
+        board = server.active_games["ROOM"]
+        sockets = {name: RecordingSocket() for name in PLAYERS}
+
+        for name, ws in sockets.items():
+            await server.handle_message(ws, {'type': 'reconnect', 'player_id': f"id-{name}",
+                                             'resume_token': token_for(server, name)})
+        await asyncio.sleep(0)   # Let the background session updates run
+
+        for name, ws in sockets.items():
+            reply = ws.of_type('reconnect_success')[0]
+            assert reply['game_state']['hand'] == board.hands[name]
+            assert server.network_manager.resume_tokens.verify(reply['resume_token']).player_id == f"id-{name}"
+            assert server.network_manager.get_live_connection(f"id-{name}") is ws
+            assert server.room_rosters["ROOM"].get_player_by_socket(ws) == (name, f"id-{name}")
+        assert set(server.redis_manager.calls) == {'attempt_reconnect', 'append_room_event'}
+        assert server.network_manager.reconnect_stats == {'fast': 4, 'slow': 0}
+
+    @pytest.mark.asyncio
+    async def test_gameplay_prompt(self, server):
+        """The player whose turn it is gets turn_start with their hand."""
+        board = server.active_games["ROOM"]
+        current = board.players[board.current_turn]
+        ws = RecordingSocket()
+
+        await server.handle_message(ws, {'type': 'reconnect', 'resume_token': token_for(server, current)})
+
+        turn = ws.of_type('turn_start')[0]
+        assert turn['your_turn'] and turn['hand'] == board.hands[current]
+
+    @pytest.mark.asyncio
+    async def test_already_connected(self, server):
+        """A seat with a live, active socket is not taken over."""
+        first, second = RecordingSocket(), RecordingSocket()
+        await server.handle_message(first, {'type': 'reconnect', 'resume_token': token_for(server, "P1")})
+
+        await server.handle_message(second, {'type': 'reconnect', 'resume_token': token_for(server, "P1")})
+
+        assert not second.of_type('reconnect_success') and second.of_type('error')
+        assert server.network_manager.get_live_connection("id-P1") is first
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("case", ["forged", "other_player", "unknown_seat"])
+    async def test_falls_back_to_redis_path(self, server, case):
+        """Tokens that cannot be used go through attempt_reconnect instead."""
+        ws = RecordingSocket()
+        message = {'type': 'reconnect', 'player_id': "id-P1", 'room_code': "ROOM", 'resume_token': token_for(server, "P1")}
+        if case == "forged":
+            message['resume_token'] = ResumeTokenSigner(b'other').issue("id-P1", "P1", "ROOM")
+        elif case == "other_player":
+            message['player_id'] = "id-P2"
+        else:
+            server.room_rosters["ROOM"].remove_player("id-P1")
+
+        await server.handle_message(ws, message)
+
+        assert server.redis_manager.calls[0] == 'attempt_reconnect'
+        assert ws.of_type('error') and not ws.of_type('reconnect_success')
+        assert server.network_manager.reconnect_stats['fast'] == 0
+
+
+class TestDeltaResume:
+    """Test the fast path with HOKM_STATE_SYNC=delta."""
+
+    @pytest.mark.asyncio
+    async def test_resumes_stream_from_token(self, make_server):
+        """Without last_seq the stream resumes from the token's sequence, not a keyframe."""
+        server = make_server('delta')
+        board = server.active_games["ROOM"]
+        await server.sync_room_state("ROOM", board)
+        await server.network_manager.flush_updates("ROOM")
+        manager = server.network_manager.room_delta_managers["ROOM"]
+        token = token_for(server, "P1", manager.sequence_counter, manager.epoch)
+        play_one(board)
+        await server.sync_room_state("ROOM", board)
+        await server.network_manager.flush_updates("ROOM")
+
+        ws = RecordingSocket()
+        await server.handle_message(ws, {'type': 'reconnect', 'resume_token': token})
+
+        assert 'game_state' not in ws.of_type('reconnect_success')[0]
+        resume = ws.of_type('state_sync')[0]
+        assert resume['resume'] and not resume['keyframe'] and resume['base'] == 1 and resume['seq'] == 2
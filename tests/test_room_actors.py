@@ -0,0 +1,183 @@
+"""
+Unit tests for per-room actors.
+
+Tests cover:
+1. Serial, in-order processing of one room's commands
+2. Independent rooms running concurrently
+3. Bounded mailboxes, re-entrant calls and idle shutdown
+4. GameServer routing room messages (including reconnects) through the actors
+
+Usage:
+    pytest tests/test_room_actors.py
+    pytest tests/test_room_actors.py -v  # verbose output
+"""
+
+import pytest
+import asyncio
+
+# Add backend directory to path for imports
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from room_actors import MailboxFull, RoomActorRegistry
+from server import GameServer
+
+# GameServer() writes simple_users.json to the working directory
+pytestmark = pytest.mark.usefixtures('tmp_cwd')
+
+
+class Recorder:
+    """Handler that logs start/end around an await, to expose interleaving."""
+
+    def __init__(self, delay=0.01):
+        self.log = []
+        self.delay = delay
+
+    async def __call__(self, name):
+        self.log.append(('start', name))
+        await asyncio.sleep(self.delay)
+        self.log.append(('end', name))
+        return name
+
+
+class TestRoomActor:
+    """Test the actor and registry."""
+
+    @pytest.mark.asyncio
+    async def test_commands_for_one_room_never_interleave(self):
+        """Concurrent submissions run one at a time, in arrival order."""
+        registry = RoomActorRegistry()
+        handler = Recorder()
+
+        results = await asyncio.gather(*(registry.run("ROOM", handler, n) for n in range(5)))
+
+        assert results == list(range(5))
+        assert handler.log == [(event, n) for n in range(5) for event in ('start', 'end')]
+        await registry.stop_all()
+
+    @pytest.mark.asyncio
+    async def test_rooms_run_concurrently(self):
+        """Different rooms do not wait for each other."""
+        registry = RoomActorRegistry()
+        handler = Recorder(delay=0.05)
+
+        await asyncio.gather(registry.run("A", handler, "a"), registry.run("B", handler, "b"))
+
+        assert [event for event, _ in handler.log] == ['start', 'start', 'end', 'end']
+        await registry.stop_all()
+
+    @pytest.mark.asyncio
+    async def test_full_mailbox_rejects(self):
+        """Commands beyond the mailbox size raise MailboxFull and are counted."""
+        registry = RoomActorRegistry(mailbox_size=2)
+        handler = Recorder(delay=0.05)
+        futures = [registry.submit("ROOM", handler, 0)]
+        await asyncio.sleep(0.01)  # the actor takes the first command off the mailbox
+
+        futures += [registry.submit("ROOM", handler, n) for n in (1, 2)]
+        with pytest.raises(MailboxFull):
+            registry.submit("ROOM", handler, 3)
+
+        assert await asyncio.gather(*futures) == [0, 1, 2]
+        metrics = registry.get_metrics()
+        assert metrics['rejected'] == 1
+        assert metrics['rooms']['ROOM']['max_depth'] == 2
+        assert metrics['rooms']['ROOM']['processed'] == 3
+        await registry.stop_all()
+
+    @pytest.mark.asyncio
+    async def test_reentrant_run_does_not_deadlock(self):
+        """A handler may run another command for its own room inline."""
+        registry = RoomActorRegistry()
+        inner = Recorder()
+
+        async def outer():
+            return await registry.run("ROOM", inner, "inner")
+
+        assert await asyncio.wait_for(registry.run("ROOM", outer), timeout=1.0) == "inner"
+        await registry.stop_all()
+
+    @pytest.mark.asyncio
+    async def test_errors_reach_the_caller(self):
+        """A failing command raises for its caller and the actor keeps serving."""
+        registry = RoomActorRegistry()
+
+        async def boom():
+            raise ValueError("bad move")
+
+        with pytest.raises(ValueError):
+            await registry.run("ROOM", boom)
+
+        assert await registry.run("ROOM", Recorder(), "next") == "next"
+        assert registry.get_metrics()['rooms']['ROOM']['failed'] == 1
+        await registry.stop_all()
+
+    @pytest.mark.asyncio
+    async def test_idle_actor_stops(self):
+        """Idle actors remove themselves and are recreated on demand."""
+        registry = RoomActorRegistry(idle_timeout=0.02)
+        await registry.run("ROOM", Recorder(delay=0), "x")
+
+        await asyncio.sleep(0.1)
+
+        assert "ROOM" not in registry.actors
+        assert registry.get_metrics()['stopped'] == 1
+        assert await registry.run("ROOM", Recorder(delay=0), "y") == "y"
+        assert registry.get_metrics()['started'] == 2
+        await registry.stop_all()
+
+
+class TestServerRouting:
+    """Test that GameServer runs room messages on the room's actor."""
+
+    @pytest.mark.asyncio
+    async def test_play_card_messages_are_serialized(self):
+        """play_card messages for one room from different sockets do not overlap."""
+        server = GameServer()
+        server.auth_manager.is_authenticated = lambda websocket: True
+        handler = Recorder()
+
+        async def handle_play_card(websocket, message):
+            await handler(message['card'])
+
+        server.handle_play_card = handle_play_card
+        messages = [
+            {'type': 'play_card', 'room_code': 'ROOM', 'player_id': f'p{n}', 'card': f'card{n}'}
+            for n in range(3)
+        ]
+
+        await asyncio.gather(*(server.handle_message(object(), message) for message in messages))
+
+        assert handler.log == [(event, f'card{n}') for n in range(3) for event in ('start', 'end')]
+        assert server.room_actors.get_metrics()['rooms']['ROOM']['processed'] == 3
+        await server.room_actors.stop_all()
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("room_from", ["message", "token"])
+    async def test_reconnects_are_serialized(self, room_from):
+        """A reconnect queues behind the room's other commands, taking the room from the token or the message."""
+        server = GameServer()
+        server.auth_manager.is_authenticated = lambda websocket: True
+        handler = Recorder()
+
+        async def handle_play_card(websocket, message):
+            await handler('play_card')
+
+        async def handle_reconnect(websocket, message, claims):
+            await handler('reconnect')
+
+        server.handle_play_card = handle_play_card
+        server.handle_reconnect = handle_reconnect
+        reconnect = {'type': 'reconnect', 'player_id': 'p0'}
+        if room_from == "token":
+            reconnect['resume_token'] = server.network_manager.resume_tokens.issue('p0', 'user0', 'ROOM')
+        else:
+            reconnect['room_code'] = 'ROOM'
+        play = {'type': 'play_card', 'room_code': 'ROOM', 'player_id': 'p1', 'card': 'card'}
+
+        await asyncio.gather(server.handle_message(object(), play), server.handle_message(object(), reconnect))
+
+        assert handler.log == [('start', 'play_card'), ('end', 'play_card'), ('start', 'reconnect'), ('end', 'reconnect')]
+        assert server.room_actors.get_metrics()['rooms']['ROOM']['processed'] == 2
+        await server.room_actors.stop_all()
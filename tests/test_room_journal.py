@@ -0,0 +1,152 @@
+"""
+Unit tests for the per-room broadcast journal.
+
+Tests cover:
+1. Monotonic journal event IDs issued by NetworkManager
+2. Journal entry decoding in ResilientRedisManager
+3. Broadcasts carrying their event_id and appending to the journal
+
+Usage:
+    pytest tests/test_room_journal.py
+    pytest tests/test_room_journal.py -v  # verbose output
+"""
+
+import pytest
+
+# Add backend directory to path for imports
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from network import NetworkManager
+from redis_manager_resilient import ResilientRedisManager
+from socket_helpers import RecordingSocket
+
+
+def parse_id(event_id):
+    ms, seq = event_id.split('-')
+    return int(ms), int(seq)
+
+
+@pytest.fixture
+def network():
+    """NetworkManager singleton with empty connection and journal tables."""
+    manager = NetworkManager()
+    manager.live_connections.clear()
+    manager.connection_metadata.clear()
+    manager.room_connections.clear()
+    manager.journal_ids.clear()
+    yield manager
+    manager.live_connections.clear()
+    manager.connection_metadata.clear()
+    manager.room_connections.clear()
+    manager.journal_ids.clear()
+
+
+class TestEventIds:
+    """Test journal ID generation."""
+
+    def test_ids_strictly_increase_within_a_millisecond(self, network):
+        """Many IDs issued back to back are strictly increasing."""
+        ids = [parse_id(network.next_event_id("ROOM")) for _ in range(500)]
+
+        assert ids == sorted(ids)
+        assert len(set(ids)) == len(ids)
+
+    def test_ids_survive_clock_going_backwards(self, network):
+        """A stalled or stepped-back clock still yields larger IDs."""
+        future_ms = parse_id(network.next_event_id("ROOM"))[0] + 60000
+        network.journal_ids["ROOM"] = (future_ms, 7)
+
+        assert parse_id(network.next_event_id("ROOM")) == (future_ms, 8)
+
+    def test_rooms_have_independent_sequences(self, network):
+        """Each room tracks its own last ID."""
+        network.journal_ids["A"] = (10 ** 15, 3)
+        first_b = parse_id(network.next_event_id("B"))
+
+        assert first_b[0] < 10 ** 15
+        assert parse_id(network.next_event_id("A")) == (10 ** 15, 4)
+
+
+class StreamClient:
+    """Minimal in-memory stand-in for the stream commands used by the journal."""
+
+    def __init__(self):
+        self.streams = {}
+
+    def pipeline(self):
+        return self
+
+    def xadd(self, key, fields, id='*', maxlen=None, approximate=True):
+        entries = self.streams.setdefault(key, [])
+        entries.append((id.encode(), {k.encode(): v.encode() for k, v in fields.items()}))
+        if maxlen is not None:
+            del entries[:-maxlen]
+
+    def expire(self, key, seconds):
+        pass
+
+    def execute(self):
+        return []
+
+    def xread(self, streams, count=None):
+        result = []
+        for key, after_id in streams.items():
+            after = parse_id(after_id)
+            entries = [e for e in self.streams.get(key, []) if parse_id(e[0].decode()) > after]
+            if entries:
+                result.append([key.encode(), entries[:count]])
+        return result
+
+
+class TestResilientJournal:
+    """Test append/read on the sync manager."""
+
+    @pytest.fixture
+    def manager(self):
+        manager = ResilientRedisManager()
+        manager.redis = StreamClient()
+        return manager
+
+    def test_append_and_read_after(self, manager):
+        """Reads return decoded entries strictly after the given ID."""
+        manager.append_room_event("ROOM", "1-0", "card_played", {'card': 'A_hearts'})
+        manager.append_room_event("ROOM", "1-1", "trick_result", {'winner': 'alice'})
+        manager.append_room_event("ROOM", "2-0", "turn_start", {})
+
+        events = manager.read_room_events("ROOM", "1-0")
+
+        assert [e['event_id'] for e in events] == ["1-1", "2-0"]
+        assert events[0]['type'] == 'trick_result'
+        assert events[0]['data'] == {'winner': 'alice'}
+
+    def test_journal_is_capped(self, manager):
+        """MAXLEN trimming keeps only the newest entries."""
+        for i in range(10):
+            manager.append_room_event("ROOM", f"{i + 1}-0", "info", {'i': i}, maxlen=3)
+
+        events = manager.read_room_events("ROOM")
+
+        assert [e['data']['i'] for e in events] == [7, 8, 9]
+
+
+class TestBroadcastJournal:
+    """Test broadcast_to_room journaling."""
+
+    @pytest.mark.asyncio
+    async def test_broadcast_carries_event_id_and_is_journaled(self, network):
+        """Clients see the same event_id that the journal stores."""
+        manager = ResilientRedisManager()
+        manager.redis = StreamClient()
+        ws = RecordingSocket()
+        network.register_connection(ws, "p1", "ROOM", "alice")
+
+        await network.broadcast_to_room("ROOM", 'phase_change', {'new_phase': 'gameplay'}, manager,
+                                        players=[{'player_id': 'p1', 'username': 'alice'}])
+
+        sent = ws.sent[0]
+        events = manager.read_room_events("ROOM")
+        assert len(events) == 1
+        assert events[0]['event_id'] == sent['event_id']
+        assert events[0]['data'] == {'new_phase': 'gameplay'}
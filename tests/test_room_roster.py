@@ -0,0 +1,207 @@
+"""
+Unit tests for the in-memory RoomRoster.
+
+Tests cover:
+1. Adding players and seat ordering
+2. Socket binding, rebinding on reconnect and unbinding on disconnect
+3. Pruning at game start and hydration from Redis room player lists
+4. GameServer sending hands and turn_start to the roster without Redis reads
+
+Usage:
+    pytest tests/test_room_roster.py
+    pytest tests/test_room_roster.py -v  # verbose output
+"""
+
+import pytest
+import random
+
+# Add backend directory to path for imports
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from game_board import GameBoard
+from network import NetworkManager
+from room_roster import RoomRoster
+from server import GameServer
+from board_helpers import PLAYERS, deal_to_gameplay
+from socket_helpers import RecordingSocket
+
+
+class FakeSocket:
+    """Hashable stand-in for a websocket."""
+
+    def __init__(self, name):
+        self.name = name
+
+
+@pytest.fixture
+def roster():
+    """Roster with four seated players, each bound to a socket."""
+    room = RoomRoster('ROOM')
+    sockets = [FakeSocket(i) for i in range(4)]
+    for i, ws in enumerate(sockets):
+        room.add_player(f"p{i}", f"user{i}", ws, player_number=i + 1)
+    room.sockets = sockets
+    return room
+
+
+class TestMembership:
+    """Test player membership and ordering."""
+
+    def test_players_kept_in_join_order(self, roster):
+        """to_room_players returns players in the order they joined."""
+        players = roster.to_room_players()
+
+        assert [p['username'] for p in players] == ['user0', 'user1', 'user2', 'user3']
+        assert [p['player_number'] for p in players] == [1, 2, 3, 4]
+        assert len(roster) == 4
+        assert 'p2' in roster
+
+    def test_to_room_players_returns_copies(self, roster):
+        """Mutating the exported list does not change the roster."""
+        players = roster.to_room_players()
+        players[0]['connection_status'] = 'tampered'
+
+        assert roster.get_player('p0')['connection_status'] == 'active'
+
+    def test_rejoin_updates_existing_entry(self, roster):
+        """Adding a known player id updates it instead of duplicating."""
+        roster.add_player('p1', 'user1', player_number=2, rating=1200)
+
+        assert len(roster) == 4
+        assert roster.get_player('p1')['rating'] == 1200
+
+    def test_retain_players_prunes_others(self, roster):
+        """retain_players drops everyone not in the given ids."""
+        roster.add_player('p4', 'late')
+        removed = roster.retain_players(['p0', 'p1', 'p2', 'p3'])
+
+        assert removed == ['p4']
+        assert roster.get_player_id('late') is None
+        assert len(roster) == 4
+
+
+class TestSocketBinding:
+    """Test websocket <-> player resolution."""
+
+    def test_lookup_by_socket(self, roster):
+        """A bound socket resolves to (username, player_id)."""
+        assert roster.get_player_by_socket(roster.sockets[2]) == ('user2', 'p2')
+        assert roster.get_player_by_socket(FakeSocket('unknown')) == (None, None)
+
+    def test_unbind_marks_disconnected_but_keeps_seat(self, roster):
+        """Closing a socket keeps the player seated for reconnection."""
+        assert roster.unbind_socket(roster.sockets[0]) == 'p0'
+
+        assert roster.get_player_by_socket(roster.sockets[0]) == (None, None)
+        assert roster.get_player('p0')['connection_status'] == 'disconnected'
+        assert roster.active_count() == 3
+        assert 'p0' in roster
+
+    def test_rebind_replaces_old_socket(self, roster):
+        """Reconnecting on a new socket drops the stale one."""
+        new_ws = FakeSocket('new')
+        roster.unbind_socket(roster.sockets[1])
+
+        assert roster.bind_socket(new_ws, 'p1')
+        assert roster.get_player_by_socket(new_ws) == ('user1', 'p1')
+        assert roster.get_player('p1')['connection_status'] == 'active'
+
+        newer_ws = FakeSocket('newer')
+        roster.bind_socket(newer_ws, 'p1')
+        assert roster.get_player_by_socket(new_ws) == (None, None)
+
+    def test_bind_unknown_player_fails(self, roster):
+        """Sockets can only be bound to seated players."""
+        assert not roster.bind_socket(FakeSocket('x'), 'ghost')
+
+
+class TestHydration:
+    """Test building a roster from Redis room player entries."""
+
+    def test_from_room_players(self):
+        """Redis entries become seated, unbound players; placeholders are skipped."""
+        entries = [
+            {'player_id': 'a', 'username': 'alice', 'player_number': 1, 'connection_status': 'active'},
+            {'player_id': None, 'username': 'placeholder'},
+            {'player_id': 'b', 'username': 'bob', 'player_number': 2, 'connection_status': 'active'},
+        ]
+
+        roster = RoomRoster.from_room_players('ROOM', entries)
+
+        assert [p['username'] for p in roster.to_room_players()] == ['alice', 'bob']
+        assert roster.get_player('a')['player_number'] == 1
+        # No sockets yet, so nobody is considered active until they rebind
+        assert roster.active_count() == 0
+        assert roster.get_player_id('bob') == 'b'
+
+
+class RosterOnlyRedis:
+    """Async manager stand-in that counts room player reads."""
+
+    is_async = True
+
+    def __init__(self):
+        self.room_player_reads = 0
+
+    async def get_room_players(self, room_code):
+        self.room_player_reads += 1
+        return []
+
+    def __getattr__(self, name):
+        async def call(*args):
+            return True
+        return call
+
+
+@pytest.mark.usefixtures('tmp_cwd')
+class TestServerSends:
+    """Test that per-player hands and turn_start go to the roster's players."""
+
+    @pytest.fixture
+    def server(self, monkeypatch):
+        monkeypatch.setenv('HOKM_OUTBOUND_QUEUE', '0')
+        previous = NetworkManager._instance
+        NetworkManager._instance = None
+        server = GameServer()
+        server.redis_manager = RosterOnlyRedis()
+        yield server
+        server.cancel_turn_deadline("ROOM")
+        NetworkManager._instance = previous
+
+    def seat(self, server, board):
+        server.active_games["ROOM"] = board
+        roster = server.get_roster("ROOM")
+        sockets = {}
+        for i, name in enumerate(PLAYERS):
+            sockets[name] = RecordingSocket(name)
+            server.network_manager.register_connection(sockets[name], f"id-{name}", "ROOM", name)
+            roster.add_player(f"id-{name}", name, sockets[name], player_number=i + 1)
+        return sockets
+
+    @pytest.mark.asyncio
+    async def test_initial_hands(self, server):
+        """Each player gets their five cards."""
+        random.seed(2)
+        board = GameBoard(PLAYERS, "ROOM")
+        board.assign_teams_and_hakem()
+        sockets = self.seat(server, board)
+
+        await server.broadcast_initial_hands("ROOM", board.initial_deal())
+
+        assert all(ws.of_type('initial_deal')[0]['hand'] == board.hands[name] for name, ws in sockets.items())
+        assert server.redis_manager.room_player_reads == 0
+
+    @pytest.mark.asyncio
+    async def test_first_trick_turn_start(self, server):
+        """Every player gets turn_start with their hand; only the hakem's says it is their turn."""
+        board = deal_to_gameplay()
+        sockets = self.seat(server, board)
+
+        await server.start_first_trick("ROOM")
+
+        for name, ws in sockets.items():
+            turn = ws.of_type('turn_start')[0]
+            assert turn['hand'] == board.hands[name] and turn['your_turn'] == (name == board.hakem)
+        assert server.redis_manager.room_player_reads == 0
@@ -0,0 +1,189 @@
+"""
+Unit tests for room-affinity sharding.
+
+Tests cover:
+1. Consistent hash ring stability, balance and minimal movement
+2. Workers redirecting rooms they do not own
+3. The acceptor handing a connection to the owning worker (auth replayed)
+4. Supervisor worker restarts and stats aggregation
+
+Usage:
+    pytest tests/test_room_sharding.py
+    pytest tests/test_room_sharding.py -v  # verbose output
+"""
+
+import pytest
+import asyncio
+import json
+import time
+from collections import Counter
+
+# Add backend directory to path for imports
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import websockets
+
+from room_sharding import ConsistentHashRing, ShardAcceptor, ShardConfig, ShardSupervisor
+from server import GameServer
+
+# GameServer() writes simple_users.json to the working directory
+pytestmark = pytest.mark.usefixtures('tmp_cwd')
+
+ROOMS = [f"{n:04d}" for n in range(4000)]
+
+
+def exit_immediately(index, config, stats_queue):
+    """Worker target that crashes straight away."""
+    os._exit(3)
+
+
+class TestHashRing:
+    """Test room-to-worker assignment."""
+
+    def test_assignment_is_stable(self):
+        """Separately built rings (i.e. separate processes) agree on every room."""
+        first, second = ConsistentHashRing(range(4)), ConsistentHashRing(range(4))
+
+        assert all(first.node_for(room) == second.node_for(room) for room in ROOMS)
+
+    def test_rooms_are_balanced(self):
+        """Each of four workers gets a fair share of rooms."""
+        counts = Counter(ConsistentHashRing(range(4)).node_for(room) for room in ROOMS)
+
+        assert set(counts) == {0, 1, 2, 3}
+        assert all(600 < count < 1400 for count in counts.values())
+
+    def test_adding_a_worker_moves_few_rooms(self):
+        """Growing from four to five workers only moves rooms to the new worker."""
+        before = ConsistentHashRing(range(4))
+        after = ConsistentHashRing(range(5))
+
+        moved = [room for room in ROOMS if before.node_for(room) != after.node_for(room)]
+
+        assert len(moved) < len(ROOMS) * 0.35
+        assert all(after.node_for(room) == 4 for room in moved)
+
+
+class CapturingNetwork:
+    """Network manager stand-in recording sent messages."""
+
+    def __init__(self):
+        self.sent = []
+        self.connection_metadata = {}
+
+    async def send_message(self, websocket, message_type, data=None):
+        self.sent.append((message_type, data))
+        return True
+
+
+class TestWorkerOwnership:
+    """Test the in-process ownership check."""
+
+    @pytest.mark.asyncio
+    async def test_foreign_room_is_redirected(self):
+        """A worker only accepts rooms from its own shard."""
+        urls = ["ws://127.0.0.1:9000", "ws://127.0.0.1:9001"]
+        server = GameServer()
+        server.network_manager = CapturingNetwork()
+        server.configure_sharding(0, urls)
+        own = next(room for room in ROOMS if server.shard_ring.node_for(room) == 0)
+        foreign = next(room for room in ROOMS if server.shard_ring.node_for(room) == 1)
+
+        assert await server.check_room_owner(object(), own)
+        assert not await server.check_room_owner(object(), foreign)
+        assert server.network_manager.sent == [
+            ('redirect', {'room_code': foreign, 'shard': 1, 'url': urls[1]})
+        ]
+
+    @pytest.mark.asyncio
+    async def test_unsharded_server_owns_everything(self):
+        """Without sharding every room is accepted."""
+        server = GameServer()
+
+        assert await server.check_room_owner(object(), "1234")
+
+
+async def start_fake_worker(name, received):
+    """Worker stand-in: answers auth, and tags every other frame with its name."""
+    async def handler(websocket):
+        async for raw in websocket:
+            message = json.loads(raw)
+            received.append((name, message['type']))
+            if message['type'].startswith('auth_'):
+                await websocket.send(json.dumps({'type': 'auth_response', 'success': True}))
+            else:
+                await websocket.send(json.dumps({'type': 'ack', 'worker': name, 'for': message['type']}))
+    server = await websockets.serve(handler, '127.0.0.1', 0)
+    port = server.sockets[0].getsockname()[1]
+    return server, f"ws://127.0.0.1:{port}"
+
+
+class TestAcceptor:
+    """Test handing connections to the owning worker."""
+
+    @pytest.mark.asyncio
+    async def test_join_is_handed_to_owner_with_auth_replayed(self):
+        """Auth goes to the home worker; join switches to the owner, which is authenticated first."""
+        received = []
+        workers = [await start_fake_worker(f"w{i}", received) for i in range(2)]
+        acceptor = ShardAcceptor([url for _, url in workers])
+        public = await websockets.serve(acceptor.handle, '127.0.0.1', 0)
+        port = public.sockets[0].getsockname()[1]
+        room = next(room for room in ROOMS if acceptor.ring.node_for(room) == 1)
+
+        try:
+            async with websockets.connect(f"ws://127.0.0.1:{port}") as client:
+                await client.send(json.dumps({'type': 'auth_login', 'username': 'u', 'password': 'p'}))
+                assert json.loads(await client.recv())['type'] == 'auth_response'
+                await client.send(json.dumps({'type': 'join', 'room_code': room}))
+                reply = json.loads(await asyncio.wait_for(client.recv(), timeout=2.0))
+        finally:
+            public.close()
+            for server, _ in workers:
+                server.close()
+
+        assert reply == {'type': 'ack', 'worker': 'w1', 'for': 'join'}
+        assert ('w1', 'auth_login') in received
+        assert received.index(('w1', 'auth_login')) < received.index(('w1', 'join'))
+        assert acceptor.get_metrics()['handoffs'] == 1
+
+
+class TestSupervisor:
+    """Test worker supervision and stats."""
+
+    def test_crashed_worker_is_restarted_with_backoff(self):
+        """A dead worker is restarted after its backoff, which then doubles."""
+        supervisor = ShardSupervisor(ShardConfig(workers=1, restart_backoff=1.0), worker_target=exit_immediately)
+        slot = supervisor.slots[0]
+        supervisor._start_worker(slot)
+        slot.process.join(5)
+        now = time.time()
+
+        supervisor.check_workers(now)
+        assert slot.restart_at == pytest.approx(now + 1.0)
+        supervisor.check_workers(now + 0.5)
+        assert slot.restarts == 0
+
+        supervisor.check_workers(now + 1.0)
+        assert slot.restarts == 1
+        assert slot.backoff == 2.0
+        slot.process.join(5)
+
+    def test_stats_are_aggregated(self):
+        """Worker reports are summed across the shard."""
+        supervisor = ShardSupervisor(ShardConfig(workers=2))
+        supervisor.stats_queue.put({'shard_index': 0, 'active_games': 3, 'connections': 12})
+        supervisor.stats_queue.put({'shard_index': 1, 'active_games': 2, 'connections': 8})
+
+        deadline = time.time() + 2.0
+        while time.time() < deadline and not all(slot.stats for slot in supervisor.slots):
+            supervisor.drain_stats()
+            time.sleep(0.01)
+        stats = supervisor.get_stats()
+
+        assert stats['active_games'] == 5
+        assert stats['connections'] == 20
+        assert stats['alive_workers'] == 0
+        assert stats['per_worker'][1]['active_games'] == 2
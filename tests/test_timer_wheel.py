@@ -0,0 +1,253 @@
+"""
+Unit tests for the timing wheel and turn deadlines.
+
+Tests cover:
+1. Firing at the right tick, including cascades from higher levels
+2. Keyed re-arm and O(1) cancel, at 100k timers
+3. GameServer auto-playing a legal card or choosing hokm on expiry
+4. Deadlines being kept across rejected plays and superseded by real ones
+
+Usage:
+    pytest tests/test_timer_wheel.py
+    pytest tests/test_timer_wheel.py -v  # verbose output
+"""
+
+import pytest
+import asyncio
+import random
+import time
+
+# Add backend directory to path for imports
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from game_board import GameBoard
+from room_roster import RoomRoster
+from server import GameServer
+from timer_wheel import TimerWheel
+from write_behind import WriteBehindPersister
+
+# GameServer() writes simple_users.json to the working directory
+pytestmark = pytest.mark.usefixtures('tmp_cwd')
+
+PLAYERS = ["P1", "P2", "P3", "P4"]
+
+
+class TestTimerWheel:
+    """Test arming, cancelling and advancing."""
+
+    def test_fires_on_its_tick(self):
+        """A timer fires once, when its tick is reached."""
+        wheel = TimerWheel(tick=0.1)
+        fired = []
+        wheel.arm('a', 0.5, fired.append, 'a')
+
+        wheel.advance(4)
+        assert fired == []
+        wheel.advance(1)
+        assert fired == ['a']
+        wheel.advance(100)
+        assert fired == ['a']
+        assert len(wheel) == 0
+
+    def test_long_delays_cascade(self):
+        """Timers beyond level 0 are cascaded down and fire on time."""
+        wheel = TimerWheel(tick=1.0, wheel_bits=2, levels=4)   # 4 slots per level
+        fired = []
+        delays = [1, 3, 4, 5, 17, 63, 100, 250]
+        for delay in delays:
+            wheel.arm(delay, delay, lambda d=delay: fired.append((d, wheel.current_tick)))
+
+        wheel.advance(255)
+
+        assert fired == [(d, d) for d in delays]
+        assert wheel.get_metrics()['cascaded'] > 0
+
+    def test_rearm_replaces_and_cancel_removes(self):
+        """Arming a key again replaces its timer; cancelled timers never fire."""
+        wheel = TimerWheel(tick=0.1)
+        fired = []
+        wheel.arm('room', 0.2, fired.append, 'old')
+        wheel.arm('room', 0.5, fired.append, 'new')
+        wheel.arm('other', 0.1, fired.append, 'other')
+        assert wheel.cancel('other')
+        assert not wheel.cancel('other')
+
+        wheel.advance(10)
+
+        assert fired == ['new']
+
+    def test_hundred_thousand_timers(self):
+        """100k timers arm, cancel and fire without per-timer scans."""
+        wheel = TimerWheel(tick=0.1)
+        fired = []
+        rng = random.Random(7)
+
+        start = time.perf_counter()
+        for n in range(100_000):
+            wheel.arm(n, rng.uniform(0.1, 60.0), fired.append, n)
+        for n in range(0, 100_000, 2):
+            wheel.cancel(n)
+        elapsed = time.perf_counter() - start
+        wheel.advance(601)
+
+        assert elapsed < 2.0
+        assert len(fired) == 50_000
+        assert all(n % 2 == 1 for n in fired)
+        assert len(wheel) == 0
+
+    @pytest.mark.asyncio
+    async def test_running_wheel_fires_in_real_time(self):
+        """The background task advances with the clock."""
+        wheel = TimerWheel(tick=0.01)
+        fired = asyncio.Event()
+        wheel.arm('room', 0.05, fired.set)
+        wheel.start()
+
+        await asyncio.wait_for(fired.wait(), timeout=1.0)
+        await wheel.stop()
+
+
+def board_in(phase, room_code="ROOM", seed=3):
+    """Board waiting for hokm, or in gameplay with one card played."""
+    random.seed(seed)
+    board = GameBoard(PLAYERS, room_code)
+    board.assign_teams_and_hakem()
+    board.initial_deal()
+    if phase == 'gameplay':
+        board.set_hokm('hearts')
+        board.final_deal()
+        player = board.players[board.current_turn]
+        board.play_card(player, board.hands[player][0])
+    return board
+
+
+class RecordingRedis:
+    """Redis manager stand-in that records which methods were called."""
+
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        def call(*args, **kwargs):
+            self.calls.append(name)
+        return call
+
+
+class DeadlineServer:
+    """GameServer with broadcasts recorded and persistence kept in memory."""
+
+    def __init__(self, board, room_code="ROOM"):
+        self.server = GameServer()
+        self.broadcasts = []
+        self.saves = []
+
+        async def broadcast_to_room(room_code, msg_type, data):
+            self.broadcasts.append((msg_type, data))
+
+        async def save(room_code, state, moves):
+            self.saves.append(moves)
+            return True
+
+        self.server.broadcast_to_room = broadcast_to_room
+        self.server.state_persister = WriteBehindPersister(save, window=0.01)
+        self.server.active_games[room_code] = board
+        self.server.room_rosters[room_code] = RoomRoster.from_room_players(
+            room_code, [{'player_id': f"id-{name}", 'username': name} for name in PLAYERS]
+        )
+
+    def sent(self, msg_type):
+        return [data for kind, data in self.broadcasts if kind == msg_type]
+
+
+class TestTurnDeadlines:
+    """Test GameServer auto-play on expired deadlines."""
+
+    @pytest.mark.asyncio
+    async def test_expired_turn_plays_a_legal_card(self):
+        """The stalled player's lowest legal card is played and broadcast."""
+        board = board_in('gameplay')
+        harness = DeadlineServer(board)
+        server = harness.server
+        server.turn_timeout = 0.2
+        player = board.players[board.current_turn]
+        legal = [c for c in board.hands[player] if board.validate_play(player, c)[0]]
+
+        server.arm_turn_deadline("ROOM")
+        server.turn_timers.advance(2)
+
+        await asyncio.sleep(0.05)
+        timeouts = harness.sent('turn_timeout')
+        played = harness.sent('card_played')
+        assert timeouts == [{'player': player, 'action': 'play_card', 'card': timeouts[0]['card']}]
+        assert timeouts[0]['card'] in legal
+        assert played[0]['player'] == player and played[0]['card'] == timeouts[0]['card']
+        assert server.auto_play_metrics['cards'] == 1
+        # The next player now has a deadline of their own
+        assert "ROOM" in server.turn_timers
+        await server.room_actors.stop_all()
+
+    @pytest.mark.asyncio
+    async def test_expired_hokm_selection_picks_longest_suit(self):
+        """The hakem's strongest suit becomes hokm and the first trick starts."""
+        board = board_in('hokm_selection')
+        harness = DeadlineServer(board)
+        server = harness.server
+        server.hokm_timeout = 0.1
+        server.redis_manager = redis = RecordingRedis()
+        hakem_hand = list(board.hands[board.hakem])
+
+        server.arm_turn_deadline("ROOM")
+        server.turn_timers.advance(1)
+        await asyncio.sleep(0.05)
+
+        suit = harness.sent('turn_timeout')[0]['suit']
+        counts = {s: sum(1 for c in hakem_hand if c.endswith('_' + s)) for s in ('hearts', 'diamonds', 'clubs', 'spades')}
+        assert counts[suit] == max(counts.values())
+        assert board.hokm == suit
+        assert board.game_phase == 'gameplay'
+        # State is written by the persister only, never by the board itself
+        assert 'save_game_state' not in redis.calls and harness.saves
+        await server.room_actors.stop_all()
+
+    @pytest.mark.asyncio
+    async def test_rejected_play_keeps_deadline(self):
+        """Re-arming for the same turn does not push the deadline back."""
+        harness = DeadlineServer(board_in('gameplay'))
+        server = harness.server
+        server.turn_timeout = 1.0
+
+        server.arm_turn_deadline("ROOM")
+        server.turn_timers.advance(5)
+        server.arm_turn_deadline("ROOM")
+
+        assert server.turn_timers.remaining("ROOM") == pytest.approx(0.5)
+
+    @pytest.mark.asyncio
+    async def test_late_expiry_is_superseded(self):
+        """An expiry queued before the player acted does nothing."""
+        board = board_in('gameplay')
+        harness = DeadlineServer(board)
+        server = harness.server
+        server.arm_turn_deadline("ROOM")
+        _, seq = server.turn_deadlines["ROOM"]
+
+        player = board.players[board.current_turn]
+        board.play_card(player, next(c for c in board.hands[player] if board.validate_play(player, c)[0]))
+        server.arm_turn_deadline("ROOM")
+        await server.auto_play_turn("ROOM", seq)
+
+        assert harness.sent('turn_timeout') == []
+        assert server.auto_play_metrics['superseded'] == 1
+
+    def test_dropping_room_cancels_deadline(self):
+        """Rooms that are cleared leave no timer behind."""
+        harness = DeadlineServer(board_in('gameplay'))
+        server = harness.server
+        server.arm_turn_deadline("ROOM")
+
+        server.drop_room_state("ROOM")
+
+        assert "ROOM" not in server.turn_timers
+        assert server.turn_deadlines == {}
@@ -0,0 +1,284 @@
+"""
+Unit tests for the negotiated binary wire protocol.
+
+Tests cover:
+1. Round trips of compacted fields (types, cards, hands, player UUIDs)
+2. Decoding to the same objects as the JSON protocol
+3. Malformed binary frames
+4. Mixed-protocol broadcasts and send_message
+5. Subprotocol negotiation over a real websocket
+6. Bytes per full game compared to JSON
+7. Compressed binary frames, the preset dictionary and per-message choice
+
+Usage:
+    pytest tests/test_wire_protocol.py
+    pytest tests/test_wire_protocol.py -v  # verbose output
+"""
+
+import pytest
+import json
+import uuid
+
+# Add backend directory to path for imports
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+import websockets
+
+import wire_protocol
+from broadcast_fanout import BroadcastFanout
+from network import NetworkManager
+from wire_protocol import (SUBPROTOCOL_JSON_Z, SUBPROTOCOL_MSGPACK, SUBPROTOCOL_MSGPACK_Z, FrameCompressor,
+                           WireFormatError, client_subprotocols, compress_frame, decode, encode,
+                           game_messages, measure_game_traffic, select_subprotocol, server_subprotocols,
+                           uses_frame_compression)
+
+pytestmark = pytest.mark.skipif(not wire_protocol.MSGPACK_AVAILABLE, reason="msgpack not installed")
+
+PLAYER_ID = str(uuid.UUID(int=12345, version=4))
+
+
+class ProtocolSocket:
+    """Websocket stand-in with a negotiated subprotocol."""
+
+    def __init__(self, subprotocol=None):
+        self.subprotocol = subprotocol
+        self.sent = []
+
+    async def send(self, frame):
+        self.sent.append(frame)
+
+
+class TestCodec:
+    """Test encoding and decoding of single messages."""
+
+    def test_card_played_round_trip(self):
+        """Compacted fields decode back to the original message."""
+        message = {'type': 'card_played', 'player': 'alice', 'card': '10_diamonds', 'team': 2,
+                   'player_id': PLAYER_ID, 'event_id': '17-0'}
+
+        frame = encode(message, binary=True)
+
+        assert isinstance(frame, bytes)
+        assert decode(frame) == message
+        assert len(frame) < len(json.dumps(message)) / 2
+
+    def test_hand_is_one_byte_per_card(self):
+        """A 13-card hand costs 13 bytes plus a small header."""
+        hand = ['2_hearts', 'A_spades', 'Q_clubs', '7_diamonds'] * 3 + ['K_hearts']
+        frame = encode({'type': 'turn_start', 'hand': hand, 'your_turn': True}, binary=True)
+
+        assert decode(frame)['hand'] == hand
+        assert len(frame) < 25
+
+    def test_unknown_values_are_passed_through(self):
+        """Unknown types and keys, bad cards and non-canonical ids stay as they are."""
+        message = {'type': 'custom_event', 'extra_field': [1, None, 'x'], 'card': 'joker',
+                   'hand': ['A_hearts', 'wild'], 'player_id': PLAYER_ID.upper()}
+
+        assert decode(encode(message, binary=True)) == message
+
+    def test_decodes_like_json(self):
+        """Non-string dict keys become strings, as with JSON."""
+        message = {'type': 'hand_complete', 'tricks': {0: 7, 1: 3}, 'round_scores': {0: 1, 1: 0},
+                   'teams': {'1': ('a', 'b')}}
+
+        assert decode(encode(message, binary=True)) == json.loads(encode(message))
+
+    def test_text_frames_stay_json(self):
+        """The default protocol is unchanged JSON text."""
+        message = {'type': 'info', 'message': 'hi'}
+
+        assert encode(message) == json.dumps(message)
+        assert decode(json.dumps(message)) == message
+
+    @pytest.mark.parametrize("frame", [b'\xc1', b'\x81\x7f\x01', b'\x82\x00'])
+    def test_malformed_binary_frames(self, frame):
+        """Bad or truncated frames raise WireFormatError (a ValueError)."""
+        with pytest.raises(WireFormatError):
+            decode(frame)
+
+    def test_subprotocol_lists(self):
+        """The server prefers msgpack; clients only offer what they ask for."""
+        assert server_subprotocols()[:2] == [SUBPROTOCOL_MSGPACK_Z, SUBPROTOCOL_MSGPACK]
+        assert client_subprotocols(None) is None
+        assert client_subprotocols('json') == ['hokm.json.v1']
+        assert client_subprotocols('msgpack')[0] == SUBPROTOCOL_MSGPACK
+        assert client_subprotocols(None, compress=True) == ['hokm.json.z1', 'hokm.json.v1']
+        assert client_subprotocols('msgpack', compress=True)[0] == SUBPROTOCOL_MSGPACK_Z
+
+    def test_select_subprotocol(self):
+        """Selection falls back to no subprotocol under either callback signature."""
+        offered = ['hokm.json.v1', SUBPROTOCOL_MSGPACK]
+        assert select_subprotocol(object(), offered) == SUBPROTOCOL_MSGPACK     # connection, offered
+        assert select_subprotocol(offered, server_subprotocols()) == SUBPROTOCOL_MSGPACK   # legacy
+        assert select_subprotocol(object(), []) is None
+        assert select_subprotocol(['chat'], server_subprotocols()) is None
+
+
+class TestSending:
+    """Test the network paths choosing the frame format per connection."""
+
+    @pytest.mark.asyncio
+    async def test_mixed_room_broadcast(self):
+        """JSON and binary recipients of one broadcast get the same message."""
+        fanout = BroadcastFanout()
+        text_ws, binary_ws = ProtocolSocket(), ProtocolSocket(SUBPROTOCOL_MSGPACK)
+
+        await fanout.broadcast('card_played', {'player': 'alice', 'card': 'A_hearts', 'player_id': PLAYER_ID},
+                               [(text_ws, {'you': 'bob', 'player_number': 2}),
+                                (binary_ws, {'you': 'carol', 'player_number': 3})])
+
+        as_text = json.loads(text_ws.sent[0])
+        as_binary = decode(binary_ws.sent[0])
+        assert isinstance(binary_ws.sent[0], bytes)
+        assert as_binary.pop('you') == 'carol' and as_binary.pop('player_number') == 3
+        assert as_text.pop('you') == 'bob' and as_text.pop('player_number') == 2
+        assert as_binary == as_text
+
+    @pytest.mark.asyncio
+    async def test_send_message_uses_negotiated_protocol(self):
+        """Direct sends are binary only for connections that asked."""
+        text_ws, binary_ws = ProtocolSocket(), ProtocolSocket(SUBPROTOCOL_MSGPACK)
+
+        await NetworkManager.send_message(text_ws, 'error', {'message': 'nope'})
+        await NetworkManager.send_message(binary_ws, 'error', {'message': 'nope'})
+
+        assert json.loads(text_ws.sent[0]) == {'type': 'error', 'message': 'nope'}
+        assert decode(binary_ws.sent[0]) == {'type': 'error', 'message': 'nope'}
+
+    @pytest.mark.asyncio
+    async def test_handshake_negotiation(self):
+        """Clients offering msgpack get binary frames; others get JSON text."""
+        async def handler(websocket):
+            request = await NetworkManager.receive_message(websocket)
+            await NetworkManager.send_message(websocket, 'info', {'card': request['card']})
+
+        async with websockets.serve(handler, "127.0.0.1", 0, subprotocols=server_subprotocols(),
+                                    select_subprotocol=select_subprotocol) as server:
+            port = server.sockets[0].getsockname()[1]
+            url = f"ws://127.0.0.1:{port}"
+            async with websockets.connect(url, subprotocols=client_subprotocols('msgpack')) as ws:
+                await ws.send(encode({'type': 'play_card', 'card': 'J_clubs'}, binary=True))
+                binary_reply = await ws.recv()
+                negotiated = ws.subprotocol
+            async with websockets.connect(url) as ws:
+                await ws.send(encode({'type': 'play_card', 'card': 'J_clubs'}))
+                text_reply = await ws.recv()
+
+        assert negotiated == SUBPROTOCOL_MSGPACK
+        assert decode(binary_reply) == {'type': 'info', 'card': 'J_clubs'}
+        assert json.loads(text_reply) == {'type': 'info', 'card': 'J_clubs'}
+
+
+def state_sync_frame(seq=7, binary=False):
+    """A keyframe-sized state_sync as the delta stream sends it."""
+    players = ['alice', 'bob', 'carol', 'dave']
+    hand = ['2_hearts', '5_hearts', 'J_hearts', 'A_diamonds', '3_clubs', '9_clubs', 'Q_clubs',
+            '4_spades', '10_spades', 'K_spades', 'A_spades']
+    return encode({'type': 'state_sync', 'room_code': '4821', 'epoch': 'a1b2c3d4', 'seq': seq, 'keyframe': True,
+                   'changes': {'phase': 'gameplay', 'hokm': 'clubs', 'hakem': 'bob', 'players': players,
+                               'teams': {name: seat % 2 for seat, name in enumerate(players)},
+                               'current_turn': 2, 'tricks': {'0': 1, '1': 0}, 'completed_tricks': 1,
+                               'current_trick': [['carol', '7_diamonds']], 'led_suit': 'diamonds',
+                               'played_cards': ['2_clubs', 'K_clubs', 'A_clubs', '8_clubs'], 'hand': hand}},
+                  binary)
+
+
+class TestCompressedFrames:
+    """Test compressed binary frames."""
+
+    @pytest.mark.parametrize("binary", [False, True])
+    def test_round_trip(self, binary):
+        """A compressed frame decodes to the message it carries, in either protocol."""
+        frame = state_sync_frame(binary=binary)
+
+        compressed = compress_frame(frame)
+
+        assert isinstance(compressed, bytes) and compressed[0] == 0xc1
+        assert decode(compressed) == decode(frame)
+        assert len(compressed) < len(frame) * 0.6
+
+    def test_preset_dictionary_helps_small_frames(self):
+        """The dictionary makes a single small message smaller than plain deflate does."""
+        frame = encode({'type': 'state_sync', 'room_code': '4821', 'epoch': 'a1b2c3d4', 'seq': 8,
+                        'keyframe': False, 'base': 7,
+                        'changes': {'current_turn': 3, 'current_trick': [['carol', '7_diamonds'],
+                                                                         ['dave', 'Q_diamonds']]}})
+
+        assert len(compress_frame(frame)) < len(compress_frame(frame, preset=False)) < len(frame)
+
+    @pytest.mark.parametrize("frame", [b'\xc1\x02', b'\xc1\x00\xff\xff\xff', compress_frame('{"a": 1}')[:-2]])
+    def test_malformed_compressed_frames(self, frame):
+        """Truncated or corrupt compressed frames raise WireFormatError."""
+        with pytest.raises(WireFormatError):
+            decode(frame)
+
+    def test_compressor_chooses_per_message(self):
+        """Small frames are skipped; kinds that do not compress are only re-probed now and then."""
+        compressor = FrameCompressor(min_size=128, max_ratio=0.9, probe_every=4)
+        small = encode({'type': 'state_sync', 'seq': 1})
+        noise = encode({'type': 'state_sync', 'data': os.urandom(256)}, binary=True)
+
+        assert compressor.compress(small, 'delta') is small
+        assert isinstance(compressor.compress(state_sync_frame(), 'keyframe'), bytes)
+        results = [compressor.compress(noise, 'noise') for _ in range(6)]
+
+        assert all(result is noise for result in results)
+        stats = compressor.get_stats()
+        assert stats['kinds']['delta']['skipped_small'] == 1
+        assert stats['kinds']['keyframe']['compressed'] == 1
+        assert stats['kinds']['noise']['tried'] == 2    # First frame, then one probe after 4 skips
+        assert stats['bytes_out'] < stats['bytes_in']
+
+    def test_only_without_transport_deflate(self):
+        """Connections already using permessage-deflate are not sent compressed frames."""
+        class Extension:
+            name = 'permessage-deflate'
+
+        class Protocol:
+            extensions = [Extension()]
+
+        plain, deflating = ProtocolSocket(SUBPROTOCOL_JSON_Z), ProtocolSocket(SUBPROTOCOL_JSON_Z)
+        deflating.protocol = Protocol()
+
+        assert uses_frame_compression(plain)
+        assert not uses_frame_compression(deflating)
+        assert not uses_frame_compression(ProtocolSocket(SUBPROTOCOL_MSGPACK))
+
+    @pytest.mark.asyncio
+    async def test_negotiated_over_websocket(self):
+        """A client offering hokm.json.z1 gets it and can read compressed frames."""
+        frame = compress_frame(state_sync_frame())
+
+        async def handler(websocket):
+            await websocket.recv()
+            await websocket.send(frame)
+
+        async with websockets.serve(handler, "127.0.0.1", 0, subprotocols=server_subprotocols(),
+                                    select_subprotocol=select_subprotocol, compression=None) as server:
+            port = server.sockets[0].getsockname()[1]
+            async with websockets.connect(f"ws://127.0.0.1:{port}", compression=None,
+                                          subprotocols=client_subprotocols(None, compress=True)) as ws:
+                await ws.send(encode({'type': 'info'}))
+                reply = await ws.recv()
+                negotiated = ws.subprotocol
+                usable = uses_frame_compression(ws)
+
+        assert negotiated == SUBPROTOCOL_JSON_Z and usable
+        assert decode(reply) == decode(state_sync_frame())
+
+
+class TestBenchmark:
+    """Test the per-game benchmark."""
+
+    def test_full_game_is_smaller_in_binary(self):
+        """Binary frames for a whole game take well under half the JSON bytes."""
+        messages = game_messages(seed=3)
+
+        as_json = measure_game_traffic(False, messages, repeat=1)
+        as_binary = measure_game_traffic(True, messages, repeat=1)
+
+        assert as_json['frames'] == as_binary['frames'] > 1000
+        assert as_binary['bytes'] < as_json['bytes'] * 0.4
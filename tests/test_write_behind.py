@@ -0,0 +1,230 @@
+"""
+Unit tests for the coalescing write-behind persister.
+
+Tests cover:
+1. Coalescing bursts of snapshots and moves into one write
+2. Explicit flushes, shutdown flush_all and discard
+3. Retry of failed writes and per-room write ordering
+4. Lag metrics
+5. GameServer disconnects recording activity through the persister
+
+Usage:
+    pytest tests/test_write_behind.py
+    pytest tests/test_write_behind.py -v  # verbose output
+"""
+
+import pytest
+import asyncio
+
+# Add backend directory to path for imports
+import sys
+import os
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'backend'))
+
+from write_behind import WriteBehindPersister
+from server import GameServer
+from board_helpers import deal_to_gameplay
+
+
+class RecordingStore:
+    """Async save target that records every write."""
+
+    def __init__(self, delay=0.0, fail_times=0):
+        self.delay = delay
+        self.fail_times = fail_times
+        self.writes = []
+
+    async def save(self, room_code, state, moves):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        if self.fail_times:
+            self.fail_times -= 1
+            return False
+        self.writes.append((room_code, dict(state), list(moves)))
+        return True
+
+
+class TestCoalescing:
+    """Test burst coalescing."""
+
+    @pytest.mark.asyncio
+    async def test_burst_becomes_single_write(self):
+        """Four plays inside the window produce one write with all moves."""
+        store = RecordingStore()
+        persister = WriteBehindPersister(store.save, window=0.05)
+
+        for i in range(4):
+            persister.submit('ROOM', {'played': i}, moves=[{'card': i}])
+        await asyncio.sleep(0.15)
+
+        assert len(store.writes) == 1
+        room_code, state, moves = store.writes[0]
+        assert state == {'played': 3}
+        assert [m['card'] for m in moves] == [0, 1, 2, 3]
+
+    @pytest.mark.asyncio
+    async def test_callable_snapshot_evaluated_once_at_write(self):
+        """Callable snapshots are serialized only when written."""
+        store = RecordingStore()
+        persister = WriteBehindPersister(store.save, window=0.05)
+        calls = []
+
+        def snapshot():
+            calls.append(1)
+            return {'phase': 'gameplay'}
+
+        for _ in range(3):
+            persister.submit('ROOM', snapshot)
+        await asyncio.sleep(0.15)
+
+        assert len(calls) == 1
+        assert store.writes[0][1] == {'phase': 'gameplay'}
+
+    @pytest.mark.asyncio
+    async def test_rooms_are_written_independently(self):
+        """Each room gets its own write."""
+        store = RecordingStore()
+        persister = WriteBehindPersister(store.save, window=0.05)
+
+        persister.submit('A', {'x': 1})
+        persister.submit('B', {'x': 2})
+        await asyncio.sleep(0.15)
+
+        assert sorted(w[0] for w in store.writes) == ['A', 'B']
+
+
+class TestFlushing:
+    """Test explicit flush paths."""
+
+    @pytest.mark.asyncio
+    async def test_save_now_writes_immediately(self):
+        """save_now does not wait for the window."""
+        store = RecordingStore()
+        persister = WriteBehindPersister(store.save, window=10.0)
+
+        persister.submit('ROOM', {'a': 1}, moves=[{'card': 'A_hearts'}])
+        assert await persister.save_now('ROOM', {'a': 2})
+
+        assert store.writes == [('ROOM', {'a': 2}, [{'card': 'A_hearts'}])]
+        assert persister.get_metrics()['pending_rooms'] == 0
+
+    @pytest.mark.asyncio
+    async def test_flush_all_on_shutdown(self):
+        """flush_all writes every pending room."""
+        store = RecordingStore()
+        persister = WriteBehindPersister(store.save, window=10.0)
+
+        persister.submit('A', {'x': 1})
+        persister.submit('B', {'x': 2})
+        assert await persister.flush_all()
+
+        assert len(store.writes) == 2
+
+    @pytest.mark.asyncio
+    async def test_discard_drops_pending_state(self):
+        """Deleted rooms are not resurrected by a late write."""
+        store = RecordingStore()
+        persister = WriteBehindPersister(store.save, window=0.05)
+
+        persister.submit('ROOM', {'x': 1})
+        persister.discard('ROOM')
+        await asyncio.sleep(0.15)
+
+        assert store.writes == []
+        assert persister.get_metrics()['discarded'] == 1
+
+    @pytest.mark.asyncio
+    async def test_flush_during_write_does_not_cancel_it(self):
+        """A flush issued while a write is running waits for it and keeps order."""
+        store = RecordingStore(delay=0.1)
+        persister = WriteBehindPersister(store.save, window=0.01)
+
+        persister.submit('ROOM', {'v': 1})
+        await asyncio.sleep(0.05)  # timer fired, first write in progress
+        await persister.save_now('ROOM', {'v': 2})
+
+        assert [w[1]['v'] for w in store.writes] == [1, 2]
+
+
+class TestFailures:
+    """Test failure handling and metrics."""
+
+    @pytest.mark.asyncio
+    async def test_failed_write_is_retried_with_moves(self):
+        """Moves from a failed write are kept for the next attempt."""
+        store = RecordingStore(fail_times=1)
+        persister = WriteBehindPersister(store.save, window=0.02)
+
+        persister.submit('ROOM', {'v': 1}, moves=[{'card': 1}])
+        await asyncio.sleep(0.03)
+        persister.submit('ROOM', {'v': 2}, moves=[{'card': 2}])
+        await asyncio.sleep(0.1)
+
+        assert store.writes == [('ROOM', {'v': 2}, [{'card': 1}, {'card': 2}])]
+        metrics = persister.get_metrics()
+        assert metrics['failed_writes'] == 1
+        assert metrics['writes'] == 1
+        assert metrics['moves_written'] == 2
+
+    @pytest.mark.asyncio
+    async def test_lag_metrics(self):
+        """Lag covers the time from first change to durable write."""
+        store = RecordingStore()
+        persister = WriteBehindPersister(store.save, window=0.05)
+
+        persister.submit('ROOM', {'v': 1})
+        assert persister.get_metrics()['pending_rooms'] == 1
+        await asyncio.sleep(0.15)
+
+        metrics = persister.get_metrics()
+        assert metrics['max_lag_ms'] >= 40
+        assert metrics['pending_rooms'] == 0
+        assert metrics['coalesced'] == 0
+
+
+class SessionRedis:
+    """Async manager stand-in for the disconnect path that records which methods were called."""
+
+    is_async = True
+
+    def __init__(self):
+        self.calls = []
+
+    def __getattr__(self, name):
+        async def call(*args):
+            self.calls.append(name)
+            if name == 'get_player_session':
+                return {'username': 'P1', 'room_code': 'ROOM'}
+            if name == 'get_room_players':
+                return [{'player_id': 'id-P1', 'username': 'P1', 'connection_status': 'active'}]
+            return True
+        return call
+
+
+class SilentSocket:
+    async def send(self, frame):
+        pass
+
+
+@pytest.mark.usefixtures('tmp_cwd')
+class TestServerDisconnect:
+    """Test that a disconnect does not rewrite the whole game state."""
+
+    @pytest.mark.asyncio
+    async def test_disconnect_touches_activity_through_persister(self):
+        """last_activity goes out as a delta with the room's other writes, never as a full read-modify-write."""
+        server = GameServer()
+        server.redis_manager = SessionRedis()
+        game = deal_to_gameplay()
+        game.to_redis_delta()   # Already persisted
+        server.active_games["ROOM"] = game
+        ws = SilentSocket()
+        server.network_manager.register_connection(ws, 'id-P1', "ROOM", 'P1')
+
+        await server._handle_room_disconnect(ws, "ROOM")
+        assert "ROOM" in server.state_persister.rooms
+        await server.state_persister.flush("ROOM")
+
+        assert 'get_game_state' not in server.redis_manager.calls
+        assert 'save_game_state' not in server.redis_manager.calls
+        assert server.redis_manager.calls.count('update_game_state_fields') == 1